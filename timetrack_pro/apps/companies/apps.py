@@ -4,3 +4,14 @@ from django.apps import AppConfig
 class CompaniesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.companies'
+
+    def ready(self):
+        from django.db.models.signals import post_delete, post_save
+
+        from apps.companies import versioning
+
+        for model in ('timeentries.TimeEntry', 'timesheets.Timesheet'):
+            post_save.connect(versioning.bump_for_user_owned, sender=model)
+            post_delete.connect(versioning.bump_for_user_owned, sender=model)
+        post_save.connect(versioning.bump_for_user, sender='users.User')
+        post_delete.connect(versioning.bump_for_user, sender='users.User')
@@ -0,0 +1,184 @@
+"""
+Tenant context loader for TimeTrack Pro.
+
+Company and CompanySettings are read on most business paths (week start day,
+escalation thresholds, default rates, unlock window). Dereferencing
+``user.company.settings`` lazily costs up to two queries per call site, so the
+same request can load the same company several times.
+
+A tenant scope caches one TenantContext per company for the lifetime of a
+request (TenantContextMiddleware) or a Celery task (task_prerun/task_postrun
+hooks in config/celery.py). Outside a scope every lookup loads fresh.
+
+Usage:
+    with tenant_scope() as scope:
+        ctx = get_user_tenant_context(user)
+        ctx.week_start_day
+        scope.queries_saved
+"""
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+
+from apps.companies.models import Company, CompanySettings
+from apps.infrastructure.metrics import CACHE_REQUESTS
+
+
+@dataclass(frozen=True)
+class TenantContext:
+    """Company plus its settings, loaded in a single query."""
+
+    company: Company
+    _settings: CompanySettings | None = None
+
+    @property
+    def company_id(self) -> int:
+        return self.company.id
+
+    @property
+    def settings(self) -> CompanySettings:
+        """Company settings; raises CompanySettings.DoesNotExist if missing."""
+        if self._settings is None:
+            raise CompanySettings.DoesNotExist(
+                f'Company {self.company.id} has no settings.'
+            )
+        return self._settings
+
+    @property
+    def week_start_day(self) -> int:
+        return self.company.week_start_day
+
+    @property
+    def timezone(self) -> str:
+        return self.company.timezone
+
+    @property
+    def tzinfo(self):
+        """pytz timezone for the company, falling back to UTC."""
+        return self.company.tzinfo
+
+
+@dataclass
+class TenantScope:
+    """
+    Per-request/per-task cache of tenant contexts.
+
+    Tracks loads (queries issued), hits (lookups served from memory) and
+    queries_saved (the hits that would have queried without the scope; a
+    company instance with its settings already cached costs nothing either
+    way).
+    """
+
+    contexts: dict[int, TenantContext] = field(default_factory=dict)
+    loads: int = 0
+    hits: int = 0
+    queries_saved: int = 0
+
+    def as_log_fields(self) -> dict:
+        return {
+            'tenant_loads': self.loads,
+            'tenant_hits': self.hits,
+            'tenant_queries_saved': self.queries_saved,
+        }
+
+
+_current_scope: ContextVar[TenantScope | None] = ContextVar('tenant_scope', default=None)
+
+
+def get_current_scope() -> TenantScope | None:
+    """Get the active tenant scope, if any."""
+    return _current_scope.get()
+
+
+def open_tenant_scope() -> tuple[TenantScope, Token | None]:
+    """
+    Activate a tenant scope.
+
+    Reuses the active scope when one is already open (e.g. an eager Celery
+    task running inside a request), in which case the returned token is None.
+    """
+    scope = _current_scope.get()
+    if scope is not None:
+        return scope, None
+    scope = TenantScope()
+    return scope, _current_scope.set(scope)
+
+
+def close_tenant_scope(token: Token | None) -> None:
+    """Deactivate a scope opened by open_tenant_scope()."""
+    if token is not None:
+        _current_scope.reset(token)
+
+
+@contextmanager
+def tenant_scope() -> Iterator[TenantScope]:
+    """Context manager wrapping open_tenant_scope()/close_tenant_scope()."""
+    scope, token = open_tenant_scope()
+    try:
+        yield scope
+    finally:
+        close_tenant_scope(token)
+
+
+def _build_context(company: Company) -> TenantContext:
+    try:
+        company_settings = company.settings
+    except CompanySettings.DoesNotExist:
+        company_settings = None
+    return TenantContext(company=company, _settings=company_settings)
+
+
+def _load_context(company_id: int) -> TenantContext:
+    company = Company.objects.select_related('settings').get(pk=company_id)
+    return _build_context(company)
+
+
+def get_tenant_context(company: Company | int) -> TenantContext:
+    """
+    Get the tenant context for a company.
+
+    Args:
+        company: Company instance or primary key. An instance whose settings
+            are already cached (e.g. via select_related) is used as-is.
+
+    Returns:
+        TenantContext for the company
+    """
+    company_id = company.pk if isinstance(company, Company) else company
+    scope = _current_scope.get()
+
+    preloaded = isinstance(company, Company) and Company.settings.is_cached(company)
+
+    if scope is not None and company_id in scope.contexts:
+        scope.hits += 1
+        if not preloaded:
+            scope.queries_saved += 1
+        CACHE_REQUESTS.inc(cache='tenant_context', result='hit')
+        return scope.contexts[company_id]
+
+    if preloaded:
+        context = _build_context(company)
+    else:
+        context = _load_context(company_id)
+        if scope is not None:
+            scope.loads += 1
+            CACHE_REQUESTS.inc(cache='tenant_context', result='miss')
+
+    if scope is not None:
+        scope.contexts[company_id] = context
+    return context
+
+
+def get_user_tenant_context(user) -> TenantContext:
+    """
+    Get the tenant context for a user's company.
+
+    Uses the user's cached company instance when available, otherwise
+    loads by company_id without touching the lazy relation.
+    """
+    from apps.users.models import User
+
+    if User.company.is_cached(user):
+        return get_tenant_context(user.company)
+    return get_tenant_context(user.company_id)
@@ -0,0 +1,36 @@
+"""
+Middleware for Companies app.
+"""
+import logging
+
+from apps.companies.context import tenant_scope
+
+logger = logging.getLogger(__name__)
+
+
+class TenantContextMiddleware:
+    """
+    Open a tenant scope for the duration of each request.
+
+    Authentication happens inside DRF views (JWT), so the scope is populated
+    lazily on first lookup rather than here. The scope is attached to the
+    request as ``request.tenant_scope`` for downstream instrumentation.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with tenant_scope() as scope:
+            request.tenant_scope = scope
+            response = self.get_response(request)
+
+        if scope.loads or scope.hits:
+            logger.debug(
+                'Tenant context for %s %s',
+                request.method,
+                request.path,
+                extra=scope.as_log_fields(),
+            )
+
+        return response
@@ -8,6 +8,7 @@ Contains:
 """
 from decimal import Decimal
 
+import pytz
 from django.conf import settings
 from django.db import models
 
@@ -43,6 +44,14 @@ class Company(TimeStampedModel):
     def __str__(self) -> str:
         return self.name
 
+    @property
+    def tzinfo(self):
+        """pytz timezone for the company, falling back to UTC."""
+        try:
+            return pytz.timezone(self.timezone)
+        except pytz.UnknownTimeZoneError:
+            return pytz.UTC
+
 
 class CompanySettings(TimeStampedModel):
     """
@@ -0,0 +1,156 @@
+"""
+Tests for the tenant context loader.
+
+Business rules:
+- Company + CompanySettings load in one query
+- Within a scope, each company is loaded at most once
+- Outside a scope, every lookup loads fresh
+"""
+import pytest
+from django.test import RequestFactory
+
+
+@pytest.mark.django_db
+class TestTenantContextLoading:
+    """Tests for get_tenant_context()."""
+
+    def test_loads_company_and_settings_in_one_query(
+        self, company, django_assert_num_queries
+    ):
+        """
+        Given: A company with settings
+        When: Loading its tenant context by id
+        Then: One query returns both company and settings
+        """
+        from apps.companies.context import get_tenant_context
+
+        with django_assert_num_queries(1):
+            ctx = get_tenant_context(company.id)
+            assert ctx.settings.escalation_days == company.settings.escalation_days
+            assert ctx.week_start_day == company.week_start_day
+            assert ctx.timezone == 'UTC'
+
+    def test_scope_loads_each_company_once(self, company, django_assert_num_queries):
+        """
+        Given: An open tenant scope
+        When: Looking up the same company three times
+        Then: Only the first lookup queries, the rest are counted as saved
+        """
+        from apps.companies.context import get_tenant_context, tenant_scope
+
+        with tenant_scope() as scope:
+            with django_assert_num_queries(1):
+                for _ in range(3):
+                    get_tenant_context(company.id)
+
+        assert scope.loads == 1
+        assert scope.hits == 2
+        assert scope.queries_saved == 2
+
+    def test_preloaded_company_hits_save_no_queries(self, company):
+        """
+        Given: An open tenant scope and a company with settings already loaded
+        When: Looking it up by instance twice
+        Then: The second lookup is a hit but not counted as a saved query
+        """
+        from apps.companies.context import get_tenant_context, tenant_scope
+        from apps.companies.models import Company
+
+        loaded = Company.objects.select_related('settings').get(pk=company.pk)
+
+        with tenant_scope() as scope:
+            get_tenant_context(loaded)
+            get_tenant_context(loaded)
+
+        assert (scope.loads, scope.hits, scope.queries_saved) == (0, 1, 0)
+
+    def test_lookup_outside_scope_reflects_saved_changes(self, company):
+        """
+        Given: No open scope
+        When: Settings change between lookups
+        Then: The second lookup sees the new value
+        """
+        from apps.companies.context import get_tenant_context
+
+        assert get_tenant_context(company.id).settings.escalation_days == 3
+
+        company.settings.escalation_days = 5
+        company.settings.save()
+
+        assert get_tenant_context(company.id).settings.escalation_days == 5
+
+    def test_user_with_cached_company_settings_needs_no_query(
+        self, user, django_assert_num_queries
+    ):
+        """
+        Given: A user fetched with select_related('company__settings')
+        When: Getting the user's tenant context
+        Then: No query is issued
+        """
+        from apps.companies.context import get_user_tenant_context
+        from apps.users.models import User
+
+        loaded = User.objects.select_related('company__settings').get(pk=user.pk)
+
+        with django_assert_num_queries(0):
+            ctx = get_user_tenant_context(loaded)
+
+        assert ctx.company_id == user.company_id
+
+    def test_missing_settings_only_fail_when_accessed(self):
+        """
+        Given: A company without settings
+        When: Loading its tenant context
+        Then: Company fields work, settings raise DoesNotExist
+        """
+        from apps.companies.context import get_tenant_context
+        from apps.companies.models import Company, CompanySettings
+
+        company = Company.objects.create(name='No Settings Corp')
+        ctx = get_tenant_context(company.id)
+
+        assert ctx.week_start_day == Company.WeekDay.MONDAY
+        with pytest.raises(CompanySettings.DoesNotExist):
+            _ = ctx.settings
+
+
+@pytest.mark.django_db
+class TestTenantContextMiddleware:
+    """Tests for TenantContextMiddleware."""
+
+    def test_middleware_shares_scope_across_request(self, company):
+        """
+        Given: A view that looks up the tenant twice
+        When: The request passes through the middleware
+        Then: The scope on the request records one load and one hit
+        """
+        from django.http import HttpResponse
+
+        from apps.companies.context import get_tenant_context
+        from apps.companies.middleware import TenantContextMiddleware
+
+        def view(request):
+            get_tenant_context(company.id)
+            get_tenant_context(company.id)
+            return HttpResponse()
+
+        request = RequestFactory().get('/')
+        TenantContextMiddleware(view)(request)
+
+        assert request.tenant_scope.loads == 1
+        assert request.tenant_scope.hits == 1
+
+    def test_scope_closed_after_request(self, company):
+        """
+        Given: A request has completed
+        When: Checking the current scope
+        Then: No scope is active
+        """
+        from django.http import HttpResponse
+
+        from apps.companies.context import get_current_scope
+        from apps.companies.middleware import TenantContextMiddleware
+
+        TenantContextMiddleware(lambda request: HttpResponse())(RequestFactory().get('/'))
+
+        assert get_current_scope() is None
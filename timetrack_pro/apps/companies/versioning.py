@@ -0,0 +1,72 @@
+"""
+Per-company data versions for cache invalidation.
+
+Each company has a data version in the shared cache that changes whenever
+time entries, timesheets or users in that company are written. Caches key
+their entries on the version, so a write makes every older entry
+unreachable without having to find and delete it.
+
+Versions are nanosecond timestamps rather than counters: if the version key
+is evicted, the regenerated value can never collide with an older one, and
+callers can tell how recently the data changed.
+"""
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+
+def _version_key(company_id: int) -> str:
+    return f'company:data_version:{company_id}'
+
+
+def get_data_version(company_id: int) -> int:
+    """Get the current data version for a company."""
+    key = _version_key(company_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_data_version(company_id: int) -> None:
+    """
+    Change a company's data version now and again after commit.
+
+    The second bump covers readers that computed from pre-commit data
+    between the first bump and the commit.
+    """
+    if company_id is None:
+        return
+    key = _version_key(company_id)
+    cache.set(key, time.time_ns(), timeout=None)
+    transaction.on_commit(lambda: cache.set(key, time.time_ns(), timeout=None))
+
+
+def version_age_seconds(version: int) -> float:
+    """Seconds since the data version last changed."""
+    return (time.time_ns() - version) / 1e9
+
+
+def _user_company_id(instance, field: str = 'user') -> int | None:
+    """Company id for an instance's user, without loading the user if cached."""
+    from apps.users.models import User
+
+    descriptor = getattr(type(instance), field)
+    if descriptor.is_cached(instance):
+        return getattr(instance, field).company_id
+    user_id = getattr(instance, f'{field}_id')
+    return User.objects.filter(pk=user_id).values_list('company_id', flat=True).first()
+
+
+def bump_for_user_owned(sender, instance, **kwargs) -> None:
+    """post_save/post_delete receiver for TimeEntry and Timesheet."""
+    bump_data_version(_user_company_id(instance))
+
+
+def bump_for_user(sender, instance, update_fields=None, **kwargs) -> None:
+    """post_save/post_delete receiver for User (manager and active changes)."""
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    bump_data_version(instance.company_id)
@@ -0,0 +1,11 @@
+from django.contrib import admin
+
+from .models import OutboxMessage
+
+
+@admin.register(OutboxMessage)
+class OutboxMessageAdmin(admin.ModelAdmin):
+    list_display = ('task_name', 'created_at', 'available_at', 'attempts')
+    list_filter = ('task_name',)
+    readonly_fields = ('task_name', 'args', 'kwargs', 'options', 'created_at', 'attempts', 'last_error')
+    ordering = ('id',)
@@ -4,3 +4,13 @@ from django.apps import AppConfig
 class InfrastructureConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.infrastructure'
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+
+        from apps.infrastructure.instrumentation import install_serializer_timing, is_enabled
+        from apps.infrastructure.metrics import mark_connection_created
+
+        if is_enabled():
+            install_serializer_timing()
+        connection_created.connect(mark_connection_created)
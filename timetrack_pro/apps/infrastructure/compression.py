@@ -0,0 +1,227 @@
+"""
+Negotiated response compression for TimeTrack Pro API.
+
+ResponseCompressionMiddleware compresses API responses with the best
+encoding the client accepts: zstd and brotli when their packages are
+installed, gzip always. Static files are left to WhiteNoise, which serves
+them pre-compressed.
+
+Responses are skipped when they are:
+- outside COMPRESSION_PATH_PREFIXES, or under COMPRESSION_EXCLUDE_PATHS.
+  Auth endpoints are excluded because they return tokens next to
+  attacker-influenced input, which compression turns into a length oracle
+  (BREACH).
+- below COMPRESSION_MIN_SIZE bytes (streaming responses are always
+  compressed), of a content type not in COMPRESSION_CONTENT_TYPES, already
+  encoded, or marked ``Cache-Control: no-transform``.
+
+Streaming responses (e.g. CSV exports) are compressed chunk by chunk with
+one compressor per response, flushing after each chunk so the client keeps
+receiving data as it is produced.
+
+Settings:
+    COMPRESSION_ENABLED: Turn compression on/off (default True)
+    COMPRESSION_MIN_SIZE: Smallest body worth compressing (default 1024)
+    COMPRESSION_ENCODINGS: Server preference order (default zstd, br, gzip)
+    COMPRESSION_PATH_PREFIXES: Paths to compress (default ['/api/'])
+    COMPRESSION_EXCLUDE_PATHS: Path prefixes never compressed
+    COMPRESSION_CONTENT_TYPES: Media types to compress
+"""
+import zlib
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterable, AsyncIterator, Iterable, Iterator
+
+from django.conf import settings
+from django.utils.text import compress_sequence, compress_string
+
+from apps.infrastructure.metrics import registry
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+RESPONSES_COMPRESSED = registry.counter(
+    'http_responses_compressed_total', 'API responses compressed, by encoding.', ('encoding',),
+)
+BYTES_SAVED = registry.counter(
+    'http_compression_bytes_saved_total', 'Body bytes saved by compressing buffered responses.', ('encoding',),
+)
+
+# Random gzip header padding, as in Django's GZipMiddleware (BREACH hardening)
+GZIP_MAX_RANDOM_BYTES = 100
+
+
+class Encoder(ABC):
+    """
+    One Content-Encoding: whole-body and streaming compression.
+
+    Subclasses implement compress() and compressor(); the streaming methods
+    are built on compressor().
+    """
+
+    name = ''
+
+    @abstractmethod
+    def compress(self, data: bytes) -> bytes:
+        """Compress a whole body."""
+
+    @abstractmethod
+    def compressor(self):
+        """Object with compress(chunk) -> bytes and finish() -> bytes."""
+
+    def compress_stream(self, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        stream = self.compressor()
+        for chunk in chunks:
+            if data := stream.compress(chunk):
+                yield data
+        yield stream.finish()
+
+    async def compress_async_stream(self, chunks: AsyncIterable[bytes]) -> AsyncIterator[bytes]:
+        stream = self.compressor()
+        async for chunk in chunks:
+            if data := stream.compress(chunk):
+                yield data
+        yield stream.finish()
+
+
+class _ZlibStream:
+    def __init__(self):
+        self._obj = zlib.compressobj(6, zlib.DEFLATED, 31)
+
+    def compress(self, chunk: bytes) -> bytes:
+        return self._obj.compress(chunk) + self._obj.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._obj.flush()
+
+
+class GzipEncoder(Encoder):
+    name = 'gzip'
+
+    def compress(self, data: bytes) -> bytes:
+        return compress_string(data, max_random_bytes=GZIP_MAX_RANDOM_BYTES)
+
+    def compress_stream(self, chunks):
+        return compress_sequence(chunks, max_random_bytes=GZIP_MAX_RANDOM_BYTES)
+
+    def compressor(self):
+        return _ZlibStream()
+
+
+class _BrotliStream:
+    def __init__(self):
+        self._obj = brotli.Compressor(quality=4)
+
+    def compress(self, chunk: bytes) -> bytes:
+        return self._obj.process(chunk) + self._obj.flush()
+
+    def finish(self) -> bytes:
+        return self._obj.finish()
+
+
+class BrotliEncoder(Encoder):
+    name = 'br'
+
+    def compress(self, data: bytes) -> bytes:
+        # Quality 4-5 is the usual trade-off for dynamic content
+        return brotli.compress(data, quality=4)
+
+    def compressor(self):
+        return _BrotliStream()
+
+
+class _ZstdStream:
+    def __init__(self):
+        self._obj = zstandard.ZstdCompressor(level=3).compressobj()
+
+    def compress(self, chunk: bytes) -> bytes:
+        return self._obj.compress(chunk) + self._obj.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._obj.flush()
+
+
+class ZstdEncoder(Encoder):
+    name = 'zstd'
+
+    def compress(self, data: bytes) -> bytes:
+        return zstandard.ZstdCompressor(level=3).compress(data)
+
+    def compressor(self):
+        return _ZstdStream()
+
+
+def available_encoders() -> dict[str, Encoder]:
+    """Encoders whose libraries are installed, by Content-Encoding token."""
+    encoders = {'gzip': GzipEncoder()}
+    if brotli is not None:
+        encoders['br'] = BrotliEncoder()
+    if zstandard is not None:
+        encoders['zstd'] = ZstdEncoder()
+    return encoders
+
+
+def parse_accept_encoding(header: str) -> dict[str, float]:
+    """Parse an Accept-Encoding header into {coding: q}."""
+    accepted = {}
+    for item in header.split(','):
+        coding, _, params = item.strip().partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(';'):
+            key, _, value = param.strip().partition('=')
+            if key.strip().lower() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+def choose_encoder(header: str) -> Encoder | None:
+    """
+    Pick the encoder for a request's Accept-Encoding.
+
+    The client's q-values decide; ties go to COMPRESSION_ENCODINGS order.
+    """
+    accepted = parse_accept_encoding(header)
+    if not accepted:
+        return None
+
+    encoders = available_encoders()
+    preference = [
+        name for name in getattr(settings, 'COMPRESSION_ENCODINGS', ['zstd', 'br', 'gzip'])
+        if name in encoders
+    ]
+    wildcard = accepted.get('*', 0.0)
+    candidates = [
+        (accepted.get(name, wildcard), -rank, name)
+        for rank, name in enumerate(preference)
+    ]
+    q, _, name = max(candidates, default=(0.0, 0, None))
+    return encoders[name] if q > 0 else None
+
+
+def should_compress(request, response) -> bool:
+    """Whether a response is eligible for compression, ignoring size."""
+    path = request.path
+    if not any(path.startswith(prefix) for prefix in getattr(settings, 'COMPRESSION_PATH_PREFIXES', ['/api/'])):
+        return False
+    if any(path.startswith(prefix) for prefix in getattr(settings, 'COMPRESSION_EXCLUDE_PATHS', [])):
+        return False
+    if response.has_header('Content-Encoding'):
+        return False
+    if 'no-transform' in response.get('Cache-Control', ''):
+        return False
+
+    content_type = response.get('Content-Type', '').split(';')[0].strip().lower()
+    return content_type in getattr(settings, 'COMPRESSION_CONTENT_TYPES', ['application/json'])
@@ -0,0 +1,304 @@
+"""
+Email delivery for TimeTrack Pro notification tasks.
+
+Notification tasks used to call send_mail() once and fail on the first
+error, and a slow provider kept every worker blocked in sends. deliver()
+wraps one send from inside a bound task:
+
+    @shared_task(bind=True, ignore_result=True, max_retries=...)
+    def send_something(self, user_id):
+        ...
+        deliver(self, subject=..., message=..., recipient_list=[user.email])
+
+deliver_many() does the same for a batch of messages over one connection;
+a message refused for good is skipped, and a retry or park only covers the
+messages not yet sent.
+
+- Transient failures (connection errors and timeouts, 4xx SMTP replies,
+  provider 429/5xx responses) are retried with exponential backoff and full
+  jitter, so retries from many workers don't arrive at the provider in waves.
+- Permanent failures (5xx SMTP replies such as a refused recipient or
+  rejected credentials, other provider 4xx responses) fail at once: retrying
+  can't fix them.
+- Connection-level failures also feed a circuit breaker for the configured
+  EMAIL_BACKEND, shared by all workers through the cache. Once it opens,
+  deliver() sends nothing: the call is parked in the outbox until the
+  breaker's retry time and the worker moves on. After the cooldown one probe send is let through;
+  success closes the breaker, failure opens it again.
+
+Metrics: email_deliveries_total by outcome (sent, retried, parked, failed,
+rejected) is the drain rate; email_circuit_open and celery_queue_depth
+(sampled by record_queue_depths) show why a queue is growing.
+
+Settings:
+    EMAIL_TIMEOUT: Seconds before a send gives up (default 10)
+    EMAIL_MAX_RETRIES: Retries per message before it fails (default 5)
+    EMAIL_RETRY_BASE_DELAY / EMAIL_RETRY_MAX_DELAY: Backoff bounds in seconds (default 5 / 600)
+    EMAIL_CIRCUIT_FAILURE_THRESHOLD: Failures within the window that open the breaker (default 5)
+    EMAIL_CIRCUIT_WINDOW: Seconds failures are counted over (default 60)
+    EMAIL_CIRCUIT_RESET_TIMEOUT: Seconds the breaker stays open before a probe (default 60)
+"""
+import random
+import smtplib
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from typing import Any
+
+from celery.utils.log import get_task_logger
+from django.conf import settings
+from django.core.cache import cache
+from django.core.mail import EmailMessage, get_connection, send_mail
+from django.utils import timezone
+
+from apps.infrastructure.metrics import registry
+
+try:
+    from anymail.exceptions import AnymailRequestsAPIError
+except ImportError:  # pragma: no cover - optional dependency
+    AnymailRequestsAPIError = None
+
+logger = get_task_logger(__name__)
+
+EMAIL_DELIVERIES = registry.counter(
+    'email_deliveries_total', 'Notification emails by outcome (sent, retried, parked, failed, rejected).',
+    ('backend', 'outcome'),
+)
+CIRCUIT_OPEN = registry.gauge(
+    'email_circuit_open', 'Whether the email backend circuit breaker is open (1) or closed (0).', ('backend',),
+    cluster_wide=True,
+)
+
+# Errors from the email backend; is_transient() decides which are worth retrying
+DELIVERY_ERRORS = (smtplib.SMTPException, OSError)
+if AnymailRequestsAPIError is not None:
+    DELIVERY_ERRORS += (AnymailRequestsAPIError,)
+
+
+def is_connection_error(exc: Exception) -> bool:
+    """Whether the provider couldn't be reached or didn't answer (counts toward the breaker)."""
+    if AnymailRequestsAPIError is not None and isinstance(exc, AnymailRequestsAPIError):
+        return exc.status_code is None or exc.status_code == 429 or exc.status_code >= 500
+    if isinstance(exc, (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError)):
+        return True
+    # SMTPException subclasses OSError; any other SMTP error is a reply from the server
+    return isinstance(exc, OSError) and not isinstance(exc, smtplib.SMTPException)
+
+
+def is_transient(exc: Exception) -> bool:
+    """Whether a delivery error may succeed on retry: connection errors and 4xx replies."""
+    if is_connection_error(exc):
+        return True
+    if isinstance(exc, smtplib.SMTPRecipientsRefused):
+        return bool(exc.recipients) and all(400 <= code < 500 for code, _ in exc.recipients.values())
+    if isinstance(exc, smtplib.SMTPResponseException):
+        return 400 <= exc.smtp_code < 500
+    return False
+
+
+def backoff_delay(retries: int, base: float, cap: float) -> float:
+    """Seconds to wait before retry number retries + 1: full-jitter exponential backoff."""
+    return random.uniform(0, min(cap, base * 2 ** retries))
+
+
+class CircuitOpen(Exception):
+    """The breaker is open; nothing should be sent before retry_at."""
+
+    def __init__(self, name: str, retry_at: datetime):
+        super().__init__(f'Circuit {name} is open until {retry_at.isoformat()}')
+        self.name = name
+        self.retry_at = retry_at
+
+
+class CircuitBreaker:
+    """
+    Failure-counting circuit breaker with its state in the shared cache.
+
+    Closed: calls go through; failures are counted over a sliding window.
+    Open: calls are refused until the reset timeout passes.
+    Half-open: one caller at a time probes; its outcome closes or reopens.
+    """
+
+    def __init__(self, name: str, failure_threshold: int, window: int, reset_timeout: int):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.window = window
+        self.reset_timeout = reset_timeout
+
+    @classmethod
+    def for_email(cls, backend: str | None = None) -> 'CircuitBreaker':
+        """The breaker for an email backend (default: EMAIL_BACKEND)."""
+        return cls(
+            backend or settings.EMAIL_BACKEND,
+            failure_threshold=getattr(settings, 'EMAIL_CIRCUIT_FAILURE_THRESHOLD', 5),
+            window=getattr(settings, 'EMAIL_CIRCUIT_WINDOW', 60),
+            reset_timeout=getattr(settings, 'EMAIL_CIRCUIT_RESET_TIMEOUT', 60),
+        )
+
+    def _key(self, part: str) -> str:
+        return f'circuit:{self.name}:{part}'
+
+    def check(self) -> None:
+        """Raise CircuitOpen unless a call may go through now."""
+        open_until = cache.get(self._key('open_until'))
+        if open_until is None:
+            return
+        now = timezone.now()
+        if now < open_until:
+            raise CircuitOpen(self.name, open_until)
+        # Half-open: the first caller after the cooldown probes, the rest wait
+        if not cache.add(self._key('probe'), True, timeout=self.reset_timeout):
+            raise CircuitOpen(self.name, now + timedelta(seconds=self.reset_timeout))
+
+    def record_success(self) -> None:
+        if cache.get(self._key('open_until')) is not None:
+            logger.info(f'Circuit {self.name} closed')
+        cache.delete_many([self._key('failures'), self._key('open_until'), self._key('probe')])
+        CIRCUIT_OPEN.set(0, backend=self.name)
+
+    def record_failure(self) -> None:
+        probing = cache.get(self._key('probe')) is not None
+        cache.add(self._key('failures'), 0, timeout=self.window)
+        try:
+            failures = cache.incr(self._key('failures'))
+        except ValueError:  # Expired between add and incr
+            failures = 1
+        if probing or failures >= self.failure_threshold:
+            self.open()
+
+    def open(self) -> None:
+        open_until = timezone.now() + timedelta(seconds=self.reset_timeout)
+        # Outlives open_until so a half-open breaker is still known as one
+        cache.set(self._key('open_until'), open_until, timeout=self.reset_timeout * 10)
+        cache.delete_many([self._key('failures'), self._key('probe')])
+        CIRCUIT_OPEN.set(1, backend=self.name)
+        logger.warning(f'Circuit {self.name} opened until {open_until.isoformat()}')
+
+
+def _park(task, breaker: CircuitBreaker, exc: CircuitOpen, args, kwargs, count: int = 1) -> None:
+    """Hold a task call in the outbox until the breaker's retry time, plus jitter."""
+    from apps.infrastructure.outbox import park
+
+    jitter = timedelta(seconds=random.uniform(0, breaker.reset_timeout))
+    park(task.name, args=args, kwargs=kwargs, until=exc.retry_at + jitter)
+    EMAIL_DELIVERIES.inc(count, backend=breaker.name, outcome='parked')
+
+
+def _reject(breaker: CircuitBreaker, exc: Exception, count: int = 1) -> None:
+    """Record a send the provider refused for good; the breaker is not affected."""
+    logger.warning(f'Email rejected by {breaker.name}: {exc}')
+    EMAIL_DELIVERIES.inc(count, backend=breaker.name, outcome='rejected')
+
+
+def _retry(task, breaker: CircuitBreaker, exc: Exception, args=None, count: int = 1):
+    """Count a failed send and retry the task with backoff, or re-raise past max_retries."""
+    if is_connection_error(exc):
+        breaker.record_failure()
+    if task.request.retries >= task.max_retries:
+        EMAIL_DELIVERIES.inc(count, backend=breaker.name, outcome='failed')
+        raise exc
+    EMAIL_DELIVERIES.inc(count, backend=breaker.name, outcome='retried')
+    countdown = backoff_delay(
+        task.request.retries,
+        base=getattr(settings, 'EMAIL_RETRY_BASE_DELAY', 5),
+        cap=getattr(settings, 'EMAIL_RETRY_MAX_DELAY', 600),
+    )
+    raise task.retry(args=args, exc=exc, countdown=countdown)
+
+
+def deliver(task, **message) -> bool:
+    """
+    Send one email from a bound task, retrying or parking on failure.
+
+    Args:
+        task: The running task (bind=True); retried or parked as a whole
+        **message: send_mail() arguments other than from_email/fail_silently
+
+    Returns:
+        True if sent, False if parked behind an open circuit
+
+    Raises:
+        celery.exceptions.Retry: After a transient failure, within max_retries
+        Exception: The backend's error, for a permanent failure or past max_retries
+    """
+    breaker = CircuitBreaker.for_email()
+    try:
+        breaker.check()
+    except CircuitOpen as exc:
+        _park(task, breaker, exc, task.request.args or (), task.request.kwargs)
+        return False
+
+    try:
+        send_mail(from_email=settings.DEFAULT_FROM_EMAIL, fail_silently=False, **message)
+    except DELIVERY_ERRORS as exc:
+        if not is_transient(exc):
+            _reject(breaker, exc)
+            raise
+        _retry(task, breaker, exc)
+
+    breaker.record_success()
+    EMAIL_DELIVERIES.inc(backend=breaker.name, outcome='sent')
+    return True
+
+
+def deliver_many(task, messages: list[tuple[Any, EmailMessage]], retry_args: Callable[[list], tuple]) -> int:
+    """
+    Send a batch of emails over one connection from a bound task.
+
+    A message refused for good is skipped and the batch carries on; one
+    refused with a 4xx reply is set aside. If the connection fails, the
+    rest of the batch is set aside too. The task is then re-run with
+    retry_args(keys of the messages set aside), so a retry or park never
+    repeats a sent or rejected message.
+
+    Args:
+        task: The running task (bind=True)
+        messages: (key, message) pairs, e.g. keyed by recipient user id
+        retry_args: Builds the task's positional args for a list of keys
+
+    Returns:
+        Number of emails sent (0 if parked)
+
+    Raises:
+        celery.exceptions.Retry: If any message is left for a retry, within max_retries
+    """
+    if not messages:
+        return 0
+
+    breaker = CircuitBreaker.for_email()
+    try:
+        breaker.check()
+    except CircuitOpen as exc:
+        _park(task, breaker, exc, retry_args([key for key, _ in messages]), task.request.kwargs, len(messages))
+        return 0
+
+    sent = attempted = 0
+    pending, error = [], None
+    try:
+        with get_connection(fail_silently=False) as connection:
+            for key, message in messages:
+                message.connection = connection
+                try:
+                    message.send()
+                except DELIVERY_ERRORS as exc:
+                    if is_connection_error(exc):
+                        raise
+                    if is_transient(exc):
+                        pending.append(key)
+                        error = exc
+                    else:
+                        _reject(breaker, exc)
+                else:
+                    sent += 1
+                attempted += 1
+    except DELIVERY_ERRORS as exc:
+        pending += [key for key, _ in messages[attempted:]]
+        error = exc
+
+    if sent:
+        EMAIL_DELIVERIES.inc(sent, backend=breaker.name, outcome='sent')
+        # A connection lost mid-batch still counts against the breaker
+        if error is None or not is_connection_error(error):
+            breaker.record_success()
+    if pending:
+        _retry(task, breaker, error, args=retry_args(pending), count=len(pending))
+    return sent
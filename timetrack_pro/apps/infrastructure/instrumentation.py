@@ -0,0 +1,223 @@
+"""
+Request and task instrumentation for TimeTrack Pro.
+
+Records per-request (or per-task) query count, DB time, serializer time and
+total latency. Results are logged as structured fields through the
+``apps`` logger (JSON in production) and can be checked against per-route
+query budgets.
+
+Settings:
+    INSTRUMENTATION_ENABLED: Turn collection on/off (default True)
+    INSTRUMENTATION_SERVER_TIMING: Add a Server-Timing header (default False)
+    QUERY_BUDGETS: Dict of view name -> max queries
+    QUERY_BUDGET_DEFAULT: Budget for routes not in QUERY_BUDGETS (None = unlimited)
+    QUERY_BUDGET_RAISE: Raise QueryBudgetExceeded instead of warning (tests)
+"""
+import logging
+import time
+from contextlib import ExitStack
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import wraps
+
+from django.conf import settings
+from django.db import connections
+
+from apps.infrastructure.metrics import record_task_finished
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(Exception):
+    """Raised when a route exceeds its query budget and QUERY_BUDGET_RAISE is set."""
+
+
+@dataclass
+class Measurement:
+    """Timings collected for one request or task."""
+
+    route: str
+    started: float = field(default_factory=time.perf_counter)
+    queries: int = 0
+    db_seconds: float = 0.0
+    serializer_seconds: float = 0.0
+    total_seconds: float = 0.0
+    _serializer_depth: int = 0
+
+    def finish(self) -> None:
+        self.total_seconds = time.perf_counter() - self.started
+
+    def as_log_fields(self) -> dict:
+        return {
+            'route': self.route,
+            'queries': self.queries,
+            'db_ms': round(self.db_seconds * 1000, 2),
+            'serializer_ms': round(self.serializer_seconds * 1000, 2),
+            'total_ms': round(self.total_seconds * 1000, 2),
+        }
+
+    def server_timing(self) -> str:
+        """Format as a Server-Timing header value."""
+        return ', '.join([
+            f'db;desc="{self.queries} queries";dur={self.db_seconds * 1000:.2f}',
+            f'serializer;dur={self.serializer_seconds * 1000:.2f}',
+            f'total;dur={self.total_seconds * 1000:.2f}',
+        ])
+
+
+# Open measurements, outermost first (e.g. a request, then an eager task inside it)
+_current: ContextVar[tuple[Measurement, ...]] = ContextVar('instrumentation_measurements', default=())
+
+
+def get_current_measurement() -> Measurement | None:
+    """Get the measurement for the innermost active request/task, if any."""
+    measurements = _current.get()
+    return measurements[-1] if measurements else None
+
+
+def _query_wrapper(execute, sql, params, many, context):
+    measurements = _current.get()
+    if not measurements:
+        return execute(sql, params, many, context)
+
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        elapsed = time.perf_counter() - start
+        for measurement in measurements:
+            measurement.queries += 1
+            measurement.db_seconds += elapsed
+
+
+class measure:
+    """
+    Context manager that collects a Measurement for the enclosed block.
+
+    Scopes nest: a query counts once towards every open measurement. Only
+    the outermost scope installs the query wrapper.
+
+    Usage:
+        with measure('time-entry-list') as m:
+            ...
+        m.queries, m.total_seconds
+    """
+
+    def __init__(self, route: str):
+        self.measurement = Measurement(route=route)
+        self._stack = ExitStack()
+        self._token = None
+
+    def __enter__(self) -> Measurement:
+        outer = _current.get()
+        self._token = _current.set((*outer, self.measurement))
+        if not outer:
+            for connection in connections.all():
+                self._stack.enter_context(connection.execute_wrapper(_query_wrapper))
+        return self.measurement
+
+    def __exit__(self, *exc_info) -> None:
+        self._stack.close()
+        _current.reset(self._token)
+        self.measurement.finish()
+
+
+def is_enabled() -> bool:
+    return getattr(settings, 'INSTRUMENTATION_ENABLED', True)
+
+
+def get_query_budget(route: str) -> int | None:
+    """Get the query budget for a route (view name)."""
+    budgets = getattr(settings, 'QUERY_BUDGETS', {})
+    return budgets.get(route, getattr(settings, 'QUERY_BUDGET_DEFAULT', None))
+
+
+def check_query_budget(measurement: Measurement) -> None:
+    """
+    Warn (or raise, when QUERY_BUDGET_RAISE is set) if over budget.
+
+    Raises:
+        QueryBudgetExceeded: If over budget and QUERY_BUDGET_RAISE is True
+    """
+    budget = get_query_budget(measurement.route)
+    if budget is None or measurement.queries <= budget:
+        return
+
+    message = (
+        f'Query budget exceeded for {measurement.route}: '
+        f'{measurement.queries} queries (budget {budget})'
+    )
+    if getattr(settings, 'QUERY_BUDGET_RAISE', False):
+        raise QueryBudgetExceeded(message)
+    logger.warning(message, extra={**measurement.as_log_fields(), 'query_budget': budget})
+
+
+def _timed_data(prop):
+    """Wrap a serializer ``data`` property to accumulate serializer time."""
+    getter = prop.fget
+
+    @wraps(getter)
+    def data(self):
+        measurements = _current.get()
+        if not measurements:
+            return getter(self)
+
+        for measurement in measurements:
+            measurement._serializer_depth += 1
+        start = time.perf_counter()
+        try:
+            return getter(self)
+        finally:
+            elapsed = time.perf_counter() - start
+            for measurement in measurements:
+                measurement._serializer_depth -= 1
+                if measurement._serializer_depth == 0:
+                    measurement.serializer_seconds += elapsed
+
+    data._instrumented = True
+    return property(data)
+
+
+def install_serializer_timing() -> None:
+    """
+    Time DRF serializer ``.data`` access for the active measurement.
+
+    Only the outermost serializer is timed so nested serializers are not
+    double counted. Safe to call more than once.
+    """
+    from rest_framework import serializers
+
+    for cls in (serializers.Serializer, serializers.ListSerializer):
+        prop = cls.__dict__['data']
+        if not getattr(prop.fget, '_instrumented', False):
+            cls.data = _timed_data(prop)
+
+
+# Celery hooks (connected in config/celery.py)
+
+_task_measurements: dict[str, measure] = {}
+
+
+def start_task_measurement(task_id: str, task_name: str) -> None:
+    """task_prerun hook: begin measuring a task."""
+    if not is_enabled():
+        return
+    context = measure(task_name)
+    context.__enter__()
+    _task_measurements[task_id] = context
+
+
+def finish_task_measurement(task_id: str, state: str | None = None) -> Measurement | None:
+    """task_postrun hook: stop measuring a task and log the result."""
+    context = _task_measurements.pop(task_id, None)
+    if context is None:
+        return None
+    context.__exit__(None, None, None)
+    measurement = context.measurement
+    record_task_finished(measurement.route, measurement.total_seconds, state)
+    logger.info(
+        'Task %s finished',
+        measurement.route,
+        extra={**measurement.as_log_fields(), 'task_id': task_id, 'state': state},
+    )
+    return measurement
@@ -0,0 +1,451 @@
+"""
+In-process metrics registry for TimeTrack Pro.
+
+Counters, gauges and histograms rendered in the Prometheus text exposition
+format at the admin-only /metrics endpoint.
+
+Gunicorn workers and Celery workers are separate processes, so each process
+periodically publishes a snapshot of its registry to the shared cache (Redis
+in production). The endpoint merges every live snapshot, so one scrape sees
+the whole deployment regardless of which web worker serves it.
+
+Settings:
+    METRICS_PUBLISH_INTERVAL: Seconds between snapshot publishes (default 15)
+    METRICS_SNAPSHOT_TTL: Seconds before a silent process drops out (default 300)
+"""
+import os
+import socket
+import threading
+import time
+from bisect import bisect_left
+
+from django.conf import settings
+from django.core.cache import cache
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+PROCESS_INDEX_KEY = 'metrics:processes'
+PROCESS_INDEX_LOCK_KEY = 'metrics:processes:lock'
+# Held only for one get + set; expires so a crashed holder can't wedge the index
+PROCESS_INDEX_LOCK_TIMEOUT = 5
+SNAPSHOT_KEY_PREFIX = 'metrics:snapshot:'
+
+
+class Metric:
+    """Base class for labelled metrics."""
+
+    type = ''
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: dict[tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f'{self.name} expects labels {self.labelnames}, got {tuple(labels)}')
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _samples(self) -> list:
+        return [[list(key), _copy(value)] for key, value in self._values.items()]
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            samples = self._samples()
+        return {
+            'type': self.type,
+            'help': self.documentation,
+            'labelnames': list(self.labelnames),
+            'samples': samples,
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+def _copy(value):
+    return [list(value[0]), value[1], value[2]] if isinstance(value, list) else value
+
+
+class Counter(Metric):
+    """Monotonically increasing value."""
+
+    type = 'counter'
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(Metric):
+    """
+    Value that can go up and down.
+
+    Per-process gauges (e.g. pool connections) are summed across processes.
+    A cluster_wide gauge is a reading of shared state (a queue depth, replica
+    lag) taken by whichever process ran the check, so processes would repeat
+    the same value: merging keeps the most recently set sample instead.
+    """
+
+    type = 'gauge'
+
+    def __init__(self, name, documentation, labelnames=(), cluster_wide: bool = False):
+        super().__init__(name, documentation, labelnames)
+        self.cluster_wide = cluster_wide
+        self._set_at: dict[tuple[str, ...], float] = {}
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+            self._set_at[key] = time.time()
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+            self._set_at[key] = time.time()
+
+    def _samples(self) -> list:
+        if not self.cluster_wide:
+            return super()._samples()
+        return [[list(key), value, self._set_at[key]] for key, value in self._values.items()]
+
+    def snapshot(self) -> dict:
+        data = super().snapshot()
+        data['merge'] = 'latest' if self.cluster_wide else 'sum'
+        return data
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+            self._set_at.clear()
+
+
+class Histogram(Metric):
+    """Distribution of observations in fixed buckets."""
+
+    type = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total, count = self._values.get(key) or [[0] * (len(self.buckets) + 1), 0.0, 0]
+            counts[index] += 1
+            self._values[key] = [counts, total + value, count + 1]
+
+    def snapshot(self) -> dict:
+        data = super().snapshot()
+        data['buckets'] = list(self.buckets)
+        return data
+
+
+class MetricsRegistry:
+    """Collection of metrics for one process."""
+
+    def __init__(self):
+        self._metrics: dict[str, Metric] = {}
+        self._lock = threading.Lock()
+        self._last_publish = 0.0
+
+    def _get_or_create(self, cls, name, documentation, labelnames, **kwargs) -> Metric:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = cls(name, documentation, labelnames, **kwargs)
+                self._metrics[name] = metric
+            return metric
+
+    def counter(self, name, documentation, labelnames=()) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(self, name, documentation, labelnames=(), cluster_wide=False) -> Gauge:
+        return self._get_or_create(Gauge, name, documentation, labelnames, cluster_wide=cluster_wide)
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {metric.name: metric.snapshot() for metric in metrics}
+
+    def clear(self) -> None:
+        """Reset all values (tests)."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            metric.clear()
+
+    def publish(self, force: bool = False) -> None:
+        """
+        Publish this process's snapshot to the shared cache.
+
+        Throttled to once per METRICS_PUBLISH_INTERVAL unless forced. The
+        process index is a read-modify-write shared by every process, so it
+        is updated under a cache.add lock. This runs on the request path, so
+        the lock is tried once and never waited for: if another process
+        holds it, the index is updated on a later publish, well within
+        METRICS_SNAPSHOT_TTL.
+        """
+        now = time.time()
+        interval = getattr(settings, 'METRICS_PUBLISH_INTERVAL', 15)
+        if not force and now - self._last_publish < interval:
+            return
+        self._last_publish = now
+
+        ttl = getattr(settings, 'METRICS_SNAPSHOT_TTL', 300)
+        process_id = get_process_id()
+        cache.set(f'{SNAPSHOT_KEY_PREFIX}{process_id}', self.snapshot(), timeout=ttl)
+
+        if not cache.add(PROCESS_INDEX_LOCK_KEY, process_id, timeout=PROCESS_INDEX_LOCK_TIMEOUT):
+            return
+        try:
+            index = cache.get(PROCESS_INDEX_KEY) or {}
+            index = {pid: seen for pid, seen in index.items() if now - seen < ttl}
+            index[process_id] = now
+            cache.set(PROCESS_INDEX_KEY, index, timeout=None)
+        finally:
+            cache.delete(PROCESS_INDEX_LOCK_KEY)
+
+
+def get_process_id() -> str:
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+def collect_snapshots() -> list[dict]:
+    """Get the latest snapshot from every live process."""
+    index = cache.get(PROCESS_INDEX_KEY) or {}
+    keys = [f'{SNAPSHOT_KEY_PREFIX}{pid}' for pid in index]
+    return list(cache.get_many(keys).values())
+
+
+def merge_snapshots(snapshots: list[dict]) -> dict:
+    """
+    Merge per-process snapshots into one.
+
+    Counters, histograms and per-process gauges are summed per label set;
+    cluster-wide gauges keep the most recently set sample.
+    """
+    merged: dict[str, dict] = {}
+    for snapshot in snapshots:
+        for name, data in snapshot.items():
+            target = merged.setdefault(name, {**data, 'samples': {}})
+            for labels, value, *set_at in data['samples']:
+                key = tuple(labels)
+                current = target['samples'].get(key)
+                if data.get('merge') == 'latest':
+                    if current is None or set_at[0] > current[1]:
+                        target['samples'][key] = [value, set_at[0]]
+                elif current is None:
+                    target['samples'][key] = _copy(value)
+                elif data['type'] == 'histogram':
+                    counts = [a + b for a, b in zip(current[0], value[0], strict=True)]
+                    target['samples'][key] = [counts, current[1] + value[1], current[2] + value[2]]
+                else:
+                    target['samples'][key] = current + value
+    for data in merged.values():
+        if data.get('merge') == 'latest':
+            data['samples'] = [[list(key), value] for key, (value, _) in data['samples'].items()]
+        else:
+            data['samples'] = [[list(key), value] for key, value in data['samples'].items()]
+    return merged
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(labelnames, labels, extra=None) -> str:
+    pairs = list(zip(labelnames, labels, strict=True))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(str(value))}"' for name, value in pairs) + '}'
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def render(snapshot: dict) -> str:
+    """Render a snapshot in the Prometheus text exposition format (0.0.4)."""
+    lines = []
+    for name in sorted(snapshot):
+        data = snapshot[name]
+        labelnames = data['labelnames']
+        lines.append(f'# HELP {name} {data["help"]}')
+        lines.append(f'# TYPE {name} {data["type"]}')
+        for labels, value, *_ in sorted(data['samples']):
+            if data['type'] == 'histogram':
+                counts, total, count = value
+                cumulative = 0
+                for bound, bucket_count in zip([*data['buckets'], float('inf')], counts, strict=True):
+                    cumulative += bucket_count
+                    le = _format_labels(labelnames, labels, ('le', _format_value(bound)))
+                    lines.append(f'{name}_bucket{le} {cumulative}')
+                lines.append(f'{name}_sum{_format_labels(labelnames, labels)} {_format_value(total)}')
+                lines.append(f'{name}_count{_format_labels(labelnames, labels)} {count}')
+            else:
+                lines.append(f'{name}{_format_labels(labelnames, labels)} {_format_value(value)}')
+    return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+HTTP_REQUESTS = registry.counter(
+    'http_requests_total', 'HTTP requests by route and status.', ('route', 'method', 'status'),
+)
+HTTP_REQUEST_DURATION = registry.histogram(
+    'http_request_duration_seconds', 'HTTP request latency by route.', ('route', 'method'),
+)
+HTTP_REQUEST_QUERIES = registry.histogram(
+    'http_request_queries', 'DB queries per HTTP request by route.', ('route',),
+    buckets=(1, 2, 5, 10, 20, 50, 100, 250),
+)
+CELERY_TASKS = registry.counter(
+    'celery_tasks_total', 'Celery task executions by outcome.', ('task', 'outcome'),
+)
+CELERY_TASK_DURATION = registry.histogram(
+    'celery_task_duration_seconds', 'Celery task run time.', ('task',),
+)
+CELERY_QUEUE_LAG = registry.histogram(
+    'celery_task_queue_lag_seconds', 'Time between publish and task start.', ('task',),
+)
+DB_CONNECTIONS = registry.counter(
+    'db_connection_uses_total',
+    'Requests/tasks by whether their DB connection was new or reused.',
+    ('alias', 'state'),
+)
+OUTBOX_MESSAGES = registry.counter(
+    'outbox_messages_total', 'Outbox messages by relay outcome (published, retried, parked).', ('outcome',),
+)
+OUTBOX_BACKLOG = registry.gauge(
+    'outbox_backlog', 'Outbox messages waiting to be relayed (pending) or given up on (parked).', ('state',),
+    cluster_wide=True,
+)
+CELERY_QUEUE_DEPTH = registry.gauge(
+    'celery_queue_depth', 'Messages waiting in each broker queue.', ('queue',),
+    cluster_wide=True,
+)
+CACHE_REQUESTS = registry.counter(
+    'cache_requests_total', 'Application cache lookups by result.', ('cache', 'result'),
+)
+DB_POOL_CONNECTIONS = registry.gauge(
+    'db_pool_connections', 'Connections held by the pool (total or idle).', ('alias', 'state'),
+)
+DB_POOL_WAITING = registry.gauge(
+    'db_pool_requests_waiting', 'Checkouts currently waiting for a pooled connection.', ('alias',),
+)
+DB_POOL_EVENTS = registry.counter(
+    'db_pool_events_total', 'Pool checkouts, queued checkouts and connection churn.', ('alias', 'event'),
+)
+DB_POOL_WAIT = registry.counter(
+    'db_pool_wait_seconds_total', 'Time spent waiting for a pooled connection.', ('alias',),
+)
+
+# psycopg_pool stats key -> event label
+POOL_EVENT_STATS = {
+    'requests_num': 'checkout',
+    'requests_queued': 'queued',
+    'requests_errors': 'checkout_error',
+    'connections_num': 'opened',
+    'connections_lost': 'lost',
+    'returns_bad': 'returned_bad',
+}
+
+
+def get_pool(connection):
+    """The psycopg pool behind a connection, or None if pooling is off."""
+    if not connection.settings_dict.get('OPTIONS', {}).get('pool'):
+        return None
+    return connection.pool
+
+
+def mark_connection_created(sender, connection, **kwargs) -> None:
+    """
+    connection_created receiver: flag the connection as new.
+
+    Pooled connections fire this on every checkout, so they are never
+    flagged; physical connects show up as the pool's 'opened' event.
+    """
+    if get_pool(connection) is None:
+        connection._metrics_new_connection = True
+
+
+def record_pool_stats(connection_list=None) -> None:
+    """Record psycopg pool gauges and the counters accrued since the last call."""
+    from django.db import connections
+
+    if connection_list is None:
+        connection_list = connections.all(initialized_only=True)
+
+    for connection in connection_list:
+        pool = get_pool(connection)
+        if pool is None:
+            continue
+        alias = connection.alias
+        stats = pool.pop_stats()
+        DB_POOL_CONNECTIONS.set(stats.get('pool_size', 0), alias=alias, state='total')
+        DB_POOL_CONNECTIONS.set(stats.get('pool_available', 0), alias=alias, state='idle')
+        DB_POOL_WAITING.set(stats.get('requests_waiting', 0), alias=alias)
+        for key, event in POOL_EVENT_STATS.items():
+            if stats.get(key):
+                DB_POOL_EVENTS.inc(stats[key], alias=alias, event=event)
+        if stats.get('requests_wait_ms'):
+            DB_POOL_WAIT.inc(stats['requests_wait_ms'] / 1000, alias=alias)
+
+
+def record_connection_usage() -> None:
+    """
+    Count each open DB connection as new or reused for this request/task.
+
+    Called at the end of a request or task; resets the 'new' flag so the
+    next unit of work on the same connection counts as a reuse.
+    """
+    from django.db import connections
+
+    for connection in connections.all(initialized_only=True):
+        if connection.connection is None:
+            continue
+        is_new = getattr(connection, '_metrics_new_connection', False)
+        DB_CONNECTIONS.inc(alias=connection.alias, state='new' if is_new else 'reused')
+        connection._metrics_new_connection = False
+    record_pool_stats()
+
+
+def record_task_published(headers: dict) -> None:
+    """before_task_publish receiver helper: stamp the publish time for queue lag."""
+    headers.setdefault('published_at', time.time())
+
+
+def record_task_started(task) -> None:
+    """task_prerun helper: observe queue lag if the message was stamped."""
+    published_at = getattr(task.request, 'published_at', None)
+    if published_at is None:
+        published_at = (getattr(task.request, 'headers', None) or {}).get('published_at')
+    if published_at is not None:
+        CELERY_QUEUE_LAG.observe(max(time.time() - float(published_at), 0.0), task=task.name)
+
+
+def record_task_finished(task_name: str, duration: float | None, state: str | None) -> None:
+    """task_postrun helper: record outcome, duration and connection reuse."""
+    CELERY_TASKS.inc(task=task_name, outcome=(state or 'UNKNOWN').lower())
+    if duration is not None:
+        CELERY_TASK_DURATION.observe(duration, task=task_name)
+    record_connection_usage()
+    registry.publish()
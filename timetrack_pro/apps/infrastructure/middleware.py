@@ -0,0 +1,142 @@
+"""
+Shared middleware for TimeTrack Pro.
+"""
+import logging
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+from apps.infrastructure import compression, metrics, replicas
+from apps.infrastructure.instrumentation import check_query_budget, is_enabled, measure
+
+logger = logging.getLogger('apps.infrastructure.instrumentation')
+
+
+def get_route_name(request, default: str | None = None) -> str:
+    """Stable route label for a request: the URL name, else default or the path."""
+    match = getattr(request, 'resolver_match', None)
+    if match is not None and match.view_name:
+        return match.view_name
+    return default if default is not None else request.path
+
+
+class RequestInstrumentationMiddleware:
+    """
+    Record query count, DB time, serializer time and latency per request.
+
+    Should be the outermost middleware so latency covers the whole stack.
+    Emits one structured log record per request and enforces QUERY_BUDGETS.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not is_enabled():
+            return self.get_response(request)
+
+        with measure(request.path) as measurement:
+            response = self.get_response(request)
+
+        measurement.route = get_route_name(request)
+        fields = {
+            **measurement.as_log_fields(),
+            'method': request.method,
+            'status': response.status_code,
+        }
+        tenant_scope = getattr(request, 'tenant_scope', None)
+        if tenant_scope is not None:
+            fields.update(tenant_scope.as_log_fields())
+
+        logger.info('%s %s', request.method, measurement.route, extra=fields)
+
+        if getattr(settings, 'INSTRUMENTATION_SERVER_TIMING', False):
+            response['Server-Timing'] = measurement.server_timing()
+
+        self.record_metrics(request, response, measurement)
+
+        check_query_budget(measurement)
+        return response
+
+    def record_metrics(self, request, response, measurement):
+        # Unmatched paths share one label to keep metric cardinality bounded
+        route = get_route_name(request, default='<unmatched>')
+        metrics.HTTP_REQUESTS.inc(route=route, method=request.method, status=response.status_code)
+        metrics.HTTP_REQUEST_DURATION.observe(
+            measurement.total_seconds, route=route, method=request.method,
+        )
+        metrics.HTTP_REQUEST_QUERIES.observe(measurement.queries, route=route)
+        metrics.record_connection_usage()
+        metrics.registry.publish()
+
+
+class ReplicaPinningMiddleware:
+    """
+    Pin a user's reads to the primary briefly after any unsafe request.
+
+    Reads after a write in the same request are already pinned by
+    ReplicaRouter; this covers the user's next requests (read-after-write).
+    """
+
+    SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        user = getattr(request, 'user', None)
+        if request.method not in self.SAFE_METHODS and user is not None and user.is_authenticated:
+            replicas.pin_user_to_primary(user)
+        return response
+
+
+class ResponseCompressionMiddleware:
+    """
+    Compress API responses with gzip, brotli or zstd as negotiated.
+
+    Place near the top of MIDDLEWARE, after RequestInstrumentationMiddleware,
+    so everything below it sees the uncompressed body. See
+    apps.infrastructure.compression for what is skipped and why.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if not getattr(settings, 'COMPRESSION_ENABLED', True):
+            return response
+        if not compression.should_compress(request, response):
+            return response
+        if not response.streaming and len(response.content) < getattr(settings, 'COMPRESSION_MIN_SIZE', 1024):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoder = compression.choose_encoder(request.headers.get('Accept-Encoding', ''))
+        if encoder is None:
+            return response
+
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = encoder.compress_async_stream(response.streaming_content)
+            else:
+                response.streaming_content = encoder.compress_stream(response.streaming_content)
+            # Compressed length is unknown until the stream ends
+            del response.headers['Content-Length']
+        else:
+            original_size = len(response.content)
+            compressed = encoder.compress(response.content)
+            if len(compressed) >= original_size:
+                return response
+            response.content = compressed
+            response.headers['Content-Length'] = str(len(compressed))
+            compression.BYTES_SAVED.inc(original_size - len(compressed), encoding=encoder.name)
+
+        # A strong ETag must not match a differently encoded body (RFC 9110 8.8.1)
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = f'W/{etag}'
+        response.headers['Content-Encoding'] = encoder.name
+        compression.RESPONSES_COMPRESSED.inc(encoding=encoder.name)
+        return response
@@ -0,0 +1,29 @@
+"""
+Infrastructure models for TimeTrack Pro.
+"""
+from django.db import models
+from django.utils import timezone
+
+
+class OutboxMessage(models.Model):
+    """
+    A Celery task call written in the caller's transaction (apps.infrastructure.outbox).
+
+    Rows are deleted once relayed. A message that keeps failing to publish
+    is parked with available_at cleared.
+    """
+    task_name = models.CharField(max_length=200)
+    args = models.JSONField(default=list, blank=True)
+    kwargs = models.JSONField(default=dict, blank=True)
+    options = models.JSONField(default=dict, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    # When the relay may next try to publish; None once parked
+    available_at = models.DateTimeField(null=True, default=timezone.now, db_index=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        ordering = ['id']
+
+    def __str__(self):
+        return f'{self.task_name} #{self.pk}'
@@ -5,9 +5,11 @@ All notifications are sent asynchronously via Celery tasks.
 """
 from celery import shared_task
 from django.conf import settings
-from django.core.mail import send_mail
+from django.core.mail import EmailMultiAlternatives
 from django.template.loader import render_to_string
 
+from apps.infrastructure.delivery import deliver, deliver_many
+
 
 class NotificationType:
     """Notification type constants."""
@@ -37,12 +39,18 @@ SECURITY_NOTIFICATIONS = {
     NotificationType.ACCOUNT_LOCKED,
 }
 
+# Same priority as the password emails in CELERY_TASK_ROUTES (lower is sooner)
+SECURITY_NOTIFICATION_PRIORITY = 0
+
 
-@shared_task
-def send_notification(user_id: int, notification_type: str, context: dict) -> bool:
+@shared_task(bind=True, ignore_result=True, max_retries=settings.EMAIL_MAX_RETRIES)
+def send_notification(self, user_id: int, notification_type: str, context: dict) -> bool:
     """
     Send a notification to a user.
 
+    Delivery failures are retried with backoff, and sends are parked while
+    the email provider's circuit is open (apps.infrastructure.delivery).
+
     Args:
         user_id: ID of the user to notify
         notification_type: Type of notification (from NotificationType)
@@ -50,6 +58,7 @@ def send_notification(user_id: int, notification_type: str, context: dict) -> bo
 
     Returns:
         True if notification was sent, False if skipped due to preferences
+        or parked
     """
     from apps.users.models import User
 
@@ -58,15 +67,71 @@ def send_notification(user_id: int, notification_type: str, context: dict) -> bo
     except User.DoesNotExist:
         return False
 
-    is_security = notification_type in SECURITY_NOTIFICATIONS
+    if not wants_notification(user, notification_type):
+        return False
+
+    subject, text_content, html_content = render_notification(user, notification_type, context)
+    return deliver(
+        self,
+        subject=subject,
+        message=text_content,
+        recipient_list=[user.email],
+        html_message=html_content,
+    )
+
+
+@shared_task(bind=True, ignore_result=True, max_retries=settings.EMAIL_MAX_RETRIES)
+def send_notification_batch(self, user_ids: list[int], notification_type: str, context: dict) -> int:
+    """
+    Send the same notification to a batch of users over one connection.
+
+    Used for reminders and other fan-outs (queue_bulk_notifications), so a
+    large tenant costs one task per batch instead of one per user. A retry
+    or park only covers the users not yet sent to.
+
+    Args:
+        user_ids: IDs of the users to notify
+        notification_type: Type of notification (from NotificationType)
+        context: Template context shared by all recipients
+
+    Returns:
+        Number of emails sent
+    """
+    from apps.users.models import User
+
+    users = User.objects.filter(pk__in=user_ids, is_active=True).order_by('pk')
+    messages = []
+    for user in users:
+        if not wants_notification(user, notification_type):
+            continue
+        subject, text_content, html_content = render_notification(user, notification_type, dict(context))
+        message = EmailMultiAlternatives(
+            subject=subject,
+            body=text_content,
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            to=[user.email],
+        )
+        if html_content:
+            message.attach_alternative(html_content, 'text/html')
+        messages.append((user.pk, message))
+
+    return deliver_many(self, messages, lambda pending: (pending, notification_type, context))
 
-    if is_security:
-        if not user.security_notifications_enabled:
-            return False
-    else:
-        if not user.workflow_notifications_enabled:
-            return False
 
+def wants_notification(user, notification_type: str) -> bool:
+    """Whether the user's preferences allow a notification type."""
+    if notification_type in SECURITY_NOTIFICATIONS:
+        return user.security_notifications_enabled
+    return user.workflow_notifications_enabled
+
+
+def render_notification(user, notification_type: str, context: dict) -> tuple[str, str, str | None]:
+    """
+    Render a notification for a user.
+
+    Returns:
+        (subject, text body, HTML body or None if there is no template)
+    """
     subject = NOTIFICATION_SUBJECTS.get(
         notification_type,
         'TimeTrack Pro Notification'
@@ -88,16 +153,7 @@ def send_notification(user_id: int, notification_type: str, context: dict) -> bo
         html_content = None
         text_content = _generate_fallback_message(notification_type, context)
 
-    send_mail(
-        subject=subject,
-        message=text_content,
-        from_email=settings.DEFAULT_FROM_EMAIL,
-        recipient_list=[user.email],
-        html_message=html_content,
-        fail_silently=False,
-    )
-
-    return True
+    return subject, text_content, html_content
 
 
 def _generate_fallback_message(notification_type: str, context: dict) -> str:
@@ -131,27 +187,46 @@ def _generate_fallback_message(notification_type: str, context: dict) -> str:
     return messages.get(notification_type, "You have a new notification.")
 
 
+def notification_priority(notification_type: str) -> int | None:
+    """Broker priority for a notification; None keeps the route's default."""
+    return SECURITY_NOTIFICATION_PRIORITY if notification_type in SECURITY_NOTIFICATIONS else None
+
+
 def queue_notification(user_id: int, notification_type: str, context: dict) -> None:
     """
     Queue a notification for async delivery.
 
-    This is the primary interface for sending notifications.
+    This is the primary interface for sending notifications. Security
+    notifications jump ahead of workflow ones on the notifications queue.
     """
-    send_notification.delay(user_id, notification_type, context)
+    send_notification.apply_async(
+        (user_id, notification_type, context),
+        priority=notification_priority(notification_type),
+    )
 
 
 def queue_bulk_notifications(
     user_ids: list[int],
     notification_type: str,
     context: dict
-) -> None:
+) -> int:
     """
-    Queue notifications for multiple users.
+    Queue notifications for multiple users, NOTIFICATION_BATCH_SIZE per task.
 
     Args:
         user_ids: List of user IDs to notify
         notification_type: Type of notification
         context: Shared context for all notifications
+
+    Returns:
+        Number of batches queued
     """
-    for user_id in user_ids:
-        send_notification.delay(user_id, notification_type, context)
+    batch_size = getattr(settings, 'NOTIFICATION_BATCH_SIZE', 200)
+    batches = 0
+    for start in range(0, len(user_ids), batch_size):
+        send_notification_batch.apply_async(
+            (list(user_ids[start:start + batch_size]), notification_type, context),
+            priority=notification_priority(notification_type),
+        )
+        batches += 1
+    return batches
@@ -0,0 +1,160 @@
+"""
+Transactional outbox for TimeTrack Pro.
+
+Request handlers used to call task.delay() directly: one broker round trip
+per call on the request path, published even when the surrounding
+transaction later rolled back. enqueue() writes an OutboxMessage in the
+caller's transaction instead:
+
+    with transaction.atomic():
+        timesheet = serializer.save()
+        enqueue(send_timesheet_submitted_notification, args=(timesheet.id,))
+
+relay_outbox (apps.infrastructure.tasks, every few seconds from beat) drains
+committed messages in batches. Rows are locked with SKIP LOCKED so relays
+can overlap, and each batch is deleted once published. Delivery is at least
+once: a relay that dies between publishing and committing publishes that
+batch again, so tasks must tolerate repeats.
+
+Messages routed at URGENT_PRIORITY (password resets) don't wait for the
+next relay run: enqueue() publishes the row itself once the transaction
+commits, and the periodic relay picks it up if that fails.
+
+Settings:
+    OUTBOX_BATCH_SIZE: Messages published per transaction (default 100)
+    OUTBOX_MAX_BATCHES: Batches per relay run (default 50)
+    OUTBOX_MAX_ATTEMPTS: Failed publishes before a message is parked (default 10)
+"""
+from datetime import timedelta
+from fnmatch import fnmatchcase
+
+from celery import signature
+from celery.utils.log import get_task_logger
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from apps.infrastructure.metrics import OUTBOX_MESSAGES
+from apps.infrastructure.models import OutboxMessage
+
+logger = get_task_logger(__name__)
+
+# Longest wait between publish attempts for one message
+MAX_RETRY_DELAY = timedelta(minutes=5)
+# Messages at this priority are published on commit instead of by the relay
+URGENT_PRIORITY = 0
+
+
+def get_priority(task_name: str, options: dict) -> int | None:
+    """The priority a task is published at: its options, else CELERY_TASK_ROUTES."""
+    if 'priority' in options:
+        return options['priority']
+    routes = getattr(settings, 'CELERY_TASK_ROUTES', {})
+    route = routes.get(task_name)
+    if route is None:
+        route = next((r for pattern, r in routes.items() if fnmatchcase(task_name, pattern)), {})
+    return route.get('priority')
+
+
+def publish_on_commit(message: OutboxMessage) -> None:
+    """on_commit callback: publish one message now; the relay retries on failure."""
+    try:
+        relay_batch(pks=[message.pk])
+    except Exception as exc:
+        logger.warning(f'Outbox message {message.pk} ({message.task_name}) left for the relay: {exc}')
+
+
+def enqueue(task, args=(), kwargs=None, **options) -> OutboxMessage:
+    """
+    Record a task call to publish once the current transaction commits.
+
+    Args:
+        task: A Celery task or its registered name
+        args: Positional task arguments (JSON-serializable)
+        kwargs: Keyword task arguments (JSON-serializable)
+        **options: apply_async options, e.g. priority or countdown
+
+    Returns:
+        The outbox row
+    """
+    message = OutboxMessage.objects.create(
+        task_name=task if isinstance(task, str) else task.name,
+        args=list(args),
+        kwargs=kwargs or {},
+        options=options,
+    )
+    if get_priority(message.task_name, options) == URGENT_PRIORITY:
+        transaction.on_commit(lambda: publish_on_commit(message))
+    return message
+
+
+def park(task, until, args=(), kwargs=None, **options) -> OutboxMessage:
+    """
+    Record a task call to publish no earlier than a given time.
+
+    Used to hold work back while a downstream service is unavailable
+    (apps.infrastructure.delivery), without keeping it in a worker.
+    """
+    return OutboxMessage.objects.create(
+        task_name=task if isinstance(task, str) else task.name,
+        args=list(args),
+        kwargs=kwargs or {},
+        options=options,
+        available_at=until,
+    )
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """Exponential backoff for a message that failed to publish."""
+    return min(timedelta(seconds=2 ** attempts), MAX_RETRY_DELAY)
+
+
+def relay_batch(batch_size: int | None = None, pks: list[int] | None = None) -> dict:
+    """
+    Publish one batch of due messages.
+
+    Args:
+        batch_size: Messages per batch (default OUTBOX_BATCH_SIZE)
+        pks: Only consider these messages
+
+    Returns:
+        Counts of published, retried and parked messages
+    """
+    batch_size = batch_size or getattr(settings, 'OUTBOX_BATCH_SIZE', 100)
+    max_attempts = getattr(settings, 'OUTBOX_MAX_ATTEMPTS', 10)
+    counts = {'published': 0, 'retried': 0, 'parked': 0}
+
+    with transaction.atomic():
+        now = timezone.now()
+        due = OutboxMessage.objects.select_for_update(skip_locked=True).filter(available_at__lte=now)
+        if pks is not None:
+            due = due.filter(pk__in=pks)
+        messages = list(due.order_by('id')[:batch_size])
+        published, failed = [], []
+        for message in messages:
+            try:
+                signature(
+                    message.task_name, args=message.args, kwargs=message.kwargs, options=message.options,
+                ).apply_async()
+            except Exception as exc:
+                logger.warning(f'Outbox message {message.pk} ({message.task_name}) not published: {exc}')
+                message.attempts += 1
+                message.last_error = str(exc)
+                if message.attempts >= max_attempts:
+                    message.available_at = None
+                    counts['parked'] += 1
+                else:
+                    message.available_at = now + retry_delay(message.attempts)
+                    counts['retried'] += 1
+                failed.append(message)
+            else:
+                published.append(message.pk)
+
+        OutboxMessage.objects.filter(pk__in=published).delete()
+        OutboxMessage.objects.bulk_update(failed, ['attempts', 'last_error', 'available_at'])
+
+    counts['published'] = len(published)
+    for outcome, count in counts.items():
+        if count:
+            OUTBOX_MESSAGES.inc(count, outcome=outcome)
+    return counts
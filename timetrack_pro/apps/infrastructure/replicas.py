@@ -0,0 +1,196 @@
+"""
+Read-replica routing for TimeTrack Pro.
+
+Writes always go to ``default`` (the primary). Reads go to a replica only
+inside an explicit replica block, for read-only report views and exports:
+
+    @replica_reads
+    def get(self, request): ...
+
+    with use_replica():
+        list(Timesheet.objects.filter(...))
+
+Reads fall back to the primary when:
+- no replicas are configured (development, tests)
+- a write has already happened in the same request/task
+- the requesting user wrote within the pin window (read-after-write across
+  requests; recorded by ReplicaPinningMiddleware). The window is never
+  shorter than REPLICA_MAX_LAG_SECONDS: a replica within the lag limit may
+  still be missing anything written less than that long ago.
+- every replica is lagging more than REPLICA_MAX_LAG_SECONDS or unreachable
+
+Settings:
+    DATABASE_REPLICAS: Aliases in DATABASES to use as replicas (default [])
+    REPLICA_PIN_SECONDS: Read-after-write window per user (default and minimum: REPLICA_MAX_LAG_SECONDS)
+    REPLICA_MAX_LAG_SECONDS: Lag above which a replica is skipped (default 10)
+    REPLICA_LAG_CHECK_INTERVAL: Seconds to cache a lag reading (default 5)
+"""
+import logging
+import math
+import random
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError, connections
+
+from apps.infrastructure.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+PRIMARY = 'default'
+
+REPLICA_LAG = registry.gauge(
+    'db_replica_lag_seconds', 'Last measured replication lag per replica.', ('alias',), cluster_wide=True,
+)
+REPLICA_READS = registry.counter(
+    'db_replica_reads_total', 'Replica-eligible read blocks by database chosen.', ('target',),
+)
+
+LAG_QUERY = (
+    'SELECT CASE '
+    'WHEN NOT pg_is_in_recovery() THEN 0 '
+    'WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 '
+    'ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END'
+)
+
+
+@dataclass
+class ReplicaState:
+    """Routing state for one replica block."""
+
+    alias: str | None
+    wrote: bool = False
+
+
+_state: ContextVar[ReplicaState | None] = ContextVar('replica_state', default=None)
+
+
+def get_replicas() -> list[str]:
+    return list(getattr(settings, 'DATABASE_REPLICAS', []))
+
+
+def _pin_key(user_id) -> str:
+    return f'replica:pin:user:{user_id}'
+
+
+def get_pin_seconds() -> float:
+    """Read-after-write window: at least as long as the lag a replica may have."""
+    max_lag = getattr(settings, 'REPLICA_MAX_LAG_SECONDS', 10)
+    return max(getattr(settings, 'REPLICA_PIN_SECONDS', None) or 0, max_lag)
+
+
+def pin_user_to_primary(user) -> None:
+    """Send this user's replica-eligible reads to the primary for a short window."""
+    if get_replicas() and getattr(user, 'pk', None):
+        cache.set(_pin_key(user.pk), True, timeout=math.ceil(get_pin_seconds()))
+
+
+def is_user_pinned(user) -> bool:
+    return bool(getattr(user, 'pk', None)) and bool(cache.get(_pin_key(user.pk)))
+
+
+def get_replica_lag(alias: str) -> float | None:
+    """
+    Replication lag in seconds for a replica, or None if unreachable.
+
+    Readings are cached for REPLICA_LAG_CHECK_INTERVAL so the check costs at
+    most one query per replica per interval across all processes.
+    """
+    key = f'replica:lag:{alias}'
+    cached = cache.get(key)
+    if cached is not None:
+        return None if cached < 0 else cached
+
+    try:
+        with connections[alias].cursor() as cursor:
+            cursor.execute(LAG_QUERY)
+            lag = float(cursor.fetchone()[0] or 0)
+    except DatabaseError as e:
+        logger.warning('Replica %s unavailable: %s', alias, e)
+        lag = None
+
+    REPLICA_LAG.set(-1 if lag is None else lag, alias=alias)
+    cache.set(key, -1 if lag is None else lag, timeout=getattr(settings, 'REPLICA_LAG_CHECK_INTERVAL', 5))
+    return lag
+
+
+def choose_replica() -> str | None:
+    """Pick a replica within the lag limit, or None to use the primary."""
+    max_lag = getattr(settings, 'REPLICA_MAX_LAG_SECONDS', 10)
+    healthy = [
+        alias for alias in get_replicas()
+        if (lag := get_replica_lag(alias)) is not None and lag <= max_lag
+    ]
+    return random.choice(healthy) if healthy else None
+
+
+@contextmanager
+def use_replica(user=None) -> Iterator[ReplicaState]:
+    """
+    Allow reads in this block to go to a replica.
+
+    Args:
+        user: Optional user whose recent writes should pin reads to the primary
+    """
+    current = _state.get()
+    if current is not None:
+        yield current
+        return
+
+    alias = None
+    if get_replicas() and not (user is not None and is_user_pinned(user)):
+        alias = choose_replica()
+    REPLICA_READS.inc(target=alias or PRIMARY)
+
+    state = ReplicaState(alias=alias)
+    token = _state.set(state)
+    try:
+        yield state
+    finally:
+        _state.reset(token)
+
+
+def replica_reads(view_method):
+    """Decorator for read-only view methods: route reads to a replica."""
+
+    @wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        with use_replica(user=request.user):
+            return view_method(self, request, *args, **kwargs)
+
+    return wrapper
+
+
+class ReplicaRouter:
+    """
+    Database router sending replica-block reads to replicas.
+
+    All writes, and all reads outside a replica block, use the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if state is None or state.alias is None or state.wrote:
+            return None
+        return state.alias
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            # Read-after-write: the rest of this block reads from the primary
+            state.wrote = True
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in get_replicas():
+            return False
+        return None
@@ -70,3 +70,18 @@ def file_exists(name: str) -> bool:
     """
     storage = get_storage()
     return storage.exists(name)
+
+
+def read_file(name: str) -> bytes:
+    """
+    Read a file's content from storage.
+
+    Args:
+        name: File path in storage
+
+    Returns:
+        File content as bytes
+    """
+    storage = get_storage()
+    with storage.open(name, 'rb') as f:
+        return f.read()
@@ -1,25 +1,124 @@
 """
 Shared Celery task utilities for TimeTrack Pro.
 """
+from functools import cache
+
 from celery import shared_task
 from celery.utils.log import get_task_logger
 
 logger = get_task_logger(__name__)
 
 
+@cache
+def resolve_task(task_name: str):
+    """A registered task by name, or any importable callable (resolved once per process)."""
+    from celery import current_app
+    from django.utils.module_loading import import_string
+
+    task = current_app.tasks.get(task_name)
+    return task if task is not None else import_string(task_name)
+
+
 @shared_task(bind=True, max_retries=3)
 def retry_on_failure(self, task_name: str, *args, **kwargs):
     """
     Generic retry wrapper for tasks.
 
+    Retries use exponential backoff with full jitter (base 60s, capped at 15 minutes).
+
     Usage:
         retry_on_failure.delay('apps.timesheets.tasks.send_reminder', user_id=123)
     """
-    from django.utils.module_loading import import_string
+    from apps.infrastructure.delivery import backoff_delay
 
     try:
-        task_func = import_string(task_name)
-        return task_func(*args, **kwargs)
+        return resolve_task(task_name)(*args, **kwargs)
     except Exception as exc:
         logger.error(f"Task {task_name} failed: {exc}")
-        raise self.retry(exc=exc, countdown=60 * (self.request.retries + 1))
+        raise self.retry(exc=exc, countdown=backoff_delay(self.request.retries, base=60, cap=900))
+
+
+@shared_task(ignore_result=True)
+def relay_outbox() -> dict:
+    """
+    Publish committed outbox messages to the broker, batch by batch.
+
+    Stops at the first short batch or after OUTBOX_MAX_BATCHES.
+    """
+    from django.conf import settings
+
+    from apps.infrastructure.outbox import relay_batch
+
+    batch_size = getattr(settings, 'OUTBOX_BATCH_SIZE', 100)
+    totals = {'published': 0, 'retried': 0, 'parked': 0}
+    for _ in range(getattr(settings, 'OUTBOX_MAX_BATCHES', 50)):
+        counts = relay_batch(batch_size)
+        for outcome, count in counts.items():
+            totals[outcome] += count
+        if sum(counts.values()) < batch_size:
+            break
+    return totals
+
+
+@shared_task(ignore_result=True)
+def record_queue_depths() -> dict:
+    """
+    Sample broker queue depths and the outbox backlog into metrics.
+
+    Depths are read with passive declares, so missing queues count as empty.
+    """
+    from celery import current_app
+    from django.conf import settings
+    from django.db.models import Count, Q
+
+    from apps.infrastructure.metrics import CELERY_QUEUE_DEPTH, OUTBOX_BACKLOG
+    from apps.infrastructure.models import OutboxMessage
+
+    depths = {}
+    with current_app.connection_for_read() as connection:
+        channel = connection.default_channel
+        for queue in getattr(settings, 'CELERY_WORKER_QUEUE_OPTIONS', {}):
+            try:
+                depths[queue] = channel.queue_declare(queue=queue, passive=True).message_count
+            except Exception:
+                depths[queue] = 0
+            CELERY_QUEUE_DEPTH.set(depths[queue], queue=queue)
+
+    backlog = OutboxMessage.objects.aggregate(
+        pending=Count('id', filter=Q(available_at__isnull=False)),
+        parked=Count('id', filter=Q(available_at__isnull=True)),
+    )
+    for state, count in backlog.items():
+        OUTBOX_BACKLOG.set(count, state=state)
+    return {'queues': depths, 'outbox': backlog}
+
+
+def apply_queue_worker_options(conf, queues) -> dict:
+    """
+    Apply CELERY_WORKER_QUEUE_OPTIONS to a worker that consumes one queue.
+
+    Called from the celeryd_init signal, before the worker reads its
+    concurrency and prefetch settings, so explicit -c and
+    --prefetch-multiplier options still take precedence.
+
+    Args:
+        conf: The Celery app configuration
+        queues: The worker's -Q value (list, comma-separated string or None)
+
+    Returns:
+        The options applied (empty when the worker consumes several queues)
+    """
+    from django.conf import settings
+
+    if isinstance(queues, str):
+        queues = [name.strip() for name in queues.split(',') if name.strip()]
+    queues = list(queues or [conf.task_default_queue])
+    if len(queues) != 1:
+        return {}
+
+    options = getattr(settings, 'CELERY_WORKER_QUEUE_OPTIONS', {}).get(queues[0], {})
+    if 'concurrency' in options:
+        conf.worker_concurrency = options['concurrency']
+    if 'prefetch_multiplier' in options:
+        conf.worker_prefetch_multiplier = options['prefetch_multiplier']
+    return options
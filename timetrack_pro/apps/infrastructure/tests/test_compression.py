@@ -0,0 +1,156 @@
+"""
+Tests for negotiated API response compression.
+"""
+import gzip
+import json
+import zlib
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory
+
+LARGE_JSON = json.dumps({'data': [{'id': i, 'description': 'Sprint planning'} for i in range(200)]})
+
+
+def run_middleware(response, path='/api/v1/time-entries/', accept_encoding='gzip'):
+    from apps.infrastructure.middleware import ResponseCompressionMiddleware
+
+    request = RequestFactory().get(path, HTTP_ACCEPT_ENCODING=accept_encoding)
+    return ResponseCompressionMiddleware(lambda r: response)(request)
+
+
+def json_response(body=LARGE_JSON, **headers):
+    response = HttpResponse(body, content_type='application/json')
+    for name, value in headers.items():
+        response[name] = value
+    return response
+
+
+class TestChooseEncoder:
+    """Tests for Accept-Encoding negotiation."""
+
+    @pytest.mark.parametrize('header, expected', [
+        ('gzip', 'gzip'),
+        ('gzip;q=0.5, deflate', 'gzip'),
+        ('*', 'gzip'),
+        ('identity', None),
+        ('gzip;q=0', None),
+        ('', None),
+    ])
+    def test_gzip_negotiation(self, header, expected):
+        from apps.infrastructure.compression import choose_encoder
+
+        encoder = choose_encoder(header)
+
+        assert (encoder.name if encoder else None) == expected
+
+    def test_prefers_zstd_then_brotli_when_installed(self):
+        from apps.infrastructure.compression import available_encoders, choose_encoder
+
+        installed = available_encoders()
+        expected = next(name for name in ('zstd', 'br', 'gzip') if name in installed)
+
+        assert choose_encoder('gzip, br, zstd').name == expected
+
+    def test_client_q_values_win(self):
+        from apps.infrastructure.compression import choose_encoder
+
+        assert choose_encoder('zstd;q=0.1, br;q=0.1, gzip;q=0.9').name == 'gzip'
+
+
+    def test_encoder_without_compressor_cannot_be_created(self):
+        from apps.infrastructure.compression import Encoder
+
+        class BodyOnlyEncoder(Encoder):
+            name = 'body-only'
+
+            def compress(self, data):
+                return data
+
+        with pytest.raises(TypeError, match='compressor'):
+            BodyOnlyEncoder()
+
+
+class TestResponseCompressionMiddleware:
+    """Tests for ResponseCompressionMiddleware."""
+
+    def test_compresses_large_json(self):
+        """
+        Given: A JSON API response above the size threshold
+        When: The client accepts gzip
+        Then: The body is gzipped, headers updated and the ETag weakened
+        """
+        response = run_middleware(json_response(ETag='"abc"'))
+
+        assert response['Content-Encoding'] == 'gzip'
+        assert 'Accept-Encoding' in response['Vary']
+        assert response['ETag'] == 'W/"abc"'
+        assert int(response['Content-Length']) == len(response.content) < len(LARGE_JSON)
+        assert gzip.decompress(response.content).decode() == LARGE_JSON
+
+    @pytest.mark.parametrize('response, path', [
+        (lambda: json_response('{"ok": true}'), '/api/v1/time-entries/'),
+        (lambda: json_response(), '/api/v1/auth/login/'),
+        (lambda: json_response(), '/admin/'),
+        (lambda: json_response(**{'Cache-Control': 'no-transform'}), '/api/v1/time-entries/'),
+        (lambda: HttpResponse(LARGE_JSON, content_type='image/png'), '/api/v1/time-entries/'),
+    ], ids=['small', 'auth', 'non-api', 'no-transform', 'content-type'])
+    def test_skips_ineligible_responses(self, response, path):
+        result = run_middleware(response(), path=path)
+
+        assert not result.has_header('Content-Encoding')
+
+    def test_disabled_by_setting(self, settings):
+        settings.COMPRESSION_ENABLED = False
+
+        assert not run_middleware(json_response()).has_header('Content-Encoding')
+
+    def test_streaming_response(self):
+        """Streaming exports are compressed incrementally, one chunk at a time."""
+        rows = [f'{i},{date(2024, 1, 1) + timedelta(days=i)},8.00\n'.encode() for i in range(50)]
+        response = StreamingHttpResponse(iter(rows), content_type='text/csv')
+
+        response = run_middleware(response, path='/api/v1/users/1/export/')
+        chunks = list(response.streaming_content)
+
+        assert response['Content-Encoding'] == 'gzip'
+        assert not response.has_header('Content-Length')
+        assert len(chunks) > 1
+        assert zlib.decompress(b''.join(chunks), 31) == b''.join(rows)
+
+    @pytest.mark.parametrize('module, encoding', [('brotli', 'br'), ('zstandard', 'zstd')])
+    def test_optional_encoders_round_trip(self, module, encoding):
+        library = pytest.importorskip(module)
+
+        response = run_middleware(json_response(), accept_encoding=encoding)
+
+        assert response['Content-Encoding'] == encoding
+        if encoding == 'br':
+            body = library.decompress(response.content)
+        else:
+            body = library.ZstdDecompressor().decompress(response.content)
+        assert body.decode() == LARGE_JSON
+
+
+@pytest.mark.django_db
+class TestCompressedApiResponses:
+    """End to end through the middleware stack."""
+
+    def test_time_entry_list_is_gzipped(self, authenticated_client, user, project):
+        from apps.timeentries.models import TimeEntry
+
+        TimeEntry.objects.bulk_create([
+            TimeEntry(
+                user=user, project=project, date=date.today() - timedelta(days=i), hours=Decimal('1.00'),
+                billing_rate=Decimal('100.00'), rate_source=TimeEntry.RateSource.PROJECT,
+                description='Code review and follow-up fixes',
+            )
+            for i in range(20)
+        ])
+
+        response = authenticated_client.get('/api/v1/time-entries/', HTTP_ACCEPT_ENCODING='gzip')
+
+        assert response['Content-Encoding'] == 'gzip'
+        assert json.loads(gzip.decompress(response.content))['meta']['total'] == 20
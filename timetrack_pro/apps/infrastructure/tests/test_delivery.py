@@ -0,0 +1,279 @@
+"""
+Tests for email delivery retries and the circuit breaker.
+"""
+import smtplib
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from django.core import mail
+from django.utils import timezone
+
+from apps.infrastructure.models import OutboxMessage
+
+
+@pytest.fixture
+def eager_retries(settings):
+    """Let eagerly applied tasks re-run on retry instead of raising Retry."""
+    settings.CELERY_TASK_EAGER_PROPAGATES = False
+
+
+class TestBackoffDelay:
+    """Tests for backoff_delay."""
+
+    def test_delay_grows_exponentially_up_to_cap(self):
+        """The jitter range doubles per retry and stops at the cap."""
+        from apps.infrastructure.delivery import backoff_delay
+
+        with patch('apps.infrastructure.delivery.random.uniform', side_effect=lambda low, high: high):
+            assert [backoff_delay(n, base=5, cap=60) for n in range(5)] == [5, 10, 20, 40, 60]
+
+    def test_delay_is_jittered(self):
+        """Delays are spread over [0, bound] rather than fixed."""
+        from apps.infrastructure.delivery import backoff_delay
+
+        delays = {backoff_delay(3, base=5, cap=600) for _ in range(20)}
+
+        assert len(delays) > 1
+        assert all(0 <= delay <= 40 for delay in delays)
+
+
+class TestIsTransient:
+    """Tests for classifying delivery errors."""
+
+    @pytest.mark.parametrize('exc, transient', [
+        (smtplib.SMTPServerDisconnected('gone'), True),
+        (TimeoutError('timed out'), True),
+        (ConnectionRefusedError(), True),
+        (smtplib.SMTPConnectError(421, b'busy'), True),
+        (smtplib.SMTPResponseException(421, b'try later'), True),
+        (smtplib.SMTPRecipientsRefused({'a@example.com': (450, b'mailbox busy')}), True),
+        (smtplib.SMTPRecipientsRefused({'a@example.com': (550, b'no such user')}), False),
+        (smtplib.SMTPSenderRefused(553, b'sender rejected', 'noreply@example.com'), False),
+        (smtplib.SMTPAuthenticationError(535, b'bad credentials'), False),
+        (smtplib.SMTPDataError(451, b'local error'), True),
+        (smtplib.SMTPDataError(554, b'message rejected'), False),
+        (smtplib.SMTPNotSupportedError(), False),
+    ])
+    def test_smtp_errors(self, exc, transient):
+        """Connection errors and 4xx replies are transient; 5xx replies are permanent."""
+        from apps.infrastructure.delivery import is_transient
+
+        assert is_transient(exc) is transient
+
+    @pytest.mark.parametrize('status_code, transient', [(None, True), (429, True), (503, True), (400, False)])
+    def test_provider_api_errors(self, status_code, transient):
+        """Provider API errors are transient when unanswered, throttled or 5xx."""
+        anymail = pytest.importorskip('anymail.exceptions')
+        from apps.infrastructure.delivery import is_transient
+
+        assert is_transient(anymail.AnymailRequestsAPIError(status_code=status_code)) is transient
+
+
+class TestCircuitBreaker:
+    """Tests for CircuitBreaker state changes."""
+
+    def _breaker(self):
+        from apps.infrastructure.delivery import CircuitBreaker
+
+        return CircuitBreaker('test-backend', failure_threshold=3, window=60, reset_timeout=30)
+
+    def test_opens_after_threshold(self):
+        """
+        Given: A closed breaker
+        When: Failures reach the threshold
+        Then: Calls are refused until the reset timeout
+        """
+        from apps.infrastructure.delivery import CircuitOpen
+
+        breaker = self._breaker()
+        for _ in range(2):
+            breaker.record_failure()
+        breaker.check()
+
+        breaker.record_failure()
+
+        with pytest.raises(CircuitOpen) as exc_info:
+            breaker.check()
+        assert exc_info.value.retry_at > timezone.now() + timedelta(seconds=25)
+
+    def test_half_open_allows_one_probe(self):
+        """
+        Given: An open breaker whose cooldown has passed
+        When: Two callers check
+        Then: The first probes, the second waits; a successful probe closes it
+        """
+        from apps.infrastructure.delivery import CircuitOpen
+
+        breaker = self._breaker()
+        breaker.open()
+        later = timezone.now() + timedelta(seconds=31)
+
+        with patch('apps.infrastructure.delivery.timezone.now', return_value=later):
+            breaker.check()
+            with pytest.raises(CircuitOpen):
+                breaker.check()
+
+        breaker.record_success()
+        breaker.check()
+
+    def test_failed_probe_reopens(self):
+        """A failure while probing opens the breaker again at once."""
+        from apps.infrastructure.delivery import CircuitOpen
+
+        breaker = self._breaker()
+        breaker.open()
+        with patch('apps.infrastructure.delivery.timezone.now', return_value=timezone.now() + timedelta(seconds=31)):
+            breaker.check()
+
+        breaker.record_failure()
+
+        with pytest.raises(CircuitOpen):
+            breaker.check()
+
+
+@pytest.mark.django_db
+class TestDeliver:
+    """Tests for notification tasks sending through deliver()."""
+
+    def test_sends_email(self, user):
+        """
+        Given: A healthy provider
+        When: A notification task runs
+        Then: One email is sent
+        """
+        from apps.infrastructure.notifications import send_notification
+
+        result = send_notification.apply(args=(user.id, 'timesheet_approved', {}))
+
+        assert result.get() is True
+        assert len(mail.outbox) == 1
+
+    def test_retries_then_parks_when_circuit_opens(self, settings, user, eager_retries):
+        """
+        Given: A provider that keeps failing
+        When: The task retries
+        Then: The circuit opens and the next attempt is parked in the outbox
+        """
+        from apps.users.tasks import send_password_reset_email
+
+        settings.EMAIL_CIRCUIT_FAILURE_THRESHOLD = 3
+        failure = smtplib.SMTPServerDisconnected('timed out')
+
+        with patch('apps.infrastructure.delivery.send_mail', side_effect=failure) as send:
+            send_password_reset_email.apply(args=(user.id,))
+
+        assert send.call_count == 3
+        message = OutboxMessage.objects.get()
+        assert message.task_name == 'apps.users.tasks.send_password_reset_email'
+        assert message.args == [user.id]
+        assert message.available_at > timezone.now()
+
+    def test_gives_up_after_max_retries(self, settings, user, eager_retries):
+        """A message still failing after max_retries is dropped, not parked."""
+        from apps.infrastructure.notifications import send_notification
+
+        settings.EMAIL_CIRCUIT_FAILURE_THRESHOLD = 100
+        failure = smtplib.SMTPServerDisconnected('timed out')
+
+        with patch('apps.infrastructure.delivery.send_mail', side_effect=failure) as send:
+            send_notification.apply(args=(user.id, 'timesheet_approved', {}))
+
+        assert send.call_count == send_notification.max_retries + 1
+        assert not OutboxMessage.objects.exists()
+
+    @pytest.mark.parametrize('failure', [
+        smtplib.SMTPRecipientsRefused({'a@example.com': (550, b'no such user')}),
+        smtplib.SMTPSenderRefused(553, b'sender rejected', 'noreply@example.com'),
+        smtplib.SMTPAuthenticationError(535, b'bad credentials'),
+        smtplib.SMTPDataError(554, b'message rejected'),
+    ])
+    def test_permanent_failure_is_not_retried(self, settings, user, eager_retries, failure):
+        """
+        Given: A provider that refuses the message for good
+        When: The task runs
+        Then: It fails after one attempt and the breaker stays closed
+        """
+        from apps.infrastructure.delivery import CircuitBreaker
+        from apps.users.tasks import send_password_reset_email
+
+        settings.EMAIL_CIRCUIT_FAILURE_THRESHOLD = 1
+
+        with patch('apps.infrastructure.delivery.send_mail', side_effect=failure) as send:
+            result = send_password_reset_email.apply(args=(user.id,))
+
+        assert send.call_count == 1
+        assert result.failed()
+        CircuitBreaker.for_email().check()
+        assert not OutboxMessage.objects.exists()
+
+    def test_transient_reply_is_retried_without_opening_circuit(self, settings, user, eager_retries):
+        """A 4xx reply is retried, but only connection errors count toward the breaker."""
+        from apps.infrastructure.delivery import CircuitBreaker
+        from apps.infrastructure.notifications import send_notification
+
+        settings.EMAIL_CIRCUIT_FAILURE_THRESHOLD = 1
+        failure = smtplib.SMTPDataError(451, b'try again later')
+
+        with patch('apps.infrastructure.delivery.send_mail', side_effect=[failure, 1]) as send:
+            send_notification.apply(args=(user.id, 'timesheet_approved', {}))
+
+        assert send.call_count == 2
+        CircuitBreaker.for_email().check()
+
+
+@pytest.mark.django_db
+class TestDeliverMany:
+    """Tests for batch notifications sent through deliver_many()."""
+
+    def _send_failing(self, failures):
+        """Patch EmailMessage.send to raise failures[address] once per address, recording attempts."""
+        from django.core.mail import EmailMessage
+
+        attempts = []
+
+        def send(message, fail_silently=False):
+            address = message.to[0]
+            attempts.append(address)
+            if address in failures:
+                raise failures.pop(address)
+            mail.outbox.append(message)
+            return 1
+
+        return patch.object(EmailMessage, 'send', autospec=True, side_effect=send), attempts
+
+    def test_permanently_refused_recipient_is_skipped(self, company, user_factory, eager_retries):
+        """
+        Given: A batch of three whose first recipient is refused with a 550
+        When: send_notification_batch runs
+        Then: The other two are sent in the same run and nothing is retried
+        """
+        from apps.infrastructure.notifications import send_notification_batch
+
+        users = [user_factory(company=company) for _ in range(3)]
+        refused = smtplib.SMTPRecipientsRefused({users[0].email: (550, b'no such user')})
+        send, attempts = self._send_failing({users[0].email: refused})
+
+        with send:
+            result = send_notification_batch.apply(args=([u.id for u in users], 'weekly_reminder', {}))
+
+        assert result.get() == 2
+        assert attempts == [u.email for u in users]
+        assert [m.to[0] for m in mail.outbox] == [u.email for u in users[1:]]
+
+    def test_connection_loss_retries_only_unsent(self, company, user_factory, eager_retries):
+        """
+        Given: A batch of three where the connection drops on the second
+        When: send_notification_batch runs
+        Then: The retry sends the second and third only, and each user gets one email
+        """
+        from apps.infrastructure.notifications import send_notification_batch
+
+        users = [user_factory(company=company) for _ in range(3)]
+        send, attempts = self._send_failing({users[1].email: smtplib.SMTPServerDisconnected('gone')})
+
+        with send:
+            send_notification_batch.apply(args=([u.id for u in users], 'weekly_reminder', {}))
+
+        assert attempts == [users[0].email, users[1].email, users[1].email, users[2].email]
+        assert sorted(m.to[0] for m in mail.outbox) == sorted(u.email for u in users)
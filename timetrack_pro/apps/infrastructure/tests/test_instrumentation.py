@@ -0,0 +1,175 @@
+"""
+Tests for request/task instrumentation and query budgets.
+"""
+import logging
+
+import pytest
+from django.test import override_settings
+
+
+@pytest.mark.django_db
+class TestMeasure:
+    """Tests for the measure() context manager."""
+
+    def test_counts_queries_and_db_time(self, user):
+        """
+        Given: Two queries inside a measured block
+        When: The block exits
+        Then: Query count is 2 and timings are populated
+        """
+        from apps.infrastructure.instrumentation import measure
+        from apps.users.models import User
+
+        with measure('test') as m:
+            list(User.objects.all())
+            User.objects.filter(pk=user.pk).exists()
+
+        assert m.queries == 2
+        assert m.db_seconds > 0
+        assert m.total_seconds >= m.db_seconds
+
+    def test_nested_scopes_count_each_query_once_per_scope(self, user):
+        """
+        Given: A measured block (e.g. an eager task) inside another (a request)
+        When: One query runs in the outer block only and two in the inner one
+        Then: The inner scope counts its two queries, the outer all three
+        """
+        from apps.infrastructure.instrumentation import get_current_measurement, measure
+        from apps.users.models import User
+
+        with measure('outer') as outer:
+            User.objects.filter(pk=user.pk).exists()
+            with measure('inner') as inner:
+                assert get_current_measurement() is inner
+                list(User.objects.all())
+                User.objects.filter(pk=user.pk).exists()
+            assert get_current_measurement() is outer
+
+        assert (outer.queries, inner.queries) == (3, 2)
+        assert get_current_measurement() is None
+
+    def test_records_outermost_serializer_time(self, user):
+        """
+        Given: A serializer with nested serializers
+        When: Accessing .data inside a measured block
+        Then: Serializer time is recorded
+        """
+        from apps.infrastructure.instrumentation import measure
+        from apps.timesheets.serializers import NestedUserSerializer
+
+        with measure('test') as m:
+            data = NestedUserSerializer([user, user], many=True).data
+
+        assert len(data) == 2
+        assert m.serializer_seconds > 0
+
+    def test_queries_outside_block_not_counted(self, user):
+        """
+        Given: A measured block has exited
+        When: Running another query
+        Then: The measurement is unchanged
+        """
+        from apps.infrastructure.instrumentation import measure
+        from apps.users.models import User
+
+        with measure('test') as m:
+            User.objects.count()
+        User.objects.count()
+
+        assert m.queries == 1
+
+
+@pytest.mark.django_db
+class TestRequestInstrumentationMiddleware:
+    """Tests for RequestInstrumentationMiddleware."""
+
+    def test_logs_structured_fields(self, authenticated_client, caplog):
+        """
+        Given: An authenticated request
+        When: GET /api/v1/time-entries/
+        Then: A log record carries route, queries and timings
+        """
+        with caplog.at_level(logging.INFO, logger='apps.infrastructure.instrumentation'):
+            authenticated_client.get('/api/v1/time-entries/')
+
+        record = next(r for r in caplog.records if getattr(r, 'route', None) == 'time-entry-list')
+        assert record.status == 200
+        assert record.queries > 0
+        assert record.total_ms >= record.db_ms
+
+    @override_settings(INSTRUMENTATION_SERVER_TIMING=True)
+    def test_server_timing_header(self, authenticated_client):
+        """
+        Given: INSTRUMENTATION_SERVER_TIMING enabled
+        When: Making a request
+        Then: Response carries a Server-Timing header
+        """
+        response = authenticated_client.get('/api/v1/time-entries/')
+
+        assert 'db;desc=' in response['Server-Timing']
+        assert 'total;dur=' in response['Server-Timing']
+
+    def test_no_server_timing_header_by_default(self, authenticated_client):
+        """
+        Given: Default settings
+        When: Making a request
+        Then: No Server-Timing header
+        """
+        response = authenticated_client.get('/api/v1/time-entries/')
+
+        assert not response.has_header('Server-Timing')
+
+    @override_settings(QUERY_BUDGETS={'time-entry-list': 1}, QUERY_BUDGET_RAISE=True)
+    def test_budget_exceeded_raises_in_tests(self, authenticated_client):
+        """
+        Given: A budget of 1 query and QUERY_BUDGET_RAISE
+        When: The endpoint issues more queries
+        Then: QueryBudgetExceeded is raised
+        """
+        from apps.infrastructure.instrumentation import QueryBudgetExceeded
+
+        with pytest.raises(QueryBudgetExceeded):
+            authenticated_client.get('/api/v1/time-entries/')
+
+    @override_settings(QUERY_BUDGETS={'time-entry-list': 1}, QUERY_BUDGET_RAISE=False)
+    def test_budget_exceeded_warns_in_production(self, authenticated_client, caplog):
+        """
+        Given: A budget of 1 query without QUERY_BUDGET_RAISE
+        When: The endpoint issues more queries
+        Then: A warning is logged and the response is still returned
+        """
+        with caplog.at_level(logging.WARNING, logger='apps.infrastructure.instrumentation'):
+            response = authenticated_client.get('/api/v1/time-entries/')
+
+        assert response.status_code == 200
+        assert any('Query budget exceeded' in r.message for r in caplog.records)
+
+
+@pytest.mark.django_db
+class TestTaskInstrumentation:
+    """Tests for the Celery task hooks."""
+
+    def test_task_measurement_lifecycle(self, user):
+        """
+        Given: A task measurement is started
+        When: The task runs a query and finishes
+        Then: The returned measurement counts it
+        """
+        from apps.infrastructure.instrumentation import (
+            finish_task_measurement,
+            start_task_measurement,
+        )
+        from apps.users.models import User
+
+        start_task_measurement('task-1', 'apps.timesheets.tasks.create_weekly_timesheets')
+        User.objects.count()
+        measurement = finish_task_measurement('task-1', 'SUCCESS')
+
+        assert measurement.route == 'apps.timesheets.tasks.create_weekly_timesheets'
+        assert measurement.queries == 1
+
+    def test_finish_unknown_task_is_noop(self):
+        """Finishing a task that was never started returns None."""
+        from apps.infrastructure.instrumentation import finish_task_measurement
+
+        assert finish_task_measurement('missing') is None
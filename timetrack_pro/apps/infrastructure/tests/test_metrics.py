@@ -0,0 +1,287 @@
+"""
+Tests for the metrics registry and /metrics endpoint.
+"""
+from types import SimpleNamespace
+
+import pytest
+from django.core.cache import cache
+
+
+@pytest.fixture(autouse=True)
+def clean_registry():
+    from apps.infrastructure.metrics import registry
+
+    registry.clear()
+    cache.clear()
+    yield
+    registry.clear()
+
+
+class TestRegistry:
+    """Tests for metric types and rendering."""
+
+    def test_render_counter(self):
+        """
+        Given: A counter incremented twice for one label set
+        When: Rendering the snapshot
+        Then: HELP/TYPE lines and the summed sample are emitted
+        """
+        from apps.infrastructure.metrics import MetricsRegistry, render
+
+        registry = MetricsRegistry()
+        counter = registry.counter('jobs_total', 'Jobs run.', ('kind',))
+        counter.inc(kind='a')
+        counter.inc(2, kind='a')
+
+        output = render(registry.snapshot())
+
+        assert '# HELP jobs_total Jobs run.' in output
+        assert '# TYPE jobs_total counter' in output
+        assert 'jobs_total{kind="a"} 3' in output
+
+    def test_histogram_buckets_are_cumulative(self):
+        """
+        Given: Observations of 0.2 and 3 in a histogram
+        When: Rendering
+        Then: Bucket counts are cumulative and +Inf equals the count
+        """
+        from apps.infrastructure.metrics import MetricsRegistry, render
+
+        registry = MetricsRegistry()
+        histogram = registry.histogram('latency_seconds', 'Latency.', buckets=(0.1, 1, 5))
+        histogram.observe(0.2)
+        histogram.observe(3)
+
+        output = render(registry.snapshot())
+
+        assert 'latency_seconds_bucket{le="0.1"} 0' in output
+        assert 'latency_seconds_bucket{le="1"} 1' in output
+        assert 'latency_seconds_bucket{le="5"} 2' in output
+        assert 'latency_seconds_bucket{le="+Inf"} 2' in output
+        assert 'latency_seconds_count 2' in output
+
+    def test_wrong_labels_rejected(self):
+        """Incrementing with labels that do not match raises ValueError."""
+        from apps.infrastructure.metrics import MetricsRegistry
+
+        counter = MetricsRegistry().counter('jobs_total', 'Jobs run.', ('kind',))
+
+        with pytest.raises(ValueError):
+            counter.inc(other='a')
+
+    def test_merge_sums_process_snapshots(self):
+        """
+        Given: Two processes that each counted and observed
+        When: Merging their snapshots
+        Then: Counters and histograms are summed per label set
+        """
+        from apps.infrastructure.metrics import MetricsRegistry, merge_snapshots
+
+        snapshots = []
+        for _ in range(2):
+            registry = MetricsRegistry()
+            registry.counter('jobs_total', 'Jobs run.', ('kind',)).inc(kind='a')
+            registry.histogram('latency_seconds', 'Latency.', buckets=(1,)).observe(0.5)
+            snapshots.append(registry.snapshot())
+
+        merged = merge_snapshots(snapshots)
+
+        assert merged['jobs_total']['samples'] == [[['a'], 2]]
+        counts, total, count = merged['latency_seconds']['samples'][0][1]
+        assert counts == [2, 0]
+        assert count == 2
+
+    def test_merge_keeps_latest_cluster_wide_gauge(self):
+        """
+        Given: Two processes that sampled a queue depth (10, then 4) and each hold 3 pool connections
+        When: Merging their snapshots
+        Then: The queue depth is the newest reading; the per-process pool gauge is summed
+        """
+        from unittest.mock import patch
+
+        from apps.infrastructure.metrics import MetricsRegistry, merge_snapshots, render
+
+        snapshots = []
+        for sampled_at, depth in ((1000.0, 10), (1005.0, 4)):
+            registry = MetricsRegistry()
+            with patch('apps.infrastructure.metrics.time.time', return_value=sampled_at):
+                registry.gauge('queue_depth', 'Depth.', ('queue',), cluster_wide=True).set(depth, queue='bulk')
+            registry.gauge('pool_connections', 'Connections.').set(3)
+            snapshots.append(registry.snapshot())
+
+        merged = merge_snapshots(reversed(snapshots))
+
+        assert merged['queue_depth']['samples'] == [[['bulk'], 4]]
+        assert merged['pool_connections']['samples'] == [[[], 6]]
+        assert 'queue_depth{queue="bulk"} 4' in render(merged)
+
+    def test_concurrent_publishes_keep_every_process(self):
+        """
+        Given: Eight processes publishing around the same time, with a slow cache read
+        When: They publish in rounds
+        Then: No round drops a registered process, and all of them end up collected
+        """
+        import random
+        import threading
+        import time
+        from unittest.mock import patch
+
+        from django.core.cache.backends.locmem import LocMemCache
+
+        from apps.infrastructure.metrics import MetricsRegistry, collect_snapshots
+
+        registries = [MetricsRegistry() for _ in range(8)]
+        for registry in registries:
+            registry.counter('jobs_total', 'Jobs run.').inc()
+        cache_get = LocMemCache.get
+
+        def slow_get(*args, **kwargs):
+            value = cache_get(*args, **kwargs)
+            time.sleep(0.002)
+            return value
+
+        def publish(registry):
+            time.sleep(random.uniform(0, 0.02))  # processes publish at their own times
+            registry.publish(force=True)
+
+        registered = 0
+        with patch('apps.infrastructure.metrics.get_process_id', side_effect=lambda: threading.current_thread().name), \
+                patch.object(LocMemCache, 'get', autospec=True, side_effect=slow_get):
+            for _ in range(20):
+                threads = [
+                    threading.Thread(target=publish, args=(r,), name=f'p{i}')
+                    for i, r in enumerate(registries)
+                ]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+                now_registered = len(collect_snapshots())
+                assert now_registered >= registered
+                registered = now_registered
+                if registered == 8:
+                    break
+
+        assert registered == 8
+
+    def test_busy_index_lock_skips_index_update(self):
+        """
+        Given: Another process holding the index lock
+        When: Publishing
+        Then: The snapshot is written, the index is left alone and the lock is not waited for
+        """
+        from unittest.mock import patch
+
+        from apps.infrastructure.metrics import (
+            PROCESS_INDEX_KEY,
+            PROCESS_INDEX_LOCK_KEY,
+            SNAPSHOT_KEY_PREFIX,
+            MetricsRegistry,
+            get_process_id,
+        )
+
+        cache.set(PROCESS_INDEX_LOCK_KEY, 'other')
+
+        with patch('apps.infrastructure.metrics.time.sleep') as sleep:
+            MetricsRegistry().publish(force=True)
+
+        sleep.assert_not_called()
+        assert cache.get(f'{SNAPSHOT_KEY_PREFIX}{get_process_id()}') is not None
+        assert cache.get(PROCESS_INDEX_KEY) is None
+
+
+@pytest.mark.django_db
+class TestMetricsEndpoint:
+    """Tests for GET /metrics."""
+
+    def test_admin_can_scrape(self, authenticated_admin_client):
+        """
+        Given: An admin user after one API request
+        When: GET /metrics
+        Then: Prometheus text including the request counter is returned
+        """
+        authenticated_admin_client.get('/api/v1/time-entries/')
+
+        response = authenticated_admin_client.get('/metrics')
+
+        assert response.status_code == 200
+        assert response['Content-Type'].startswith('text/plain; version=0.0.4')
+        body = response.content.decode()
+        assert 'http_requests_total{route="time-entry-list",method="GET",status="200"}' in body
+        assert 'http_request_duration_seconds_bucket' in body
+
+    def test_non_admin_forbidden(self, authenticated_client):
+        """Employees cannot read metrics."""
+        response = authenticated_client.get('/metrics')
+
+        assert response.status_code == 403
+
+    def test_unauthenticated_rejected(self, api_client):
+        """Anonymous requests are rejected."""
+        response = api_client.get('/metrics')
+
+        assert response.status_code == 401
+
+
+@pytest.mark.django_db
+class TestTaskMetrics:
+    """Tests for the Celery metric hooks."""
+
+    def test_queue_lag_and_outcome(self):
+        """
+        Given: A message stamped at publish time
+        When: The task starts and finishes
+        Then: Queue lag, duration and outcome are recorded
+        """
+        from apps.infrastructure.metrics import (
+            CELERY_QUEUE_LAG,
+            CELERY_TASKS,
+            record_task_finished,
+            record_task_published,
+            record_task_started,
+        )
+
+        headers = {}
+        record_task_published(headers)
+        task = SimpleNamespace(name='apps.timesheets.tasks.escalate', request=SimpleNamespace(**headers))
+
+        record_task_started(task)
+        record_task_finished(task.name, 0.01, 'SUCCESS')
+
+        assert CELERY_QUEUE_LAG.snapshot()['samples'][0][1][2] == 1
+        assert CELERY_TASKS.snapshot()['samples'] == [[[task.name, 'success'], 1]]
+
+
+@pytest.mark.django_db
+class TestConnectionPoolMetrics:
+    """Tests for psycopg pool integration."""
+
+    def test_pool_reuses_connections_across_checkouts(self):
+        """
+        Given: A pooled database alias
+        When: Connecting and closing twice (two requests/tasks)
+        Then: Two checkouts are recorded against one physical connection
+        """
+        pytest.importorskip('psycopg_pool')
+        from django.db import connections
+
+        from apps.infrastructure.metrics import DB_POOL_EVENTS, record_pool_stats
+
+        connection = connections['default']
+        settings_dict = {
+            **connection.settings_dict,
+            'CONN_MAX_AGE': 0,
+            'OPTIONS': {'pool': {'min_size': 1, 'max_size': 1}},
+        }
+        pooled = connection.__class__(settings_dict, alias='pooled')
+        try:
+            for _ in range(2):
+                pooled.ensure_connection()
+                pooled.close()
+            record_pool_stats([pooled])
+        finally:
+            pooled.close_pool()
+
+        events = {tuple(labels): value for labels, value in DB_POOL_EVENTS.snapshot()['samples']}
+        assert events[('pooled', 'checkout')] == 2
+        assert events[('pooled', 'opened')] == 1
@@ -0,0 +1,153 @@
+"""
+Tests for the transactional outbox.
+"""
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+from django.db import transaction
+from django.utils import timezone
+
+from apps.infrastructure.models import OutboxMessage
+
+TASK = 'apps.timesheets.tasks.send_timesheet_submitted_notification'
+
+
+@pytest.mark.django_db
+class TestEnqueue:
+    """Tests for writing outbox messages."""
+
+    def test_rolled_back_writes_leave_no_message(self):
+        """
+        Given: A transaction that enqueues a task and then fails
+        When: It rolls back
+        Then: No message is left to publish
+        """
+        from apps.infrastructure.outbox import enqueue
+
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                enqueue(TASK, args=(1,))
+                raise RuntimeError
+
+        assert not OutboxMessage.objects.exists()
+
+    def test_submit_writes_outbox_without_publishing(self, authenticated_client, user, project):
+        """
+        Given: A draft timesheet with an entry
+        When: POST /timesheets/:id/submit/
+        Then: The notification is in the outbox and nothing reached the broker
+        """
+        from apps.timeentries.models import TimeEntry
+        from apps.timesheets.models import Timesheet
+
+        timesheet = Timesheet.objects.create(user=user, week_start=date(2024, 6, 10))
+        TimeEntry.objects.create(
+            user=user, project=project, timesheet=timesheet,
+            date=date(2024, 6, 10), hours=Decimal('8.00'),
+            billing_rate=Decimal('100.00'), rate_source=TimeEntry.RateSource.PROJECT,
+        )
+
+        with patch(f'{TASK}.apply_async') as apply_async:
+            response = authenticated_client.post(f'/api/v1/timesheets/{timesheet.pk}/submit/')
+
+        assert response.status_code == 200
+        apply_async.assert_not_called()
+        message = OutboxMessage.objects.get()
+        assert (message.task_name, message.args) == (TASK, [timesheet.pk])
+
+    def test_password_reset_published_on_commit(self, api_client, user, django_capture_on_commit_callbacks):
+        """
+        Given: An active user
+        When: POST /auth/password/reset/ commits
+        Then: The reset email reaches the broker without waiting for the relay
+        """
+        reset_task = 'apps.users.tasks.send_password_reset_email'
+
+        with patch(f'{reset_task}.apply_async') as apply_async:
+            with django_capture_on_commit_callbacks(execute=True):
+                response = api_client.post('/api/v1/auth/password/reset/', {'email': user.email})
+
+        assert response.status_code == 200
+        apply_async.assert_called_once()
+        assert not OutboxMessage.objects.exists()
+
+    def test_failed_urgent_publish_left_for_relay(self, django_capture_on_commit_callbacks):
+        """
+        Given: A priority-0 message and a broker that is down
+        When: The enqueuing transaction commits
+        Then: The row stays in the outbox with its attempt recorded
+        """
+        from apps.infrastructure.outbox import enqueue
+
+        with patch(f'{TASK}.apply_async', side_effect=ConnectionError('broker down')):
+            with django_capture_on_commit_callbacks(execute=True):
+                enqueue(TASK, args=(1,), priority=0)
+
+        message = OutboxMessage.objects.get()
+        assert message.attempts == 1
+
+    def test_other_priorities_wait_for_relay(self, django_capture_on_commit_callbacks):
+        """
+        Given: A task routed below urgent priority
+        When: It is enqueued
+        Then: No on-commit publish is registered
+        """
+        from apps.infrastructure.outbox import enqueue
+
+        with django_capture_on_commit_callbacks() as callbacks:
+            enqueue(TASK, args=(1,))
+
+        assert callbacks == []
+
+
+@pytest.mark.django_db
+class TestRelay:
+    """Tests for relay_outbox."""
+
+    def test_relay_publishes_in_order_and_deletes(self, settings):
+        """
+        Given: Three queued messages and a batch size of two
+        When: The relay runs
+        Then: All are published oldest first and removed
+        """
+        from apps.infrastructure.outbox import enqueue
+        from apps.infrastructure.tasks import relay_outbox
+
+        settings.OUTBOX_BATCH_SIZE = 2
+        for timesheet_id in (1, 2, 3):
+            enqueue(TASK, args=(timesheet_id,), priority=1)
+
+        with patch(f'{TASK}.apply_async') as apply_async:
+            result = relay_outbox()
+
+        assert result == {'published': 3, 'retried': 0, 'parked': 0}
+        assert [call.args[0] for call in apply_async.call_args_list] == [(1,), (2,), (3,)]
+        assert apply_async.call_args.kwargs['priority'] == 1
+        assert not OutboxMessage.objects.exists()
+
+    def test_failed_publish_backs_off_then_parks(self, settings):
+        """
+        Given: A broker that refuses the message
+        When: The relay keeps running past OUTBOX_MAX_ATTEMPTS
+        Then: The message is retried later, then parked
+        """
+        from apps.infrastructure.outbox import enqueue, relay_batch
+
+        settings.OUTBOX_MAX_ATTEMPTS = 2
+        message = enqueue(TASK, args=(1,))
+
+        with patch(f'{TASK}.apply_async', side_effect=ConnectionError('broker down')):
+            assert relay_batch()['retried'] == 1
+            message.refresh_from_db()
+            assert message.available_at > timezone.now()
+            assert relay_batch()['retried'] == 0
+
+            OutboxMessage.objects.filter(pk=message.pk).update(available_at=timezone.now() - timedelta(seconds=1))
+            assert relay_batch()['parked'] == 1
+
+        message.refresh_from_db()
+        assert message.attempts == 2
+        assert message.available_at is None
+        assert 'broker down' in message.last_error
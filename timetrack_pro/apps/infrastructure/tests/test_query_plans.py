@@ -0,0 +1,147 @@
+"""
+EXPLAIN regression tests for hot query shapes.
+
+Each test seeds a small dataset, refreshes planner statistics and checks
+that the hot query is served by its composite index. Sequential scans are
+disabled for the check because on a table this small Postgres would
+rightly prefer one; what matters is that a matching index exists and the
+planner picks it over the single-column foreign key indexes.
+"""
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from django.utils import timezone
+
+SEED_USERS = 10
+SEED_DAYS = 60
+SEED_PERIODS = 100
+
+
+@pytest.fixture
+def seeded(db, company, project, user_factory):
+    """A few thousand rows spread across users, dates and historic periods."""
+    from apps.rates.models import Rate
+    from apps.timeentries.models import TimeEntry
+    from apps.timesheets.models import ApprovalDelegation, OOOPeriod, Timesheet
+
+    users = [user_factory() for _ in range(SEED_USERS)]
+    start = date(2026, 1, 5)
+
+    TimeEntry.objects.bulk_create([
+        TimeEntry(
+            user=u, project=project, date=start + timedelta(days=d), hours=Decimal('4.00'),
+            billing_rate=Decimal('100.00'), rate_source=TimeEntry.RateSource.COMPANY,
+        )
+        for u in users for d in range(SEED_DAYS) for _ in range(2)
+    ])
+    Timesheet.objects.bulk_create([
+        Timesheet(
+            user=u, week_start=start + timedelta(weeks=w),
+            status=Timesheet.Status.SUBMITTED if w % 4 == 0 else Timesheet.Status.APPROVED,
+            submitted_at=timezone.now() - timedelta(days=w),
+        )
+        for u in users for w in range(SEED_DAYS // 7)
+    ])
+    Rate.objects.bulk_create([
+        Rate(
+            company=company, employee=u, project=project, rate_type=rate_type,
+            hourly_rate=Decimal('100.00'), effective_from=start + timedelta(days=30 * i),
+        )
+        for u in users for rate_type in Rate.RateType.values for i in range(5)
+    ])
+    OOOPeriod.objects.bulk_create([
+        OOOPeriod(
+            user=u, start_date=start + timedelta(days=10 * i), end_date=start + timedelta(days=10 * i + 3),
+        )
+        for u in users for i in range(SEED_PERIODS)
+    ])
+    ApprovalDelegation.objects.bulk_create([
+        ApprovalDelegation(
+            delegator=users[0], delegate=u,
+            start_date=start + timedelta(days=10 * i), end_date=start + timedelta(days=10 * i + 3),
+        )
+        for u in users[1:] for i in range(SEED_PERIODS)
+    ])
+
+    with connection.cursor() as cursor:
+        for model in (TimeEntry, Timesheet, Rate, OOOPeriod, ApprovalDelegation):
+            cursor.execute(f'ANALYZE {model._meta.db_table}')
+    return users
+
+
+def explain(queryset) -> str:
+    with connection.cursor() as cursor:
+        cursor.execute('SET LOCAL enable_seqscan = off')
+    return queryset.explain()
+
+
+@pytest.mark.django_db
+class TestHotQueryPlans:
+    """Hot queries must use their composite indexes."""
+
+    def test_daily_limit_check(self, seeded):
+        """TimeEntry lookups by user and date use timeentry_user_date_idx."""
+        from apps.timeentries.models import TimeEntry
+
+        plan = explain(TimeEntry.objects.filter(user=seeded[3], date=date(2026, 1, 20)))
+
+        assert 'timeentry_user_date_idx' in plan
+
+    def test_overtime_scan(self, seeded):
+        """The overtime scan reads the day's entries from timeentry_date_user_idx, not per user."""
+        from apps.reports.services import OvertimeService
+
+        plan = explain(OvertimeService.get_daily_totals_over(date(2026, 1, 20), 8))
+
+        assert 'timeentry_date_user_idx' in plan
+        assert 'timeentry_user_date_idx' not in plan
+        assert 'Nested Loop' not in plan
+
+    def test_escalation_scan(self, seeded):
+        """Submitted timesheets older than a cutoff use timesheet_status_submitted_idx."""
+        from apps.timesheets.models import Timesheet
+
+        plan = explain(Timesheet.objects.filter(
+            status=Timesheet.Status.SUBMITTED,
+            submitted_at__lte=timezone.now() - timedelta(days=2),
+        ))
+
+        assert 'timesheet_status_submitted_idx' in plan
+
+    def test_rate_resolution(self, seeded, company, project):
+        """The most specific rate lookup uses rate_resolution_idx."""
+        from apps.rates.models import Rate
+
+        plan = explain(
+            Rate.objects.filter(
+                company=company, employee=seeded[2], project=project,
+                rate_type=Rate.RateType.EMPLOYEE_PROJECT,
+                effective_from__lte=date(2026, 3, 1),
+            ).order_by('-effective_from')[:1]
+        )
+
+        assert 'rate_resolution_idx' in plan
+
+    def test_ooo_lookup(self, seeded):
+        """Active OOO checks use ooo_user_dates_idx."""
+        from apps.timesheets.models import OOOPeriod
+
+        today = date(2026, 1, 16)
+        plan = explain(OOOPeriod.objects.filter(
+            user=seeded[4], start_date__lte=today, end_date__gte=today,
+        ))
+
+        assert 'ooo_user_dates_idx' in plan
+
+    def test_delegation_lookup(self, seeded):
+        """Active delegation checks use delegation_delegate_dates_idx."""
+        from apps.timesheets.models import ApprovalDelegation
+
+        today = date(2026, 1, 16)
+        plan = explain(ApprovalDelegation.objects.filter(
+            delegate=seeded[5], start_date__lte=today, end_date__gte=today,
+        ))
+
+        assert 'delegation_delegate_dates_idx' in plan
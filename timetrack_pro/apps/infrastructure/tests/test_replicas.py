@@ -0,0 +1,143 @@
+"""
+Tests for read-replica routing.
+"""
+from unittest.mock import patch
+
+import pytest
+from django.core.cache import cache
+from django.db import router
+from django.test import override_settings
+
+from apps.timeentries.models import TimeEntry
+
+
+@pytest.fixture
+def replica(monkeypatch):
+    """A configured, healthy replica (lag readings are patched)."""
+    from apps.infrastructure import replicas
+
+    lag = {'replica': 0.5}
+    monkeypatch.setattr(replicas, 'get_replica_lag', lambda alias: lag[alias])
+    cache.clear()
+    with override_settings(DATABASE_REPLICAS=['replica'], REPLICA_MAX_LAG_SECONDS=10):
+        yield lag
+    cache.clear()
+
+
+class TestReplicaRouter:
+    """Tests for ReplicaRouter decisions."""
+
+    def test_reads_use_primary_outside_replica_block(self, replica):
+        """Reads outside use_replica() are never routed to a replica."""
+        assert router.db_for_read(TimeEntry) == 'default'
+
+    def test_reads_use_replica_inside_block(self, replica):
+        """Reads inside use_replica() go to a healthy replica."""
+        from apps.infrastructure.replicas import use_replica
+
+        with use_replica():
+            assert router.db_for_read(TimeEntry) == 'replica'
+
+    def test_no_replicas_configured(self):
+        """Without replicas everything uses the primary."""
+        from apps.infrastructure.replicas import use_replica
+
+        with use_replica():
+            assert router.db_for_read(TimeEntry) == 'default'
+
+    def test_lagging_replica_falls_back_to_primary(self, replica):
+        """A replica lagging past REPLICA_MAX_LAG_SECONDS is skipped."""
+        from apps.infrastructure.replicas import use_replica
+
+        replica['replica'] = 30.0
+
+        with use_replica():
+            assert router.db_for_read(TimeEntry) == 'default'
+
+    def test_write_pins_rest_of_block_to_primary(self, replica):
+        """
+        Given: A replica block
+        When: A write is routed
+        Then: Later reads in the block use the primary
+        """
+        from apps.infrastructure.replicas import use_replica
+
+        with use_replica():
+            assert router.db_for_write(TimeEntry) == 'default'
+            assert router.db_for_read(TimeEntry) == 'default'
+
+    def test_replicas_are_not_migrated(self, replica):
+        """Migrations only run against the primary."""
+        assert router.allow_migrate('replica', 'timeentries') is False
+        assert router.allow_migrate('default', 'timeentries') is True
+
+
+@pytest.mark.django_db
+class TestReadAfterWritePinning:
+    """Tests for per-user read-after-write pinning."""
+
+    def test_pinned_user_reads_from_primary(self, replica, user):
+        """A user who just wrote is kept on the primary."""
+        from apps.infrastructure.replicas import pin_user_to_primary, use_replica
+
+        pin_user_to_primary(user)
+
+        with use_replica(user=user):
+            assert router.db_for_read(TimeEntry) == 'default'
+
+    def test_pin_outlasts_max_lag(self, replica, settings):
+        """A pin shorter than the allowed replica lag is extended to the lag."""
+        from apps.infrastructure.replicas import get_pin_seconds
+
+        settings.REPLICA_PIN_SECONDS = 5
+
+        assert get_pin_seconds() == 10
+
+    def test_deactivation_export_reads_primary(self, replica, user, admin):
+        """The audit export is read from the primary even when the user isn't pinned."""
+        from apps.users.services import DeactivationService
+
+        export = DeactivationService.export_user_data
+        targets = []
+
+        def record_target(target_user):
+            targets.append(router.db_for_read(TimeEntry))
+            return export(target_user)
+
+        with patch.object(DeactivationService, 'export_user_data', side_effect=record_target):
+            DeactivationService.execute_deactivation(user, admin, reason='Left the company')
+
+        assert targets == ['default']
+
+    def test_unsafe_request_pins_user(self, replica, authenticated_client, user):
+        """
+        Given: Replicas are configured
+        When: The user makes a POST request
+        Then: The user is pinned to the primary
+        """
+        from apps.infrastructure.replicas import is_user_pinned
+
+        authenticated_client.post('/api/v1/ooo-periods/', {}, format='json')
+
+        assert is_user_pinned(user)
+
+    def test_safe_request_does_not_pin(self, replica, authenticated_client, user):
+        """GET requests do not pin the user."""
+        from apps.infrastructure.replicas import is_user_pinned
+
+        authenticated_client.get('/api/v1/ooo-periods/')
+
+        assert not is_user_pinned(user)
+
+
+@pytest.mark.django_db
+class TestReplicaLag:
+    """Tests for lag measurement."""
+
+    def test_primary_reports_zero_lag(self):
+        """A server that is not in recovery reports no lag."""
+        from apps.infrastructure.replicas import get_replica_lag
+
+        cache.clear()
+
+        assert get_replica_lag('default') == 0
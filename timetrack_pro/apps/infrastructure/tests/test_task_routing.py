@@ -0,0 +1,97 @@
+"""
+Tests for Celery queue routing and per-queue worker options.
+"""
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from config.celery import app
+
+
+def route(name):
+    return app.amqp.router.route({}, name)
+
+
+class TestTaskRoutes:
+    """Tests for CELERY_TASK_ROUTES."""
+
+    @pytest.mark.parametrize('name, queue, priority', [
+        ('apps.users.tasks.send_password_reset_email', 'notifications', 0),
+        ('apps.infrastructure.notifications.send_notification', 'notifications', 3),
+        ('apps.timesheets.tasks.send_timesheet_submitted_notification', 'notifications', 3),
+        ('apps.timesheets.tasks.create_weekly_timesheets', 'schedules', None),
+        ('apps.timesheets.tasks.check_pending_escalations', 'schedules', None),
+        ('apps.timesheets.tasks.archive_old_timesheets', 'bulk', 9),
+        ('apps.timeentries.tasks.purge_time_entry_tombstones', 'bulk', 9),
+        ('apps.infrastructure.tasks.retry_on_failure', 'default', None),
+    ])
+    def test_task_queue(self, name, queue, priority):
+        """Each task family lands on its own queue, at its priority."""
+        options = route(name)
+
+        assert options['queue'].name == queue
+        assert options.get('priority') == priority
+
+    def test_fire_and_forget_tasks_ignore_results(self):
+        """Notification and sweep tasks don't write to the result backend."""
+        from apps.infrastructure.notifications import send_notification
+        from apps.timesheets.tasks import check_pending_escalations, create_weekly_timesheets
+        from apps.users.tasks import send_password_reset_email
+
+        for task in (send_notification, send_password_reset_email, create_weekly_timesheets, check_pending_escalations):
+            assert task.ignore_result is True
+
+    def test_security_notifications_jump_the_queue(self):
+        """
+        Given: A security and a workflow notification
+        When: Queued through queue_notification
+        Then: The security one is sent at the top priority, the other at the route's
+        """
+        from apps.infrastructure.notifications import NotificationType, queue_notification
+
+        with patch('apps.infrastructure.notifications.send_notification.apply_async') as apply_async:
+            queue_notification(1, NotificationType.ACCOUNT_LOCKED, {})
+            queue_notification(1, NotificationType.TIMESHEET_APPROVED, {})
+
+        assert [call.kwargs['priority'] for call in apply_async.call_args_list] == [0, None]
+
+
+class TestQueueWorkerOptions:
+    """Tests for apply_queue_worker_options."""
+
+    def _conf(self):
+        return SimpleNamespace(task_default_queue='default', worker_concurrency=None, worker_prefetch_multiplier=4)
+
+    def test_single_queue_worker_gets_its_options(self, settings):
+        """A worker started with -Q bulk gets the bulk concurrency and prefetch."""
+        from apps.infrastructure.tasks import apply_queue_worker_options
+
+        settings.CELERY_WORKER_QUEUE_OPTIONS = {'bulk': {'concurrency': 1, 'prefetch_multiplier': 1}}
+        conf = self._conf()
+
+        apply_queue_worker_options(conf, 'bulk')
+
+        assert (conf.worker_concurrency, conf.worker_prefetch_multiplier) == (1, 1)
+
+    def test_worker_without_queues_uses_default_queue_options(self, settings):
+        """A worker without -Q consumes the default queue and gets its options."""
+        from apps.infrastructure.tasks import apply_queue_worker_options
+
+        settings.CELERY_WORKER_QUEUE_OPTIONS = {'default': {'concurrency': 3}}
+        conf = self._conf()
+
+        apply_queue_worker_options(conf, None)
+
+        assert conf.worker_concurrency == 3
+        assert conf.worker_prefetch_multiplier == 4
+
+    def test_multi_queue_worker_is_left_alone(self, settings):
+        """A worker consuming several queues keeps the global settings."""
+        from apps.infrastructure.tasks import apply_queue_worker_options
+
+        settings.CELERY_WORKER_QUEUE_OPTIONS = {'bulk': {'concurrency': 1}}
+        conf = self._conf()
+
+        assert apply_queue_worker_options(conf, ['bulk', 'schedules']) == {}
+        assert conf.worker_concurrency is None
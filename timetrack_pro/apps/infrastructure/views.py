@@ -0,0 +1,34 @@
+"""
+Views for Infrastructure endpoints.
+"""
+from django.http import HttpResponse
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from apps.infrastructure.metrics import collect_snapshots, merge_snapshots, registry, render
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class MetricsView(APIView):
+    """
+    GET /metrics
+
+    Metrics for all live web and Celery processes in Prometheus text format.
+    Admin only.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        if not request.user.is_admin:
+            return Response(
+                {'detail': 'Only admins can view metrics.'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        registry.publish(force=True)
+        snapshot = merge_snapshots(collect_snapshots())
+        return HttpResponse(render(snapshot), content_type=PROMETHEUS_CONTENT_TYPE)
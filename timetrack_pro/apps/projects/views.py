@@ -7,9 +7,10 @@ from rest_framework.permissions import IsAuthenticated
 from apps.projects.models import Project
 from apps.projects.serializers import ProjectSerializer
 from core.pagination import StandardPagination
+from core.sparse import SparseFieldsMixin
 
 
-class ProjectViewSet(viewsets.ReadOnlyModelViewSet):
+class ProjectViewSet(SparseFieldsMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet for listing projects (read-only for now)."""
 
     permission_classes = [IsAuthenticated]
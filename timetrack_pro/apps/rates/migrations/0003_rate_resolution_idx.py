@@ -0,0 +1,24 @@
+# Generated by Django 5.2.10 on 2026-10-19 09:00
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('rates', '0002_initial'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='rate',
+            index=models.Index(
+                fields=['company', 'rate_type', 'employee', 'project', '-effective_from'],
+                name='rate_resolution_idx',
+            ),
+        ),
+    ]
@@ -54,6 +54,13 @@ class Rate(TimeStampedModel):
 
     class Meta:
         ordering = ['-effective_from']
+        indexes = [
+            # RateResolutionService: latest effective rate per hierarchy level
+            models.Index(
+                fields=['company', 'rate_type', 'employee', 'project', '-effective_from'],
+                name='rate_resolution_idx',
+            ),
+        ]
 
     def __str__(self) -> str:
         return f'{self.rate_type}: ${self.hourly_rate}/hr'
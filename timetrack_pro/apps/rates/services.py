@@ -14,6 +14,7 @@ from typing import Optional
 
 from django.db.models import Q
 
+from apps.companies.context import get_tenant_context
 from apps.rates.models import Rate
 
 
@@ -46,7 +47,7 @@ class RateResolutionService:
         Returns:
             RateResolutionResult with rate and source
         """
-        company = project.company
+        company_id = project.company_id
 
         effective_filter = Q(effective_from__lte=as_of_date) & (
             Q(effective_to__isnull=True) | Q(effective_to__gte=as_of_date)
@@ -54,7 +55,7 @@ class RateResolutionService:
 
         employee_project_rate = (
             Rate.objects.filter(
-                company=company,
+                company_id=company_id,
                 employee=user,
                 project=project,
                 rate_type=Rate.RateType.EMPLOYEE_PROJECT,
@@ -71,7 +72,7 @@ class RateResolutionService:
 
         project_rate = (
             Rate.objects.filter(
-                company=company,
+                company_id=company_id,
                 project=project,
                 rate_type=Rate.RateType.PROJECT,
             )
@@ -87,7 +88,7 @@ class RateResolutionService:
 
         employee_rate = (
             Rate.objects.filter(
-                company=company,
+                company_id=company_id,
                 employee=user,
                 rate_type=Rate.RateType.EMPLOYEE,
             )
@@ -102,6 +103,6 @@ class RateResolutionService:
             )
 
         return RateResolutionResult(
-            rate=company.settings.default_hourly_rate,
+            rate=get_tenant_context(company_id).settings.default_hourly_rate,
             source='COMPANY',
         )
@@ -19,9 +19,10 @@ from apps.rates.serializers import (
 from apps.rates.services import RateResolutionService
 from apps.users.models import User
 from core.pagination import StandardPagination
+from core.sparse import SparseFieldsMixin
 
 
-class RateViewSet(viewsets.ModelViewSet):
+class RateViewSet(SparseFieldsMixin, viewsets.ModelViewSet):
     """ViewSet for Rate CRUD operations."""
 
     permission_classes = [IsAuthenticated]
@@ -0,0 +1,13 @@
+from django.contrib import admin
+
+from .models import OvertimeFinding
+
+
+@admin.register(OvertimeFinding)
+class OvertimeFindingAdmin(admin.ModelAdmin):
+    list_display = ('user', 'company', 'date', 'hours', 'threshold')
+    list_filter = ('company', 'date')
+    search_fields = ('user__email', 'user__first_name', 'user__last_name')
+    date_hierarchy = 'date'
+    raw_id_fields = ('user', 'company')
+    readonly_fields = ('created_at',)
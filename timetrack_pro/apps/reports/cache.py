@@ -0,0 +1,88 @@
+"""
+Response cache for report endpoints.
+
+Report responses are cached per (report, company, caller scope, normalized
+query params, company data version). Any time entry, timesheet or user
+write in the company changes the data version (apps.companies.versioning),
+so cached responses are never served stale; they simply stop being reached
+and expire after REPORT_CACHE_TIMEOUT.
+
+When read replicas are configured, results computed within
+REPLICA_MAX_LAG_SECONDS of a version change are not cached, since the
+replica may not have caught up with the write yet.
+
+Settings:
+    REPORT_CACHE_TIMEOUT: Seconds to keep a cached response (default 300, 0 disables)
+"""
+import hashlib
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.response import Response
+
+from apps.companies.versioning import get_data_version, version_age_seconds
+from apps.infrastructure.metrics import CACHE_REQUESTS
+from apps.infrastructure.replicas import get_replicas
+
+
+def get_caller_scope(user) -> str:
+    """Admins see the whole company; managers see themselves and their reports."""
+    return 'company' if user.is_admin else f'manager:{user.pk}'
+
+
+def normalize_params(query_params) -> str:
+    """Stable representation of query params (order-insensitive, comma lists sorted)."""
+    parts = []
+    for name in sorted(query_params):
+        values = sorted(
+            ','.join(sorted(v.strip() for v in value.split(',')))
+            for value in query_params.getlist(name)
+        )
+        parts.append(f'{name}={"|".join(values)}')
+    return '&'.join(parts)
+
+
+def get_cache_key(report: str, user, query_params, version: int) -> str:
+    params_hash = hashlib.sha256(normalize_params(query_params).encode()).hexdigest()[:32]
+    return f'report:{report}:{user.company_id}:{version}:{get_caller_scope(user)}:{params_hash}'
+
+
+def _can_cache(version: int) -> bool:
+    if not get_replicas():
+        return True
+    return version_age_seconds(version) > getattr(settings, 'REPLICA_MAX_LAG_SECONDS', 10)
+
+
+def cached_report(report: str):
+    """
+    Decorator for report view methods: serve repeat requests from the cache.
+
+    Only successful responses from managers/admins are cached.
+    """
+
+    def decorator(view_method):
+        @wraps(view_method)
+        def wrapper(self, request, *args, **kwargs):
+            timeout = getattr(settings, 'REPORT_CACHE_TIMEOUT', 300)
+            user = request.user
+            if not timeout or not user.is_manager or not user.company_id:
+                return view_method(self, request, *args, **kwargs)
+
+            version = get_data_version(user.company_id)
+            key = get_cache_key(report, user, request.query_params, version)
+            data = cache.get(key)
+            if data is not None:
+                CACHE_REQUESTS.inc(cache='report', result='hit')
+                return Response(data)
+
+            CACHE_REQUESTS.inc(cache='report', result='miss')
+            response = view_method(self, request, *args, **kwargs)
+            if response.status_code == status.HTTP_200_OK and _can_cache(version):
+                cache.set(key, response.data, timeout=timeout)
+            return response
+
+        return wrapper
+
+    return decorator
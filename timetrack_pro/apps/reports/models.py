@@ -0,0 +1,41 @@
+"""
+Report models for TimeTrack Pro.
+"""
+from django.conf import settings
+from django.db import models
+
+
+class OvertimeFinding(models.Model):
+    """
+    A user's day whose logged hours exceeded the company's daily_warning_threshold.
+
+    Written by the nightly overtime scan (apps.reports.services.OvertimeService);
+    a rescan of a day replaces that day's findings.
+    """
+    company = models.ForeignKey(
+        'companies.Company',
+        on_delete=models.CASCADE,
+        related_name='overtime_findings',
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='overtime_findings',
+    )
+    date = models.DateField()
+    hours = models.DecimalField(max_digits=5, decimal_places=2)
+    # Threshold in force when the day was scanned
+    threshold = models.PositiveSmallIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-date', 'user_id']
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'date'], name='overtime_finding_user_date_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['company', 'date'], name='overtime_company_date_idx'),
+        ]
+
+    def __str__(self) -> str:
+        return f'{self.user_id} {self.date}: {self.hours}h > {self.threshold}h'
@@ -0,0 +1,97 @@
+"""
+Services for report data computed ahead of time.
+
+Includes:
+- OvertimeService: Flags user-days over the company's daily_warning_threshold
+"""
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import QuerySet, Sum
+
+from apps.companies.models import Company, CompanySettings
+from apps.companies.versioning import bump_data_version
+from apps.reports.models import OvertimeFinding
+from apps.timeentries.models import TimeEntry
+from apps.users.models import User
+
+
+class OvertimeService:
+    """Nightly overtime scan."""
+
+    @classmethod
+    def get_threshold(cls, company: Company) -> int:
+        """The company's daily_warning_threshold, or the field default without settings."""
+        try:
+            return company.settings.daily_warning_threshold
+        except CompanySettings.DoesNotExist:
+            return CompanySettings._meta.get_field('daily_warning_threshold').default
+
+    @classmethod
+    def get_daily_totals_over(cls, day: date, threshold: int) -> QuerySet:
+        """
+        Per-user hours on `day` above the threshold, across all companies.
+
+        Filters on the entry table alone, so Postgres reads the day's
+        entries from timeentry_date_user_idx in one pass: linear in the
+        entries logged that day, never a loop over users. HAVING drops the
+        totals under the threshold.
+        """
+        return (
+            TimeEntry.objects
+            .filter(date=day)
+            .values('user_id')
+            .annotate(total=Sum('hours'))
+            .filter(total__gt=threshold)
+            .order_by()
+        )
+
+    @classmethod
+    def get_overtime_by_company(cls, day: date, threshold: int) -> dict[int, list[tuple[int, Decimal]]]:
+        """
+        (user_id, hours) over the threshold on `day`, grouped by company.
+
+        The users are looked up after the totals, so only users over the
+        threshold are read.
+        """
+        totals = {row['user_id']: row['total'] for row in cls.get_daily_totals_over(day, threshold)}
+        by_company = defaultdict(list)
+        if totals:
+            for user_id, company_id in User.objects.filter(pk__in=totals).values_list('pk', 'company_id'):
+                by_company[company_id].append((user_id, totals[user_id]))
+        return dict(by_company)
+
+    @classmethod
+    def scan_day(cls, company: Company, day: date, overtime: dict | None = None) -> int:
+        """
+        Record the company's user-days on `day` over the threshold.
+
+        The day's previous findings are replaced, so a rescan is idempotent.
+
+        Args:
+            company: The company to scan
+            day: The day to scan
+            overtime: get_overtime_by_company() for the day at a threshold no
+                higher than the company's, shared across companies scanned
+                for the same day (default: computed here)
+
+        Returns:
+            Number of findings recorded
+        """
+        threshold = cls.get_threshold(company)
+        if overtime is None:
+            overtime = cls.get_overtime_by_company(day, threshold)
+        findings = [
+            OvertimeFinding(company=company, user_id=user_id, date=day, hours=hours, threshold=threshold)
+            for user_id, hours in overtime.get(company.pk, [])
+            if hours > threshold
+        ]
+
+        with transaction.atomic():
+            deleted, _ = OvertimeFinding.objects.filter(company=company, date=day).delete()
+            OvertimeFinding.objects.bulk_create(findings)
+            if deleted or findings:
+                bump_data_version(company.pk)
+        return len(findings)
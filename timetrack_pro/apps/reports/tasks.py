@@ -0,0 +1,67 @@
+"""
+Celery tasks for precomputed reports.
+
+Tasks:
+- scan_overtime: Nightly; flag user-days over the daily warning threshold
+"""
+from datetime import date, timedelta
+
+from celery import shared_task
+from celery.utils.log import get_task_logger
+from django.utils import timezone
+
+logger = get_task_logger(__name__)
+
+
+@shared_task(ignore_result=True)
+def scan_overtime(company_ids: list[int] | None = None, day: str | None = None) -> dict:
+    """
+    Record overtime findings for one day.
+
+    Queued by dispatch_local_schedules shortly after each company's local
+    midnight (OVERTIME_SCAN_LOCAL_HOUR).
+
+    Args:
+        company_ids: Only scan these companies (default: all)
+        day: ISO date to scan (default: each company's previous local day)
+
+    Returns:
+        Dict with scanned company and finding counts
+    """
+    from apps.companies.models import Company
+    from apps.reports.services import OvertimeService
+
+    now = timezone.now()
+    stats = {'companies': 0, 'findings': 0, 'failed': 0}
+
+    companies = Company.objects.select_related('settings').order_by('pk')
+    if company_ids is not None:
+        companies = companies.filter(pk__in=company_ids)
+
+    by_date: dict[date, list] = {}
+    for company in companies:
+        scan_date = date.fromisoformat(day) if day else now.astimezone(company.tzinfo).date() - timedelta(days=1)
+        by_date.setdefault(scan_date, []).append(company)
+
+    for scan_date, day_companies in by_date.items():
+        # One pass over the day's entries for every company scanning it
+        threshold = min(OvertimeService.get_threshold(company) for company in day_companies)
+        try:
+            overtime = OvertimeService.get_overtime_by_company(scan_date, threshold)
+        except Exception as e:
+            logger.error(f"Overtime totals failed for {scan_date}: {e}")
+            stats['failed'] += len(day_companies)
+            continue
+        for company in day_companies:
+            try:
+                stats['findings'] += OvertimeService.scan_day(company, scan_date, overtime)
+                stats['companies'] += 1
+            except Exception as e:
+                logger.error(f"Overtime scan failed for company {company.id} on {scan_date}: {e}")
+                stats['failed'] += 1
+
+    logger.info(
+        f"Overtime scan: companies={stats['companies']}, "
+        f"findings={stats['findings']}, failed={stats['failed']}"
+    )
+    return stats
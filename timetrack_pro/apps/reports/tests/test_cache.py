@@ -0,0 +1,108 @@
+"""
+Tests for the versioned report response cache.
+"""
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+
+from apps.timeentries.models import TimeEntry
+from apps.timesheets.models import Timesheet
+
+
+@pytest.fixture
+def approved_timesheet(user, timesheet_factory):
+    return timesheet_factory(user=user, status=Timesheet.Status.APPROVED)
+
+
+def add_entry(user, project, timesheet, hours):
+    return TimeEntry.objects.create(
+        user=user, project=project, timesheet=timesheet, date=date.today(),
+        hours=Decimal(hours), billing_rate=Decimal('100.00'),
+        rate_source=TimeEntry.RateSource.PROJECT,
+    )
+
+
+@pytest.mark.django_db
+class TestReportCache:
+    """Tests for cached_report on the report views."""
+
+    def test_repeat_request_served_from_cache(
+        self, authenticated_admin_client, user, project, approved_timesheet
+    ):
+        """
+        Given: A report request has been made
+        When: Repeating it with no intervening writes
+        Then: The same data is returned with fewer queries
+        """
+        add_entry(user, project, approved_timesheet, '8.00')
+        url = '/api/v1/reports/hours/summary/?group_by=user'
+
+        with CaptureQueriesContext(connection) as first_queries:
+            first = authenticated_admin_client.get(url)
+        with CaptureQueriesContext(connection) as second_queries:
+            second = authenticated_admin_client.get(url)
+
+        assert second.status_code == status.HTTP_200_OK
+        assert second.data == first.data
+        assert len(second_queries) < len(first_queries)
+
+    def test_time_entry_write_invalidates(
+        self, authenticated_admin_client, user, project, approved_timesheet
+    ):
+        """
+        Given: A cached hours summary
+        When: A new time entry is saved
+        Then: The next request reflects it
+        """
+        add_entry(user, project, approved_timesheet, '8.00')
+        authenticated_admin_client.get('/api/v1/reports/hours/summary/')
+
+        add_entry(user, project, approved_timesheet, '2.00')
+        response = authenticated_admin_client.get('/api/v1/reports/hours/summary/')
+
+        assert Decimal(response.data['total_hours']) == Decimal('10.00')
+
+    def test_timesheet_state_change_invalidates(self, authenticated_admin_client, approved_timesheet):
+        """
+        Given: Cached approval metrics
+        When: A timesheet changes status
+        Then: The next request reflects it
+        """
+        authenticated_admin_client.get('/api/v1/reports/approval/metrics/')
+
+        approved_timesheet.status = Timesheet.Status.REJECTED
+        approved_timesheet.save()
+        response = authenticated_admin_client.get('/api/v1/reports/approval/metrics/')
+
+        assert response.data['rejected_count'] == 1
+
+    def test_param_order_is_normalized(self, admin):
+        """Equivalent query strings map to the same cache key."""
+        from django.http import QueryDict
+
+        from apps.reports.cache import get_cache_key
+
+        a = QueryDict('group_by=user,project&start_date=2026-01-01')
+        b = QueryDict('start_date=2026-01-01&group_by=project,user')
+
+        assert get_cache_key('hours_summary', admin, a, 1) == get_cache_key('hours_summary', admin, b, 1)
+
+    def test_manager_and_admin_scopes_are_separate(self, admin, manager):
+        """Managers never receive an admin's company-wide cached report."""
+        from django.http import QueryDict
+
+        from apps.reports.cache import get_cache_key
+
+        params = QueryDict('')
+
+        assert get_cache_key('utilization', admin, params, 1) != get_cache_key('utilization', manager, params, 1)
+
+    def test_forbidden_responses_not_cached(self, authenticated_client):
+        """Employees still get 403 and nothing is cached for them."""
+        response = authenticated_client.get('/api/v1/reports/hours/summary/')
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
@@ -0,0 +1,173 @@
+"""
+Tests for the nightly overtime scan and GET /api/v1/reports/overtime/.
+"""
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+import pytz
+from django.utils import timezone
+from rest_framework import status
+
+from apps.reports.models import OvertimeFinding
+
+DAY = date(2024, 6, 12)
+
+
+@pytest.mark.django_db
+class TestOvertimeScan:
+    """Tests for OvertimeService.scan_day / scan_overtime."""
+
+    def test_flags_days_over_threshold(
+        self, company, company_factory, user_factory, time_entry_factory, django_assert_num_queries,
+    ):
+        """
+        Given: A threshold of 8h; users logging 9h, exactly 8h and 9h on another day, and 10h in another company
+        When: The day is scanned
+        Then: Only the company's user over the threshold that day is recorded, from one grouped query
+        """
+        from apps.reports.services import OvertimeService
+
+        company.settings.daily_warning_threshold = 8
+        company.settings.save()
+        over, exact = user_factory(), user_factory()
+        for hours in ('5.00', '4.00'):
+            time_entry_factory(user=over, date=DAY, hours=Decimal(hours))
+        time_entry_factory(user=exact, date=DAY, hours=Decimal('8.00'))
+        time_entry_factory(user=exact, date=DAY - timedelta(days=1), hours=Decimal('9.00'))
+        time_entry_factory(user=user_factory(company=company_factory()), date=DAY, hours=Decimal('10.00'))
+
+        # Grouped totals, their users' companies, then delete + insert inside a savepoint
+        with django_assert_num_queries(6):
+            assert OvertimeService.scan_day(company, DAY) == 1
+
+        finding = OvertimeFinding.objects.get()
+        assert (finding.user, finding.date, finding.hours, finding.threshold) == (over, DAY, Decimal('9.00'), 8)
+
+    def test_rescan_replaces_findings(self, company, user, time_entry_factory):
+        """
+        Given: A scanned day whose entries were then reduced under the threshold
+        When: The day is scanned again
+        Then: The stale finding is removed
+        """
+        from apps.reports.services import OvertimeService
+
+        entry = time_entry_factory(user=user, date=DAY, hours=Decimal('10.00'))
+        OvertimeService.scan_day(company, DAY)
+        entry.hours = Decimal('6.00')
+        entry.save()
+
+        assert OvertimeService.scan_day(company, DAY) == 0
+        assert not OvertimeFinding.objects.exists()
+
+    def test_task_scans_previous_local_day(self, company_factory, user_factory, time_entry_factory):
+        """
+        Given: A company in Tokyo, where it is already June 13 at 20:00 UTC on June 12
+        When: scan_overtime runs without a day
+        Then: June 12 (its previous local day) is scanned
+        """
+        from apps.reports.tasks import scan_overtime
+
+        company = company_factory(timezone='Asia/Tokyo')
+        time_entry_factory(user=user_factory(company=company), date=DAY, hours=Decimal('12.00'))
+        now = pytz.UTC.localize(timezone.datetime(2024, 6, 12, 20, 0))
+
+        with patch('apps.reports.tasks.timezone.now', return_value=now):
+            result = scan_overtime(company_ids=[company.id])
+
+        assert result == {'companies': 1, 'findings': 1, 'failed': 0}
+        assert OvertimeFinding.objects.get().date == DAY
+
+    def test_task_reads_each_day_once_for_all_companies(self, company_factory, user_factory, time_entry_factory):
+        """
+        Given: Two companies with thresholds of 8h and 10h, each with a user logging 9h
+        When: scan_overtime runs for both on one day
+        Then: The day's totals are read once and each company applies its own threshold
+        """
+        from apps.reports.services import OvertimeService
+        from apps.reports.tasks import scan_overtime
+
+        companies = [company_factory(), company_factory()]
+        for company, threshold in zip(companies, (8, 10), strict=True):
+            company.settings.daily_warning_threshold = threshold
+            company.settings.save()
+            time_entry_factory(user=user_factory(company=company), date=DAY, hours=Decimal('9.00'))
+
+        with patch(
+            'apps.reports.services.OvertimeService.get_daily_totals_over',
+            wraps=OvertimeService.get_daily_totals_over,
+        ) as totals:
+            result = scan_overtime(company_ids=[c.id for c in companies], day=DAY.isoformat())
+
+        totals.assert_called_once_with(DAY, 8)
+        assert result == {'companies': 2, 'findings': 1, 'failed': 0}
+        assert OvertimeFinding.objects.get().company == companies[0]
+
+    def test_dispatcher_queues_scan_after_local_midnight(self, settings, company_factory):
+        """
+        Given: OVERTIME_SCAN_LOCAL_HOUR = 1 and a UTC company
+        When: The local scheduler runs at 01:05 on June 13
+        Then: A scan of June 12 is queued for the company
+        """
+        from apps.timesheets.tasks import dispatch_local_schedules
+
+        settings.OVERTIME_SCAN_LOCAL_HOUR = 1
+        company = company_factory(timezone='UTC')
+        now = pytz.UTC.localize(timezone.datetime(2024, 6, 13, 1, 5))
+
+        with patch('apps.timesheets.tasks.timezone.now', return_value=now), \
+                patch('apps.reports.tasks.scan_overtime.delay') as scan:
+            result = dispatch_local_schedules()
+
+        scan.assert_called_once_with(company_ids=[company.id], day='2024-06-12')
+        assert result['scan_overtime'] == [company.id]
+
+
+@pytest.mark.django_db
+class TestOvertimeReportEndpoint:
+    """Tests for GET /api/v1/reports/overtime/"""
+
+    def _finding(self, user, day=DAY, hours='10.00'):
+        return OvertimeFinding.objects.create(
+            company=user.company, user=user, date=day, hours=Decimal(hours), threshold=8,
+        )
+
+    def test_admin_sees_company_findings(self, authenticated_admin_client, user, company_factory, user_factory):
+        """
+        Given: Findings in the admin's company and another company
+        When: GET /reports/overtime/
+        Then: Only the own company's findings are returned, with the excess
+        """
+        self._finding(user)
+        self._finding(user_factory(company=company_factory()))
+
+        response = authenticated_admin_client.get('/api/v1/reports/overtime/')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['finding_count'] == 1
+        assert response.data['findings'][0]['user_id'] == user.id
+        assert Decimal(response.data['findings'][0]['excess_hours']) == Decimal('2.00')
+
+    def test_manager_sees_only_reports_in_date_range(self, authenticated_manager_client, manager, user, user_factory):
+        """
+        Given: Findings for a direct report (two days) and an unrelated user
+        When: The manager filters by date
+        Then: Only the direct report's finding in range is returned
+        """
+        self._finding(user)
+        self._finding(user, day=DAY - timedelta(days=7))
+        self._finding(user_factory())
+
+        response = authenticated_manager_client.get(
+            '/api/v1/reports/overtime/', {'start_date': str(DAY), 'end_date': str(DAY)},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [f['user_id'] for f in response.data['findings']] == [user.id]
+
+    def test_employee_cannot_view(self, authenticated_client):
+        """Employees get 403."""
+        response = authenticated_client.get('/api/v1/reports/overtime/')
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
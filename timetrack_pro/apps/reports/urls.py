@@ -6,6 +6,7 @@ from django.urls import path
 from apps.reports.views import (
     ApprovalMetricsView,
     HoursSummaryView,
+    OvertimeReportView,
     UtilizationReportView,
 )
 
@@ -13,4 +14,5 @@ urlpatterns = [
     path('hours/summary/', HoursSummaryView.as_view(), name='hours_summary'),
     path('approval/metrics/', ApprovalMetricsView.as_view(), name='approval_metrics'),
     path('utilization/', UtilizationReportView.as_view(), name='utilization'),
+    path('overtime/', OvertimeReportView.as_view(), name='overtime'),
 ]
@@ -1,7 +1,7 @@
 """
 Views for Reporting/Analytics API.
 """
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
 from decimal import Decimal
 
 from django.db.models import Sum, Count, Q
@@ -10,16 +10,27 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from apps.infrastructure.replicas import replica_reads
+from apps.reports.cache import cached_report
+from apps.reports.models import OvertimeFinding
 from apps.timeentries.models import TimeEntry
-from apps.timesheets.models import Timesheet
+from apps.timesheets.models import Timesheet, TimesheetArchive
 from apps.users.models import User
 
 
 class HoursSummaryView(APIView):
-    """GET /api/v1/reports/hours/summary/"""
+    """
+    GET /api/v1/reports/hours/summary/
+
+    Archived timesheets (ArchiveService) have left the time entry table, so
+    total_hours excludes them; archived_hours sums the archived weeks that
+    overlap the range, which callers must add for complete totals.
+    """
 
     permission_classes = [IsAuthenticated]
 
+    @cached_report('hours_summary')
+    @replica_reads
     def get(self, request):
         if not request.user.is_manager:
             return Response(
@@ -41,17 +52,27 @@ class HoursSummaryView(APIView):
         if end_date:
             queryset = queryset.filter(date__lte=end_date)
 
+        archives = TimesheetArchive.objects.filter(user__company=request.user.company)
+        if start_date:
+            archives = archives.filter(week_start__gt=date.fromisoformat(start_date) - timedelta(days=7))
+        if end_date:
+            archives = archives.filter(week_start__lte=end_date)
+
         if not request.user.is_admin:
             managed_users = User.objects.filter(manager=request.user)
             queryset = queryset.filter(
                 Q(user__in=managed_users) | Q(user=request.user)
             )
+            archives = archives.filter(Q(user__in=managed_users) | Q(user=request.user))
 
         total_hours = queryset.aggregate(total=Sum('hours'))['total'] or Decimal('0.00')
+        archived = archives.aggregate(hours=Sum('total_hours'), count=Count('pk'))
 
         response_data = {
             'total_hours': str(total_hours),
             'entry_count': queryset.count(),
+            'archived_hours': str(archived['hours'] or Decimal('0.00')),
+            'archived_timesheet_count': archived['count'],
         }
 
         group_by_fields = [g.strip() for g in group_by.split(',')] if group_by else []
@@ -91,6 +112,8 @@ class ApprovalMetricsView(APIView):
 
     permission_classes = [IsAuthenticated]
 
+    @cached_report('approval_metrics')
+    @replica_reads
     def get(self, request):
         if not request.user.is_manager:
             return Response(
@@ -138,6 +161,8 @@ class UtilizationReportView(APIView):
 
     permission_classes = [IsAuthenticated]
 
+    @cached_report('utilization')
+    @replica_reads
     def get(self, request):
         if not request.user.is_manager:
             return Response(
@@ -199,3 +224,57 @@ class UtilizationReportView(APIView):
             'utilization_data': utilization_data,
             'expected_weekly_hours': str(expected_weekly_hours),
         })
+
+
+class OvertimeReportView(APIView):
+    """GET /api/v1/reports/overtime/"""
+
+    permission_classes = [IsAuthenticated]
+
+    @cached_report('overtime')
+    @replica_reads
+    def get(self, request):
+        if not request.user.is_manager:
+            return Response(
+                {'detail': 'Only managers and admins can view reports.'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        queryset = OvertimeFinding.objects.filter(
+            company=request.user.company,
+        ).select_related('user')
+
+        user_id = request.query_params.get('user_id')
+        start_date = request.query_params.get('start_date')
+        end_date = request.query_params.get('end_date')
+
+        if user_id:
+            queryset = queryset.filter(user_id=user_id)
+        if start_date:
+            queryset = queryset.filter(date__gte=start_date)
+        if end_date:
+            queryset = queryset.filter(date__lte=end_date)
+
+        if not request.user.is_admin:
+            managed_users = User.objects.filter(manager=request.user)
+            queryset = queryset.filter(
+                Q(user__in=managed_users) | Q(user=request.user)
+            )
+
+        findings = [
+            {
+                'user_id': finding.user_id,
+                'email': finding.user.email,
+                'name': f"{finding.user.first_name} {finding.user.last_name}".strip(),
+                'date': str(finding.date),
+                'hours': str(finding.hours),
+                'threshold': finding.threshold,
+                'excess_hours': str(finding.hours - finding.threshold),
+            }
+            for finding in queryset
+        ]
+
+        return Response({
+            'findings': findings,
+            'finding_count': len(findings),
+        })
@@ -6,3 +6,10 @@ class TimeentriesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.timeentries'
     verbose_name = 'Time Entries'
+
+    def ready(self):
+        from django.db.models.signals import post_delete
+
+        from apps.timeentries.services import record_tombstone
+
+        post_delete.connect(record_tombstone, sender='timeentries.TimeEntry')
@@ -0,0 +1,61 @@
+"""
+Convert the TimeEntry table to date range partitioning.
+
+Usage:
+    python manage.py partition_time_entries
+    python manage.py partition_time_entries --check
+"""
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.timeentries import partitioning
+from apps.timeentries.models import TimeEntry
+
+
+class Command(BaseCommand):
+    help = 'Convert the time entry table to range partitions by date (month or quarter).'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--ahead', type=int, default=None,
+            help='Future partitions to create (default TIME_ENTRY_PARTITIONS_AHEAD).',
+        )
+        parser.add_argument(
+            '--check', action='store_true',
+            help='Only report partitions and whether a date-bounded query prunes.',
+        )
+
+    def handle(self, *args, ahead=None, check=False, **options):
+        today = timezone.localdate()
+
+        if check:
+            self.report(today)
+            return
+
+        if partitioning.is_partitioned():
+            raise CommandError('Time entries are already partitioned; nothing to convert.')
+
+        created = partitioning.convert_to_partitioned(today, ahead)
+        self.stdout.write(self.style.SUCCESS(
+            f'Partitioned {TimeEntry._meta.db_table} into {len(created)} partitions.'
+        ))
+        self.report(today)
+
+    def report(self, today):
+        if not partitioning.is_partitioned():
+            self.stdout.write('Time entries are not partitioned.')
+            return
+
+        partitions = sorted(partitioning.existing_partitions())
+        self.stdout.write(f'{len(partitions)} partitions: {", ".join(partitions)}')
+
+        week_start = today - timedelta(days=today.weekday())
+        scanned = partitioning.scanned_partitions(
+            TimeEntry.objects.filter(date__gte=week_start, date__lte=week_start + timedelta(days=6))
+        )
+        if len(scanned) < len(partitions):
+            self.stdout.write(self.style.SUCCESS(f'Current-week query scans: {", ".join(sorted(scanned))}'))
+        else:
+            self.stdout.write(self.style.WARNING('Current-week query scans every partition (no pruning).'))
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.10 on 2026-10-19 09:00
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('timeentries', '0004_remove_timeentry_is_timer_entry_and_more'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='timeentry',
+            index=models.Index(fields=['user', 'date'], name='timeentry_user_date_idx'),
+        ),
+    ]
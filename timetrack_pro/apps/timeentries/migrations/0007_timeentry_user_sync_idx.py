@@ -0,0 +1,24 @@
+# Generated by Django 5.2.10 on 2026-10-19 10:00
+
+from django.db import migrations, models
+
+from apps.timeentries.operations import AddIndexConcurrentlyPartitioned
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction. The table may
+    # already be partitioned (partition_time_entries), hence the
+    # partition-aware operation.
+    atomic = False
+
+    dependencies = [
+        ('timeentries', '0006_timeentrytombstone'),
+    ]
+
+    operations = [
+        AddIndexConcurrentlyPartitioned(
+            model_name='timeentry',
+            index=models.Index(fields=['user', 'updated_at', 'id'], name='timeentry_user_sync_idx'),
+        ),
+    ]
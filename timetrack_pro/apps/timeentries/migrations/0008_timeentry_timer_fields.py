@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('timeentries', '0007_timeentry_user_sync_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='timeentry',
+            name='is_timer_entry',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='timeentry',
+            name='timer_started_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='timeentry',
+            name='timer_stopped_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
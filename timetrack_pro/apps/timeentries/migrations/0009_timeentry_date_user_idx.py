@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:00
+
+from django.db import migrations, models
+
+from apps.timeentries.operations import AddIndexConcurrentlyPartitioned
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction. The table may
+    # already be partitioned (partition_time_entries), hence the
+    # partition-aware operation.
+    atomic = False
+
+    dependencies = [
+        ('timeentries', '0008_timeentry_timer_fields'),
+    ]
+
+    operations = [
+        AddIndexConcurrentlyPartitioned(
+            model_name='timeentry',
+            index=models.Index(fields=['date', 'user'], name='timeentry_date_user_idx'),
+        ),
+    ]
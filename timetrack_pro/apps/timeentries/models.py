@@ -56,9 +56,22 @@ class TimeEntry(TimeStampedModel):
         help_text='Where the billing rate was resolved from',
     )
 
+    # Set on entries materialized from a stopped timer (TimerService)
+    is_timer_entry = models.BooleanField(default=False)
+    timer_started_at = models.DateTimeField(null=True, blank=True)
+    timer_stopped_at = models.DateTimeField(null=True, blank=True)
+
     class Meta:
         ordering = ['-date', '-created_at']
         verbose_name_plural = 'time entries'
+        indexes = [
+            # Daily hour limit check and per-day lookups
+            models.Index(fields=['user', 'date'], name='timeentry_user_date_idx'),
+            # Nightly overtime scan: all entries for one day
+            models.Index(fields=['date', 'user'], name='timeentry_date_user_idx'),
+            # Delta sync keyset: (updated_at, id) per user
+            models.Index(fields=['user', 'updated_at', 'id'], name='timeentry_user_sync_idx'),
+        ]
 
     def __str__(self) -> str:
         return f'{self.user.email} - {self.project.name} - {self.date}'
@@ -66,3 +79,28 @@ class TimeEntry(TimeStampedModel):
     @property
     def billable_amount(self) -> Decimal:
         return self.hours * self.billing_rate
+
+
+class TimeEntryTombstone(models.Model):
+    """
+    Record of a deleted time entry, for delta sync clients.
+
+    Purged after TIME_ENTRY_TOMBSTONE_RETENTION_DAYS; clients whose cursor
+    is older than that must resync from scratch.
+    """
+
+    entry_id = models.BigIntegerField()
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='time_entry_tombstones',
+    )
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'deleted_at', 'id'], name='tombstone_user_sync_idx'),
+        ]
+
+    def __str__(self) -> str:
+        return f'Deleted entry {self.entry_id}'
@@ -0,0 +1,98 @@
+"""
+Migration operations for the time entry table.
+
+The table may have been converted to range partitions
+(apps.timeentries.partitioning) before a later migration runs, and Postgres
+can't CREATE INDEX CONCURRENTLY on a partitioned table. Index migrations use
+AddIndexConcurrentlyPartitioned instead of AddIndexConcurrently: on a plain
+table it is the same operation; on a partitioned one it creates the index
+ON ONLY the parent (invalid, no rows locked), builds a matching index
+concurrently on each partition and attaches it. The parent index becomes
+valid once every partition's index is attached, and partitions created
+later get it automatically.
+
+This module must not import models: migrations import it.
+"""
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db.backends.utils import names_digest
+
+
+def is_partitioned_table(connection, table: str) -> bool:
+    """Whether a table is a partitioned (parent) table."""
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT relkind = 'p' FROM pg_class WHERE oid = to_regclass(%s)", [table])
+        row = cursor.fetchone()
+    return bool(row and row[0])
+
+
+def partitions_of(connection, table: str) -> list[str]:
+    """Names of the partitions attached to a table."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT child.relname FROM pg_inherits '
+            'JOIN pg_class child ON child.oid = pg_inherits.inhrelid '
+            'WHERE pg_inherits.inhparent = to_regclass(%s) ORDER BY child.relname',
+            [table],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def partition_index_name(index_name: str, partition: str) -> str:
+    """Name for a partition's copy of an index, unique per partition and within 63 bytes."""
+    return f'{index_name[:50]}_{names_digest(partition, length=8)}'
+
+
+def create_partitioned_index(schema_editor, model, index, concurrently: bool = True) -> None:
+    """
+    Create an index on a partitioned table without locking it against writes.
+
+    Safe to re-run after an interruption: every step is IF NOT EXISTS, and
+    a partition whose index is already attached is skipped.
+    """
+    connection = schema_editor.connection
+    qn = schema_editor.quote_name
+    table = model._meta.db_table
+    columns = ', '.join(
+        f'{qn(model._meta.get_field(field_name).column)} {order}'.strip()
+        for field_name, order in index.fields_orders
+    )
+    concurrent = 'CONCURRENTLY ' if concurrently else ''
+
+    schema_editor.execute(f'CREATE INDEX IF NOT EXISTS {qn(index.name)} ON ONLY {qn(table)} ({columns})')
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT child.relname FROM pg_inherits '
+            'JOIN pg_class child ON child.oid = pg_inherits.inhrelid '
+            'WHERE pg_inherits.inhparent = to_regclass(%s)',
+            [index.name],
+        )
+        attached = {row[0] for row in cursor.fetchall()}
+
+    for partition in partitions_of(connection, table):
+        name = partition_index_name(index.name, partition)
+        if name in attached:
+            continue
+        schema_editor.execute(f'CREATE INDEX {concurrent}IF NOT EXISTS {qn(name)} ON {qn(partition)} ({columns})')
+        schema_editor.execute(f'ALTER INDEX {qn(index.name)} ATTACH PARTITION {qn(name)}')
+
+
+class AddIndexConcurrentlyPartitioned(AddIndexConcurrently):
+    """AddIndexConcurrently that also works once the table is partitioned."""
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if not self.allow_migrate_model(schema_editor.connection.alias, model):
+            return
+        if not is_partitioned_table(schema_editor.connection, model._meta.db_table):
+            return super().database_forwards(app_label, schema_editor, from_state, to_state)
+        self._ensure_not_in_transaction(schema_editor)
+        create_partitioned_index(schema_editor, model, self.index)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        model = from_state.apps.get_model(app_label, self.model_name)
+        if not self.allow_migrate_model(schema_editor.connection.alias, model):
+            return
+        if not is_partitioned_table(schema_editor.connection, model._meta.db_table):
+            return super().database_backwards(app_label, schema_editor, from_state, to_state)
+        # Partitioned indexes can't be dropped concurrently; this drops every partition's copy too
+        schema_editor.execute(f'DROP INDEX IF EXISTS {schema_editor.quote_name(self.index.name)}')
@@ -0,0 +1,269 @@
+"""
+Range partitioning of the TimeEntry table by date.
+
+Every time entry query filters on ``date``, so a table partitioned by month
+(or quarter) lets Postgres prune to the partitions a query can touch. Each
+partition is vacuumed and indexed on its own, so maintenance cost tracks the
+recent, hot partitions rather than the whole history, and old partitions can
+later be detached or archived without a bulk DELETE.
+
+Partitioning is opt-in. ``manage.py partition_time_entries`` converts an
+existing unpartitioned table; once converted, the
+``ensure_time_entry_partitions`` task keeps partitions created ahead of time.
+A DEFAULT partition catches dates outside the created range so inserts never
+fail. Index migrations on the table use AddIndexConcurrentlyPartitioned
+(apps.timeentries.operations), since the table may be converted before
+they run.
+
+Postgres requires the partition key in every unique constraint, so the
+primary key becomes (id, date) and the database-level foreign key from
+TimesheetComment.entry is dropped. Django still enforces on_delete=CASCADE
+for that relation in the ORM.
+
+Settings:
+    TIME_ENTRY_PARTITION_INTERVAL: 'month' or 'quarter' (default 'month')
+    TIME_ENTRY_PARTITIONS_AHEAD: Future partitions to keep created (default 3)
+"""
+import re
+from dataclasses import dataclass
+from datetime import date
+
+from django.conf import settings
+from django.db import connection, transaction
+
+from apps.timeentries.models import TimeEntry
+
+INTERVALS = {'month': 1, 'quarter': 3}
+
+
+@dataclass(frozen=True)
+class PartitionRange:
+    """One partition's bounds: start inclusive, end exclusive."""
+
+    start: date
+    end: date
+    interval: str
+
+    @property
+    def name(self) -> str:
+        table = TimeEntry._meta.db_table
+        if self.interval == 'quarter':
+            return f'{table}_p{self.start.year}_q{(self.start.month - 1) // 3 + 1}'
+        return f'{table}_p{self.start.year}_{self.start.month:02d}'
+
+
+def get_interval() -> str:
+    interval = getattr(settings, 'TIME_ENTRY_PARTITION_INTERVAL', 'month')
+    if interval not in INTERVALS:
+        raise ValueError(f'TIME_ENTRY_PARTITION_INTERVAL must be one of {list(INTERVALS)}')
+    return interval
+
+
+def _add_months(d: date, months: int) -> date:
+    month_index = d.year * 12 + d.month - 1 + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def partition_for(d: date, interval: str) -> PartitionRange:
+    """Get the partition range containing a date."""
+    months = INTERVALS[interval]
+    start = date(d.year, (d.month - 1) // months * months + 1, 1)
+    return PartitionRange(start, _add_months(start, months), interval)
+
+
+def partitions_between(first: date, last: date, interval: str) -> list[PartitionRange]:
+    """Get the partition ranges covering first..last (inclusive)."""
+    ranges = []
+    current = partition_for(first, interval)
+    while current.start <= last:
+        ranges.append(current)
+        current = partition_for(current.end, interval)
+    return ranges
+
+
+def is_partitioned() -> bool:
+    """Whether the TimeEntry table is a partitioned table."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT c.relkind = 'p' FROM pg_class c "
+            "WHERE c.oid = to_regclass(%s)",
+            [TimeEntry._meta.db_table],
+        )
+        row = cursor.fetchone()
+    return bool(row and row[0])
+
+
+def existing_partitions() -> set[str]:
+    """Names of the partitions currently attached to the TimeEntry table."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT child.relname FROM pg_inherits '
+            'JOIN pg_class child ON child.oid = pg_inherits.inhrelid '
+            'WHERE pg_inherits.inhparent = to_regclass(%s)',
+            [TimeEntry._meta.db_table],
+        )
+        return {row[0] for row in cursor.fetchall()}
+
+
+def _default_partition_name() -> str:
+    return f'{TimeEntry._meta.db_table}_default'
+
+
+def create_partition(partition: PartitionRange) -> None:
+    """
+    Create and attach one partition.
+
+    Rows already sitting in the DEFAULT partition for this range are moved
+    into the new partition first, since Postgres refuses to attach a range
+    that overlaps rows in the default.
+    """
+    qn = connection.ops.quote_name
+    table = qn(TimeEntry._meta.db_table)
+    default = qn(_default_partition_name())
+    name = qn(partition.name)
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f'CREATE TABLE {name} (LIKE {table} INCLUDING DEFAULTS)')
+        if _default_partition_name() in existing_partitions():
+            cursor.execute(
+                f'WITH moved AS (DELETE FROM {default} WHERE date >= %s AND date < %s RETURNING *) '
+                f'INSERT INTO {name} SELECT * FROM moved',
+                [partition.start, partition.end],
+            )
+        cursor.execute(
+            f'ALTER TABLE {table} ATTACH PARTITION {name} FOR VALUES FROM (%s) TO (%s)',
+            [partition.start, partition.end],
+        )
+
+
+def ensure_partitions(today: date, ahead: int | None = None) -> list[str]:
+    """
+    Create any missing partitions from today's through `ahead` intervals out.
+
+    Args:
+        today: Reference date
+        ahead: Number of future partitions (default TIME_ENTRY_PARTITIONS_AHEAD)
+
+    Returns:
+        Names of the partitions created
+    """
+    interval = get_interval()
+    if ahead is None:
+        ahead = getattr(settings, 'TIME_ENTRY_PARTITIONS_AHEAD', 3)
+
+    current = partition_for(today, interval)
+    last = _add_months(current.start, INTERVALS[interval] * ahead)
+    existing = existing_partitions()
+
+    created = []
+    for partition in partitions_between(current.start, last, interval):
+        if partition.name not in existing:
+            create_partition(partition)
+            created.append(partition.name)
+    return created
+
+
+def _table_definitions(cursor, table: str) -> tuple[list[str], list[tuple[str, str]]]:
+    """Index and foreign key DDL for a table, excluding the primary key."""
+    cursor.execute(
+        'SELECT indexdef FROM pg_indexes i '
+        'JOIN pg_class c ON c.relname = i.indexname '
+        'JOIN pg_index x ON x.indexrelid = c.oid '
+        'WHERE i.tablename = %s AND NOT x.indisprimary',
+        [table],
+    )
+    indexes = [row[0] for row in cursor.fetchall()]
+    cursor.execute(
+        'SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint '
+        "WHERE conrelid = to_regclass(%s) AND contype = 'f'",
+        [table],
+    )
+    foreign_keys = cursor.fetchall()
+    return indexes, foreign_keys
+
+
+def _referencing_foreign_keys(cursor, table: str) -> list[tuple[str, str]]:
+    """(table, constraint) pairs for foreign keys pointing at a table."""
+    cursor.execute(
+        'SELECT conrelid::regclass::text, conname FROM pg_constraint '
+        "WHERE confrelid = to_regclass(%s) AND contype = 'f'",
+        [table],
+    )
+    return cursor.fetchall()
+
+
+def convert_to_partitioned(today: date, ahead: int | None = None) -> list[str]:
+    """
+    Convert the unpartitioned TimeEntry table into a range-partitioned one.
+
+    Runs in a single transaction holding an exclusive lock for the duration
+    of the copy, so schedule it in a maintenance window on large tables.
+
+    Args:
+        today: Reference date for creating future partitions
+        ahead: Number of future partitions (default TIME_ENTRY_PARTITIONS_AHEAD)
+
+    Returns:
+        Names of the partitions created
+    """
+    if is_partitioned():
+        raise RuntimeError(f'{TimeEntry._meta.db_table} is already partitioned.')
+
+    interval = get_interval()
+    qn = connection.ops.quote_name
+    table = TimeEntry._meta.db_table
+    old_table = f'{table}_unpartitioned'
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        # Flush deferred FK checks; ALTER TABLE refuses pending trigger events
+        cursor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+        cursor.execute(f'LOCK TABLE {qn(table)} IN ACCESS EXCLUSIVE MODE')
+        indexes, foreign_keys = _table_definitions(cursor, table)
+        for referencing_table, constraint in _referencing_foreign_keys(cursor, table):
+            cursor.execute(f'ALTER TABLE {qn(referencing_table)} DROP CONSTRAINT {qn(constraint)}')
+
+        cursor.execute(f'SELECT min(date) FROM {qn(table)}')
+        first = cursor.fetchone()[0] or today
+
+        cursor.execute(f'ALTER TABLE {qn(table)} RENAME TO {qn(old_table)}')
+        cursor.execute(
+            f'CREATE TABLE {qn(table)} (LIKE {qn(old_table)} INCLUDING DEFAULTS INCLUDING IDENTITY) '
+            'PARTITION BY RANGE (date)'
+        )
+        cursor.execute(f'CREATE TABLE {qn(_default_partition_name())} PARTITION OF {qn(table)} DEFAULT')
+
+        created = []
+        for partition in partitions_between(first, today, interval):
+            create_partition(partition)
+            created.append(partition.name)
+        created += ensure_partitions(today, ahead)
+
+        cursor.execute(f'INSERT INTO {qn(table)} OVERRIDING SYSTEM VALUE SELECT * FROM {qn(old_table)}')
+        cursor.execute(
+            "SELECT setval(pg_get_serial_sequence(%s, 'id'), "
+            f'(SELECT coalesce(max(id), 0) + 1 FROM {qn(table)}), false)',
+            [table],
+        )
+        cursor.execute(f'DROP TABLE {qn(old_table)}')
+
+        # Index and constraint names were freed by the drop; recreate them on
+        # the parent so they cascade to every partition. The captured DDL
+        # still names the original table, which is now the partitioned one.
+        cursor.execute(f'ALTER TABLE {qn(table)} ADD PRIMARY KEY (id, date)')
+        for indexdef in indexes:
+            cursor.execute(indexdef)
+        for constraint, definition in foreign_keys:
+            cursor.execute(f'ALTER TABLE {qn(table)} ADD CONSTRAINT {qn(constraint)} {definition}')
+
+    return created
+
+
+def scanned_partitions(queryset) -> set[str]:
+    """
+    Partitions a TimeEntry queryset would scan, from its EXPLAIN plan.
+
+    Used to check that date-bounded queries prune partitions.
+    """
+    plan = queryset.explain()
+    pattern = rf'\bon ({re.escape(TimeEntry._meta.db_table)}_(?:p\d{{4}}_(?:\d{{2}}|q\d)|default))\b'
+    return set(re.findall(pattern, plan))
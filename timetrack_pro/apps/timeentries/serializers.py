@@ -7,9 +7,11 @@ from decimal import Decimal
 from django.db.models import Sum
 from rest_framework import serializers
 
+from apps.companies.context import get_user_tenant_context
 from apps.projects.models import Project
 from apps.rates.services import RateResolutionService
 from apps.timeentries.models import TimeEntry
+from core.serializers import ValuesSerializer
 
 
 def get_week_start(target_date: date, week_start_day: int = 0) -> date:
@@ -22,7 +24,7 @@ def get_or_create_timesheet(user, entry_date: date):
     """Get or create a timesheet for the given user and date."""
     from apps.timesheets.models import Timesheet
 
-    week_start_day = user.company.week_start_day if hasattr(user, 'company') and user.company else 0
+    week_start_day = get_user_tenant_context(user).week_start_day if user.company_id else 0
     week_start = get_week_start(entry_date, week_start_day)
 
     timesheet, _ = Timesheet.objects.get_or_create(
@@ -67,6 +69,9 @@ class TimeEntrySerializer(serializers.ModelSerializer):
             'description',
             'billing_rate',
             'rate_source',
+            'is_timer_entry',
+            'timer_started_at',
+            'timer_stopped_at',
             'created_at',
             'updated_at',
         ]
@@ -76,6 +81,9 @@ class TimeEntrySerializer(serializers.ModelSerializer):
             'project',
             'billing_rate',
             'rate_source',
+            'is_timer_entry',
+            'timer_started_at',
+            'timer_stopped_at',
             'created_at',
             'updated_at',
         ]
@@ -113,22 +121,67 @@ class TimeEntrySerializer(serializers.ModelSerializer):
         project = validated_data['project']
         entry_date = validated_data.get('date', date.today())
 
-        rate_result = RateResolutionService.resolve(
-            user=user,
-            project=project,
-            as_of_date=entry_date,
-        )
+        # Entries from a stopped timer arrive with the rate snapshotted at start
+        if 'billing_rate' not in validated_data:
+            rate_result = RateResolutionService.resolve(
+                user=user,
+                project=project,
+                as_of_date=entry_date,
+            )
+            validated_data['billing_rate'] = rate_result.rate
+            validated_data['rate_source'] = rate_result.source
 
         timesheet = get_or_create_timesheet(user, entry_date)
 
         validated_data['user'] = user
-        validated_data['billing_rate'] = rate_result.rate
-        validated_data['rate_source'] = rate_result.source
         validated_data['timesheet'] = timesheet
 
         return super().create(validated_data)
 
 
+# Fast path for TimeEntryViewSet.list
+time_entry_list_values = ValuesSerializer(TimeEntrySerializer)
+
+
+class TimerStartSerializer(serializers.Serializer):
+    """Serializer for starting a timer."""
+
+    project = serializers.PrimaryKeyRelatedField(queryset=Project.objects.all())
+    description = serializers.CharField(required=False, allow_blank=True, default='')
+
+
+class TimerStopSerializer(serializers.Serializer):
+    """Serializer for stopping a timer; the description replaces the one given at start."""
+
+    description = serializers.CharField(required=False, allow_blank=True)
+
+
+class ActiveTimerSerializer(serializers.Serializer):
+    """Read-only view of a running timer (apps.timeentries.services.ActiveTimer)."""
+
+    project = serializers.SerializerMethodField()
+    date = serializers.DateField()
+    description = serializers.CharField()
+    billing_rate = serializers.DecimalField(max_digits=10, decimal_places=2)
+    rate_source = serializers.CharField()
+    is_timer_entry = serializers.SerializerMethodField()
+    timer_started_at = serializers.DateTimeField(source='started_at')
+    timer_stopped_at = serializers.SerializerMethodField()
+    elapsed_hours = serializers.SerializerMethodField()
+
+    def get_project(self, timer) -> dict:
+        return {'id': timer.project_id, 'name': timer.project_name}
+
+    def get_is_timer_entry(self, timer) -> bool:
+        return True
+
+    def get_timer_stopped_at(self, timer) -> None:
+        return None
+
+    def get_elapsed_hours(self, timer) -> str:
+        return str(timer.elapsed_hours())
+
+
 class TimeEntryUpdateSerializer(serializers.ModelSerializer):
     """Serializer for updating TimeEntry (doesn't recalculate rate)."""
 
@@ -0,0 +1,354 @@
+"""
+Business logic services for TimeEntry.
+
+Services:
+- TimeEntrySyncService: Delta sync of a user's entries for offline clients
+- TimerService: Live timers held in the cache until stopped
+"""
+import base64
+import binascii
+import json
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, timedelta
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.db.models import Q, QuerySet, Sum
+from django.utils import timezone
+
+from apps.companies.context import get_user_tenant_context
+from apps.infrastructure.replicas import PRIMARY
+from apps.rates.services import RateResolutionService
+from apps.timeentries.models import TimeEntry, TimeEntryTombstone
+from apps.users.models import User
+
+
+class InvalidSyncCursor(Exception):
+    """Raised when a sync cursor cannot be decoded."""
+
+
+class SyncCursorExpired(Exception):
+    """Raised when a sync cursor predates the tombstone retention window."""
+
+
+@dataclass(frozen=True)
+class SyncPosition:
+    """Keyset position in one change stream: last (timestamp, id) seen."""
+
+    timestamp: datetime
+    id: int
+
+    def after(self, field: str) -> Q:
+        return Q(**{f'{field}__gt': self.timestamp}) | Q(**{field: self.timestamp, 'id__gt': self.id})
+
+
+@dataclass
+class SyncPage:
+    """One page of changes plus the cursor to resume from."""
+
+    entries: list[TimeEntry]
+    deleted: list[int]
+    cursor: str
+    has_more: bool
+
+
+# Start of the oldest client transaction open in this database, other than
+# our own. Background workers (autovacuum, replication) never write entries;
+# sessions idle in transaction for longer than the given seconds are
+# abandoned rather than about to commit.
+OLDEST_TRANSACTION_QUERY = (
+    'SELECT min(xact_start) FROM pg_stat_activity '
+    "WHERE datname = current_database() AND pid <> pg_backend_pid() AND backend_type = 'client backend' "
+    'AND xact_start IS NOT NULL '
+    "AND NOT (state = 'idle in transaction' AND state_change < clock_timestamp() - make_interval(secs => %s))"
+)
+
+
+class TimeEntrySyncService:
+    """
+    Service for delta sync of time entries.
+
+    Changes are read from two streams, entries ordered by (updated_at, id)
+    and tombstones ordered by (deleted_at, id), each seeking from the
+    client's last position on a (user, timestamp, id) index, so a sync costs
+    O(changes) rather than O(history).
+
+    The cursor must never move past a row that is still uncommitted, or
+    that row would later appear behind it and never be synced. Changes are
+    only returned up to a horizon held behind the oldest transaction still
+    open on the primary (see get_settled_before), so transactions of any
+    length are covered.
+    """
+
+    @classmethod
+    def get_page_size(cls) -> int:
+        return getattr(settings, 'TIME_ENTRY_SYNC_PAGE_SIZE', 500)
+
+    @classmethod
+    def get_settled_before(cls) -> datetime:
+        """
+        Sync horizon: no row at or before it can still be committed.
+
+        updated_at/deleted_at are set inside the writing transaction, so
+        never before it started. The horizon is the start of the oldest
+        other transaction open on the primary (or now), less
+        TIME_ENTRY_SYNC_SETTLE_SECONDS for clock skew between app servers
+        and the database. The database role must be able to see the other
+        app sessions in pg_stat_activity (the same role, or pg_read_all_stats).
+
+        One long transaction (a dump, a stuck session) would otherwise stall
+        sync for every client: sessions idle in transaction for over
+        TIME_ENTRY_SYNC_IDLE_TRANSACTION_SECONDS are ignored, and the horizon
+        is never held back more than TIME_ENTRY_SYNC_MAX_HOLD_SECONDS.
+        """
+        now = timezone.now()
+        idle_limit = getattr(settings, 'TIME_ENTRY_SYNC_IDLE_TRANSACTION_SECONDS', 30)
+        with connections[PRIMARY].cursor() as cursor:
+            cursor.execute(OLDEST_TRANSACTION_QUERY, [idle_limit])
+            oldest = cursor.fetchone()[0]
+        horizon = now if oldest is None else min(now, oldest)
+        horizon = max(horizon, now - timedelta(seconds=getattr(settings, 'TIME_ENTRY_SYNC_MAX_HOLD_SECONDS', 300)))
+        return horizon - timedelta(seconds=getattr(settings, 'TIME_ENTRY_SYNC_SETTLE_SECONDS', 2))
+
+    @classmethod
+    def get_tombstone_cutoff(cls) -> datetime:
+        return timezone.now() - timedelta(days=getattr(settings, 'TIME_ENTRY_TOMBSTONE_RETENTION_DAYS', 90))
+
+    @classmethod
+    def encode_cursor(cls, entries: SyncPosition, tombstones: SyncPosition) -> str:
+        payload = {
+            'e': [entries.timestamp.isoformat(), entries.id],
+            't': [tombstones.timestamp.isoformat(), tombstones.id],
+        }
+        return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+    @classmethod
+    def decode_cursor(cls, cursor: str) -> tuple[SyncPosition, SyncPosition]:
+        """
+        Decode a cursor into (entry position, tombstone position).
+
+        Raises:
+            InvalidSyncCursor: If the cursor is malformed
+        """
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            return tuple(
+                SyncPosition(datetime.fromisoformat(payload[key][0]), int(payload[key][1]))
+                for key in ('e', 't')
+            )
+        except (binascii.Error, ValueError, KeyError, IndexError, TypeError) as e:
+            raise InvalidSyncCursor('Invalid sync cursor.') from e
+
+    @classmethod
+    def get_changed_entries(cls, user: User, position: SyncPosition | None) -> QuerySet:
+        queryset = TimeEntry.objects.filter(user=user)
+        if position is not None:
+            queryset = queryset.filter(position.after('updated_at'))
+        return queryset.order_by('updated_at', 'id')
+
+    @classmethod
+    def get_tombstones(cls, user: User, position: SyncPosition) -> QuerySet:
+        return (
+            TimeEntryTombstone.objects
+            .filter(position.after('deleted_at'), user=user)
+            .order_by('deleted_at', 'id')
+        )
+
+    @classmethod
+    def get_changes(cls, user: User, cursor: str | None = None) -> SyncPage:
+        """
+        Get a user's entry changes since a cursor.
+
+        Args:
+            user: Entry owner
+            cursor: Cursor from the previous page, or None for a full sync
+
+        Returns:
+            SyncPage with changed entries, deleted entry ids and the next cursor
+
+        Raises:
+            InvalidSyncCursor: If the cursor is malformed
+            SyncCursorExpired: If tombstones since the cursor have been purged
+        """
+        settled_before = cls.get_settled_before()
+        limit = cls.get_page_size()
+
+        if cursor:
+            entry_position, tombstone_position = cls.decode_cursor(cursor)
+            if tombstone_position.timestamp < cls.get_tombstone_cutoff():
+                raise SyncCursorExpired('Sync cursor has expired; resync from scratch.')
+        else:
+            # A full sync sees only live entries, so earlier deletions are moot
+            entry_position = None
+            tombstone_position = SyncPosition(settled_before, 0)
+
+        entries = list(
+            cls.get_changed_entries(user, entry_position)
+            .filter(updated_at__lte=settled_before)
+            .select_related('user', 'project')[:limit + 1]
+        )
+        tombstones = list(
+            cls.get_tombstones(user, tombstone_position)
+            .filter(deleted_at__lte=settled_before)
+            .values_list('deleted_at', 'id', 'entry_id')[:limit + 1]
+        )
+
+        more_entries, more_tombstones = len(entries) > limit, len(tombstones) > limit
+        entries, tombstones = entries[:limit], tombstones[:limit]
+
+        if entries:
+            entry_position = SyncPosition(entries[-1].updated_at, entries[-1].id)
+        elif entry_position is None:
+            entry_position = SyncPosition(settled_before, 0)
+        if more_tombstones:
+            tombstone_position = SyncPosition(tombstones[-1][0], tombstones[-1][1])
+        else:
+            # Caught up: move to the settle point so quiet streams don't
+            # leave the cursor to age past the retention window
+            tombstone_position = SyncPosition(settled_before, 0)
+
+        return SyncPage(
+            entries=entries,
+            deleted=[entry_id for _, _, entry_id in tombstones],
+            cursor=cls.encode_cursor(entry_position, tombstone_position),
+            has_more=more_entries or more_tombstones,
+        )
+
+    @classmethod
+    def purge_tombstones(cls) -> int:
+        """Delete tombstones older than the retention window."""
+        deleted, _ = TimeEntryTombstone.objects.filter(deleted_at__lt=cls.get_tombstone_cutoff()).delete()
+        return deleted
+
+
+def record_tombstone(sender, instance: TimeEntry, origin=None, **kwargs) -> None:
+    """post_delete receiver: leave a tombstone for sync clients."""
+    if isinstance(origin, User):
+        # The user's tombstones are going with them
+        return
+    TimeEntryTombstone.objects.create(entry_id=instance.pk, user_id=instance.user_id)
+
+
+class TimerAlreadyRunning(Exception):
+    """Raised when starting a timer while another one is running."""
+
+
+class NoActiveTimer(Exception):
+    """Raised when stopping a timer that is not running."""
+
+
+DAILY_HOURS_LIMIT = Decimal('24')
+HOURS_QUANTUM = Decimal('0.01')
+
+
+@dataclass(frozen=True)
+class ActiveTimer:
+    """A running timer, as held in the cache."""
+
+    user_id: int
+    project_id: int
+    project_name: str
+    description: str
+    date: date
+    started_at: datetime
+    billing_rate: Decimal
+    rate_source: str
+
+    def elapsed_hours(self, now: datetime | None = None) -> Decimal:
+        seconds = ((now or timezone.now()) - self.started_at).total_seconds()
+        return (Decimal(seconds) / 3600).quantize(HOURS_QUANTUM, rounding=ROUND_HALF_UP)
+
+
+class TimerService:
+    """
+    Service for live timers.
+
+    A running timer lives only in the cache, keyed by user: starting,
+    polling and ticking cost no database writes. Start is a single atomic
+    add, so a user can have one timer at most; stop atomically deletes the
+    key, so only one of two concurrent stops gets the timer. The caller then
+    materializes a TimeEntry from it, with the rate snapshotted at start.
+    An entry that fails validation (daily limit already reached, project no
+    longer valid) would fail the same way on every retry, so the timer is
+    dropped; only an unexpected error while saving restores it.
+
+    The cache must be shared across processes (Redis in production) and
+    must not evict these keys before TIMER_STATE_TIMEOUT.
+    """
+
+    @classmethod
+    def _key(cls, user_id: int) -> str:
+        return f'timer:active:{user_id}'
+
+    @classmethod
+    def _timeout(cls) -> int:
+        return getattr(settings, 'TIMER_STATE_TIMEOUT', 7 * 24 * 3600)
+
+    @classmethod
+    def get_active(cls, user: User) -> ActiveTimer | None:
+        """The user's running timer, if any."""
+        state = cache.get(cls._key(user.pk))
+        return ActiveTimer(**state) if state else None
+
+    @classmethod
+    def start(cls, user: User, project, description: str = '') -> ActiveTimer:
+        """
+        Start a timer, snapshotting the billing rate.
+
+        Raises:
+            TimerAlreadyRunning: If the user already has a running timer
+        """
+        if cache.get(cls._key(user.pk)) is not None:
+            raise TimerAlreadyRunning('A timer is already running. Stop it before starting another.')
+
+        started_at = timezone.now()
+        entry_date = started_at.astimezone(get_user_tenant_context(user).tzinfo).date()
+        rate = RateResolutionService.resolve(user=user, project=project, as_of_date=entry_date)
+
+        timer = ActiveTimer(
+            user_id=user.pk,
+            project_id=project.pk,
+            project_name=project.name,
+            description=description,
+            date=entry_date,
+            started_at=started_at,
+            billing_rate=rate.rate,
+            rate_source=rate.source,
+        )
+        if not cache.add(cls._key(user.pk), asdict(timer), timeout=cls._timeout()):
+            raise TimerAlreadyRunning('A timer is already running. Stop it before starting another.')
+        return timer
+
+    @classmethod
+    def stop(cls, user: User) -> ActiveTimer:
+        """
+        Take the user's running timer out of the cache.
+
+        Raises:
+            NoActiveTimer: If no timer is running (or a concurrent stop took it)
+        """
+        key = cls._key(user.pk)
+        state = cache.get(key)
+        if state is None or not cache.delete(key):
+            raise NoActiveTimer('No timer is running.')
+        return ActiveTimer(**state)
+
+    @classmethod
+    def restore(cls, timer: ActiveTimer) -> bool:
+        """Put a stopped timer back, e.g. when its entry could not be saved."""
+        return cache.add(cls._key(timer.user_id), asdict(timer), timeout=cls._timeout())
+
+    @classmethod
+    def hours_to_record(cls, timer: ActiveTimer, stopped_at: datetime) -> Decimal:
+        """
+        Hours for the entry: elapsed time, capped at what is left of the
+        daily limit on the timer's date. Zero or less if the day is full.
+        """
+        logged = TimeEntry.objects.filter(
+            user_id=timer.user_id,
+            date=timer.date,
+        ).aggregate(total=Sum('hours'))['total'] or Decimal('0')
+        # At least one quantum, so a stopped timer becomes an entry unless the day is full
+        return min(max(timer.elapsed_hours(stopped_at), HOURS_QUANTUM), DAILY_HOURS_LIMIT - logged)
@@ -0,0 +1,50 @@
+"""
+Celery tasks for TimeEntry maintenance.
+
+Tasks:
+- ensure_time_entry_partitions: Create upcoming date partitions ahead of time
+- purge_time_entry_tombstones: Delete sync tombstones past retention
+"""
+from celery import shared_task
+from celery.utils.log import get_task_logger
+from django.utils import timezone
+
+logger = get_task_logger(__name__)
+
+
+@shared_task(ignore_result=True)
+def ensure_time_entry_partitions() -> dict:
+    """
+    Create missing time entry partitions for the coming months.
+
+    No-op until the table has been converted with
+    ``manage.py partition_time_entries``.
+
+    Returns:
+        Dict with the names of the partitions created
+    """
+    from apps.timeentries import partitioning
+
+    if not partitioning.is_partitioned():
+        return {'created': []}
+
+    created = partitioning.ensure_partitions(timezone.localdate())
+    if created:
+        logger.info(f"Created time entry partitions: {', '.join(created)}")
+    return {'created': created}
+
+
+@shared_task(ignore_result=True)
+def purge_time_entry_tombstones() -> dict:
+    """
+    Delete deletion tombstones older than TIME_ENTRY_TOMBSTONE_RETENTION_DAYS.
+
+    Returns:
+        Dict with the number of tombstones deleted
+    """
+    from apps.timeentries.services import TimeEntrySyncService
+
+    deleted = TimeEntrySyncService.purge_tombstones()
+    if deleted:
+        logger.info(f'Purged {deleted} time entry tombstones')
+    return {'deleted': deleted}
@@ -0,0 +1,168 @@
+"""
+Tests for ETag / If-None-Match on time entry and timesheet endpoints.
+"""
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+
+from apps.timeentries.models import TimeEntry
+
+
+def add_entry(user, project, timesheet=None, hours='8.00'):
+    return TimeEntry.objects.create(
+        user=user, project=project, timesheet=timesheet, date=date.today(),
+        hours=Decimal(hours), billing_rate=Decimal('100.00'),
+        rate_source=TimeEntry.RateSource.PROJECT,
+    )
+
+
+@pytest.mark.django_db
+class TestTimeEntryConditionalGet:
+    """Tests for GET /api/v1/time-entries/ with ETags."""
+
+    def test_matching_etag_returns_304_without_serializing(self, authenticated_client, user, project):
+        """
+        Given: A list response with an ETag
+        When: Polling again with If-None-Match
+        Then: 304 with no body and fewer queries
+        """
+        add_entry(user, project)
+        with CaptureQueriesContext(connection) as full:
+            first = authenticated_client.get('/api/v1/time-entries/')
+
+        with CaptureQueriesContext(connection) as conditional:
+            second = authenticated_client.get('/api/v1/time-entries/', HTTP_IF_NONE_MATCH=first['ETag'])
+
+        assert first.status_code == status.HTTP_200_OK
+        assert second.status_code == status.HTTP_304_NOT_MODIFIED
+        assert second['ETag'] == first['ETag']
+        assert not second.content
+        assert len(conditional) < len(full)
+
+    def test_update_changes_etag(self, authenticated_client, user, project):
+        """An edited entry produces a new ETag and a full response."""
+        entry = add_entry(user, project)
+        etag = authenticated_client.get('/api/v1/time-entries/')['ETag']
+
+        entry.hours = Decimal('6.00')
+        entry.save()
+        response = authenticated_client.get('/api/v1/time-entries/', HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response['ETag'] != etag
+
+    def test_delete_changes_etag(self, authenticated_client, user, project):
+        """Deleting an entry changes the row count and so the ETag."""
+        add_entry(user, project)
+        entry = add_entry(user, project)
+        etag = authenticated_client.get('/api/v1/time-entries/')['ETag']
+
+        entry.delete()
+        response = authenticated_client.get('/api/v1/time-entries/', HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_query_params_are_part_of_etag(self, authenticated_client, user, project):
+        """A different page or filter never matches another response's ETag."""
+        add_entry(user, project)
+        etag = authenticated_client.get('/api/v1/time-entries/')['ETag']
+
+        response = authenticated_client.get(
+            f'/api/v1/time-entries/?project={project.id}', HTTP_IF_NONE_MATCH=etag
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_detail_etag(self, authenticated_client, user, project):
+        """Detail responses support conditional GET too."""
+        entry = add_entry(user, project)
+        etag = authenticated_client.get(f'/api/v1/time-entries/{entry.id}/')['ETag']
+
+        response = authenticated_client.get(f'/api/v1/time-entries/{entry.id}/', HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_wildcard_matches_existing_entry(self, authenticated_client, user, project):
+        """If-None-Match: * returns 304 for an entry that exists."""
+        entry = add_entry(user, project)
+
+        response = authenticated_client.get(f'/api/v1/time-entries/{entry.id}/', HTTP_IF_NONE_MATCH='*')
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_wildcard_on_missing_entry_is_404(self, authenticated_client):
+        """If-None-Match: * doesn't match a resource that doesn't exist."""
+        response = authenticated_client.get('/api/v1/time-entries/999999/', HTTP_IF_NONE_MATCH='*')
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_missing_entry_still_404(self, authenticated_client):
+        """Unknown ids return 404 without an ETag."""
+        response = authenticated_client.get('/api/v1/time-entries/999999/')
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert not response.has_header('ETag')
+
+
+@pytest.mark.django_db
+class TestTimesheetConditionalGet:
+    """Tests for GET /api/v1/timesheets/ with ETags."""
+
+    def test_new_entry_changes_timesheet_etag(self, authenticated_client, user, project, timesheet_factory):
+        """
+        Given: A timesheet detail response with an ETag
+        When: An entry is added to the timesheet
+        Then: The ETag changes, since the detail renders entries
+        """
+        timesheet = timesheet_factory(user=user)
+        url = f'/api/v1/timesheets/{timesheet.id}/'
+        etag = authenticated_client.get(url)['ETag']
+        assert authenticated_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == status.HTTP_304_NOT_MODIFIED
+
+        add_entry(user, project, timesheet=timesheet)
+        response = authenticated_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data['entries']) == 1
+
+    def test_list_304(self, authenticated_client, user, timesheet_factory):
+        """Timesheet list polling returns 304 when nothing changed."""
+        timesheet_factory(user=user)
+        etag = authenticated_client.get('/api/v1/timesheets/')['ETag']
+
+        response = authenticated_client.get('/api/v1/timesheets/', HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_wildcard_matches_empty_list(self, authenticated_client):
+        """The list resource exists even with no rows, so * matches it."""
+        response = authenticated_client.get('/api/v1/timesheets/', HTTP_IF_NONE_MATCH='*')
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_fingerprint_does_not_multiply_related_rows(self, user, project, timesheet_factory):
+        """
+        Given: Two timesheets, one with two entries and three comments
+        When: Fingerprinting the timesheet queryset
+        Then: Counts are per table, from one query without joining entries to comments
+        """
+        from apps.timesheets.models import Timesheet, TimesheetComment
+        from apps.timesheets.views import TimesheetViewSet
+
+        timesheet = timesheet_factory(user=user)
+        timesheet_factory(user=user, week_start=timesheet.week_start.replace(year=timesheet.week_start.year - 1))
+        for _ in range(2):
+            add_entry(user, project, timesheet=timesheet)
+        for text in ('a', 'b', 'c'):
+            TimesheetComment.objects.create(timesheet=timesheet, author=user, text=text)
+
+        with CaptureQueriesContext(connection) as queries:
+            fingerprint = TimesheetViewSet().get_fingerprint(Timesheet.objects.filter(user=user))
+
+        assert (fingerprint['count'], fingerprint['entries'], fingerprint['comments']) == (2, 2, 3)
+        assert len(queries) == 1
+        assert 'JOIN' not in queries[0]['sql']
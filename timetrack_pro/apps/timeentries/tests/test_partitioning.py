@@ -0,0 +1,201 @@
+"""
+Tests for TimeEntry range partitioning.
+
+Conversion runs inside the test transaction, so the DDL is rolled back
+with everything else.
+"""
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+from django.test import override_settings
+
+from apps.timeentries import partitioning
+from apps.timeentries.models import TimeEntry
+
+
+def make_entry(user, project, entry_date):
+    return TimeEntry.objects.create(
+        user=user,
+        project=project,
+        date=entry_date,
+        hours=Decimal('2.00'),
+        billing_rate=Decimal('100.00'),
+        rate_source=TimeEntry.RateSource.PROJECT,
+    )
+
+
+class TestPartitionRanges:
+    """Tests for partition boundary calculation."""
+
+    def test_monthly_ranges(self):
+        """Monthly partitions cover calendar months, end exclusive."""
+        ranges = partitioning.partitions_between(date(2025, 11, 20), date(2026, 1, 3), 'month')
+
+        assert [(r.start, r.end) for r in ranges] == [
+            (date(2025, 11, 1), date(2025, 12, 1)),
+            (date(2025, 12, 1), date(2026, 1, 1)),
+            (date(2026, 1, 1), date(2026, 2, 1)),
+        ]
+        assert ranges[0].name == 'timeentries_timeentry_p2025_11'
+
+    def test_quarterly_ranges(self):
+        """Quarterly partitions start on Jan/Apr/Jul/Oct."""
+        partition = partitioning.partition_for(date(2026, 8, 14), 'quarter')
+
+        assert (partition.start, partition.end) == (date(2026, 7, 1), date(2026, 10, 1))
+        assert partition.name == 'timeentries_timeentry_p2026_q3'
+
+
+@pytest.mark.django_db
+class TestConvertToPartitioned:
+    """Tests for converting the existing table."""
+
+    def test_conversion_keeps_rows_and_ids(self, user, project):
+        """
+        Given: Existing entries across several months
+        When: Converting to monthly partitions
+        Then: Rows keep their ids and new inserts get higher ids
+        """
+        old = [make_entry(user, project, date(2026, m, 10)) for m in (1, 2, 3)]
+
+        created = partitioning.convert_to_partitioned(date(2026, 3, 15), ahead=2)
+
+        assert partitioning.is_partitioned()
+        assert 'timeentries_timeentry_p2026_01' in created
+        assert 'timeentries_timeentry_p2026_05' in created
+        assert set(TimeEntry.objects.values_list('pk', flat=True)) == {e.pk for e in old}
+        new = make_entry(user, project, date(2026, 3, 16))
+        assert new.pk > max(e.pk for e in old)
+
+    def test_date_bounded_query_prunes(self, user, project):
+        """
+        Given: A partitioned table spanning several months
+        When: Explaining a one-week query
+        Then: Only that month's partition is scanned
+        """
+        make_entry(user, project, date(2026, 1, 10))
+        partitioning.convert_to_partitioned(date(2026, 3, 15), ahead=2)
+
+        scanned = partitioning.scanned_partitions(
+            TimeEntry.objects.filter(date__gte=date(2026, 3, 9), date__lte=date(2026, 3, 15))
+        )
+
+        assert scanned == {'timeentries_timeentry_p2026_03'}
+
+    def test_deleting_entry_still_cascades_to_comments(self, user, project, timesheet_factory):
+        """
+        Given: A comment on an entry after conversion (no DB-level FK)
+        When: Deleting the entry through the ORM
+        Then: The comment is deleted too
+        """
+        from apps.timesheets.models import TimesheetComment
+
+        entry = make_entry(user, project, date(2026, 3, 10))
+        partitioning.convert_to_partitioned(date(2026, 3, 15), ahead=1)
+        comment = TimesheetComment.objects.create(
+            timesheet=timesheet_factory(), entry=entry, author=user, text='Check this',
+        )
+
+        entry.delete()
+
+        assert not TimesheetComment.objects.filter(pk=comment.pk).exists()
+
+    def test_already_partitioned_raises(self, db):
+        """Converting twice raises instead of rebuilding the table."""
+        partitioning.convert_to_partitioned(date(2026, 3, 15), ahead=1)
+
+        with pytest.raises(RuntimeError):
+            partitioning.convert_to_partitioned(date(2026, 3, 15), ahead=1)
+
+
+@pytest.mark.django_db
+class TestEnsurePartitions:
+    """Tests for creating partitions ahead of time."""
+
+    def test_moves_rows_out_of_default_partition(self, user, project):
+        """
+        Given: An entry beyond the created range (in the DEFAULT partition)
+        When: Ensuring partitions once that month comes into range
+        Then: The partition is created and the entry moves into it
+        """
+        partitioning.convert_to_partitioned(date(2026, 3, 15), ahead=1)
+        entry = make_entry(user, project, date(2026, 7, 1))
+
+        created = partitioning.ensure_partitions(date(2026, 6, 20), ahead=1)
+
+        assert created == ['timeentries_timeentry_p2026_06', 'timeentries_timeentry_p2026_07']
+        scanned = partitioning.scanned_partitions(TimeEntry.objects.filter(date=entry.date))
+        assert scanned == {'timeentries_timeentry_p2026_07'}
+        assert TimeEntry.objects.filter(date=entry.date).get().pk == entry.pk
+
+    @override_settings(TIME_ENTRY_PARTITION_INTERVAL='quarter')
+    def test_is_idempotent(self, db):
+        """Running again creates nothing new."""
+        partitioning.convert_to_partitioned(date(2026, 3, 15), ahead=1)
+
+        assert partitioning.ensure_partitions(date(2026, 3, 15), ahead=1) == []
+
+    def test_task_is_noop_when_unpartitioned(self, db):
+        """The maintenance task does nothing until the table is converted."""
+        from apps.timeentries.tasks import ensure_time_entry_partitions
+
+        assert ensure_time_entry_partitions() == {'created': []}
+
+
+@pytest.mark.django_db
+class TestPartitionedIndexMigration:
+    """Tests for adding an index after the table is partitioned."""
+
+    def test_index_is_built_per_partition_and_attached(self, db):
+        """
+        Given: A partitioned table
+        When: Adding an index the way AddIndexConcurrentlyPartitioned does
+        Then: Every partition gets its own copy and the parent index is valid
+        """
+        from django.db import connection, models
+
+        from apps.timeentries.operations import create_partitioned_index, is_partitioned_table
+
+        partitioning.convert_to_partitioned(date(2026, 3, 15), ahead=1)
+        index = models.Index(fields=['project', '-date'], name='timeentry_test_idx')
+        assert is_partitioned_table(connection, TimeEntry._meta.db_table)
+
+        # CONCURRENTLY can't run in the test transaction; the steps are otherwise the same
+        with connection.schema_editor(atomic=False) as editor:
+            create_partitioned_index(editor, TimeEntry, index, concurrently=False)
+            create_partitioned_index(editor, TimeEntry, index, concurrently=False)
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT x.indisvalid, count(child.inhrelid) FROM pg_index x '
+                'LEFT JOIN pg_inherits child ON child.inhparent = x.indexrelid '
+                'WHERE x.indexrelid = to_regclass(%s) GROUP BY x.indisvalid',
+                [index.name],
+            )
+            valid, attached = cursor.fetchone()
+        assert valid is True
+        assert attached == len(partitioning.existing_partitions())
+
+
+@pytest.mark.django_db
+class TestPartitionCommand:
+    """Tests for manage.py partition_time_entries."""
+
+    def test_converts_and_reports_pruning(self, user, project):
+        """
+        Given: An unpartitioned table
+        When: Running the command
+        Then: The table is partitioned and the current-week query prunes
+        """
+        from io import StringIO
+
+        from django.core.management import call_command
+
+        make_entry(user, project, date.today() - timedelta(days=90))
+        out = StringIO()
+
+        call_command('partition_time_entries', stdout=out)
+
+        assert partitioning.is_partitioned()
+        assert 'Current-week query scans' in out.getvalue()
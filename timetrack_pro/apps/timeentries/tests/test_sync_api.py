@@ -0,0 +1,178 @@
+"""
+Tests for the time entry delta sync endpoint.
+"""
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+from django.utils import timezone
+from rest_framework import status
+
+from apps.timeentries.models import TimeEntry, TimeEntryTombstone
+
+URL = '/api/v1/time-entries/changes/'
+
+
+def add_entry(user, project, hours='8.00'):
+    return TimeEntry.objects.create(
+        user=user, project=project, date=date.today(),
+        hours=Decimal(hours), billing_rate=Decimal('100.00'),
+        rate_source=TimeEntry.RateSource.PROJECT,
+    )
+
+
+@pytest.fixture
+def no_settle(settings):
+    """Return changes immediately instead of after the settle window."""
+    settings.TIME_ENTRY_SYNC_SETTLE_SECONDS = 0
+
+
+@pytest.mark.django_db
+class TestTimeEntryChanges:
+    """Tests for GET /api/v1/time-entries/changes/."""
+
+    def test_full_sync_then_incremental(self, authenticated_client, user, project, no_settle):
+        """
+        Given: A full sync cursor
+        When: An entry is edited, another deleted and one created
+        Then: The next sync returns only those changes and a tombstone
+        """
+        kept = add_entry(user, project)
+        removed = add_entry(user, project)
+
+        first = authenticated_client.get(URL)
+        assert first.status_code == status.HTTP_200_OK
+        assert {e['id'] for e in first.data['entries']} == {kept.id, removed.id}
+        assert first.data['has_more'] is False
+
+        kept.hours = Decimal('6.00')
+        kept.save()
+        removed_id = removed.id
+        removed.delete()
+        created = add_entry(user, project)
+
+        second = authenticated_client.get(URL, {'since': first.data['cursor']})
+
+        assert second.status_code == status.HTTP_200_OK
+        assert [e['id'] for e in second.data['entries']] == sorted([kept.id, created.id])
+        assert second.data['deleted'] == [removed_id]
+
+        third = authenticated_client.get(URL, {'since': second.data['cursor']})
+        assert third.data['entries'] == []
+        assert third.data['deleted'] == []
+
+    def test_unsettled_changes_are_held_back(self, authenticated_client, user, project):
+        """Rows inside the settle window wait for the next sync."""
+        add_entry(user, project)
+
+        response = authenticated_client.get(URL)
+
+        assert response.data['entries'] == []
+
+    def test_pages_with_has_more(self, authenticated_client, user, project, settings, no_settle):
+        """Paging by cursor returns every entry exactly once."""
+        settings.TIME_ENTRY_SYNC_PAGE_SIZE = 2
+        ids = {add_entry(user, project).id for _ in range(5)}
+
+        seen, cursor, has_more = [], None, True
+        while has_more:
+            response = authenticated_client.get(URL, {'since': cursor} if cursor else {})
+            seen += [e['id'] for e in response.data['entries']]
+            cursor, has_more = response.data['cursor'], response.data['has_more']
+
+        assert sorted(seen) == sorted(ids)
+
+    def test_only_own_entries(self, authenticated_client, user, user_factory, project, no_settle):
+        """Other users' entries and deletions are not returned."""
+        other = user_factory()
+        add_entry(other, project).delete()
+        add_entry(other, project)
+
+        response = authenticated_client.get(URL)
+
+        assert response.data['entries'] == []
+        assert response.data['deleted'] == []
+
+    def test_expired_cursor_returns_410(self, authenticated_client, settings):
+        """A cursor older than tombstone retention requires a full resync."""
+        cursor = authenticated_client.get(URL).data['cursor']
+        settings.TIME_ENTRY_TOMBSTONE_RETENTION_DAYS = 0
+
+        response = authenticated_client.get(URL, {'since': cursor})
+
+        assert response.status_code == status.HTTP_410_GONE
+
+    def test_invalid_cursor_returns_400(self, authenticated_client):
+        """A malformed cursor is rejected."""
+        response = authenticated_client.get(URL, {'since': 'not-a-cursor'})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_horizon_waits_for_open_transactions(self, no_settle):
+        """
+        Given: Another session with a transaction open for a while
+        When: Computing the sync horizon
+        Then: It stays at that transaction's start, so its rows can't land behind a cursor
+        """
+        import psycopg
+        from django.db import connection
+
+        from apps.timeentries.services import TimeEntrySyncService
+
+        params = connection.get_connection_params()
+        with psycopg.connect(**params) as other:
+            other.execute('SELECT 1')
+            started = other.execute('SELECT xact_start FROM pg_stat_activity WHERE pid = pg_backend_pid()').fetchone()[0]
+
+            assert TimeEntrySyncService.get_settled_before() <= started
+            other.commit()
+
+        # Activity is snapshotted per transaction; the test runs inside one
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_stat_clear_snapshot()')
+        assert TimeEntrySyncService.get_settled_before() > started
+
+    @pytest.mark.parametrize('setting', ['TIME_ENTRY_SYNC_IDLE_TRANSACTION_SECONDS', 'TIME_ENTRY_SYNC_MAX_HOLD_SECONDS'])
+    def test_old_unrelated_transaction_does_not_stall_horizon(self, settings, no_settle, setting):
+        """
+        Given: Another session left idle in a transaction past the idle limit, or open past the maximum hold
+        When: Computing the sync horizon
+        Then: The horizon moves past that transaction's start
+        """
+        import time
+
+        import psycopg
+        from django.db import connection
+
+        from apps.timeentries.services import TimeEntrySyncService
+
+        setattr(settings, setting, 0)
+        params = connection.get_connection_params()
+        with psycopg.connect(**params) as other:
+            other.execute('SELECT 1')
+            started = other.execute('SELECT xact_start FROM pg_stat_activity WHERE pid = pg_backend_pid()').fetchone()[0]
+            time.sleep(0.01)
+
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT pg_stat_clear_snapshot()')
+            assert TimeEntrySyncService.get_settled_before() > started
+            other.rollback()
+
+
+@pytest.mark.django_db
+class TestTombstonePurge:
+    """Tests for purge_time_entry_tombstones."""
+
+    def test_purges_only_expired(self, user, project, settings):
+        """Tombstones past retention are deleted, recent ones kept."""
+        from apps.timeentries.tasks import purge_time_entry_tombstones
+
+        add_entry(user, project).delete()
+        add_entry(user, project).delete()
+        old = TimeEntryTombstone.objects.order_by('id').first()
+        TimeEntryTombstone.objects.filter(pk=old.pk).update(deleted_at=timezone.now() - timedelta(days=91))
+
+        result = purge_time_entry_tombstones()
+
+        assert result == {'deleted': 1}
+        assert TimeEntryTombstone.objects.count() == 1
@@ -4,11 +4,13 @@ Tests for Timer API endpoints - TDD approach.
 Endpoints:
 - POST /api/v1/time-entries/timer/start/
 - POST /api/v1/time-entries/timer/stop/
+- POST /api/v1/time-entries/timer/discard/
 - GET  /api/v1/time-entries/timer/active/
 
 Business rules:
 - Only one active timer per user at a time
 - Block new timer until current stopped
+- Running timers live in the cache; a TimeEntry is written on stop
 """
 from datetime import date, datetime, timedelta
 from decimal import Decimal
@@ -19,6 +21,14 @@ import pytz
 from rest_framework import status
 
 
+def start_timer(user, project, started_at, description=''):
+    """Start a timer for the user as if at started_at."""
+    from apps.timeentries.services import TimerService
+
+    with patch('apps.timeentries.services.timezone.now', return_value=started_at):
+        return TimerService.start(user, project, description)
+
+
 @pytest.mark.django_db
 class TestStartTimerEndpoint:
     """Tests for POST /api/v1/time-entries/timer/start/"""
@@ -76,15 +86,7 @@ class TestStartTimerEndpoint:
         When: POST /timer/start/
         Then: Returns 400 (must stop current timer first)
         """
-        from apps.timeentries.models import TimeEntry
-
-        TimeEntry.objects.create(
-            user=user, project=project, date=date.today(),
-            hours=Decimal('0.00'), billing_rate=Decimal('100.00'),
-            rate_source=TimeEntry.RateSource.PROJECT,
-            is_timer_entry=True,
-            timer_started_at=datetime.now(pytz.UTC),
-        )
+        start_timer(user, project, datetime.now(pytz.UTC))
 
         user.company.settings.default_hourly_rate = Decimal('75.00')
         user.company.settings.save()
@@ -146,16 +148,8 @@ class TestStopTimerEndpoint:
         When: POST /timer/stop/
         Then: Returns 200 with calculated hours
         """
-        from apps.timeentries.models import TimeEntry
-
         start_time = datetime.now(pytz.UTC) - timedelta(hours=2, minutes=30)
-        TimeEntry.objects.create(
-            user=user, project=project, date=date.today(),
-            hours=Decimal('0.00'), billing_rate=Decimal('100.00'),
-            rate_source=TimeEntry.RateSource.PROJECT,
-            is_timer_entry=True,
-            timer_started_at=start_time,
-        )
+        start_timer(user, project, start_time)
 
         response = authenticated_client.post('/api/v1/time-entries/timer/stop/')
 
@@ -171,16 +165,8 @@ class TestStopTimerEndpoint:
         When: POST /timer/stop/
         Then: Hours calculated as 3.25
         """
-        from apps.timeentries.models import TimeEntry
-
         start_time = datetime.now(pytz.UTC) - timedelta(hours=3, minutes=15)
-        TimeEntry.objects.create(
-            user=user, project=project, date=date.today(),
-            hours=Decimal('0.00'), billing_rate=Decimal('100.00'),
-            rate_source=TimeEntry.RateSource.PROJECT,
-            is_timer_entry=True,
-            timer_started_at=start_time,
-        )
+        start_timer(user, project, start_time)
 
         response = authenticated_client.post('/api/v1/time-entries/timer/stop/')
 
@@ -216,13 +202,7 @@ class TestStopTimerEndpoint:
         )
 
         start_time = datetime.now(pytz.UTC) - timedelta(hours=3)
-        TimeEntry.objects.create(
-            user=user, project=project, date=date.today(),
-            hours=Decimal('0.00'), billing_rate=Decimal('100.00'),
-            rate_source=TimeEntry.RateSource.PROJECT,
-            is_timer_entry=True,
-            timer_started_at=start_time,
-        )
+        start_timer(user, project, start_time)
 
         response = authenticated_client.post('/api/v1/time-entries/timer/stop/')
 
@@ -247,17 +227,8 @@ class TestStopTimerEndpoint:
         When: POST /timer/stop/ with description
         Then: Description is updated
         """
-        from apps.timeentries.models import TimeEntry
-
         start_time = datetime.now(pytz.UTC) - timedelta(hours=1)
-        TimeEntry.objects.create(
-            user=user, project=project, date=date.today(),
-            hours=Decimal('0.00'), billing_rate=Decimal('100.00'),
-            rate_source=TimeEntry.RateSource.PROJECT,
-            is_timer_entry=True,
-            timer_started_at=start_time,
-            description='',
-        )
+        start_timer(user, project, start_time)
 
         response = authenticated_client.post('/api/v1/time-entries/timer/stop/', {
             'description': 'Completed authentication feature',
@@ -266,6 +237,122 @@ class TestStopTimerEndpoint:
         assert response.status_code == status.HTTP_200_OK
         assert response.data['description'] == 'Completed authentication feature'
 
+    def test_stop_timer_keeps_rate_snapshotted_at_start(
+        self, authenticated_client, user, project, rate_factory
+    ):
+        """
+        Given: A timer started at 125.00/h, then the rate changes
+        When: POST /timer/stop/
+        Then: The entry is billed at the rate from the start
+        """
+        from apps.rates.models import Rate
+        from apps.timeentries.models import TimeEntry
+
+        rate = rate_factory(
+            company=user.company,
+            employee=user,
+            project=project,
+            rate_type=Rate.RateType.EMPLOYEE_PROJECT,
+            hourly_rate=Decimal('125.00'),
+            effective_from=date(2024, 1, 1),
+        )
+        start_timer(user, project, datetime.now(pytz.UTC) - timedelta(hours=1))
+        assert not TimeEntry.objects.filter(user=user).exists()
+
+        rate.hourly_rate = Decimal('200.00')
+        rate.save()
+
+        response = authenticated_client.post('/api/v1/time-entries/timer/stop/')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['billing_rate'] == '125.00'
+        entry = TimeEntry.objects.get(user=user)
+        assert entry.is_timer_entry is True
+        assert entry.timer_started_at is not None
+
+    def test_stop_timer_twice_returns_400(self, authenticated_client, user, project):
+        """
+        Given: A timer that was just stopped
+        When: POST /timer/stop/ again
+        Then: Returns 400 and only one entry exists
+        """
+        from apps.timeentries.models import TimeEntry
+
+        start_timer(user, project, datetime.now(pytz.UTC) - timedelta(hours=1))
+        authenticated_client.post('/api/v1/time-entries/timer/stop/')
+
+        response = authenticated_client.post('/api/v1/time-entries/timer/stop/')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert TimeEntry.objects.filter(user=user).count() == 1
+
+    def test_stop_timer_on_full_day_discards_timer(self, authenticated_client, user, project):
+        """
+        Given: User already has 24 hours logged today and a running timer
+        When: POST /timer/stop/
+        Then: Returns 400, no entry is added and a new timer can be started
+        """
+        from apps.timeentries.models import TimeEntry
+
+        TimeEntry.objects.create(
+            user=user, project=project, date=date.today(),
+            hours=Decimal('24.00'), billing_rate=Decimal('100.00'),
+            rate_source=TimeEntry.RateSource.PROJECT,
+        )
+        start_timer(user, project, datetime.now(pytz.UTC) - timedelta(hours=1))
+
+        response = authenticated_client.post('/api/v1/time-entries/timer/stop/')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'discarded' in response.data['detail']
+        assert TimeEntry.objects.filter(user=user).count() == 1
+        response = authenticated_client.post('/api/v1/time-entries/timer/start/', {'project': project.id})
+        assert response.status_code == status.HTTP_201_CREATED
+
+    def test_stop_timer_for_deleted_project_discards_timer(self, authenticated_client, user, project):
+        """
+        Given: A running timer whose project was deleted after start
+        When: POST /timer/stop/
+        Then: Returns 400 and the timer is gone
+        """
+        from apps.timeentries.services import TimerService
+
+        start_timer(user, project, datetime.now(pytz.UTC) - timedelta(hours=1))
+        project.delete()
+
+        response = authenticated_client.post('/api/v1/time-entries/timer/stop/')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert TimerService.get_active(user) is None
+
+
+@pytest.mark.django_db
+class TestDiscardTimerEndpoint:
+    """Tests for POST /api/v1/time-entries/timer/discard/"""
+
+    def test_discard_timer_returns_204_without_entry(self, authenticated_client, user, project):
+        """
+        Given: A running timer
+        When: POST /timer/discard/
+        Then: Returns 204, the timer is gone and no entry is written
+        """
+        from apps.timeentries.models import TimeEntry
+        from apps.timeentries.services import TimerService
+
+        start_timer(user, project, datetime.now(pytz.UTC) - timedelta(hours=1))
+
+        response = authenticated_client.post('/api/v1/time-entries/timer/discard/')
+
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        assert TimerService.get_active(user) is None
+        assert not TimeEntry.objects.filter(user=user).exists()
+
+    def test_discard_without_timer_returns_400(self, authenticated_client):
+        """No running timer: 400."""
+        response = authenticated_client.post('/api/v1/time-entries/timer/discard/')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
 
 @pytest.mark.django_db
 class TestGetActiveTimerEndpoint:
@@ -277,21 +364,13 @@ class TestGetActiveTimerEndpoint:
         When: GET /timer/active/
         Then: Returns 200 with timer details
         """
-        from apps.timeentries.models import TimeEntry
-
         start_time = datetime.now(pytz.UTC) - timedelta(hours=1)
-        entry = TimeEntry.objects.create(
-            user=user, project=project, date=date.today(),
-            hours=Decimal('0.00'), billing_rate=Decimal('100.00'),
-            rate_source=TimeEntry.RateSource.PROJECT,
-            is_timer_entry=True,
-            timer_started_at=start_time,
-        )
+        start_timer(user, project, start_time)
 
         response = authenticated_client.get('/api/v1/time-entries/timer/active/')
 
         assert response.status_code == status.HTTP_200_OK
-        assert response.data['id'] == entry.id
+        assert response.data['project']['id'] == project.id
         assert response.data['is_timer_entry'] is True
 
     def test_get_active_timer_no_timer_returns_404(self, authenticated_client):
@@ -312,16 +391,8 @@ class TestGetActiveTimerEndpoint:
         When: GET /timer/active/
         Then: Response includes elapsed_hours field
         """
-        from apps.timeentries.models import TimeEntry
-
         start_time = datetime.now(pytz.UTC) - timedelta(hours=2)
-        TimeEntry.objects.create(
-            user=user, project=project, date=date.today(),
-            hours=Decimal('0.00'), billing_rate=Decimal('100.00'),
-            rate_source=TimeEntry.RateSource.PROJECT,
-            is_timer_entry=True,
-            timer_started_at=start_time,
-        )
+        start_timer(user, project, start_time)
 
         response = authenticated_client.get('/api/v1/time-entries/timer/active/')
 
@@ -1,22 +1,41 @@
 """
 Views for TimeEntry API.
 """
-from rest_framework import viewsets
+from django.utils import timezone
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 
 from apps.timeentries.models import TimeEntry
 from apps.timeentries.serializers import (
+    ActiveTimerSerializer,
     TimeEntrySerializer,
     TimeEntryUpdateSerializer,
+    TimerStartSerializer,
+    TimerStopSerializer,
+    time_entry_list_values,
 )
+from apps.timeentries.services import (
+    InvalidSyncCursor,
+    NoActiveTimer,
+    SyncCursorExpired,
+    TimeEntrySyncService,
+    TimerAlreadyRunning,
+    TimerService,
+)
+from core.conditional import ConditionalGetMixin
 from core.pagination import StandardPagination
+from core.serializers import ValuesListMixin
+from core.sparse import SparseFieldsMixin
 
 
-class TimeEntryViewSet(viewsets.ModelViewSet):
+class TimeEntryViewSet(ConditionalGetMixin, SparseFieldsMixin, ValuesListMixin, viewsets.ModelViewSet):
     """ViewSet for TimeEntry CRUD operations."""
 
     permission_classes = [IsAuthenticated]
     pagination_class = StandardPagination
+    values_serializer = time_entry_list_values
 
     def get_serializer_class(self):
         if self.action in ['update', 'partial_update']:
@@ -38,3 +57,108 @@ class TimeEntryViewSet(viewsets.ModelViewSet):
             queryset = queryset.filter(project_id=project_id)
 
         return queryset
+
+    @action(detail=False, methods=['get'])
+    def changes(self, request):
+        """
+        Entries created or updated, and ids deleted, since a sync cursor.
+
+        Omit ``since`` for a full sync. Keep requesting with the returned
+        cursor while ``has_more`` is true. A 410 means the cursor is older
+        than the tombstone retention window and the client must resync.
+        """
+        try:
+            page = TimeEntrySyncService.get_changes(request.user, request.query_params.get('since'))
+        except InvalidSyncCursor as e:
+            return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except SyncCursorExpired as e:
+            return Response({'detail': str(e)}, status=status.HTTP_410_GONE)
+
+        return Response({
+            'entries': self.get_serializer(page.entries, many=True).data,
+            'deleted': page.deleted,
+            'cursor': page.cursor,
+            'has_more': page.has_more,
+        })
+
+    @action(detail=False, methods=['post'], url_path='timer/start')
+    def timer_start(self, request):
+        """Start a timer. Nothing is written to the database until it stops."""
+        serializer = TimerStartSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            timer = TimerService.start(request.user, **serializer.validated_data)
+        except TimerAlreadyRunning as e:
+            return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(ActiveTimerSerializer(timer).data, status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=['post'], url_path='timer/stop')
+    def timer_stop(self, request):
+        """
+        Stop the running timer and record it as a time entry.
+
+        If the entry can't be recorded (the day's limit is already reached,
+        or the project is no longer valid) the timer is discarded and the
+        error returned, since stopping it again would fail the same way.
+        """
+        serializer = TimerStopSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            timer = TimerService.stop(request.user)
+        except NoActiveTimer as e:
+            return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        stopped_at = timezone.now()
+        hours = TimerService.hours_to_record(timer, stopped_at)
+        if hours <= 0:
+            return Response(
+                {'detail': f'The daily hours limit for {timer.date} is already reached; the timer was discarded.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        entry_serializer = TimeEntrySerializer(
+            data={
+                'project_id': timer.project_id,
+                'date': timer.date,
+                'hours': hours,
+                'description': serializer.validated_data.get('description', timer.description),
+            },
+            context={'request': request},
+        )
+        if not entry_serializer.is_valid():
+            return Response(entry_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            entry_serializer.save(
+                billing_rate=timer.billing_rate,
+                rate_source=timer.rate_source,
+                is_timer_entry=True,
+                timer_started_at=timer.started_at,
+                timer_stopped_at=stopped_at,
+            )
+        except Exception:
+            TimerService.restore(timer)
+            raise
+        return Response(entry_serializer.data)
+
+    @action(detail=False, methods=['post'], url_path='timer/discard')
+    def timer_discard(self, request):
+        """Drop the running timer without recording an entry."""
+        try:
+            TimerService.stop(request.user)
+        except NoActiveTimer as e:
+            return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    @action(detail=False, methods=['get'], url_path='timer/active')
+    def timer_active(self, request):
+        """The running timer with its elapsed hours; 404 if none is running."""
+        timer = TimerService.get_active(request.user)
+        if timer is None:
+            return Response({'detail': 'No timer is running.'}, status=status.HTTP_404_NOT_FOUND)
+        return Response(ActiveTimerSerializer(timer).data)
@@ -1,6 +1,8 @@
 from django.contrib import admin
 
-from .models import Timesheet, TimesheetComment, OOOPeriod, AdminOverride, ApprovalDelegation
+from .models import (
+    Timesheet, TimesheetArchive, TimesheetComment, TimesheetEscalation, OOOPeriod, AdminOverride, ApprovalDelegation,
+)
 
 
 class TimesheetCommentInline(admin.TabularInline):
@@ -30,6 +32,14 @@ class TimesheetAdmin(admin.ModelAdmin):
     )
 
 
+@admin.register(TimesheetEscalation)
+class TimesheetEscalationAdmin(admin.ModelAdmin):
+    list_display = ('timesheet', 'current_approver', 'level', 'last_escalated_at', 'next_check_at')
+    list_filter = ('level',)
+    search_fields = ('timesheet__user__email', 'current_approver__email')
+    raw_id_fields = ('timesheet', 'current_approver')
+
+
 @admin.register(TimesheetComment)
 class TimesheetCommentAdmin(admin.ModelAdmin):
     list_display = ('timesheet', 'author', 'entry', 'resolved', 'created_at')
@@ -59,3 +69,14 @@ class ApprovalDelegationAdmin(admin.ModelAdmin):
     list_filter = ('start_date', 'end_date')
     search_fields = ('delegator__email', 'delegate__email')
     date_hierarchy = 'start_date'
+
+
+@admin.register(TimesheetArchive)
+class TimesheetArchiveAdmin(admin.ModelAdmin):
+    list_display = ('timesheet_id', 'user', 'week_start', 'status', 'total_hours', 'created_at')
+    list_filter = ('week_start',)
+    search_fields = ('user__email',)
+    readonly_fields = (
+        'timesheet_id', 'user', 'week_start', 'status', 'total_hours',
+        'entry_count', 'storage_path', 'checksum', 'created_at',
+    )
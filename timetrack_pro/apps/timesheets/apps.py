@@ -6,3 +6,17 @@ class TimesheetsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.timesheets'
     verbose_name = 'Timesheets'
+
+    def ready(self):
+        from django.db.models.signals import post_delete, post_save
+
+        from apps.timesheets import availability, delegation, services
+
+        post_save.connect(services.sync_escalation, sender='timesheets.Timesheet')
+        post_save.connect(availability.invalidate_for_period, sender='timesheets.OOOPeriod')
+        post_delete.connect(availability.invalidate_for_period, sender='timesheets.OOOPeriod')
+        post_save.connect(delegation.invalidate_for_delegation, sender='timesheets.ApprovalDelegation')
+        post_delete.connect(delegation.invalidate_for_delegation, sender='timesheets.ApprovalDelegation')
+        post_save.connect(services.requeue_for_ooo_change, sender='timesheets.OOOPeriod')
+        post_delete.connect(services.requeue_for_ooo_change, sender='timesheets.OOOPeriod')
+        post_save.connect(services.requeue_for_settings_change, sender='companies.CompanySettings')
@@ -0,0 +1,183 @@
+"""
+OOO availability index for TimeTrack Pro.
+
+Escalation sweeps ask "is this manager OOO today?" for the same managers
+again and again, and each answer used to be a query. OOOIndex loads a
+company's current and future OOO periods in one query and answers from
+sorted arrays:
+
+    index = get_ooo_index(company_id)
+    index.is_ooo(user_id, day)      # bisect over the user's periods
+    index.ooo_users(day)            # bisect over the company's boundaries
+
+Indexes are kept in the shared cache per company. Creating, changing or
+deleting an OOO period (OOOPeriodViewSet create/destroy, the admin) drops
+the company's index, again after commit so a concurrent rebuild can't keep
+pre-commit data. An index only holds periods that had not ended on the day
+it was built, so it is rebuilt when the date changes; earlier dates are
+answered from the database.
+
+Settings:
+    OOO_INDEX_TIMEOUT: Seconds to keep an index in the cache (default 3600)
+"""
+import bisect
+from collections import Counter
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from apps.infrastructure.metrics import CACHE_REQUESTS
+
+
+@dataclass(frozen=True)
+class UserPeriods:
+    """One user's OOO periods, sorted by start date."""
+
+    starts: tuple[date, ...]
+    ends: tuple[date, ...]
+    # Latest end among periods up to each position, so overlaps still answer correctly
+    reach: tuple[date, ...]
+
+    @classmethod
+    def build(cls, periods: Iterable[tuple[date, date]]) -> 'UserPeriods':
+        periods = sorted(periods)
+        reach, latest = [], date.min
+        for _, end in periods:
+            latest = max(latest, end)
+            reach.append(latest)
+        return cls(
+            starts=tuple(start for start, _ in periods),
+            ends=tuple(end for _, end in periods),
+            reach=tuple(reach),
+        )
+
+    def covers(self, day: date) -> bool:
+        i = bisect.bisect_right(self.starts, day)
+        return i > 0 and self.reach[i - 1] >= day
+
+    def next_start(self, after: date) -> date | None:
+        """First period start strictly after a date."""
+        i = bisect.bisect_right(self.starts, after)
+        return self.starts[i] if i < len(self.starts) else None
+
+
+@dataclass(frozen=True)
+class OOOIndex:
+    """
+    A company's current and future OOO periods.
+
+    ``boundaries`` are the dates on which anyone's OOO status changes;
+    ``segments[i]`` holds the users OOO from ``boundaries[i]`` until the
+    next boundary.
+    """
+
+    company_id: int
+    as_of: date
+    users: dict[int, UserPeriods]
+    boundaries: tuple[date, ...]
+    segments: tuple[frozenset[int], ...]
+
+    @classmethod
+    def build(cls, company_id: int, as_of: date, periods: Iterable[tuple[int, date, date]]) -> 'OOOIndex':
+        """
+        Args:
+            company_id: Company the periods belong to
+            as_of: Day the periods were loaded; earlier days are not covered
+            periods: (user_id, start_date, end_date) rows
+        """
+        by_user: dict[int, list[tuple[date, date]]] = {}
+        events: dict[date, Counter] = {}
+        for user_id, start, end in periods:
+            by_user.setdefault(user_id, []).append((start, end))
+            events.setdefault(start, Counter())[user_id] += 1
+            events.setdefault(end + timedelta(days=1), Counter())[user_id] -= 1
+
+        boundaries, segments = [], []
+        active = Counter()
+        for day in sorted(events):
+            active.update(events[day])
+            boundaries.append(day)
+            segments.append(frozenset(user_id for user_id, count in active.items() if count > 0))
+
+        return cls(
+            company_id=company_id,
+            as_of=as_of,
+            users={user_id: UserPeriods.build(rows) for user_id, rows in by_user.items()},
+            boundaries=tuple(boundaries),
+            segments=tuple(segments),
+        )
+
+    def covers_date(self, day: date) -> bool:
+        """Whether the index can answer for a day (periods ended earlier are not loaded)."""
+        return day >= self.as_of
+
+    def is_ooo(self, user_id: int, day: date) -> bool:
+        periods = self.users.get(user_id)
+        return periods is not None and periods.covers(day)
+
+    def ooo_users(self, day: date) -> frozenset[int]:
+        """Ids of users OOO on a day."""
+        i = bisect.bisect_right(self.boundaries, day)
+        return self.segments[i - 1] if i else frozenset()
+
+    def periods(self, user_id: int) -> list[tuple[date, date]]:
+        """A user's (start_date, end_date) periods that had not ended on as_of."""
+        periods = self.users.get(user_id)
+        return list(zip(periods.starts, periods.ends, strict=True)) if periods else []
+
+    def next_start(self, user_id: int, after: date) -> date | None:
+        """Start of the user's next OOO period after a date, if any."""
+        periods = self.users.get(user_id)
+        return periods.next_start(after) if periods else None
+
+
+def _index_key(company_id: int) -> str:
+    return f'ooo:index:{company_id}'
+
+
+def get_ooo_index(company_id: int) -> OOOIndex:
+    """The company's OOO index for today, from the cache or freshly loaded."""
+    from apps.timesheets.models import OOOPeriod
+
+    today = date.today()
+    key = _index_key(company_id)
+    index = cache.get(key)
+    if index is not None and index.as_of == today:
+        CACHE_REQUESTS.inc(cache='ooo_index', result='hit')
+        return index
+
+    CACHE_REQUESTS.inc(cache='ooo_index', result='miss')
+    periods = OOOPeriod.objects.filter(
+        user__company_id=company_id,
+        end_date__gte=today,
+    ).values_list('user_id', 'start_date', 'end_date')
+    index = OOOIndex.build(company_id, today, periods)
+    cache.set(key, index, timeout=getattr(settings, 'OOO_INDEX_TIMEOUT', 3600))
+    return index
+
+
+def invalidate_ooo_index(company_id: int | None) -> None:
+    """Drop a company's OOO index now and again after commit."""
+    if company_id is None:
+        return
+    key = _index_key(company_id)
+    cache.delete(key)
+    transaction.on_commit(lambda: cache.delete(key))
+
+
+def invalidate_for_period(sender, instance, **kwargs) -> None:
+    """post_save/post_delete receiver for OOOPeriod."""
+    from apps.timesheets.delegation import invalidate_delegation_graph
+    from apps.users.models import User
+
+    if type(instance).user.is_cached(instance):
+        company_id = instance.user.company_id
+    else:
+        company_id = User.objects.filter(pk=instance.user_id).values_list('company_id', flat=True).first()
+    invalidate_ooo_index(company_id)
+    # Delegation chains pass through OOO delegates
+    invalidate_delegation_graph(company_id)
@@ -0,0 +1,155 @@
+"""
+Approval delegation graph for TimeTrack Pro.
+
+Approve/reject permission checks asked the database whether a delegation
+was active every time. DelegationGraph loads a company's delegations active
+today in one query and answers from dicts of sets:
+
+    graph = get_delegation_graph(company_id)
+    graph.can_approve_for(approver_id, manager_id)   # O(1)
+    graph.delegators_of(delegate_id)                 # direct delegators
+
+With APPROVAL_DELEGATION_CHAINING on, authority passes through delegates
+who are OOO themselves: if A delegates to B, and B is OOO and delegates to
+C, then C can approve for A. Chains follow OOO delegates only, so a manager
+who is at work keeps their delegated approvals to themselves.
+
+Graphs are kept in the shared cache per company and day. Creating or
+revoking a delegation (ApprovalDelegationViewSet create/destroy, the admin)
+drops the company's graph, as does an OOO change, since OOO status decides
+chains. Other dates are answered from the database.
+
+Settings:
+    APPROVAL_DELEGATION_CHAINING: Follow delegations of OOO delegates (default False)
+    DELEGATION_GRAPH_TIMEOUT: Seconds to keep a graph in the cache (default 3600)
+"""
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import date
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from apps.infrastructure.metrics import CACHE_REQUESTS
+
+
+@dataclass(frozen=True)
+class DelegationGraph:
+    """
+    A company's delegations active on one day.
+
+    ``delegates`` and ``delegators`` are the direct edges in each direction;
+    ``approvers`` maps each delegator to everyone who can approve for them.
+    """
+
+    company_id: int
+    as_of: date
+    delegates: dict[int, frozenset[int]]
+    delegators: dict[int, frozenset[int]]
+    approvers: dict[int, frozenset[int]]
+
+    @classmethod
+    def build(
+        cls,
+        company_id: int,
+        as_of: date,
+        edges: Iterable[tuple[int, int]],
+        ooo_users: frozenset[int] | None = None,
+    ) -> 'DelegationGraph':
+        """
+        Args:
+            company_id: Company the delegations belong to
+            as_of: Day the delegations are active on
+            edges: (delegator_id, delegate_id) pairs
+            ooo_users: Users OOO on as_of, to chain through; None disables chaining
+        """
+        delegates: dict[int, set[int]] = {}
+        delegators: dict[int, set[int]] = {}
+        for delegator_id, delegate_id in edges:
+            delegates.setdefault(delegator_id, set()).add(delegate_id)
+            delegators.setdefault(delegate_id, set()).add(delegator_id)
+
+        approvers = {}
+        for delegator_id, direct in delegates.items():
+            reached = set(direct)
+            if ooo_users:
+                pending = [user_id for user_id in direct if user_id in ooo_users]
+                while pending:
+                    for user_id in delegates.get(pending.pop(), ()):
+                        if user_id not in reached:
+                            reached.add(user_id)
+                            if user_id in ooo_users:
+                                pending.append(user_id)
+            reached.discard(delegator_id)
+            approvers[delegator_id] = frozenset(reached)
+
+        return cls(
+            company_id=company_id,
+            as_of=as_of,
+            delegates={key: frozenset(value) for key, value in delegates.items()},
+            delegators={key: frozenset(value) for key, value in delegators.items()},
+            approvers=approvers,
+        )
+
+    def has_delegation(self, delegator_id: int, delegate_id: int) -> bool:
+        """Whether delegator_id delegated directly to delegate_id."""
+        return delegate_id in self.delegates.get(delegator_id, ())
+
+    def can_approve_for(self, approver_id: int, delegator_id: int | None) -> bool:
+        """Whether approver_id holds delegator_id's approval authority, directly or by chain."""
+        return approver_id in self.approvers.get(delegator_id, ())
+
+    def delegators_of(self, delegate_id: int) -> frozenset[int]:
+        """Ids of users who delegated directly to delegate_id."""
+        return self.delegators.get(delegate_id, frozenset())
+
+
+def _graph_key(company_id: int) -> str:
+    return f'delegation:graph:{company_id}'
+
+
+def get_delegation_graph(company_id: int) -> DelegationGraph:
+    """The company's delegation graph for today, from the cache or freshly built."""
+    from apps.timesheets.availability import get_ooo_index
+    from apps.timesheets.models import ApprovalDelegation
+
+    today = date.today()
+    key = _graph_key(company_id)
+    graph = cache.get(key)
+    if graph is not None and graph.as_of == today:
+        CACHE_REQUESTS.inc(cache='delegation_graph', result='hit')
+        return graph
+
+    CACHE_REQUESTS.inc(cache='delegation_graph', result='miss')
+    edges = ApprovalDelegation.objects.filter(
+        delegator__company_id=company_id,
+        start_date__lte=today,
+        end_date__gte=today,
+    ).values_list('delegator_id', 'delegate_id')
+    ooo_users = None
+    if getattr(settings, 'APPROVAL_DELEGATION_CHAINING', False):
+        ooo_users = get_ooo_index(company_id).ooo_users(today)
+    graph = DelegationGraph.build(company_id, today, edges, ooo_users)
+    cache.set(key, graph, timeout=getattr(settings, 'DELEGATION_GRAPH_TIMEOUT', 3600))
+    return graph
+
+
+def invalidate_delegation_graph(company_id: int | None) -> None:
+    """Drop a company's delegation graph now and again after commit."""
+    if company_id is None:
+        return
+    key = _graph_key(company_id)
+    cache.delete(key)
+    transaction.on_commit(lambda: cache.delete(key))
+
+
+def invalidate_for_delegation(sender, instance, **kwargs) -> None:
+    """post_save/post_delete receiver for ApprovalDelegation."""
+    from apps.users.models import User
+
+    if type(instance).delegator.is_cached(instance):
+        company_id = instance.delegator.company_id
+    else:
+        company_id = User.objects.filter(pk=instance.delegator_id).values_list('company_id', flat=True).first()
+    invalidate_delegation_graph(company_id)
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.10 on 2026-10-19 09:00
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('timesheets', '0003_add_approval_delegation'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='timesheet',
+            index=models.Index(fields=['status', 'submitted_at'], name='timesheet_status_submitted_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='oooperiod',
+            index=models.Index(fields=['user', 'start_date', 'end_date'], name='ooo_user_dates_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='approvaldelegation',
+            index=models.Index(
+                fields=['delegate', 'start_date', 'end_date'], name='delegation_delegate_dates_idx',
+            ),
+        ),
+    ]
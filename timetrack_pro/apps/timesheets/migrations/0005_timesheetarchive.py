@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:14
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('timesheets', '0004_hot_query_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TimesheetArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('timesheet_id', models.BigIntegerField(help_text='Primary key of the archived timesheet', unique=True)),
+                ('week_start', models.DateField()),
+                ('status', models.CharField(choices=[('DRAFT', 'Draft'), ('SUBMITTED', 'Submitted'), ('APPROVED', 'Approved'), ('REJECTED', 'Rejected')], max_length=20)),
+                ('total_hours', models.DecimalField(decimal_places=2, max_digits=6)),
+                ('entry_count', models.PositiveIntegerField()),
+                ('storage_path', models.CharField(max_length=255)),
+                ('checksum', models.CharField(help_text='SHA-256 of the compressed file', max_length=64)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_timesheets', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-week_start'],
+                'indexes': [models.Index(fields=['user', 'week_start'], name='archive_user_week_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:39
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def backfill_submitted(apps, schema_editor):
+    """Queue every timesheet already awaiting approval for the next sweep."""
+    Timesheet = apps.get_model('timesheets', 'Timesheet')
+    TimesheetEscalation = apps.get_model('timesheets', 'TimesheetEscalation')
+
+    now = timezone.now()
+    submitted = Timesheet.objects.filter(status='SUBMITTED').values_list('id', 'user__manager_id')
+    TimesheetEscalation.objects.bulk_create(
+        [
+            TimesheetEscalation(timesheet_id=timesheet_id, current_approver_id=manager_id, next_check_at=now)
+            for timesheet_id, manager_id in submitted.iterator()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('timesheets', '0005_timesheetarchive'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TimesheetEscalation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('level', models.PositiveSmallIntegerField(default=0, help_text='Escalations so far')),
+                ('last_escalated_at', models.DateTimeField(blank=True, null=True)),
+                ('next_check_at', models.DateTimeField(blank=True, db_index=True, help_text='When the sweep next evaluates this timesheet; empty when nothing is left to do', null=True)),
+                ('current_approver', models.ForeignKey(blank=True, help_text='Who the timesheet currently waits on; empty once escalated to admins', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='escalated_timesheets', to=settings.AUTH_USER_MODEL)),
+                ('timesheet', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='escalation', to='timesheets.timesheet')),
+            ],
+            options={
+                'ordering': ['next_check_at'],
+            },
+        ),
+        migrations.RunPython(backfill_submitted, migrations.RunPython.noop),
+    ]
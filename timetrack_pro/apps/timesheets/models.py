@@ -47,11 +47,53 @@ class Timesheet(TimeStampedModel):
     class Meta:
         unique_together = ['user', 'week_start']
         ordering = ['-week_start']
+        indexes = [
+            # Escalation checks scan submitted timesheets by age
+            models.Index(fields=['status', 'submitted_at'], name='timesheet_status_submitted_idx'),
+        ]
 
     def __str__(self) -> str:
         return f'{self.user.email} - Week of {self.week_start}'
 
 
+class TimesheetEscalation(TimeStampedModel):
+    """
+    Escalation state of a submitted timesheet.
+
+    Exists while the timesheet is SUBMITTED. The escalation sweep only
+    visits rows whose next_check_at has passed; submitting a timesheet, or
+    an OOO change for its current approver, brings the check forward.
+    """
+
+    timesheet = models.OneToOneField(
+        Timesheet,
+        on_delete=models.CASCADE,
+        related_name='escalation',
+    )
+    current_approver = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='escalated_timesheets',
+        help_text='Who the timesheet currently waits on; empty once escalated to admins',
+    )
+    level = models.PositiveSmallIntegerField(default=0, help_text='Escalations so far')
+    last_escalated_at = models.DateTimeField(null=True, blank=True)
+    next_check_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        db_index=True,
+        help_text='When the sweep next evaluates this timesheet; empty when nothing is left to do',
+    )
+
+    class Meta:
+        ordering = ['next_check_at']
+
+    def __str__(self) -> str:
+        return f'Escalation of timesheet {self.timesheet_id} (level {self.level})'
+
+
 class TimesheetComment(TimeStampedModel):
     """
     Line-item conversation on timesheet rejection.
@@ -106,6 +148,9 @@ class OOOPeriod(TimeStampedModel):
 
     class Meta:
         ordering = ['start_date']
+        indexes = [
+            models.Index(fields=['user', 'start_date', 'end_date'], name='ooo_user_dates_idx'),
+        ]
 
     def __str__(self) -> str:
         return f'{self.user.email} OOO: {self.start_date} to {self.end_date}'
@@ -169,6 +214,11 @@ class ApprovalDelegation(TimeStampedModel):
 
     class Meta:
         ordering = ['-start_date']
+        indexes = [
+            models.Index(
+                fields=['delegate', 'start_date', 'end_date'], name='delegation_delegate_dates_idx',
+            ),
+        ]
 
     def __str__(self) -> str:
         return f'{self.delegator.email} delegated to {self.delegate.email}'
@@ -179,3 +229,34 @@ class ApprovalDelegation(TimeStampedModel):
         if as_of_date is None:
             as_of_date = date.today()
         return self.start_date <= as_of_date <= self.end_date
+
+
+class TimesheetArchive(TimeStampedModel):
+    """
+    Index row for a timesheet moved to cold storage.
+
+    The timesheet, its entries, comments and admin overrides are stored as
+    one gzipped JSON file; this row keeps enough to find and summarise it.
+    """
+
+    timesheet_id = models.BigIntegerField(unique=True, help_text='Primary key of the archived timesheet')
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='archived_timesheets',
+    )
+    week_start = models.DateField()
+    status = models.CharField(max_length=20, choices=Timesheet.Status.choices)
+    total_hours = models.DecimalField(max_digits=6, decimal_places=2)
+    entry_count = models.PositiveIntegerField()
+    storage_path = models.CharField(max_length=255)
+    checksum = models.CharField(max_length=64, help_text='SHA-256 of the compressed file')
+
+    class Meta:
+        ordering = ['-week_start']
+        indexes = [
+            models.Index(fields=['user', 'week_start'], name='archive_user_week_idx'),
+        ]
+
+    def __str__(self) -> str:
+        return f'Archived timesheet {self.timesheet_id} ({self.week_start})'
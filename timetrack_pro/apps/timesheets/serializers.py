@@ -7,6 +7,7 @@ from django.db.models import Sum
 from django.utils import timezone
 from rest_framework import serializers
 
+from apps.companies.context import get_user_tenant_context
 from apps.timeentries.models import TimeEntry
 from apps.timeentries.serializers import TimeEntrySerializer
 from apps.timesheets.models import (
@@ -16,6 +17,7 @@ from apps.timesheets.models import (
     Timesheet,
     TimesheetComment,
 )
+from core.serializers import ValuesSerializer
 
 
 class NestedUserSerializer(serializers.Serializer):
@@ -116,10 +118,20 @@ class TimesheetListSerializer(serializers.ModelSerializer):
             'updated_at',
         ]
 
-    def get_total_hours(self, obj):
-        total = obj.entries.aggregate(total=Sum('hours'))['total']
+    @staticmethod
+    def format_total_hours(total):
         return str(total) if total else '0.00'
 
+    def get_total_hours(self, obj):
+        return self.format_total_hours(obj.entries.aggregate(total=Sum('hours'))['total'])
+
+
+# Fast path for TimesheetViewSet.list; totals come from one annotated query
+timesheet_list_values = ValuesSerializer(
+    TimesheetListSerializer,
+    method_fields={'total_hours': (Sum('entries__hours'), TimesheetListSerializer.format_total_hours)},
+)
+
 
 class TimesheetDetailSerializer(serializers.ModelSerializer):
     """Serializer for timesheet detail with entries."""
@@ -277,8 +289,7 @@ class TimesheetUnlockSerializer(serializers.Serializer):
             )
 
         if timesheet.approved_at:
-            user = timesheet.user
-            unlock_window_days = user.company.settings.unlock_window_days
+            unlock_window_days = get_user_tenant_context(timesheet.user).settings.unlock_window_days
             days_since_approval = (timezone.now() - timesheet.approved_at).days
 
             if days_since_approval > unlock_window_days:
@@ -3,17 +3,40 @@ Services for Timesheet business logic.
 
 Includes:
 - EscalationService: Handles approval chain escalation
+- Escalation state receivers: keep TimesheetEscalation in step with timesheets
 - OOOService: Manages Out-of-Office period constraints
+- DelegationService: Manages approval delegations
+- ReminderService: Finds users due daily/weekly reminders
+- ArchiveService: Moves old locked timesheets to cold storage
 """
-from datetime import date
-from typing import Optional
-
-from django.db.models import Q
+import gzip
+import hashlib
+import json
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Q, QuerySet, Sum
 from django.utils import timezone
 
+from apps.companies.context import get_user_tenant_context
 from apps.companies.models import CompanySettings
+from apps.infrastructure import storage
 from apps.infrastructure.notifications import send_notification
-from apps.timesheets.models import ApprovalDelegation, OOOPeriod, Timesheet
+from apps.timeentries.models import TimeEntry, TimeEntryTombstone
+from apps.timesheets.availability import get_ooo_index
+from apps.timesheets.delegation import get_delegation_graph
+from apps.timesheets.models import (
+    ApprovalDelegation,
+    OOOPeriod,
+    Timesheet,
+    TimesheetArchive,
+    TimesheetComment,
+    TimesheetEscalation,
+)
 from apps.users.models import User
 
 
@@ -26,6 +49,10 @@ class EscalationService:
     - Escalation chain: user.manager → manager.manager → ... → admin notification
     - Skips OOO managers in the chain
     - Notifies admin when chain ends with no available approver
+
+    Progress is kept on the timesheet's TimesheetEscalation: once escalated,
+    the current approver and pending clock are the escalation target's, and
+    next_check_at says when the sweep needs to look again.
     """
 
     @classmethod
@@ -43,12 +70,42 @@ class EscalationService:
         if check_date is None:
             check_date = date.today()
 
+        index = get_ooo_index(user.company_id)
+        if index.covers_date(check_date):
+            return index.is_ooo(user.pk, check_date)
+
         return OOOPeriod.objects.filter(
             user=user,
             start_date__lte=check_date,
             end_date__gte=check_date,
         ).exists()
 
+    @classmethod
+    def get_escalation(cls, timesheet: Timesheet) -> TimesheetEscalation | None:
+        """The timesheet's escalation record, if it has one."""
+        return getattr(timesheet, 'escalation', None)
+
+    @classmethod
+    def get_current_approver(cls, timesheet: Timesheet) -> User | None:
+        """
+        Who the timesheet is waiting on.
+
+        The user's manager until the first escalation, then the escalation
+        target (None once the chain was exhausted and admins notified).
+        """
+        escalation = cls.get_escalation(timesheet)
+        if escalation is not None and escalation.level:
+            return escalation.current_approver
+        return timesheet.user.manager
+
+    @classmethod
+    def get_pending_since(cls, timesheet: Timesheet):
+        """When the current approver started waiting: last escalation or submission."""
+        escalation = cls.get_escalation(timesheet)
+        if escalation is not None and escalation.last_escalated_at:
+            return escalation.last_escalated_at
+        return timesheet.submitted_at
+
     @classmethod
     def is_pending_too_long(cls, timesheet: Timesheet) -> bool:
         """
@@ -60,11 +117,12 @@ class EscalationService:
         Returns:
             True if pending days exceed company threshold, False otherwise
         """
-        if not timesheet.submitted_at:
+        pending_since = cls.get_pending_since(timesheet)
+        if not pending_since:
             return False
 
-        escalation_days = timesheet.user.company.settings.escalation_days
-        days_pending = (timezone.now() - timesheet.submitted_at).days
+        escalation_days = get_user_tenant_context(timesheet.user).settings.escalation_days
+        days_pending = (timezone.now() - pending_since).days
 
         return days_pending > escalation_days
 
@@ -74,8 +132,8 @@ class EscalationService:
         Determine if a timesheet should be escalated.
 
         Uses company's escalation_logic setting:
-        - OR: Escalate if manager is OOO OR pending too long
-        - AND: Escalate only if manager is OOO AND pending too long
+        - OR: Escalate if the current approver is OOO OR pending too long
+        - AND: Escalate only if the current approver is OOO AND pending too long
 
         Args:
             timesheet: The submitted timesheet to check
@@ -86,26 +144,55 @@ class EscalationService:
         if timesheet.status != Timesheet.Status.SUBMITTED:
             return False
 
-        manager = timesheet.user.manager
-        if not manager:
+        approver = cls.get_current_approver(timesheet)
+        if not approver:
             return False
 
-        is_ooo = cls.is_user_ooo(manager)
+        is_ooo = cls.is_user_ooo(approver)
         is_pending = cls.is_pending_too_long(timesheet)
 
-        escalation_logic = timesheet.user.company.settings.escalation_logic
+        escalation_logic = get_user_tenant_context(timesheet.user).settings.escalation_logic
 
         if escalation_logic == CompanySettings.EscalationLogic.OR:
             return is_ooo or is_pending
         else:  # AND logic
             return is_ooo and is_pending
 
+    @classmethod
+    def get_next_check_at(cls, timesheet: Timesheet) -> datetime | None:
+        """
+        Earliest time should_escalate() could turn True without a state change.
+
+        That is when the pending threshold is crossed or the current
+        approver's next OOO period starts. Returns None when neither can
+        happen; submitting again or an OOO change re-queues the timesheet.
+        """
+        approver = cls.get_current_approver(timesheet)
+        if not approver:
+            return None
+
+        now = timezone.now()
+        candidates = []
+
+        pending_since = cls.get_pending_since(timesheet)
+        if pending_since:
+            escalation_days = get_user_tenant_context(timesheet.user).settings.escalation_days
+            threshold = pending_since + timedelta(days=escalation_days + 1)
+            if threshold > now:
+                candidates.append(threshold)
+
+        next_ooo_start = get_ooo_index(approver.company_id).next_start(approver.pk, date.today())
+        if next_ooo_start:
+            candidates.append(timezone.make_aware(datetime.combine(next_ooo_start, time.min)))
+
+        return min(candidates, default=None)
+
     @classmethod
     def get_next_approver(
         cls,
         timesheet: Timesheet,
         current_approver: User
-    ) -> Optional[User]:
+    ) -> User | None:
         """
         Find the next available approver in the chain.
 
@@ -172,8 +259,32 @@ class EscalationService:
             cls._notify_admins(timesheet, context)
             result['admin_notified'] = True
 
+        cls._record_escalation(timesheet, next_approver)
         return result
 
+    @classmethod
+    def _record_escalation(cls, timesheet: Timesheet, next_approver: User | None) -> None:
+        """Move the escalation record on to the new approver and schedule its next check."""
+        escalation = cls.get_escalation(timesheet)
+        if escalation is None:
+            escalation = TimesheetEscalation(timesheet=timesheet)
+            timesheet.escalation = escalation
+
+        escalation.current_approver = next_approver
+        escalation.level += 1
+        escalation.last_escalated_at = timezone.now()
+        # With admins notified there is no one left to escalate to
+        escalation.next_check_at = cls.get_next_check_at(timesheet) if next_approver else None
+        escalation.save()
+
+    @classmethod
+    def schedule_next_check(cls, timesheet: Timesheet) -> None:
+        """Push back the next check of a timesheet that did not need escalating."""
+        TimesheetEscalation.objects.filter(timesheet=timesheet).update(
+            next_check_at=cls.get_next_check_at(timesheet),
+            updated_at=timezone.now(),
+        )
+
     @classmethod
     def _notify_admins(cls, timesheet: Timesheet, context: dict) -> None:
         """
@@ -184,7 +295,7 @@ class EscalationService:
             context: Notification context
         """
         admins = User.objects.filter(
-            company=timesheet.user.company,
+            company_id=timesheet.user.company_id,
             role=User.Role.ADMIN,
             is_active=True,
         )
@@ -200,6 +311,46 @@ class EscalationService:
             )
 
 
+def sync_escalation(sender, instance: Timesheet, created: bool = False, update_fields=None, **kwargs) -> None:
+    """
+    post_save receiver: open an escalation record on submission, drop it
+    once the timesheet leaves SUBMITTED.
+
+    New records are due immediately so the next sweep evaluates them.
+    """
+    if update_fields is not None and 'status' not in update_fields:
+        return
+
+    if instance.status != Timesheet.Status.SUBMITTED:
+        if not created:
+            TimesheetEscalation.objects.filter(timesheet=instance).delete()
+        return
+
+    TimesheetEscalation.objects.get_or_create(
+        timesheet=instance,
+        defaults={
+            'current_approver_id': instance.user.manager_id,
+            'next_check_at': timezone.now(),
+        },
+    )
+
+
+def requeue_for_ooo_change(sender, instance: OOOPeriod, **kwargs) -> None:
+    """post_save/post_delete receiver: re-check timesheets waiting on the OOO user."""
+    TimesheetEscalation.objects.filter(
+        Q(level__gt=0, current_approver_id=instance.user_id)
+        | Q(level=0, timesheet__user__manager_id=instance.user_id)
+    ).update(next_check_at=timezone.now())
+
+
+def requeue_for_settings_change(sender, instance: CompanySettings, **kwargs) -> None:
+    """post_save receiver: escalation rules changed, re-check the company's timesheets."""
+    TimesheetEscalation.objects.filter(
+        Q(level=0) | Q(current_approver__isnull=False),
+        timesheet__user__company_id=instance.company_id,
+    ).update(next_check_at=timezone.now())
+
+
 class OOOService:
     """
     Service for managing Out-of-Office periods.
@@ -236,16 +387,9 @@ class OOOService:
         is_active = start_date <= today <= end_date
         is_future = start_date > today
 
-        active_count = OOOPeriod.objects.filter(
-            user=user,
-            start_date__lte=today,
-            end_date__gte=today,
-        ).count()
-
-        future_count = OOOPeriod.objects.filter(
-            user=user,
-            start_date__gt=today,
-        ).count()
+        periods = get_ooo_index(user.company_id).periods(user.pk)
+        active_count = sum(1 for start, end in periods if start <= today <= end)
+        future_count = sum(1 for start, _ in periods if start > today)
 
         if is_active and active_count >= 1:
             raise ValueError(
@@ -334,8 +478,8 @@ class DelegationService:
         Returns:
             True if active delegation exists, False otherwise
         """
-        if as_of_date is None:
-            as_of_date = date.today()
+        if as_of_date is None or as_of_date == date.today():
+            return get_delegation_graph(delegator.company_id).has_delegation(delegator.pk, delegate.pk)
 
         return ApprovalDelegation.objects.filter(
             delegator=delegator,
@@ -353,6 +497,9 @@ class DelegationService:
         """
         Check if a user can approve a timesheet via delegation.
 
+        Follows chains through OOO delegates when
+        APPROVAL_DELEGATION_CHAINING is on.
+
         Args:
             approver: The user attempting to approve
             timesheet: The timesheet being approved
@@ -360,11 +507,12 @@ class DelegationService:
         Returns:
             True if user has delegation authority, False otherwise
         """
-        employee_manager = timesheet.user.manager
-        if not employee_manager:
+        employee = timesheet.user
+        if not employee.manager_id:
             return False
 
-        return cls.has_active_delegation(employee_manager, approver)
+        graph = get_delegation_graph(employee.company_id)
+        return graph.can_approve_for(approver.pk, employee.manager_id)
 
     @classmethod
     def get_delegators(cls, delegate: User, as_of_date: date = None) -> list[User]:
@@ -378,8 +526,11 @@ class DelegationService:
         Returns:
             List of users who delegated to this user
         """
-        if as_of_date is None:
-            as_of_date = date.today()
+        if as_of_date is None or as_of_date == date.today():
+            delegator_ids = get_delegation_graph(delegate.company_id).delegators_of(delegate.pk)
+            if not delegator_ids:
+                return []
+            return list(User.objects.filter(pk__in=delegator_ids))
 
         delegations = ApprovalDelegation.objects.filter(
             delegate=delegate,
@@ -388,3 +539,209 @@ class DelegationService:
         ).select_related('delegator')
 
         return [d.delegator for d in delegations]
+
+
+class ReminderService:
+    """
+    Finds the users due a daily or weekly reminder.
+
+    Each lookup is one anti-join per company over active users who accept
+    workflow notifications. Users OOO on the day are left out.
+    """
+
+    @classmethod
+    def _recipients(cls, company_id: int) -> QuerySet:
+        return User.objects.filter(
+            company_id=company_id,
+            is_active=True,
+            workflow_notifications_enabled=True,
+        )
+
+    @classmethod
+    def _without_ooo(cls, company_id: int, day: date, user_ids: QuerySet) -> list[int]:
+        index = get_ooo_index(company_id)
+        ooo = index.ooo_users(day) if index.covers_date(day) else frozenset()
+        return [user_id for user_id in user_ids if user_id not in ooo]
+
+    @classmethod
+    def users_missing_entries(cls, company_id: int, day: date) -> list[int]:
+        """
+        Users with no time entry on a day.
+
+        Args:
+            company_id: Company to look in
+            day: The company-local date
+
+        Returns:
+            User ids, ascending
+        """
+        from apps.timeentries.models import TimeEntry
+
+        user_ids = cls._recipients(company_id).filter(
+            ~Exists(TimeEntry.objects.filter(user=OuterRef('pk'), date=day))
+        ).order_by('pk').values_list('pk', flat=True)
+        return cls._without_ooo(company_id, day, user_ids)
+
+    @classmethod
+    def users_with_unsubmitted_timesheet(cls, company_id: int, week_start: date, day: date) -> list[int]:
+        """
+        Users who haven't submitted their timesheet for a week.
+
+        Covers DRAFT timesheets, rejected ones not yet resubmitted, and
+        weeks with no timesheet at all.
+
+        Args:
+            company_id: Company to look in
+            week_start: Start of the week
+            day: The company-local date, for OOO
+
+        Returns:
+            User ids, ascending
+        """
+        submitted = Timesheet.objects.filter(
+            user=OuterRef('pk'),
+            week_start=week_start,
+            status__in=[Timesheet.Status.SUBMITTED, Timesheet.Status.APPROVED],
+        )
+        user_ids = cls._recipients(company_id).filter(
+            ~Exists(submitted)
+        ).order_by('pk').values_list('pk', flat=True)
+        return cls._without_ooo(company_id, day, user_ids)
+
+
+class ArchiveIntegrityError(Exception):
+    """Raised when an archive file does not match its recorded checksum."""
+
+
+class ArchiveService:
+    """
+    Service for moving old timesheets to cold storage.
+
+    Business Rules:
+    - Only approved, locked timesheets are archived
+    - A timesheet is archived once its week is older than
+      TIMESHEET_ARCHIVE_AFTER_YEARS
+    - The timesheet, its entries, comments and admin overrides are written
+      to one gzipped JSON file, then deleted from the hot tables
+    - A TimesheetArchive row is kept for lookup and audit reads
+    - Archived hours leave the time entry table, so entry-based reports
+      no longer include them; the hours summary reports them separately
+      as archived_hours from the TimesheetArchive rows
+    """
+
+    FORMAT_VERSION = 1
+
+    @classmethod
+    def get_cutoff(cls, today: date = None) -> date:
+        """Get the week_start before which timesheets are archived."""
+        if today is None:
+            today = date.today()
+        years = getattr(settings, 'TIMESHEET_ARCHIVE_AFTER_YEARS', 3)
+        try:
+            return today.replace(year=today.year - years)
+        except ValueError:  # Feb 29
+            return today.replace(year=today.year - years, day=28)
+
+    @classmethod
+    def get_archivable(cls, today: date = None) -> QuerySet:
+        """Get locked, approved timesheets older than the retention horizon."""
+        return Timesheet.objects.filter(
+            status=Timesheet.Status.APPROVED,
+            locked_at__isnull=False,
+            week_start__lt=cls.get_cutoff(today),
+        ).order_by('week_start', 'pk')
+
+    @classmethod
+    def get_storage_path(cls, timesheet: Timesheet) -> str:
+        return (
+            f'archives/timesheets/{timesheet.user.company_id}/'
+            f'{timesheet.week_start.year}/{timesheet.pk}.json.gz'
+        )
+
+    @classmethod
+    def build_payload(cls, timesheet: Timesheet) -> dict:
+        """Serialize a timesheet with everything deleted alongside it."""
+        from apps.timesheets.serializers import AdminOverrideSerializer, TimesheetDetailSerializer
+
+        overrides = timesheet.admin_overrides.select_related('admin', 'timesheet__user')
+        return {
+            'format': cls.FORMAT_VERSION,
+            'archived_at': timezone.now(),
+            'timesheet': TimesheetDetailSerializer(timesheet).data,
+            'admin_overrides': AdminOverrideSerializer(overrides, many=True).data,
+        }
+
+    @classmethod
+    def archive_timesheet(cls, timesheet: Timesheet) -> TimesheetArchive:
+        """
+        Archive one timesheet and remove it from the hot tables.
+
+        Args:
+            timesheet: The timesheet to archive
+
+        Returns:
+            The created TimesheetArchive index row
+        """
+        payload = cls.build_payload(timesheet)
+        content = gzip.compress(json.dumps(payload, cls=DjangoJSONEncoder).encode())
+        path = cls.get_storage_path(timesheet)
+
+        if storage.file_exists(path):
+            storage.delete_file(path)
+        saved_path = storage.save_file(path, ContentFile(content))
+
+        entries = timesheet.entries.all()
+        totals = entries.aggregate(total=Sum('hours'))
+
+        try:
+            with transaction.atomic():
+                archive = TimesheetArchive.objects.create(
+                    timesheet_id=timesheet.pk,
+                    user_id=timesheet.user_id,
+                    week_start=timesheet.week_start,
+                    status=timesheet.status,
+                    total_hours=totals['total'] or Decimal('0.00'),
+                    entry_count=len(payload['timesheet']['entries']),
+                    storage_path=saved_path,
+                    checksum=hashlib.sha256(content).hexdigest(),
+                )
+                cls.delete_entries(timesheet)
+                # Comments, overrides and the escalation cascade with the timesheet
+                timesheet.delete()
+        except Exception:
+            storage.delete_file(saved_path)
+            raise
+
+        return archive
+
+    @classmethod
+    def delete_entries(cls, timesheet: Timesheet) -> int:
+        """
+        Delete a timesheet's entries in bulk, leaving tombstones for sync clients.
+
+        A plain queryset delete would send post_delete per entry (a tombstone
+        insert and a data version bump each); the tombstones are written in
+        one insert instead, and the timesheet's own delete bumps the version.
+        Entries are SET_NULL on timesheet delete, so they go first, after
+        the comments that reference them.
+        """
+        entries = TimeEntry.objects.filter(timesheet=timesheet)
+        rows = list(entries.values_list('pk', 'user_id'))
+        TimeEntryTombstone.objects.bulk_create(
+            [TimeEntryTombstone(entry_id=entry_id, user_id=user_id) for entry_id, user_id in rows]
+        )
+        TimesheetComment.objects.filter(entry__in=[entry_id for entry_id, _ in rows]).delete()
+        return entries._raw_delete(entries.db)
+
+    @classmethod
+    def load(cls, archive: TimesheetArchive) -> dict:
+        """
+        Read an archived timesheet back from storage.
+
+        Raises:
+            ArchiveIntegrityError: If the file does not match its checksum
+        """
+        content = storage.read_file(archive.storage_path)
+        if hashlib.sha256(content).hexdigest() != archive.checksum:
+            raise ArchiveIntegrityError(f'Checksum mismatch for {archive.storage_path}')
+        return json.loads(gzip.decompress(content))
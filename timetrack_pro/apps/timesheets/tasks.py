@@ -2,19 +2,29 @@
 Celery tasks for Timesheet automation.
 
 Tasks:
+- dispatch_local_schedules: Hourly; run company-local jobs for companies whose local time is due
 - create_weekly_timesheets: Auto-create timesheets for all users
 - send_timesheet_submitted_notification: Notify manager on submission
 - send_timesheet_approved_notification: Notify user on approval
 - send_timesheet_rejected_notification: Notify user on rejection
+- check_pending_escalations: Escalate timesheets pending too long
+- send_daily_reminders: Remind users with no time logged today
+- send_weekly_reminders: Remind users who haven't submitted this week's timesheet
+- archive_old_timesheets: Move old locked timesheets to cold storage
 """
-from datetime import date, timedelta
+from datetime import date, datetime, time, timedelta
 
 from celery import shared_task
 from celery.utils.log import get_task_logger
+from django.conf import settings
+from django.core.cache import cache
 from django.utils import timezone
 
 logger = get_task_logger(__name__)
 
+# End of the window the last dispatch_local_schedules run covered
+LOCAL_SCHEDULE_CURSOR_KEY = 'schedules:local:cursor'
+
 
 def get_week_start(target_date: date, week_start_day: int) -> date:
     """
@@ -27,18 +37,147 @@ def get_week_start(target_date: date, week_start_day: int) -> date:
     Returns:
         The date of the week start
     """
-    days_since_week_start = (target_date.weekday() - week_start_day) % 7
-    return target_date - timedelta(days=days_since_week_start)
+    return target_date - timedelta(days=day_of_week(target_date, week_start_day))
+
+
+def day_of_week(target_date: date, week_start_day: int) -> int:
+    """Position of a date in its week: 0 on the week start day, 6 on the last day."""
+    return (target_date.weekday() - week_start_day) % 7
 
 
-@shared_task
-def create_weekly_timesheets() -> dict:
+def local_dates_crossed(tzinfo, local_time: time, since: datetime, until: datetime) -> list[date]:
+    """
+    Local dates on which a wall-clock time fell in (since, until].
+
+    Args:
+        tzinfo: pytz timezone
+        local_time: Wall-clock time, e.g. midnight
+        since: Start of the window (aware, exclusive)
+        until: End of the window (aware, inclusive)
+
+    Returns:
+        The dates, oldest first; empty if the time was not crossed
+    """
+    crossed = []
+    day = since.astimezone(tzinfo).date()
+    last = until.astimezone(tzinfo).date()
+    while day <= last:
+        boundary = tzinfo.localize(datetime.combine(day, local_time))
+        if since < boundary <= until:
+            crossed.append(day)
+        day += timedelta(days=1)
+    return crossed
+
+
+@shared_task(ignore_result=True)
+def dispatch_local_schedules() -> dict:
+    """
+    Run company-local jobs for the companies whose local time just crossed them.
+
+    Runs hourly. Weekly timesheets are created at each company's local
+    midnight starting its week, and escalations are checked at
+    ESCALATION_CHECK_LOCAL_HOUR local time, so work spreads over the day
+    instead of hitting every company at once. Daily reminders go out at
+    DAILY_REMINDER_LOCAL_HOUR on the first REMINDER_WORKING_DAYS days of the
+    company's week, and weekly reminders at WEEKLY_REMINDER_LOCAL_HOUR on
+    the last of them. The overtime scan of the previous local day
+    (apps.reports.tasks.scan_overtime) runs at OVERTIME_SCAN_LOCAL_HOUR.
+    Companies are grouped by timezone and each job is queued once per group.
+
+    The window starts where the previous run ended (at most
+    LOCAL_SCHEDULE_MAX_CATCHUP_HOURS back), so a missed hour is caught up
+    rather than skipped. Rollover, escalations and the overtime scan are
+    idempotent; a caught-up reminder is sent late, once.
+
+    Returns:
+        Dict with the company ids each job was queued for
+    """
+    from apps.companies.models import Company
+    from apps.reports.tasks import scan_overtime
+
+    now = timezone.now()
+    max_catchup = timedelta(hours=getattr(settings, 'LOCAL_SCHEDULE_MAX_CATCHUP_HOURS', 24))
+    since = cache.get(LOCAL_SCHEDULE_CURSOR_KEY) or now - timedelta(hours=1)
+    since = max(since, now - max_catchup)
+
+    rollover = time(getattr(settings, 'TIMESHEET_ROLLOVER_LOCAL_HOUR', 0))
+    escalation = time(getattr(settings, 'ESCALATION_CHECK_LOCAL_HOUR', 9))
+    daily_reminder = time(getattr(settings, 'DAILY_REMINDER_LOCAL_HOUR', 17))
+    weekly_reminder = time(getattr(settings, 'WEEKLY_REMINDER_LOCAL_HOUR', 15))
+    working_days = getattr(settings, 'REMINDER_WORKING_DAYS', 5)
+    overtime_scan = time(getattr(settings, 'OVERTIME_SCAN_LOCAL_HOUR', 1))
+
+    by_timezone: dict[str, list[Company]] = {}
+    for company in Company.objects.only('id', 'timezone', 'week_start_day'):
+        by_timezone.setdefault(company.timezone, []).append(company)
+
+    dispatched = {
+        'create_weekly_timesheets': [],
+        'check_pending_escalations': [],
+        'send_daily_reminders': [],
+        'send_weekly_reminders': [],
+        'scan_overtime': [],
+    }
+    for companies in by_timezone.values():
+        tzinfo = companies[0].tzinfo
+        weekdays = {day.weekday() for day in local_dates_crossed(tzinfo, rollover, since, now)}
+        week_starting = [c.id for c in companies if c.week_start_day in weekdays]
+        if week_starting:
+            create_weekly_timesheets.delay(company_ids=week_starting)
+            dispatched['create_weekly_timesheets'] += week_starting
+        if local_dates_crossed(tzinfo, escalation, since, now):
+            company_ids = [c.id for c in companies]
+            check_pending_escalations.delay(company_ids=company_ids)
+            dispatched['check_pending_escalations'] += company_ids
+
+        # Reminders go out on the first REMINDER_WORKING_DAYS days of each company's week
+        reminder_days = local_dates_crossed(tzinfo, daily_reminder, since, now)
+        working = [
+            c.id for c in companies
+            if any(day_of_week(day, c.week_start_day) < working_days for day in reminder_days)
+        ]
+        if working:
+            send_daily_reminders.delay(company_ids=working)
+            dispatched['send_daily_reminders'] += working
+        reminder_days = local_dates_crossed(tzinfo, weekly_reminder, since, now)
+        week_ending = [
+            c.id for c in companies
+            if any(day_of_week(day, c.week_start_day) == working_days - 1 for day in reminder_days)
+        ]
+        if week_ending:
+            send_weekly_reminders.delay(company_ids=week_ending)
+            dispatched['send_weekly_reminders'] += week_ending
+
+        scan_days = local_dates_crossed(tzinfo, overtime_scan, since, now)
+        company_ids = [c.id for c in companies]
+        for day in scan_days:
+            scan_overtime.delay(company_ids=company_ids, day=(day - timedelta(days=1)).isoformat())
+        if scan_days:
+            dispatched['scan_overtime'] += company_ids
+
+    cache.set(LOCAL_SCHEDULE_CURSOR_KEY, now, timeout=None)
+    logger.info(
+        f"Local schedules: rollover={len(dispatched['create_weekly_timesheets'])} companies, "
+        f"escalations={len(dispatched['check_pending_escalations'])} companies, "
+        f"daily reminders={len(dispatched['send_daily_reminders'])} companies, "
+        f"weekly reminders={len(dispatched['send_weekly_reminders'])} companies, "
+        f"overtime scans={len(dispatched['scan_overtime'])} companies"
+    )
+    return dispatched
+
+
+@shared_task(ignore_result=True)
+def create_weekly_timesheets(company_ids: list[int] | None = None) -> dict:
     """
     Create timesheets for all active users for the current week.
 
-    Respects each company's week_start_day setting.
+    Respects each company's week_start_day and timezone: the current week
+    is the one containing the company's local date.
     Skips users who already have a timesheet for the current week.
 
+    Args:
+        company_ids: Only create for these companies (default: all)
+
     Returns:
         Dict with created/skipped/failed counts
     """
@@ -46,18 +185,20 @@ def create_weekly_timesheets() -> dict:
     from apps.users.models import User
 
     now = timezone.now()
-    today = now.date()
 
     stats = {'created': 0, 'skipped': 0, 'failed': 0}
 
     active_users = User.objects.filter(
         is_active=True
     ).select_related('company')
+    if company_ids is not None:
+        active_users = active_users.filter(company_id__in=company_ids)
 
     for user in active_users:
         try:
             week_start_day = user.company.week_start_day
-            week_start = get_week_start(today, week_start_day)
+            local_today = now.astimezone(user.company.tzinfo).date()
+            week_start = get_week_start(local_today, week_start_day)
 
             existing = Timesheet.objects.filter(
                 user=user,
@@ -87,7 +228,7 @@ def create_weekly_timesheets() -> dict:
     return stats
 
 
-@shared_task
+@shared_task(ignore_result=True)
 def send_timesheet_submitted_notification(timesheet_id: int) -> bool:
     """
     Send notification to manager when a timesheet is submitted.
@@ -124,7 +265,7 @@ def send_timesheet_submitted_notification(timesheet_id: int) -> bool:
     return True
 
 
-@shared_task
+@shared_task(ignore_result=True)
 def send_timesheet_approved_notification(timesheet_id: int) -> bool:
     """
     Send notification to user when their timesheet is approved.
@@ -160,7 +301,7 @@ def send_timesheet_approved_notification(timesheet_id: int) -> bool:
     return True
 
 
-@shared_task
+@shared_task(ignore_result=True)
 def send_timesheet_rejected_notification(timesheet_id: int) -> bool:
     """
     Send notification to user when their timesheet is rejected.
@@ -200,40 +341,53 @@ def send_timesheet_rejected_notification(timesheet_id: int) -> bool:
     return True
 
 
-@shared_task
-def check_pending_escalations() -> dict:
+@shared_task(ignore_result=True)
+def check_pending_escalations(company_ids: list[int] | None = None) -> dict:
     """
-    Check all submitted timesheets and escalate where needed.
+    Check submitted timesheets that are due and escalate where needed.
 
     Business Rules:
-    - Only checks timesheets with SUBMITTED status
+    - Only visits timesheets whose escalation next_check_at has passed:
+      newly submitted ones, ones whose approver's OOO changed, and ones
+      whose pending threshold or approver's OOO start has arrived
     - Uses company's escalation_logic (OR/AND) to determine if escalation needed
-    - Executes escalation for qualifying timesheets
+    - Escalates from the current approver, then schedules the next check
+
+    Args:
+        company_ids: Only check these companies' timesheets (default: all)
 
     Returns:
         Dict with checked/escalated/skipped counts
     """
-    from apps.timesheets.models import Timesheet
+    from apps.timesheets.models import Timesheet, TimesheetEscalation
     from apps.timesheets.services import EscalationService
 
     stats = {'checked': 0, 'escalated': 0, 'skipped': 0}
 
-    submitted_timesheets = Timesheet.objects.filter(
-        status=Timesheet.Status.SUBMITTED
-    ).select_related('user', 'user__manager', 'user__company__settings')
-
-    for timesheet in submitted_timesheets:
+    # Read from the primary: the state is what prevents repeat escalations,
+    # so a lagging replica could escalate the same timesheet twice
+    due = TimesheetEscalation.objects.filter(
+        next_check_at__lte=timezone.now(),
+        timesheet__status=Timesheet.Status.SUBMITTED,
+    ).select_related(
+        'current_approver',
+        'timesheet__user__manager',
+        'timesheet__user__company__settings',
+    ).order_by('next_check_at')
+    if company_ids is not None:
+        due = due.filter(timesheet__user__company_id__in=company_ids)
+
+    for escalation in due.iterator(chunk_size=500):
+        timesheet = escalation.timesheet
         stats['checked'] += 1
 
         try:
             if EscalationService.should_escalate(timesheet):
-                manager = timesheet.user.manager
-                if manager:
-                    EscalationService.execute_escalation(timesheet, manager)
-                    stats['escalated'] += 1
-                else:
-                    stats['skipped'] += 1
+                approver = EscalationService.get_current_approver(timesheet)
+                EscalationService.execute_escalation(timesheet, approver)
+                stats['escalated'] += 1
             else:
+                EscalationService.schedule_next_check(timesheet)
                 stats['skipped'] += 1
         except Exception as e:
             logger.error(f"Failed to process escalation for timesheet {timesheet.id}: {e}")
@@ -245,3 +399,107 @@ def check_pending_escalations() -> dict:
     )
 
     return stats
+
+
+def _companies(company_ids: list[int] | None):
+    from apps.companies.models import Company
+
+    companies = Company.objects.only('id', 'timezone', 'week_start_day').order_by('pk')
+    if company_ids is not None:
+        companies = companies.filter(pk__in=company_ids)
+    return companies
+
+
+@shared_task(ignore_result=True)
+def send_daily_reminders(company_ids: list[int] | None = None) -> dict:
+    """
+    Remind users who have logged no time for the company-local day.
+
+    One anti-join per company finds the recipients; they are sent in
+    batches of NOTIFICATION_BATCH_SIZE rather than one task per user.
+
+    Args:
+        company_ids: Only remind these companies' users (default: all)
+
+    Returns:
+        Dict with reminded user and queued batch counts
+    """
+    from apps.infrastructure.notifications import NotificationType, queue_bulk_notifications
+    from apps.timesheets.services import ReminderService
+
+    now = timezone.now()
+    stats = {'reminded': 0, 'batches': 0}
+    for company in _companies(company_ids):
+        local_today = now.astimezone(company.tzinfo).date()
+        user_ids = ReminderService.users_missing_entries(company.id, local_today)
+        stats['reminded'] += len(user_ids)
+        stats['batches'] += queue_bulk_notifications(
+            user_ids, NotificationType.DAILY_REMINDER, {'date': local_today.isoformat()},
+        )
+
+    logger.info(f"Daily reminders: reminded={stats['reminded']}, batches={stats['batches']}")
+    return stats
+
+
+@shared_task(ignore_result=True)
+def send_weekly_reminders(company_ids: list[int] | None = None) -> dict:
+    """
+    Remind users who haven't submitted their timesheet for the current week.
+
+    The week is the one containing the company-local date. Recipients are
+    found and batched as in send_daily_reminders.
+
+    Args:
+        company_ids: Only remind these companies' users (default: all)
+
+    Returns:
+        Dict with reminded user and queued batch counts
+    """
+    from apps.infrastructure.notifications import NotificationType, queue_bulk_notifications
+    from apps.timesheets.services import ReminderService
+
+    now = timezone.now()
+    stats = {'reminded': 0, 'batches': 0}
+    for company in _companies(company_ids):
+        local_today = now.astimezone(company.tzinfo).date()
+        week_start = get_week_start(local_today, company.week_start_day)
+        user_ids = ReminderService.users_with_unsubmitted_timesheet(company.id, week_start, local_today)
+        stats['reminded'] += len(user_ids)
+        stats['batches'] += queue_bulk_notifications(
+            user_ids, NotificationType.WEEKLY_REMINDER, {'week_start': week_start.isoformat()},
+        )
+
+    logger.info(f"Weekly reminders: reminded={stats['reminded']}, batches={stats['batches']}")
+    return stats
+
+
+@shared_task(ignore_result=True)
+def archive_old_timesheets() -> dict:
+    """
+    Archive locked timesheets older than TIMESHEET_ARCHIVE_AFTER_YEARS.
+
+    Processes at most TIMESHEET_ARCHIVE_BATCH_SIZE timesheets per run so a
+    backlog drains over several runs without long-running transactions.
+
+    Returns:
+        Dict with archived/failed counts
+    """
+    from django.conf import settings
+
+    from apps.timesheets.services import ArchiveService
+
+    stats = {'archived': 0, 'failed': 0}
+    batch_size = getattr(settings, 'TIMESHEET_ARCHIVE_BATCH_SIZE', 500)
+
+    timesheets = ArchiveService.get_archivable().select_related('user', 'approved_by')[:batch_size]
+    for timesheet in timesheets:
+        try:
+            ArchiveService.archive_timesheet(timesheet)
+            stats['archived'] += 1
+        except Exception as e:
+            logger.error(f"Failed to archive timesheet {timesheet.id}: {e}")
+            stats['failed'] += 1
+
+    logger.info(f"Timesheet archival: archived={stats['archived']}, failed={stats['failed']}")
+
+    return stats
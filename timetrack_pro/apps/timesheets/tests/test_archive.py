@@ -0,0 +1,223 @@
+"""
+Tests for timesheet cold-storage archival.
+"""
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from django.test import override_settings
+from django.utils import timezone
+
+from apps.timeentries.models import TimeEntry
+from apps.timesheets.models import Timesheet, TimesheetArchive, TimesheetComment
+
+
+@pytest.fixture(autouse=True)
+def archive_storage(tmp_path, settings):
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
+
+
+@pytest.fixture
+def old_timesheet(user, project, manager, timesheet_factory):
+    """An approved, locked timesheet from five years ago with one entry and comment."""
+    timesheet = timesheet_factory(
+        user=user,
+        week_start=date(2021, 3, 1),
+        status=Timesheet.Status.APPROVED,
+        approved_by=manager,
+        approved_at=timezone.now(),
+        locked_at=timezone.now(),
+    )
+    entry = TimeEntry.objects.create(
+        user=user, project=project, timesheet=timesheet, date=date(2021, 3, 2),
+        hours=Decimal('7.50'), billing_rate=Decimal('100.00'),
+        rate_source=TimeEntry.RateSource.PROJECT,
+    )
+    TimesheetComment.objects.create(timesheet=timesheet, entry=entry, author=manager, text='Looks good')
+    return timesheet
+
+
+@pytest.mark.django_db
+class TestArchiveService:
+    """Tests for ArchiveService."""
+
+    def test_only_locked_approved_past_horizon_are_archivable(self, user, timesheet_factory, old_timesheet):
+        """
+        Given: An old locked timesheet, an old unlocked one and a recent locked one
+        When: Listing archivable timesheets with a 3 year horizon
+        Then: Only the old locked timesheet qualifies
+        """
+        from apps.timesheets.services import ArchiveService
+
+        timesheet_factory(user=user, week_start=date(2021, 3, 8), status=Timesheet.Status.APPROVED)
+        timesheet_factory(
+            user=user, week_start=date(2025, 3, 3),
+            status=Timesheet.Status.APPROVED, locked_at=timezone.now(),
+        )
+
+        with override_settings(TIMESHEET_ARCHIVE_AFTER_YEARS=3):
+            archivable = list(ArchiveService.get_archivable(date(2026, 10, 19)))
+
+        assert archivable == [old_timesheet]
+
+    def test_archive_moves_rows_out_of_hot_tables(self, old_timesheet):
+        """
+        Given: An old locked timesheet with entries and comments
+        When: Archiving it
+        Then: Hot rows are deleted and a compact index row remains
+        """
+        from apps.timesheets.services import ArchiveService
+
+        timesheet_id = old_timesheet.pk
+
+        archive = ArchiveService.archive_timesheet(old_timesheet)
+
+        assert not Timesheet.objects.filter(pk=timesheet_id).exists()
+        assert not TimeEntry.objects.filter(timesheet_id=timesheet_id).exists()
+        assert not TimesheetComment.objects.filter(timesheet_id=timesheet_id).exists()
+        assert archive.timesheet_id == timesheet_id
+        assert archive.total_hours == Decimal('7.50')
+        assert archive.entry_count == 1
+        assert archive.storage_path.endswith('.json.gz')
+
+    def test_entries_deleted_in_bulk_with_tombstones(self, user, project, old_timesheet):
+        """
+        Given: An old timesheet with three entries
+        When: Archiving it
+        Then: Each entry gets a tombstone without a post_delete per entry
+        """
+        from unittest.mock import MagicMock
+
+        from django.db.models.signals import post_delete
+
+        from apps.timeentries.models import TimeEntryTombstone
+        from apps.timesheets.services import ArchiveService
+
+        for day in (3, 4):
+            TimeEntry.objects.create(
+                user=user, project=project, timesheet=old_timesheet, date=date(2021, 3, day),
+                hours=Decimal('1.00'), billing_rate=Decimal('100.00'),
+                rate_source=TimeEntry.RateSource.PROJECT,
+            )
+        entry_ids = set(old_timesheet.entries.values_list('pk', flat=True))
+        receiver = MagicMock()
+        post_delete.connect(receiver, sender=TimeEntry, weak=False)
+        try:
+            ArchiveService.archive_timesheet(old_timesheet)
+        finally:
+            post_delete.disconnect(receiver, sender=TimeEntry)
+
+        receiver.assert_not_called()
+        assert set(TimeEntryTombstone.objects.filter(user=user).values_list('entry_id', flat=True)) == entry_ids
+
+    def test_failed_delete_removes_stored_file(self, old_timesheet, archive_storage):
+        """
+        Given: Deleting the hot rows fails after the file was stored
+        When: Archiving
+        Then: The transaction rolls back and the file is removed
+        """
+        from unittest.mock import patch
+
+        from apps.timesheets.services import ArchiveService
+
+        with patch.object(ArchiveService, 'delete_entries', side_effect=RuntimeError('boom')), \
+                pytest.raises(RuntimeError):
+            ArchiveService.archive_timesheet(old_timesheet)
+
+        assert Timesheet.objects.filter(pk=old_timesheet.pk).exists()
+        assert not TimesheetArchive.objects.exists()
+        assert not [path for path in archive_storage.rglob('*') if path.is_file()]
+
+    def test_load_round_trips_payload(self, old_timesheet):
+        """
+        Given: An archived timesheet
+        When: Loading it back
+        Then: Entries and comments are intact
+        """
+        from apps.timesheets.services import ArchiveService
+
+        archive = ArchiveService.archive_timesheet(old_timesheet)
+
+        payload = ArchiveService.load(archive)
+
+        assert payload['timesheet']['id'] == archive.timesheet_id
+        assert payload['timesheet']['entries'][0]['hours'] == '7.50'
+        assert payload['timesheet']['comments'][0]['text'] == 'Looks good'
+
+    def test_load_detects_tampering(self, old_timesheet, archive_storage):
+        """A modified archive file fails its checksum."""
+        from apps.timesheets.services import ArchiveIntegrityError, ArchiveService
+
+        archive = ArchiveService.archive_timesheet(old_timesheet)
+        (archive_storage / archive.storage_path).write_bytes(b'tampered')
+
+        with pytest.raises(ArchiveIntegrityError):
+            ArchiveService.load(archive)
+
+    def test_task_archives_batch(self, old_timesheet):
+        """The nightly task archives eligible timesheets."""
+        from apps.timesheets.tasks import archive_old_timesheets
+
+        result = archive_old_timesheets()
+
+        assert result == {'archived': 1, 'failed': 0}
+        assert TimesheetArchive.objects.filter(timesheet_id=old_timesheet.pk).exists()
+
+
+@pytest.mark.django_db
+class TestArchivedHoursInReports:
+    """Archived hours are reported separately by the hours summary."""
+
+    def test_hours_summary_reports_archived_hours(self, authenticated_admin_client, old_timesheet):
+        """
+        Given: An archived week of 7.5 hours
+        When: GET /reports/hours/summary/ over a range overlapping it, and one after it
+        Then: The overlapping range reports it as archived_hours, the later one doesn't
+        """
+        from apps.timesheets.services import ArchiveService
+
+        ArchiveService.archive_timesheet(old_timesheet)
+        url = '/api/v1/reports/hours/summary/'
+
+        overlapping = authenticated_admin_client.get(url, {'start_date': '2021-03-03', 'end_date': '2021-03-31'})
+        later = authenticated_admin_client.get(url, {'start_date': '2021-03-08', 'end_date': '2021-03-31'})
+
+        assert overlapping.data['total_hours'] == '0.00'
+        assert (overlapping.data['archived_hours'], overlapping.data['archived_timesheet_count']) == ('7.50', 1)
+        assert (later.data['archived_hours'], later.data['archived_timesheet_count']) == ('0.00', 0)
+
+
+@pytest.mark.django_db
+class TestArchivedTimesheetRetrieve:
+    """Tests for reading archived timesheets through the API."""
+
+    def test_owner_reads_archived_timesheet(self, authenticated_client, old_timesheet):
+        """
+        Given: An archived timesheet
+        When: Its owner retrieves it by the original id
+        Then: The archived detail is returned and flagged
+        """
+        from apps.timesheets.services import ArchiveService
+
+        timesheet_id = old_timesheet.pk
+        ArchiveService.archive_timesheet(old_timesheet)
+
+        response = authenticated_client.get(f'/api/v1/timesheets/{timesheet_id}/')
+
+        assert response.status_code == 200
+        assert response.data['archived'] is True
+        assert response.data['total_hours'] == '7.50'
+        assert len(response.data['entries']) == 1
+
+    def test_other_user_cannot_read_archive(self, api_client, user_factory, old_timesheet):
+        """Archived timesheets keep the same access rules."""
+        from apps.timesheets.services import ArchiveService
+
+        timesheet_id = old_timesheet.pk
+        ArchiveService.archive_timesheet(old_timesheet)
+        api_client.force_authenticate(user=user_factory())
+
+        response = api_client.get(f'/api/v1/timesheets/{timesheet_id}/')
+
+        assert response.status_code == 404
@@ -0,0 +1,138 @@
+"""
+Tests for the OOO availability index.
+"""
+from datetime import date, timedelta
+
+import pytest
+
+from apps.timesheets.models import OOOPeriod
+
+
+class TestOOOIndex:
+    """Tests for interval lookups on a built index."""
+
+    def _index(self, periods, as_of=date(2026, 3, 1)):
+        from apps.timesheets.availability import OOOIndex
+
+        return OOOIndex.build(company_id=1, as_of=as_of, periods=periods)
+
+    def test_is_ooo_includes_both_ends(self):
+        """
+        Given: A period from the 5th to the 9th
+        When: Checking days around it
+        Then: Only the 5th to the 9th inclusive are OOO
+        """
+        index = self._index([(7, date(2026, 3, 5), date(2026, 3, 9))])
+
+        assert not index.is_ooo(7, date(2026, 3, 4))
+        assert index.is_ooo(7, date(2026, 3, 5))
+        assert index.is_ooo(7, date(2026, 3, 9))
+        assert not index.is_ooo(7, date(2026, 3, 10))
+        assert not index.is_ooo(8, date(2026, 3, 6))
+
+    def test_overlapping_periods(self):
+        """
+        Given: A long period containing a later short one
+        When: Checking a day after the short one ended
+        Then: The long period still counts
+        """
+        index = self._index([
+            (7, date(2026, 3, 1), date(2026, 3, 20)),
+            (7, date(2026, 3, 5), date(2026, 3, 6)),
+        ])
+
+        assert index.is_ooo(7, date(2026, 3, 10))
+        assert index.ooo_users(date(2026, 3, 10)) == {7}
+
+    def test_ooo_users_by_day(self):
+        """
+        Given: Periods for several users
+        When: Asking who is OOO on given days
+        Then: Each day returns the users covering it
+        """
+        index = self._index([
+            (1, date(2026, 3, 2), date(2026, 3, 4)),
+            (2, date(2026, 3, 3), date(2026, 3, 8)),
+            (3, date(2026, 3, 10), date(2026, 3, 10)),
+        ])
+
+        assert index.ooo_users(date(2026, 3, 1)) == set()
+        assert index.ooo_users(date(2026, 3, 3)) == {1, 2}
+        assert index.ooo_users(date(2026, 3, 5)) == {2}
+        assert index.ooo_users(date(2026, 3, 10)) == {3}
+        assert index.ooo_users(date(2026, 3, 11)) == set()
+
+    def test_next_start(self):
+        """
+        Given: An active and a future period
+        When: Asking for the next start after today
+        Then: The future period's start is returned
+        """
+        index = self._index([
+            (7, date(2026, 2, 27), date(2026, 3, 2)),
+            (7, date(2026, 3, 12), date(2026, 3, 15)),
+        ])
+
+        assert index.next_start(7, date(2026, 3, 1)) == date(2026, 3, 12)
+        assert index.next_start(7, date(2026, 3, 12)) is None
+        assert index.next_start(8, date(2026, 3, 1)) is None
+
+
+@pytest.mark.django_db
+class TestOOOIndexCache:
+    """Tests for loading and invalidating the cached index."""
+
+    def test_index_is_loaded_once(self, user, manager, django_assert_num_queries):
+        """
+        Given: A manager with an active OOO period
+        When: Checking OOO status repeatedly
+        Then: Only the first check queries the database
+        """
+        from apps.timesheets.services import EscalationService
+
+        OOOPeriod.objects.create(
+            user=manager,
+            start_date=date.today(),
+            end_date=date.today() + timedelta(days=3),
+        )
+        assert EscalationService.is_user_ooo(manager) is True
+
+        with django_assert_num_queries(0):
+            assert EscalationService.is_user_ooo(manager) is True
+            assert EscalationService.is_user_ooo(user) is False
+
+    def test_past_dates_fall_back_to_database(self, manager):
+        """
+        Given: A period that ended last week
+        When: Checking a day inside it
+        Then: The database answers, since the index holds no ended periods
+        """
+        from apps.timesheets.services import EscalationService
+
+        OOOPeriod.objects.create(
+            user=manager,
+            start_date=date.today() - timedelta(days=10),
+            end_date=date.today() - timedelta(days=7),
+        )
+
+        assert EscalationService.is_user_ooo(manager, date.today() - timedelta(days=8)) is True
+        assert EscalationService.is_user_ooo(manager) is False
+
+    def test_create_and_destroy_invalidate(self, authenticated_client, user):
+        """
+        Given: A warm index for the user's company
+        When: Creating then cancelling an OOO period through the API
+        Then: Each change is visible on the next check
+        """
+        from apps.timesheets.availability import get_ooo_index
+
+        assert not get_ooo_index(user.company_id).is_ooo(user.pk, date.today())
+
+        response = authenticated_client.post('/api/v1/ooo-periods/', {
+            'start_date': str(date.today()),
+            'end_date': str(date.today() + timedelta(days=2)),
+        })
+        assert get_ooo_index(user.company_id).is_ooo(user.pk, date.today())
+
+        authenticated_client.delete(f'/api/v1/ooo-periods/{response.data["id"]}/')
+        assert not get_ooo_index(user.company_id).is_ooo(user.pk, date.today())
@@ -0,0 +1,133 @@
+"""
+Tests for the approval delegation graph.
+"""
+from datetime import date, timedelta
+
+import pytest
+
+from apps.timesheets.models import ApprovalDelegation, OOOPeriod, Timesheet
+
+
+class TestDelegationGraph:
+    """Tests for lookups on a built graph."""
+
+    def _graph(self, edges, ooo_users=None):
+        from apps.timesheets.delegation import DelegationGraph
+
+        return DelegationGraph.build(1, date(2026, 3, 1), edges, ooo_users)
+
+    def test_direct_delegation(self):
+        """
+        Given: A delegates to B
+        When: Asking who can approve for whom
+        Then: B can approve for A, not the other way round
+        """
+        graph = self._graph([(1, 2)])
+
+        assert graph.has_delegation(1, 2)
+        assert graph.can_approve_for(2, 1)
+        assert not graph.can_approve_for(1, 2)
+        assert graph.delegators_of(2) == {1}
+        assert not graph.can_approve_for(2, None)
+
+    def test_chaining_disabled(self):
+        """
+        Given: A delegates to B, B delegates to C, chaining off
+        When: Asking whether C can approve for A
+        Then: It cannot
+        """
+        graph = self._graph([(1, 2), (2, 3)])
+
+        assert not graph.can_approve_for(3, 1)
+
+    def test_chain_follows_ooo_delegates_only(self):
+        """
+        Given: A → B → C → D, with B OOO and C at work
+        When: Asking who can approve for A
+        Then: B and C can, D cannot
+        """
+        graph = self._graph([(1, 2), (2, 3), (3, 4)], ooo_users=frozenset({2}))
+
+        assert graph.approvers[1] == {2, 3}
+
+    def test_cycles_terminate(self):
+        """
+        Given: A and B delegate to each other and both are OOO
+        When: Building the graph
+        Then: Each can approve for the other but not for themselves
+        """
+        graph = self._graph([(1, 2), (2, 1)], ooo_users=frozenset({1, 2}))
+
+        assert graph.approvers == {1: {2}, 2: {1}}
+
+
+@pytest.mark.django_db
+class TestDelegationGraphCache:
+    """Tests for loading and invalidating the cached graph."""
+
+    def test_approve_check_uses_cached_graph(self, user, manager, user_factory, django_assert_num_queries):
+        """
+        Given: An active delegation, already loaded once
+        When: Checking delegated approval again
+        Then: No queries are issued
+        """
+        from apps.timesheets.services import DelegationService
+        from apps.users.models import User
+
+        delegate = user_factory(role=User.Role.MANAGER)
+        ApprovalDelegation.objects.create(
+            delegator=manager, delegate=delegate,
+            start_date=date.today(), end_date=date.today() + timedelta(days=3),
+        )
+        timesheet = Timesheet.objects.create(user=user, week_start=date(2024, 6, 10))
+        assert DelegationService.can_approve_via_delegation(delegate, timesheet)
+
+        with django_assert_num_queries(0):
+            assert DelegationService.can_approve_via_delegation(delegate, timesheet)
+            assert DelegationService.has_active_delegation(manager, delegate)
+
+    def test_create_and_destroy_invalidate(self, authenticated_manager_client, manager, user_factory):
+        """
+        Given: A warm graph for the manager's company
+        When: Creating then revoking a delegation through the API
+        Then: Each change is visible on the next check
+        """
+        from apps.timesheets.delegation import get_delegation_graph
+        from apps.users.models import User
+
+        delegate = user_factory(role=User.Role.MANAGER)
+        assert not get_delegation_graph(manager.company_id).has_delegation(manager.pk, delegate.pk)
+
+        response = authenticated_manager_client.post('/api/v1/delegations/', {
+            'delegate_id': delegate.pk,
+            'start_date': str(date.today()),
+            'end_date': str(date.today() + timedelta(days=2)),
+        })
+        assert get_delegation_graph(manager.company_id).has_delegation(manager.pk, delegate.pk)
+
+        authenticated_manager_client.delete(f'/api/v1/delegations/{response.data["id"]}/')
+        assert not get_delegation_graph(manager.company_id).has_delegation(manager.pk, delegate.pk)
+
+    def test_chained_approval_through_ooo_delegate(self, settings, user, manager, user_factory):
+        """
+        Given: Chaining on, manager delegates to B, B delegates to C
+        When: B goes OOO
+        Then: C can approve the manager's reports' timesheets
+        """
+        from apps.timesheets.services import DelegationService
+        from apps.users.models import User
+
+        settings.APPROVAL_DELEGATION_CHAINING = True
+        second = user_factory(role=User.Role.MANAGER)
+        third = user_factory(role=User.Role.MANAGER)
+        for delegator, delegate in ((manager, second), (second, third)):
+            ApprovalDelegation.objects.create(
+                delegator=delegator, delegate=delegate,
+                start_date=date.today(), end_date=date.today() + timedelta(days=3),
+            )
+        timesheet = Timesheet.objects.create(user=user, week_start=date(2024, 6, 10))
+        assert not DelegationService.can_approve_via_delegation(third, timesheet)
+
+        OOOPeriod.objects.create(user=second, start_date=date.today(), end_date=date.today())
+
+        assert DelegationService.can_approve_via_delegation(third, timesheet)
@@ -677,3 +677,122 @@ class TestOOOPeriodConstraints:
         )
 
         assert future_ooo.pk is not None
+
+
+@pytest.mark.django_db
+class TestEscalationState:
+    """Tests for per-timesheet escalation state and the due-only sweep."""
+
+    def _submit(self, user, days_ago=0):
+        return Timesheet.objects.create(
+            user=user,
+            week_start=date(2024, 6, 10),
+            status=Timesheet.Status.SUBMITTED,
+            submitted_at=timezone.now() - timedelta(days=days_ago),
+        )
+
+    def test_submission_opens_due_record(self, user, manager):
+        """
+        Given: A timesheet is submitted
+        When: Looking at its escalation record
+        Then: It waits on the manager at level 0 and is due now
+        """
+        timesheet = self._submit(user)
+
+        escalation = timesheet.escalation
+        assert escalation.current_approver == manager
+        assert escalation.level == 0
+        assert escalation.next_check_at <= timezone.now()
+
+    def test_leaving_submitted_drops_record(self, user, manager):
+        """
+        Given: A submitted timesheet
+        When: It is approved
+        Then: Its escalation record is removed
+        """
+        from apps.timesheets.models import TimesheetEscalation
+
+        timesheet = self._submit(user)
+        timesheet.status = Timesheet.Status.APPROVED
+        timesheet.save()
+
+        assert not TimesheetEscalation.objects.filter(timesheet=timesheet).exists()
+
+    @patch('apps.infrastructure.notifications.send_notification.delay')
+    def test_escalates_once_and_records_target(self, mock_notify, user, manager, user_factory):
+        """
+        Given: A timesheet pending too long
+        When: The sweep runs twice
+        Then: The senior manager is notified once and recorded as approver
+        """
+        from apps.timesheets.tasks import check_pending_escalations
+        from apps.users.models import User
+
+        user.company.settings.escalation_logic = CompanySettings.EscalationLogic.OR
+        user.company.settings.escalation_days = 3
+        user.company.settings.save()
+        senior_manager = user_factory(role=User.Role.MANAGER)
+        manager.manager = senior_manager
+        manager.save()
+        timesheet = self._submit(user, days_ago=5)
+
+        first = check_pending_escalations()
+        second = check_pending_escalations()
+
+        assert first['escalated'] == 1
+        assert second['checked'] == 0
+        mock_notify.assert_called_once()
+        escalation = timesheet.escalation
+        escalation.refresh_from_db()
+        assert escalation.current_approver == senior_manager
+        assert escalation.level == 1
+        assert escalation.last_escalated_at is not None
+        assert escalation.next_check_at > timezone.now() + timedelta(days=3)
+
+    def test_not_due_until_threshold(self, user, manager):
+        """
+        Given: A fresh submission checked once
+        When: Looking at its next check
+        Then: It is scheduled for when the pending threshold is crossed
+        """
+        from apps.timesheets.tasks import check_pending_escalations
+
+        user.company.settings.escalation_days = 3
+        user.company.settings.save()
+        timesheet = self._submit(user)
+
+        first = check_pending_escalations()
+        second = check_pending_escalations()
+
+        assert first == {'checked': 1, 'escalated': 0, 'skipped': 1}
+        assert second['checked'] == 0
+        timesheet.escalation.refresh_from_db()
+        assert timesheet.escalation.next_check_at == timesheet.submitted_at + timedelta(days=4)
+
+    @patch('apps.infrastructure.notifications.send_notification.delay')
+    def test_approver_ooo_requeues(self, mock_notify, user, manager, admin):
+        """
+        Given: A scheduled timesheet under OR logic
+        When: The manager goes OOO
+        Then: The next sweep escalates it, to admins once the chain is exhausted
+        """
+        from apps.timesheets.tasks import check_pending_escalations
+
+        user.company.settings.escalation_logic = CompanySettings.EscalationLogic.OR
+        user.company.settings.escalation_days = 3
+        user.company.settings.save()
+        timesheet = self._submit(user)
+        check_pending_escalations()
+
+        OOOPeriod.objects.create(
+            user=manager,
+            start_date=date.today(),
+            end_date=date.today() + timedelta(days=5),
+        )
+        result = check_pending_escalations()
+
+        assert result['escalated'] == 1
+        timesheet.escalation.refresh_from_db()
+        assert timesheet.escalation.current_approver is None
+        assert timesheet.escalation.next_check_at is None
+        assert check_pending_escalations()['checked'] == 0
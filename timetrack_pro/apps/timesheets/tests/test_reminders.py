@@ -0,0 +1,151 @@
+"""
+Tests for daily and weekly reminders.
+
+Reminders go to active users who accept workflow notifications and are not
+OOO: daily when no time is logged for the local day, weekly when the
+week's timesheet hasn't been submitted.
+"""
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+import pytz
+from django.utils import timezone
+
+from apps.timesheets.models import OOOPeriod, Timesheet
+
+
+@pytest.mark.django_db
+class TestReminderService:
+    """Tests for recipient lookups."""
+
+    def test_users_missing_entries(self, company, user_factory, project, django_assert_num_queries):
+        """
+        Given: Users with and without entries today, one opted out, one OOO, one inactive
+        When: Looking up who to remind
+        Then: Only the user with nothing logged who can be reminded is returned, in one query plus the OOO index
+        """
+        from apps.timeentries.models import TimeEntry
+        from apps.timesheets.services import ReminderService
+
+        today = date.today()
+        missing = user_factory(company=company)
+        logged = user_factory(company=company)
+        user_factory(company=company, workflow_notifications_enabled=False)
+        user_factory(company=company, is_active=False)
+        away = user_factory(company=company)
+        OOOPeriod.objects.create(user=away, start_date=today, end_date=today)
+        TimeEntry.objects.create(
+            user=logged, project=project, date=today, hours=Decimal('1.00'),
+            billing_rate=Decimal('100.00'), rate_source=TimeEntry.RateSource.PROJECT,
+        )
+
+        with django_assert_num_queries(2):
+            assert ReminderService.users_missing_entries(company.id, today) == [missing.id]
+
+    def test_users_with_unsubmitted_timesheet(self, company, user_factory):
+        """
+        Given: Users with a draft, a submitted, a rejected and no timesheet
+        When: Looking up who to remind for the week
+        Then: All but the submitted one are returned
+        """
+        from apps.timesheets.services import ReminderService
+
+        week_start = date(2024, 6, 10)
+        users = {status: user_factory(company=company) for status in ('DRAFT', 'SUBMITTED', 'REJECTED', None)}
+        for status, user in users.items():
+            if status:
+                Timesheet.objects.create(user=user, week_start=week_start, status=status)
+
+        result = ReminderService.users_with_unsubmitted_timesheet(company.id, week_start, week_start + timedelta(days=4))
+
+        assert result == sorted(users[status].id for status in ('DRAFT', 'REJECTED', None))
+
+
+@pytest.mark.django_db
+class TestReminderTasks:
+    """Tests for send_daily_reminders / send_weekly_reminders."""
+
+    def test_daily_reminders_are_batched(self, settings, company, user_factory):
+        """
+        Given: Five users with no entries and a batch size of two
+        When: send_daily_reminders runs
+        Then: Three batch tasks are queued covering all five users
+        """
+        from apps.timesheets.tasks import send_daily_reminders
+
+        settings.NOTIFICATION_BATCH_SIZE = 2
+        user_ids = sorted(user_factory(company=company).id for _ in range(5))
+
+        with patch('apps.infrastructure.notifications.send_notification_batch.apply_async') as apply_async:
+            result = send_daily_reminders(company_ids=[company.id])
+
+        assert result == {'reminded': 5, 'batches': 3}
+        batches = [call.args[0] for call in apply_async.call_args_list]
+        assert [user_id for batch, _, _ in batches for user_id in batch] == user_ids
+        assert {notification_type for _, notification_type, _ in batches} == {'daily_reminder'}
+
+    def test_batch_task_sends_one_email_per_user(self, company, user_factory):
+        """
+        Given: A batch of three users, one of whom opted out
+        When: send_notification_batch runs
+        Then: Two reminder emails are sent
+        """
+        from django.core import mail
+
+        from apps.infrastructure.notifications import send_notification_batch
+
+        users = [user_factory(company=company) for _ in range(2)]
+        users.append(user_factory(company=company, workflow_notifications_enabled=False))
+
+        result = send_notification_batch.apply(args=([u.id for u in users], 'weekly_reminder', {}))
+
+        assert result.get() == 2
+        assert sorted(message.to[0] for message in mail.outbox) == sorted(u.email for u in users[:2])
+
+
+@pytest.mark.django_db
+class TestReminderDispatch:
+    """Tests for reminders in the company-local scheduler."""
+
+    def _dispatch(self, now):
+        from apps.timesheets.tasks import dispatch_local_schedules
+
+        with patch('apps.timesheets.tasks.timezone.now', return_value=now), \
+                patch('apps.timesheets.tasks.create_weekly_timesheets.delay'), \
+                patch('apps.timesheets.tasks.check_pending_escalations.delay'), \
+                patch('apps.timesheets.tasks.send_daily_reminders.delay') as daily, \
+                patch('apps.timesheets.tasks.send_weekly_reminders.delay') as weekly, \
+                patch('apps.reports.tasks.scan_overtime.delay'):
+            dispatch_local_schedules()
+        return daily, weekly
+
+    def test_daily_reminder_on_working_days_only(self, settings, company_factory):
+        """
+        Given: A Monday-start company in UTC, reminders at 17:00 on five working days
+        When: Dispatching at 17:05 on Wednesday and on Saturday
+        Then: Only Wednesday queues a daily reminder
+        """
+        settings.DAILY_REMINDER_LOCAL_HOUR = 17
+        company = company_factory(timezone='UTC', week_start_day=0)
+
+        daily, _ = self._dispatch(pytz.UTC.localize(timezone.datetime(2024, 6, 12, 17, 5)))
+        daily.assert_called_once_with(company_ids=[company.id])
+
+        daily, _ = self._dispatch(pytz.UTC.localize(timezone.datetime(2024, 6, 15, 17, 5)))
+        daily.assert_not_called()
+
+    def test_weekly_reminder_on_last_working_day(self, settings, company_factory):
+        """
+        Given: A Sunday-start company in UTC
+        When: Dispatching at 15:05 on Thursday (its fifth working day)
+        Then: Its weekly reminder is queued
+        """
+        settings.WEEKLY_REMINDER_LOCAL_HOUR = 15
+        company = company_factory(timezone='UTC', week_start_day=6)
+        company_factory(timezone='UTC', week_start_day=0)
+
+        _, weekly = self._dispatch(pytz.UTC.localize(timezone.datetime(2024, 6, 13, 15, 5)))
+
+        weekly.assert_called_once_with(company_ids=[company.id])
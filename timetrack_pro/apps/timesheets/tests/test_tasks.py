@@ -2,6 +2,7 @@
 Tests for Timesheet Celery tasks - TDD approach.
 
 Tasks:
+- dispatch_local_schedules: Queue company-local jobs for companies whose local time is due
 - create_weekly_timesheets: Auto-create timesheets for all users at week start
 - send_timesheet_submitted_notification: Notify manager when timesheet submitted
 - send_timesheet_approved_notification: Notify user when timesheet approved
@@ -156,6 +157,124 @@ class TestCreateWeeklyTimesheetsTask:
         assert result['skipped'] == 1
 
 
+    def test_uses_company_local_date(self, user_factory, company_factory):
+        """
+        Given: A company in Pacific/Auckland (UTC+12)
+        When: Running the task at Sunday 13:00 UTC (Monday 01:00 local)
+        Then: The timesheet is for the week starting that local Monday
+        """
+        from apps.timesheets.tasks import create_weekly_timesheets
+
+        user = user_factory(company=company_factory(timezone='Pacific/Auckland'))
+
+        with patch('apps.timesheets.tasks.timezone.now') as mock_now:
+            mock_now.return_value = timezone.make_aware(
+                timezone.datetime(2024, 6, 9, 13, 0, 0),  # Sunday
+                pytz.UTC
+            )
+            create_weekly_timesheets()
+
+        assert Timesheet.objects.get(user=user).week_start == date(2024, 6, 10)
+
+    def test_limits_to_company_ids(self, user_factory, company_factory):
+        """
+        Given: Users in two companies
+        When: Running the task for one company
+        Then: Only that company's users get timesheets
+        """
+        from apps.timesheets.tasks import create_weekly_timesheets
+
+        included = user_factory(company=company_factory())
+        excluded = user_factory(company=company_factory())
+
+        result = create_weekly_timesheets(company_ids=[included.company_id])
+
+        assert result['created'] == 1
+        assert Timesheet.objects.filter(user=included).exists()
+        assert not Timesheet.objects.filter(user=excluded).exists()
+
+
+@pytest.mark.django_db
+class TestDispatchLocalSchedules:
+    """Tests for the hourly company-local scheduler."""
+
+    def _dispatch(self, now):
+        from apps.timesheets.tasks import dispatch_local_schedules
+
+        with patch('apps.timesheets.tasks.timezone.now', return_value=now), \
+                patch('apps.timesheets.tasks.create_weekly_timesheets.delay') as rollover, \
+                patch('apps.timesheets.tasks.check_pending_escalations.delay') as escalations, \
+                patch('apps.timesheets.tasks.send_daily_reminders.delay'), \
+                patch('apps.timesheets.tasks.send_weekly_reminders.delay'), \
+                patch('apps.reports.tasks.scan_overtime.delay'):
+            result = dispatch_local_schedules()
+        return result, rollover, escalations
+
+    def test_local_dates_crossed(self):
+        """
+        Given: Tokyo (UTC+9) midnight falls at 15:00 UTC
+        When: Checking hourly windows around it
+        Then: Only the window containing 15:00 UTC crosses it
+        """
+        from datetime import time
+
+        from apps.timesheets.tasks import local_dates_crossed
+
+        tokyo = pytz.timezone('Asia/Tokyo')
+
+        def at(hour):
+            return pytz.UTC.localize(timezone.datetime(2024, 6, 9, hour, 5))
+
+        assert local_dates_crossed(tokyo, time(0), at(14), at(15)) == [date(2024, 6, 10)]
+        assert local_dates_crossed(tokyo, time(0), at(15), at(16)) == []
+
+    def test_rollover_only_for_companies_at_local_midnight(self, company_factory):
+        """
+        Given: Monday-start companies in Asia/Tokyo and UTC
+        When: Dispatching at Sunday 15:05 UTC (Monday 00:05 in Tokyo)
+        Then: Only the Tokyo company's timesheets roll over
+        """
+        tokyo = company_factory(timezone='Asia/Tokyo')
+        company_factory(timezone='UTC')
+
+        result, rollover, escalations = self._dispatch(pytz.UTC.localize(timezone.datetime(2024, 6, 9, 15, 5)))
+
+        rollover.assert_called_once_with(company_ids=[tokyo.id])
+        escalations.assert_not_called()
+        assert result['create_weekly_timesheets'] == [tokyo.id]
+
+    def test_escalations_at_local_hour(self, settings, company_factory):
+        """
+        Given: A company in America/New_York (UTC-4 in June)
+        When: Dispatching at 13:05 UTC (09:05 local)
+        Then: Its escalation check is queued
+        """
+        settings.ESCALATION_CHECK_LOCAL_HOUR = 9
+        new_york = company_factory(timezone='America/New_York')
+
+        _, rollover, escalations = self._dispatch(pytz.UTC.localize(timezone.datetime(2024, 6, 12, 13, 5)))
+
+        escalations.assert_called_once_with(company_ids=[new_york.id])
+        rollover.assert_not_called()
+
+    def test_catches_up_missed_hours(self, company_factory):
+        """
+        Given: The last run covered up to 14:05 UTC and the next two were missed
+        When: Dispatching again
+        Then: The missed rollover is queued
+        """
+        from django.core.cache import cache
+
+        from apps.timesheets.tasks import LOCAL_SCHEDULE_CURSOR_KEY
+
+        tokyo = company_factory(timezone='Asia/Tokyo')
+        cache.set(LOCAL_SCHEDULE_CURSOR_KEY, pytz.UTC.localize(timezone.datetime(2024, 6, 9, 14, 5)))
+
+        _, rollover, _ = self._dispatch(pytz.UTC.localize(timezone.datetime(2024, 6, 9, 17, 5)))
+
+        rollover.assert_called_once_with(company_ids=[tokyo.id])
+
+
 @pytest.mark.django_db
 class TestSendTimesheetSubmittedNotification:
     """Tests for send_timesheet_submitted_notification task."""
@@ -339,14 +458,13 @@ class TestSendTimesheetRejectedNotification:
 class TestTimesheetTaskIntegration:
     """Integration tests for timesheet task triggering."""
 
-    @patch('apps.timesheets.tasks.send_timesheet_submitted_notification.delay')
     def test_submit_action_queues_notification(
-        self, mock_task, authenticated_client, user, manager, project
+        self, authenticated_client, user, manager, project, queued
     ):
         """
         Given: User submits timesheet via API
         When: Submit endpoint is called
-        Then: Notification task is queued
+        Then: Notification task is written to the outbox
         """
         from apps.timeentries.models import TimeEntry
 
@@ -365,16 +483,15 @@ class TestTimesheetTaskIntegration:
         response = authenticated_client.post(f'/api/v1/timesheets/{timesheet.id}/submit/')
 
         assert response.status_code == 200
-        mock_task.assert_called_once_with(timesheet.id)
+        assert queued('apps.timesheets.tasks.send_timesheet_submitted_notification') == [[timesheet.id]]
 
-    @patch('apps.timesheets.tasks.send_timesheet_approved_notification.delay')
     def test_approve_action_queues_notification(
-        self, mock_task, authenticated_manager_client, user
+        self, authenticated_manager_client, user, queued
     ):
         """
         Given: Manager approves timesheet via API
         When: Approve endpoint is called
-        Then: Notification task is queued
+        Then: Notification task is written to the outbox
         """
         timesheet = Timesheet.objects.create(
             user=user,
@@ -388,16 +505,15 @@ class TestTimesheetTaskIntegration:
         )
 
         assert response.status_code == 200
-        mock_task.assert_called_once_with(timesheet.id)
+        assert queued('apps.timesheets.tasks.send_timesheet_approved_notification') == [[timesheet.id]]
 
-    @patch('apps.timesheets.tasks.send_timesheet_rejected_notification.delay')
     def test_reject_action_queues_notification(
-        self, mock_task, authenticated_manager_client, user
+        self, authenticated_manager_client, user, queued
     ):
         """
         Given: Manager rejects timesheet via API
         When: Reject endpoint is called
-        Then: Notification task is queued
+        Then: Notification task is written to the outbox
         """
         timesheet = Timesheet.objects.create(
             user=user,
@@ -411,4 +527,4 @@ class TestTimesheetTaskIntegration:
         )
 
         assert response.status_code == 200
-        mock_task.assert_called_once_with(timesheet.id)
+        assert queued('apps.timesheets.tasks.send_timesheet_rejected_notification') == [[timesheet.id]]
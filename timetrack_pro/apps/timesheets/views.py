@@ -3,14 +3,24 @@ Views for Timesheet API.
 """
 from datetime import date
 
-from django.db.models import Q
+from django.db import transaction
+from django.db.models import Count, Max, Q, Sum
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from apps.timesheets.models import AdminOverride, ApprovalDelegation, OOOPeriod, Timesheet, TimesheetComment
+from apps.infrastructure.outbox import enqueue
+from apps.timeentries.models import TimeEntry
+from apps.timesheets.models import (
+    AdminOverride,
+    ApprovalDelegation,
+    OOOPeriod,
+    Timesheet,
+    TimesheetArchive,
+    TimesheetComment,
+)
 from apps.timesheets.serializers import (
     AdminOverrideSerializer,
     ApprovalDelegationCreateSerializer,
@@ -24,9 +34,13 @@ from apps.timesheets.serializers import (
     TimesheetRejectSerializer,
     TimesheetSubmitSerializer,
     TimesheetUnlockSerializer,
+    timesheet_list_values,
 )
-from apps.timesheets.services import DelegationService, OOOService
+from apps.timesheets.services import ArchiveService, DelegationService, OOOService
+from core.conditional import ConditionalGetMixin, related_aggregate
 from core.pagination import StandardPagination
+from core.serializers import ValuesListMixin
+from core.sparse import SparseFieldsMixin
 
 
 class IsManagerPermission:
@@ -43,11 +57,27 @@ class IsAdminPermission:
         return request.user.is_admin
 
 
-class TimesheetViewSet(viewsets.ModelViewSet):
+class TimesheetViewSet(ConditionalGetMixin, SparseFieldsMixin, ValuesListMixin, viewsets.ModelViewSet):
     """ViewSet for Timesheet CRUD and workflow operations."""
 
     permission_classes = [IsAuthenticated]
     pagination_class = StandardPagination
+    values_serializer = timesheet_list_values
+    # Serializers render entry totals (list) and entries/comments (detail)
+    etag_annotations = {
+        'etag_entries_updated': related_aggregate(TimeEntry, 'timesheet', Max('updated_at')),
+        'etag_entries': related_aggregate(TimeEntry, 'timesheet', Count('pk')),
+        'etag_comments_updated': related_aggregate(TimesheetComment, 'timesheet', Max('updated_at')),
+        'etag_comments': related_aggregate(TimesheetComment, 'timesheet', Count('pk')),
+    }
+    etag_aggregates = {
+        'updated': Max('updated_at'),
+        'count': Count('pk'),
+        'entries_updated': Max('etag_entries_updated'),
+        'entries': Sum('etag_entries'),
+        'comments_updated': Max('etag_comments_updated'),
+        'comments': Sum('etag_comments'),
+    }
 
     def get_serializer_class(self):
         if self.action == 'list':
@@ -85,7 +115,7 @@ class TimesheetViewSet(viewsets.ModelViewSet):
         """Check if user can approve/reject this timesheet."""
         if user.is_admin:
             return True
-        if user.is_manager and timesheet.user.manager == user:
+        if user.is_manager and timesheet.user.manager_id == user.pk:
             return True
         if user.is_manager and DelegationService.can_approve_via_delegation(user, timesheet):
             return True
@@ -97,19 +127,35 @@ class TimesheetViewSet(viewsets.ModelViewSet):
                 pk=kwargs['pk']
             )
         except Timesheet.DoesNotExist:
+            return self._retrieve_archived(request, kwargs['pk'])
+
+        if not self._can_access_timesheet(request.user, timesheet):
             return Response(
                 {'detail': 'Not found.'},
                 status=status.HTTP_404_NOT_FOUND
             )
 
-        if not self._can_access_timesheet(request.user, timesheet):
+        return self.conditional_response(
+            request,
+            Timesheet.objects.filter(pk=timesheet.pk),
+            lambda: Response(self.get_serializer(timesheet).data),
+        )
+
+    def _retrieve_archived(self, request, pk):
+        """Serve a timesheet moved to cold storage, as it was when archived."""
+        archive = TimesheetArchive.objects.select_related('user__manager').filter(
+            timesheet_id=pk
+        ).first()
+
+        if archive is None or not self._can_access_timesheet(request.user, archive):
             return Response(
                 {'detail': 'Not found.'},
                 status=status.HTTP_404_NOT_FOUND
             )
 
-        serializer = self.get_serializer(timesheet)
-        return Response(serializer.data)
+        data = ArchiveService.load(archive)['timesheet']
+        data['archived'] = True
+        return Response(data)
 
     @action(detail=True, methods=['post'])
     def submit(self, request, pk=None):
@@ -130,10 +176,11 @@ class TimesheetViewSet(viewsets.ModelViewSet):
         if not serializer.is_valid():
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-        timesheet = serializer.save()
-
         from apps.timesheets.tasks import send_timesheet_submitted_notification
-        send_timesheet_submitted_notification.delay(timesheet.id)
+
+        with transaction.atomic():
+            timesheet = serializer.save()
+            enqueue(send_timesheet_submitted_notification, args=(timesheet.id,))
 
         return Response(TimesheetDetailSerializer(timesheet).data)
 
@@ -168,10 +215,11 @@ class TimesheetViewSet(viewsets.ModelViewSet):
         if not serializer.is_valid():
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-        timesheet = serializer.save()
-
         from apps.timesheets.tasks import send_timesheet_approved_notification
-        send_timesheet_approved_notification.delay(timesheet.id)
+
+        with transaction.atomic():
+            timesheet = serializer.save()
+            enqueue(send_timesheet_approved_notification, args=(timesheet.id,))
 
         return Response(TimesheetDetailSerializer(timesheet).data)
 
@@ -206,10 +254,11 @@ class TimesheetViewSet(viewsets.ModelViewSet):
         if not serializer.is_valid():
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-        timesheet = serializer.save()
-
         from apps.timesheets.tasks import send_timesheet_rejected_notification
-        send_timesheet_rejected_notification.delay(timesheet.id)
+
+        with transaction.atomic():
+            timesheet = serializer.save()
+            enqueue(send_timesheet_rejected_notification, args=(timesheet.id,))
 
         return Response(TimesheetDetailSerializer(timesheet).data)
 
@@ -278,7 +327,7 @@ class TimesheetViewSet(viewsets.ModelViewSet):
         )
 
 
-class OOOPeriodViewSet(viewsets.ModelViewSet):
+class OOOPeriodViewSet(SparseFieldsMixin, viewsets.ModelViewSet):
     """ViewSet for OOO Period CRUD operations."""
 
     permission_classes = [IsAuthenticated]
@@ -373,7 +422,7 @@ class AdminAuditLogView(APIView):
         return paginator.get_paginated_response(serializer.data)
 
 
-class ApprovalDelegationViewSet(viewsets.ModelViewSet):
+class ApprovalDelegationViewSet(SparseFieldsMixin, viewsets.ModelViewSet):
     """ViewSet for ApprovalDelegation CRUD operations."""
 
     permission_classes = [IsAuthenticated]
@@ -190,6 +190,8 @@ class DeactivationService:
                 'Resolve them first or use force=True to override.'
             )
 
+        # Read from the primary: the export is the permanent audit record and
+        # must include writes a replica may not have yet
         export_data = cls.export_user_data(user)
 
         audit = UserDeactivationAudit.objects.create(
@@ -5,16 +5,17 @@ from celery import shared_task
 from celery.utils.log import get_task_logger
 from django.conf import settings
 from django.contrib.auth.tokens import default_token_generator
-from django.core.mail import send_mail
 from django.template.loader import render_to_string
 from django.utils.encoding import force_bytes
 from django.utils.http import urlsafe_base64_encode
 
+from apps.infrastructure.delivery import deliver
+
 logger = get_task_logger(__name__)
 
 
-@shared_task
-def send_password_reset_email(user_id: int):
+@shared_task(bind=True, ignore_result=True, max_retries=settings.EMAIL_MAX_RETRIES)
+def send_password_reset_email(self, user_id: int):
     """
     Send password reset email to user.
 
@@ -52,19 +53,12 @@ Thanks,
 TimeTrack Pro Team
 '''
 
-    send_mail(
-        subject=subject,
-        message=message,
-        from_email=settings.DEFAULT_FROM_EMAIL,
-        recipient_list=[user.email],
-        fail_silently=False,
-    )
-
-    logger.info(f'Password reset email sent to {user.email}')
+    if deliver(self, subject=subject, message=message, recipient_list=[user.email]):
+        logger.info(f'Password reset email sent to {user.email}')
 
 
-@shared_task
-def send_password_changed_notification(user_id: int):
+@shared_task(bind=True, ignore_result=True, max_retries=settings.EMAIL_MAX_RETRIES)
+def send_password_changed_notification(self, user_id: int):
     """
     Send notification when password has been changed.
 
@@ -99,12 +93,5 @@ Thanks,
 TimeTrack Pro Team
 '''
 
-    send_mail(
-        subject=subject,
-        message=message,
-        from_email=settings.DEFAULT_FROM_EMAIL,
-        recipient_list=[user.email],
-        fail_silently=False,
-    )
-
-    logger.info(f'Password changed notification sent to {user.email}')
+    if deliver(self, subject=subject, message=message, recipient_list=[user.email]):
+        logger.info(f'Password changed notification sent to {user.email}')
@@ -6,7 +6,6 @@ Endpoints:
 - POST /api/v1/auth/password/reset/confirm/
 """
 import pytest
-from unittest.mock import patch
 from rest_framework import status
 from django.contrib.auth.tokens import default_token_generator
 from django.utils.encoding import force_bytes
@@ -17,8 +16,7 @@ from django.utils.http import urlsafe_base64_encode
 class TestPasswordResetRequestEndpoint:
     """Tests for POST /api/v1/auth/password/reset/"""
 
-    @patch('apps.users.views.send_password_reset_email.delay')
-    def test_password_reset_request_with_valid_email(self, mock_send, api_client, user):
+    def test_password_reset_request_with_valid_email(self, api_client, user, queued):
         """
         Given: A registered user email
         When: POST /auth/password/reset/
@@ -30,7 +28,7 @@ class TestPasswordResetRequestEndpoint:
 
         assert response.status_code == status.HTTP_200_OK
         assert 'detail' in response.data
-        mock_send.assert_called_once()
+        assert queued('apps.users.tasks.send_password_reset_email') == [[user.id]]
 
     def test_password_reset_request_with_nonexistent_email_returns_200(self, api_client):
         """
@@ -67,9 +65,8 @@ class TestPasswordResetRequestEndpoint:
 
         assert response.status_code == status.HTTP_400_BAD_REQUEST
 
-    @patch('apps.users.views.send_password_reset_email.delay')
     def test_password_reset_request_for_inactive_user_returns_200(
-        self, mock_send, api_client, user_factory
+        self, api_client, user_factory, queued
     ):
         """
         Given: An inactive user
@@ -83,15 +80,14 @@ class TestPasswordResetRequestEndpoint:
         })
 
         assert response.status_code == status.HTTP_200_OK
-        mock_send.assert_not_called()
+        assert queued('apps.users.tasks.send_password_reset_email') == []
 
 
 @pytest.mark.django_db
 class TestPasswordResetConfirmEndpoint:
     """Tests for POST /api/v1/auth/password/reset/confirm/"""
 
-    @patch('apps.users.views.send_password_changed_notification.delay')
-    def test_password_reset_confirm_with_valid_token(self, mock_notify, api_client, user):
+    def test_password_reset_confirm_with_valid_token(self, api_client, user):
         """
         Given: Valid uid and token
         When: POST /auth/password/reset/confirm/ with new password
@@ -195,8 +191,7 @@ class TestPasswordResetConfirmEndpoint:
 
         assert response.status_code == status.HTTP_400_BAD_REQUEST
 
-    @patch('apps.users.views.send_password_changed_notification.delay')
-    def test_password_reset_invalidates_token_after_use(self, mock_notify, api_client, user):
+    def test_password_reset_invalidates_token_after_use(self, api_client, user):
         """
         Given: Valid uid and token (already used)
         When: POST /auth/password/reset/confirm/ again
@@ -225,8 +220,7 @@ class TestPasswordResetConfirmEndpoint:
         })
         assert response.status_code == status.HTTP_400_BAD_REQUEST
 
-    @patch('apps.users.views.send_password_changed_notification.delay')
-    def test_password_reset_confirm_sends_notification(self, mock_notify, api_client, user):
+    def test_password_reset_confirm_sends_notification(self, api_client, user, queued):
         """
         Given: User has security notifications enabled
         When: Password is reset successfully
@@ -243,4 +237,4 @@ class TestPasswordResetConfirmEndpoint:
         })
 
         assert response.status_code == status.HTTP_200_OK
-        mock_notify.assert_called_once_with(user.id)
+        assert queued('apps.users.tasks.send_password_changed_notification') == [[user.id]]
@@ -1,6 +1,7 @@
 """
 Views for User app - Auth and Profile endpoints.
 """
+from django.db import transaction
 from django.utils import timezone
 from rest_framework import status
 from rest_framework.permissions import AllowAny, IsAuthenticated
@@ -11,6 +12,7 @@ from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.views import TokenRefreshView
 from rest_framework_simplejwt.exceptions import TokenError, InvalidToken
 
+from apps.infrastructure.outbox import enqueue
 from apps.users.models import User
 from apps.users.serializers import (
     DeactivationStatusSerializer,
@@ -26,6 +28,7 @@ from apps.users.serializers import (
 from apps.users.services import DeactivationService
 from apps.users.tasks import send_password_reset_email, send_password_changed_notification
 from core.pagination import StandardPagination
+from core.sparse import SparseFieldsMixin
 
 
 class LoginView(APIView):
@@ -146,7 +149,7 @@ class PasswordResetRequestView(APIView):
 
         try:
             user = User.objects.get(email=email, is_active=True)
-            send_password_reset_email.delay(user.id)
+            enqueue(send_password_reset_email, args=(user.id,))
         except User.DoesNotExist:
             pass  # Don't reveal if email exists
 
@@ -170,11 +173,12 @@ class PasswordResetConfirmView(APIView):
         if not serializer.is_valid():
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-        user = serializer.save()
+        with transaction.atomic():
+            user = serializer.save()
 
-        # Send notification if enabled
-        if user.security_notifications_enabled:
-            send_password_changed_notification.delay(user.id)
+            # Send notification if enabled
+            if user.security_notifications_enabled:
+                enqueue(send_password_changed_notification, args=(user.id,))
 
         return Response({'detail': 'Password has been reset successfully.'})
 
@@ -279,7 +283,7 @@ class UserDeactivationStatusView(APIView):
         })
 
 
-class UserListView(ListAPIView):
+class UserListView(SparseFieldsMixin, ListAPIView):
     """
     GET /api/v1/users/
 
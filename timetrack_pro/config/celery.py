@@ -4,6 +4,7 @@ Celery configuration for TimeTrack Pro.
 import os
 from celery import Celery
 from celery.schedules import crontab
+from celery.signals import before_task_publish, celeryd_init, task_postrun, task_prerun
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.development')
 
@@ -12,13 +13,33 @@ app.config_from_object('django.conf:settings', namespace='CELERY')
 app.autodiscover_tasks()
 
 app.conf.beat_schedule = {
-    'create-weekly-timesheets': {
-        'task': 'apps.timesheets.tasks.create_weekly_timesheets',
-        'schedule': crontab(hour=0, minute=5, day_of_week=1),  # Monday 00:05
+    # Publish task calls written to the outbox (apps.infrastructure.outbox)
+    'relay-outbox': {
+        'task': 'apps.infrastructure.tasks.relay_outbox',
+        'schedule': 5.0,  # Every 5 seconds
+        'options': {'expires': 5},
     },
-    'check-pending-escalations': {
-        'task': 'apps.timesheets.tasks.check_pending_escalations',
-        'schedule': crontab(hour=9, minute=0),  # Daily at 09:00
+    # Weekly rollover and escalation checks, at each company's local time
+    'dispatch-local-schedules': {
+        'task': 'apps.timesheets.tasks.dispatch_local_schedules',
+        'schedule': crontab(minute=5),  # Hourly at :05
+    },
+    'record-queue-depths': {
+        'task': 'apps.infrastructure.tasks.record_queue_depths',
+        'schedule': 30.0,  # Every 30 seconds
+        'options': {'expires': 30},
+    },
+    'ensure-time-entry-partitions': {
+        'task': 'apps.timeentries.tasks.ensure_time_entry_partitions',
+        'schedule': crontab(hour=2, minute=0),  # Daily at 02:00
+    },
+    'purge-time-entry-tombstones': {
+        'task': 'apps.timeentries.tasks.purge_time_entry_tombstones',
+        'schedule': crontab(hour=2, minute=30),  # Daily at 02:30
+    },
+    'archive-old-timesheets': {
+        'task': 'apps.timesheets.tasks.archive_old_timesheets',
+        'schedule': crontab(hour=3, minute=0),  # Daily at 03:00
     },
 }
 
@@ -26,3 +47,63 @@ app.conf.beat_schedule = {
 @app.task(bind=True, ignore_result=True)
 def debug_task(self):
     print(f'Request: {self.request!r}')
+
+
+@celeryd_init.connect
+def configure_queue_worker(conf=None, options=None, **kwargs):
+    """Give single-queue workers their queue's concurrency and prefetch."""
+    from apps.infrastructure.tasks import apply_queue_worker_options
+
+    apply_queue_worker_options(conf, (options or {}).get('queues'))
+
+
+_tenant_scope_tokens = {}
+
+
+@task_prerun.connect
+def open_task_tenant_scope(task_id=None, **kwargs):
+    """Share one tenant context cache across everything a task does."""
+    from apps.companies.context import open_tenant_scope
+
+    _tenant_scope_tokens[task_id] = open_tenant_scope()
+
+
+@task_postrun.connect
+def close_task_tenant_scope(task_id=None, task=None, **kwargs):
+    """Close the task's tenant scope and log the queries it saved."""
+    from apps.companies.context import close_tenant_scope
+
+    scope, token = _tenant_scope_tokens.pop(task_id, (None, None))
+    if scope is None:
+        return
+    close_tenant_scope(token)
+    if scope.loads or scope.hits:
+        task.get_logger().debug(
+            'Tenant context for task %s', task.name, extra=scope.as_log_fields()
+        )
+
+
+@before_task_publish.connect
+def stamp_task_publish_time(headers=None, **kwargs):
+    """Stamp messages so workers can measure queue lag."""
+    from apps.infrastructure.metrics import record_task_published
+
+    if headers is not None:
+        record_task_published(headers)
+
+
+@task_prerun.connect
+def start_task_instrumentation(task_id=None, task=None, **kwargs):
+    """Record query count, DB time, latency and queue lag for each task."""
+    from apps.infrastructure.instrumentation import start_task_measurement
+    from apps.infrastructure.metrics import record_task_started
+
+    record_task_started(task)
+    start_task_measurement(task_id, task.name)
+
+
+@task_postrun.connect
+def finish_task_instrumentation(task_id=None, state=None, **kwargs):
+    from apps.infrastructure.instrumentation import finish_task_measurement
+
+    finish_task_measurement(task_id, state)
@@ -36,9 +36,12 @@ INSTALLED_APPS = [
     'apps.rates',
     'apps.timeentries',
     'apps.timesheets',
+    'apps.reports',
 ]
 
 MIDDLEWARE = [
+    'apps.infrastructure.middleware.RequestInstrumentationMiddleware',
+    'apps.infrastructure.middleware.ResponseCompressionMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'corsheaders.middleware.CorsMiddleware',
@@ -46,6 +49,8 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'apps.companies.middleware.TenantContextMiddleware',
+    'apps.infrastructure.middleware.ReplicaPinningMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -91,6 +96,14 @@ MEDIA_ROOT = BASE_DIR / 'media'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Read replicas (apps.infrastructure.replicas); aliases are added per environment
+DATABASE_ROUTERS = ['apps.infrastructure.replicas.ReplicaRouter']
+DATABASE_REPLICAS = []
+REPLICA_MAX_LAG_SECONDS = 10
+# Read-after-write window; never shorter than REPLICA_MAX_LAG_SECONDS
+REPLICA_PIN_SECONDS = REPLICA_MAX_LAG_SECONDS
+REPLICA_LAG_CHECK_INTERVAL = 5
+
 AUTH_USER_MODEL = 'users.User'
 
 REST_FRAMEWORK = {
@@ -105,6 +118,16 @@ REST_FRAMEWORK = {
         'rest_framework.filters.SearchFilter',
         'rest_framework.filters.OrderingFilter',
     ],
+    # orjson-backed JSON; falls back to DRF's stdlib JSON if orjson is missing
+    'DEFAULT_RENDERER_CLASSES': [
+        'core.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'core.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
     'DEFAULT_PAGINATION_CLASS': 'core.pagination.StandardPagination',
     'PAGE_SIZE': 20,
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
@@ -135,8 +158,141 @@ CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = 'UTC'
+# Results are only kept for tasks that don't set ignore_result, and not for long
+CELERY_RESULT_EXPIRES = 24 * 3600
+
+# Celery queues: one worker per queue, so bulk jobs never hold up notifications.
+# Redis emulates priorities with one list per step; lower numbers are served first.
+CELERY_TASK_DEFAULT_QUEUE = 'default'
+CELERY_TASK_DEFAULT_PRIORITY = 5
+CELERY_BROKER_TRANSPORT_OPTIONS = {
+    'priority_steps': list(range(10)),
+    'sep': ':',
+    'queue_order_strategy': 'priority',
+}
+CELERY_TASK_ROUTES = {
+    'apps.users.tasks.*': {'queue': 'notifications', 'priority': 0},
+    'apps.infrastructure.notifications.send_notification': {'queue': 'notifications', 'priority': 3},
+    'apps.timesheets.tasks.send_timesheet_*': {'queue': 'notifications', 'priority': 3},
+    'apps.infrastructure.notifications.send_notification_batch': {'queue': 'notifications', 'priority': 6},
+    'apps.timesheets.tasks.dispatch_local_schedules': {'queue': 'schedules'},
+    'apps.timesheets.tasks.create_weekly_timesheets': {'queue': 'schedules'},
+    'apps.timesheets.tasks.check_pending_escalations': {'queue': 'schedules'},
+    'apps.timesheets.tasks.send_*_reminders': {'queue': 'schedules'},
+    'apps.timesheets.tasks.archive_old_timesheets': {'queue': 'bulk', 'priority': 9},
+    'apps.timeentries.tasks.*': {'queue': 'bulk', 'priority': 9},
+    'apps.reports.tasks.*': {'queue': 'bulk', 'priority': 9},
+    'apps.infrastructure.tasks.relay_outbox': {'queue': 'notifications', 'priority': 0},
+    'apps.infrastructure.tasks.record_queue_depths': {'queue': 'notifications', 'priority': 0},
+}
+# Per-queue worker settings, applied when a worker consumes exactly that queue
+# (celery -A config worker -Q notifications); explicit -c/--prefetch-multiplier win
+CELERY_WORKER_QUEUE_OPTIONS = {
+    'notifications': {
+        'concurrency': int(os.environ.get('CELERY_NOTIFICATIONS_CONCURRENCY') or 4),
+        'prefetch_multiplier': int(os.environ.get('CELERY_NOTIFICATIONS_PREFETCH') or 4),
+    },
+    'schedules': {
+        'concurrency': int(os.environ.get('CELERY_SCHEDULES_CONCURRENCY') or 2),
+        'prefetch_multiplier': int(os.environ.get('CELERY_SCHEDULES_PREFETCH') or 1),
+    },
+    'bulk': {
+        'concurrency': int(os.environ.get('CELERY_BULK_CONCURRENCY') or 1),
+        'prefetch_multiplier': int(os.environ.get('CELERY_BULK_PREFETCH') or 1),
+    },
+    'default': {
+        'concurrency': int(os.environ.get('CELERY_DEFAULT_CONCURRENCY') or 2),
+        'prefetch_multiplier': int(os.environ.get('CELERY_DEFAULT_PREFETCH') or 4),
+    },
+}
+
+# Transactional outbox (apps.infrastructure.outbox), drained by relay_outbox
+OUTBOX_BATCH_SIZE = 100
+OUTBOX_MAX_BATCHES = 50
+OUTBOX_MAX_ATTEMPTS = 10
 
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 DEFAULT_FROM_EMAIL = 'noreply@timetrackpro.com'
+# Email delivery (apps.infrastructure.delivery): retries and the provider circuit breaker
+EMAIL_TIMEOUT = 10
+EMAIL_MAX_RETRIES = 5
+EMAIL_RETRY_BASE_DELAY = 5
+EMAIL_RETRY_MAX_DELAY = 600
+EMAIL_CIRCUIT_FAILURE_THRESHOLD = 5
+EMAIL_CIRCUIT_WINDOW = 60
+EMAIL_CIRCUIT_RESET_TIMEOUT = 60
 
 FRONTEND_URL = os.environ.get('FRONTEND_URL', 'http://localhost:3000')
+
+# Request/task instrumentation (apps.infrastructure.instrumentation)
+INSTRUMENTATION_ENABLED = True
+INSTRUMENTATION_SERVER_TIMING = os.environ.get('INSTRUMENTATION_SERVER_TIMING', 'false').lower() == 'true'
+QUERY_BUDGET_DEFAULT = None
+QUERY_BUDGET_RAISE = False
+QUERY_BUDGETS = {
+    'time-entry-list': 10,
+    'time-entry-detail': 10,
+    'time-entry-changes': 5,
+    'timesheet-list': 10,
+    'timesheet-detail': 10,
+    'hours_summary': 10,
+    'approval_metrics': 10,
+    'utilization': 10,
+}
+
+# Metrics (apps.infrastructure.metrics)
+METRICS_PUBLISH_INTERVAL = int(os.environ.get('METRICS_PUBLISH_INTERVAL', '15'))
+METRICS_SNAPSHOT_TTL = 300
+
+# API response compression (apps.infrastructure.compression)
+COMPRESSION_ENABLED = os.environ.get('COMPRESSION_ENABLED', 'true').lower() == 'true'
+COMPRESSION_MIN_SIZE = 1024
+COMPRESSION_ENCODINGS = ['zstd', 'br', 'gzip']
+COMPRESSION_PATH_PREFIXES = ['/api/']
+# Token-bearing responses stay uncompressed (BREACH)
+COMPRESSION_EXCLUDE_PATHS = ['/api/v1/auth/']
+COMPRESSION_CONTENT_TYPES = ['application/json', 'text/csv', 'text/plain']
+
+# Time entry partitioning (opt-in, see apps.timeentries.partitioning)
+TIME_ENTRY_PARTITION_INTERVAL = os.environ.get('TIME_ENTRY_PARTITION_INTERVAL', 'month')
+TIME_ENTRY_PARTITIONS_AHEAD = 3
+
+# Time entry delta sync (apps.timeentries.services.TimeEntrySyncService)
+TIME_ENTRY_SYNC_PAGE_SIZE = 500
+# Allowance for clock skew between app servers and the database; open
+# transactions hold the sync horizon back on their own
+TIME_ENTRY_SYNC_SETTLE_SECONDS = 2
+# Bounds on that hold-back, so one long transaction can't stall every client
+TIME_ENTRY_SYNC_IDLE_TRANSACTION_SECONDS = 30
+TIME_ENTRY_SYNC_MAX_HOLD_SECONDS = 300
+TIME_ENTRY_TOMBSTONE_RETENTION_DAYS = 90
+
+# Live timers (apps.timeentries.services.TimerService); needs a non-evicting shared cache
+TIMER_STATE_TIMEOUT = 7 * 24 * 3600
+
+# Report response cache (apps.reports.cache)
+REPORT_CACHE_TIMEOUT = 300
+
+# OOO availability index (apps.timesheets.availability)
+OOO_INDEX_TIMEOUT = 3600
+
+# Approval delegation graph (apps.timesheets.delegation)
+APPROVAL_DELEGATION_CHAINING = os.environ.get('APPROVAL_DELEGATION_CHAINING', 'false').lower() == 'true'
+DELEGATION_GRAPH_TIMEOUT = 3600
+
+# Company-local schedules (apps.timesheets.tasks.dispatch_local_schedules)
+TIMESHEET_ROLLOVER_LOCAL_HOUR = 0
+ESCALATION_CHECK_LOCAL_HOUR = 9
+DAILY_REMINDER_LOCAL_HOUR = 17
+WEEKLY_REMINDER_LOCAL_HOUR = 15
+# Overtime scan of the previous local day (apps.reports.tasks.scan_overtime)
+OVERTIME_SCAN_LOCAL_HOUR = 1
+# Reminders go out on this many days from each company's week start
+REMINDER_WORKING_DAYS = 5
+LOCAL_SCHEDULE_MAX_CATCHUP_HOURS = 24
+# Recipients per send_notification_batch task (reminders and other fan-outs)
+NOTIFICATION_BATCH_SIZE = 200
+
+# Timesheet cold storage (apps.timesheets.services.ArchiveService)
+TIMESHEET_ARCHIVE_AFTER_YEARS = int(os.environ.get('TIMESHEET_ARCHIVE_AFTER_YEARS', '3'))
+TIMESHEET_ARCHIVE_BATCH_SIZE = 500
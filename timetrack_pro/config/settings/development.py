@@ -20,6 +20,8 @@ DATABASES = {
 
 CORS_ALLOW_ALL_ORIGINS = True
 
+INSTRUMENTATION_SERVER_TIMING = True
+
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
@@ -7,6 +7,7 @@ from sentry_sdk.integrations.django import DjangoIntegration
 from sentry_sdk.integrations.celery import CeleryIntegration
 from sentry_sdk.integrations.redis import RedisIntegration
 from .base import *
+from .base import EMAIL_TIMEOUT
 
 DEBUG = False
 
@@ -29,6 +30,34 @@ DATABASES = {
     }
 }
 
+# Connection pooling (psycopg_pool via Django's OPTIONS['pool']). Each web or
+# Celery worker process keeps one pool per database alias; connections are
+# returned to it at the end of every request/task instead of being closed.
+# Size pools per process: total = processes x DB_POOL_MAX_SIZE per alias.
+DB_POOL_ENABLED = os.environ.get('DB_POOL_ENABLED', 'false').lower() == 'true'
+if DB_POOL_ENABLED:
+    from psycopg_pool import ConnectionPool
+
+    DATABASES['default']['CONN_MAX_AGE'] = 0  # Pooling replaces persistent connections
+    DATABASES['default']['OPTIONS']['pool'] = {
+        'min_size': int(os.environ.get('DB_POOL_MIN_SIZE', '1')),
+        'max_size': int(os.environ.get('DB_POOL_MAX_SIZE', '4')),
+        'timeout': float(os.environ.get('DB_POOL_TIMEOUT', '10')),
+        'max_lifetime': float(os.environ.get('DB_POOL_MAX_LIFETIME', '1800')),
+        'max_idle': float(os.environ.get('DB_POOL_MAX_IDLE', '300')),
+        'check': ConnectionPool.check_connection,  # Health check on checkout
+    }
+
+# Read replicas: comma-separated hosts sharing the primary's credentials
+for index, host in enumerate(h.strip() for h in os.environ.get('DB_REPLICA_HOSTS', '').split(',') if h.strip()):
+    DATABASES[f'replica_{index}'] = {
+        **DATABASES['default'],
+        'HOST': host,
+        'OPTIONS': {**DATABASES['default']['OPTIONS']},
+    }
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias.startswith('replica_')]
+REPLICA_MAX_LAG_SECONDS = float(os.environ.get('REPLICA_MAX_LAG_SECONDS', '10'))
+
 # Security settings
 SECURE_BROWSER_XSS_FILTER = True
 SECURE_CONTENT_TYPE_NOSNIFF = True
@@ -60,6 +89,8 @@ if os.environ.get('SENDGRID_API_KEY'):
     EMAIL_BACKEND = 'anymail.backends.sendgrid.EmailBackend'
     ANYMAIL = {
         'SENDGRID_API_KEY': os.environ.get('SENDGRID_API_KEY'),
+        # Fail fast so a slow provider trips the circuit instead of holding workers
+        'REQUESTS_TIMEOUT': EMAIL_TIMEOUT,
     }
     DEFAULT_FROM_EMAIL = os.environ.get('DEFAULT_FROM_EMAIL', 'noreply@timetrack.local')
 
@@ -114,6 +145,12 @@ LOGGING = {
             'level': 'INFO',
             'propagate': False,
         },
+        # Per-request/per-task timing records (route, queries, db_ms, serializer_ms, total_ms)
+        'apps.infrastructure.instrumentation': {
+            'handlers': ['console'],
+            'level': os.environ.get('INSTRUMENTATION_LOG_LEVEL', 'INFO'),
+            'propagate': False,
+        },
     },
 }
 
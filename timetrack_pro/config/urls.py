@@ -5,6 +5,8 @@ from django.contrib import admin
 from django.urls import path, include
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
 
+from apps.infrastructure.views import MetricsView
+
 urlpatterns = [
     path('admin/', admin.site.urls),
 
@@ -16,6 +18,9 @@ urlpatterns = [
     path('api/v1/rates/', include('apps.rates.urls')),
     path('api/v1/reports/', include('apps.reports.urls')),
 
+    # Metrics (admin only, Prometheus text format)
+    path('metrics', MetricsView.as_view(), name='metrics'),
+
     # API Documentation
     path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
     path('api/docs/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
@@ -5,7 +5,7 @@ Contains shared fixtures used across all test modules.
 """
 import pytest
 from datetime import datetime
-from unittest.mock import patch, MagicMock
+from unittest.mock import MagicMock
 from rest_framework.test import APIClient
 import pytz
 
@@ -20,20 +20,22 @@ def reset_clock_after_test():
 
 
 @pytest.fixture(autouse=True)
-def mock_celery_tasks():
-    """
-    Mock all Celery task.delay() calls to prevent broker connection.
+def clear_cache_after_test():
+    """Clear the cache after each test to prevent test pollution."""
+    from django.core.cache import cache
 
-    Per TDD plan: "Test by mocking task.delay() calls"
-    """
-    with patch('apps.timesheets.tasks.send_timesheet_submitted_notification.delay') as mock_submitted, \
-         patch('apps.timesheets.tasks.send_timesheet_approved_notification.delay') as mock_approved, \
-         patch('apps.timesheets.tasks.send_timesheet_rejected_notification.delay') as mock_rejected:
-        yield {
-            'submitted': mock_submitted,
-            'approved': mock_approved,
-            'rejected': mock_rejected,
-        }
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def queued(db):
+    """Args of the outbox messages written for a task, oldest first."""
+    from apps.infrastructure.models import OutboxMessage
+
+    def get(task_name):
+        return list(OutboxMessage.objects.filter(task_name=task_name).values_list('args', flat=True))
+    return get
 
 
 @pytest.fixture
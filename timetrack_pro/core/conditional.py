@@ -0,0 +1,104 @@
+"""
+Conditional GET support (ETag / If-None-Match) for TimeTrack Pro API.
+"""
+import hashlib
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Count, Max, OuterRef, Subquery
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+
+
+def related_aggregate(model, field: str, aggregate) -> Subquery:
+    """
+    Scalar subquery of `aggregate` over `model` rows whose `field` is the outer row.
+
+    For ``etag_annotations``: one value per outer row, which etag_aggregates
+    then reduce (e.g. Max of the maxima, Sum of the counts).
+    """
+    rows = model.objects.filter(**{field: OuterRef('pk')}).order_by().values(field)
+    return Subquery(rows.annotate(value=aggregate).values('value'))
+
+
+class ConditionalGetMixin:
+    """
+    Strong ETags for list and retrieve, with 304 on a matching If-None-Match.
+
+    The ETag is a hash of the caller, the request path and query params, and a
+    fingerprint of the data: one aggregate query (by default max(updated_at)
+    plus row count) over the queryset the response is built from. Matching
+    requests return 304 before pagination or serialization runs.
+
+    Override ``etag_aggregates`` to cover related rows that the serializer
+    renders (e.g. nested entries), including a count so deletes are seen.
+    Aggregate related rows through ``etag_annotations`` built with
+    ``related_aggregate`` rather than joins: joining two reverse relations
+    multiplies the rows the aggregate scans.
+
+    ``If-None-Match: *`` matches whenever the resource exists.
+    """
+
+    etag_aggregates = {
+        'updated': Max('updated_at'),
+        'count': Count('pk'),
+    }
+    etag_annotations = {}
+
+    def get_fingerprint(self, queryset) -> dict:
+        """The etag_aggregates over queryset, in one query."""
+        return queryset.order_by().annotate(**self.etag_annotations).aggregate(**self.etag_aggregates)
+
+    def get_etag(self, queryset) -> str:
+        fingerprint = self.get_fingerprint(queryset)
+        params = sorted(self.request.query_params.lists())
+        payload = json.dumps(
+            [self.request.user.pk, self.request.path, params, fingerprint],
+            cls=DjangoJSONEncoder,
+            sort_keys=True,
+        )
+        return f'"{hashlib.sha256(payload.encode()).hexdigest()[:32]}"'
+
+    def conditional_response(self, request, queryset, build_response, exists=None):
+        """
+        Return 304 if the client's copy is current, otherwise build_response().
+
+        Args:
+            request: The request
+            queryset: Rows the response is built from
+            build_response: Callable producing the full response
+            exists: Whether the resource exists, for ``If-None-Match: *``
+                (default: whether queryset has rows)
+        """
+        etag = self.get_etag(queryset)
+        client_etags = {tag.removeprefix('W/') for tag in parse_etags(request.headers.get('If-None-Match', ''))}
+        if '*' in client_etags:
+            matched = queryset.exists() if exists is None else exists
+        else:
+            matched = etag in client_etags
+
+        if matched:
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = build_response()
+            if response.status_code != status.HTTP_200_OK:
+                return response
+
+        response['ETag'] = etag
+        patch_vary_headers(response, ['Authorization'])
+        return response
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        return self.conditional_response(
+            request, queryset, lambda: super(ConditionalGetMixin, self).list(request, *args, **kwargs), exists=True
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.filter_queryset(self.get_queryset()).filter(**{self.lookup_field: kwargs[lookup]})
+        return self.conditional_response(
+            request, queryset, lambda: super(ConditionalGetMixin, self).retrieve(request, *args, **kwargs)
+        )
@@ -0,0 +1,126 @@
+"""
+Benchmark the orjson renderer/parser against DRF's stdlib JSON.
+
+Payloads mirror the API's largest responses: a timesheet detail with many
+nested entries inside the pagination envelope, and an hours report with a
+long ``by_user`` array containing raw Decimals and datetimes.
+
+Usage:
+    python manage.py benchmark_json
+    python manage.py benchmark_json --entries 2000 --repeat 50
+"""
+import io
+import timeit
+from datetime import UTC, date, datetime, timedelta
+from decimal import Decimal
+from functools import partial
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from core.parsers import FastJSONParser
+from core.renderers import FastJSONRenderer, orjson
+
+
+def build_timesheet_payload(entries: int) -> dict:
+    """Paginated timesheet detail with nested entries, as serializers emit it."""
+    start = date(2024, 1, 1)
+    created = datetime(2024, 1, 1, 9, 0, tzinfo=UTC)
+    return {
+        'success': True,
+        'data': [{
+            'id': 1,
+            'user': {'id': 7, 'email': 'employee@example.com', 'first_name': 'Ada', 'last_name': 'Byron'},
+            'week_start': start.isoformat(),
+            'status': 'submitted',
+            'total_hours': f'{entries * 8}.00',
+            'entries': [
+                {
+                    'id': i,
+                    'user': {'id': 7, 'email': 'employee@example.com', 'first_name': 'Ada', 'last_name': 'Byron'},
+                    'project': {'id': i % 12, 'name': f'Project {i % 12}'},
+                    'timesheet': 1,
+                    'date': (start + timedelta(days=i % 7)).isoformat(),
+                    'hours': '8.00',
+                    'description': f'Worked on ticket #{i} – review and fixes',
+                    'billing_rate': '125.00',
+                    'rate_source': 'project',
+                    'created_at': (created + timedelta(minutes=i)).isoformat().replace('+00:00', 'Z'),
+                    'updated_at': (created + timedelta(minutes=i)).isoformat().replace('+00:00', 'Z'),
+                }
+                for i in range(entries)
+            ],
+        }],
+        'meta': {'page': 1, 'per_page': 20, 'total': 1, 'total_pages': 1},
+    }
+
+
+def build_report_payload(users: int) -> dict:
+    """Hours summary grouped by user, with raw Decimals and datetimes."""
+    generated = datetime(2024, 1, 31, 23, 0, tzinfo=UTC)
+    return {
+        'total_hours': Decimal(users * 160),
+        'entry_count': users * 20,
+        'by_user': [
+            {
+                'user_id': i,
+                'email': f'user{i}@example.com',
+                'name': f'User {i}',
+                'total_hours': Decimal('160.25') + i,
+                'billable_amount': Decimal('20031.25') + i,
+                'last_entry_at': generated - timedelta(hours=i),
+            }
+            for i in range(users)
+        ],
+    }
+
+
+class Command(BaseCommand):
+    help = 'Compare render/parse time of the orjson JSON classes with DRF stdlib JSON.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--entries', type=int, default=1000, help='Nested entries / report rows.')
+        parser.add_argument('--repeat', type=int, default=20, help='Iterations per measurement.')
+
+    def handle(self, *args, entries=1000, repeat=20, **options):
+        if orjson is None:
+            raise CommandError('orjson is not installed; nothing to compare.')
+
+        payloads = {
+            'timesheet detail': build_timesheet_payload(entries),
+            'hours report': build_report_payload(entries),
+        }
+        self.stdout.write(f'{"payload":<20} {"operation":<8} {"stdlib ms":>10} {"orjson ms":>10} {"speedup":>8}')
+
+        for name, payload in payloads.items():
+            stdlib_bytes = JSONRenderer().render(payload)
+            fast_bytes = FastJSONRenderer().render(payload)
+            if fast_bytes != stdlib_bytes:
+                raise CommandError(f'Rendered output differs for {name}.')
+
+            self.report(
+                name, 'render', repeat,
+                partial(self.render, JSONRenderer, payload),
+                partial(self.render, FastJSONRenderer, payload),
+            )
+            self.report(
+                name, 'parse', repeat,
+                partial(self.parse, JSONParser, stdlib_bytes),
+                partial(self.parse, FastJSONParser, stdlib_bytes),
+            )
+
+    @staticmethod
+    def render(renderer_class, payload):
+        return renderer_class().render(payload)
+
+    @staticmethod
+    def parse(parser_class, data):
+        return parser_class().parse(io.BytesIO(data))
+
+    def report(self, name, operation, repeat, stdlib, fast):
+        stdlib_ms = min(timeit.repeat(stdlib, number=repeat, repeat=3)) / repeat * 1000
+        fast_ms = min(timeit.repeat(fast, number=repeat, repeat=3)) / repeat * 1000
+        self.stdout.write(
+            f'{name:<20} {operation:<8} {stdlib_ms:>10.2f} {fast_ms:>10.2f} {stdlib_ms / fast_ms:>7.1f}x'
+        )
@@ -0,0 +1,107 @@
+"""
+Benchmark list serialization: ModelSerializer vs ValuesSerializer.
+
+Seeds a throwaway company with time entries and timesheets inside a
+transaction that is rolled back, then times serializing one page (query
+plus serialization, as the list endpoints do) with each path.
+
+Usage:
+    python manage.py benchmark_serializers
+    python manage.py benchmark_serializers --page-size 100 --repeat 50
+"""
+import time
+import uuid
+from datetime import date, timedelta
+from decimal import Decimal
+from functools import partial
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+
+class Command(BaseCommand):
+    help = 'Compare rows/sec of the ModelSerializer and values-based list serializers.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--page-size', type=int, default=100, help='Rows per page.')
+        parser.add_argument('--repeat', type=int, default=30, help='Pages serialized per measurement.')
+
+    def handle(self, *args, page_size=100, repeat=30, **options):
+        from apps.timeentries.models import TimeEntry
+        from apps.timeentries.serializers import TimeEntrySerializer, time_entry_list_values
+        from apps.timesheets.models import Timesheet
+        from apps.timesheets.serializers import TimesheetListSerializer, timesheet_list_values
+
+        with transaction.atomic():
+            user = self.seed(page_size)
+            entries = TimeEntry.objects.filter(user=user)
+            timesheets = Timesheet.objects.filter(user=user).select_related('user', 'approved_by')
+
+            self.stdout.write(f'{"endpoint":<12} {"serializer":<18} {"rows/sec":>10} {"speedup":>8}')
+            for name, queryset, serializer_class, values_serializer in (
+                ('time-entry', entries, TimeEntrySerializer, time_entry_list_values),
+                ('timesheet', timesheets, TimesheetListSerializer, timesheet_list_values),
+            ):
+                before = self.rows_per_second(
+                    partial(self.serialize_models, serializer_class, queryset[:page_size]), page_size, repeat,
+                )
+                after = self.rows_per_second(
+                    partial(self.serialize_values, values_serializer, queryset, page_size), page_size, repeat,
+                )
+                self.stdout.write(f'{name:<12} {"ModelSerializer":<18} {before:>10,.0f}')
+                self.stdout.write(f'{name:<12} {"ValuesSerializer":<18} {after:>10,.0f} {after / before:>7.1f}x')
+
+            transaction.set_rollback(True)
+
+    @staticmethod
+    def serialize_models(serializer_class, page):
+        return serializer_class(page, many=True).data
+
+    @staticmethod
+    def serialize_values(values_serializer, queryset, page_size):
+        return values_serializer.to_representation(values_serializer.values(queryset)[:page_size])
+
+    def rows_per_second(self, serialize_page, page_size, repeat) -> float:
+        serialize_page()  # warm up
+        start = time.perf_counter()
+        for _ in range(repeat):
+            serialize_page()
+        return page_size * repeat / (time.perf_counter() - start)
+
+    def seed(self, page_size):
+        """One user with page_size timesheets, each holding entries."""
+        from apps.companies.models import Company
+        from apps.projects.models import Project
+        from apps.timeentries.models import TimeEntry
+        from apps.timesheets.models import Timesheet
+        from apps.users.models import User
+
+        suffix = uuid.uuid4().hex[:8]
+        company = Company.objects.create(name=f'Benchmark {suffix}')
+        manager = User.objects.create(
+            email=f'manager-{suffix}@example.com', username=f'manager-{suffix}', company=company,
+        )
+        user = User.objects.create(
+            email=f'bench-{suffix}@example.com', username=f'bench-{suffix}', company=company, manager=manager,
+        )
+        projects = [Project.objects.create(name=f'Project {i}', company=company) for i in range(5)]
+
+        first_week = date(2020, 1, 6)
+        timesheets = Timesheet.objects.bulk_create([
+            Timesheet(
+                user=user, week_start=first_week + timedelta(weeks=i),
+                status=Timesheet.Status.APPROVED, approved_by=manager,
+            )
+            for i in range(page_size)
+        ])
+        TimeEntry.objects.bulk_create([
+            TimeEntry(
+                user=user, project=projects[day % 5], timesheet=timesheet,
+                date=timesheet.week_start + timedelta(days=day), hours=Decimal('7.50'),
+                billing_rate=Decimal('125.00'), rate_source=TimeEntry.RateSource.PROJECT,
+                description='Benchmark entry',
+            )
+            for timesheet in timesheets
+            for day in range(5)
+        ])
+        return user
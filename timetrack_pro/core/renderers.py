@@ -0,0 +1,56 @@
+"""
+Fast JSON renderer for TimeTrack Pro API.
+
+Uses orjson when installed and falls back to DRF's stdlib renderer when it
+is not, so the setting is safe to enable everywhere. Output is
+byte-compatible with ``rest_framework.renderers.JSONRenderer`` for the
+payloads this API produces: compact separators, UTF-8 (not ASCII-escaped),
+``\\u2028``/``\\u2029`` escaped, and dates, times, Decimals, lazy strings and
+other non-JSON types converted by DRF's own encoder.
+
+Known differences, none of which the API emits:
+- NaN/Infinity render as null instead of raising (STRICT_JSON)
+- Large floats use ``1e16`` rather than ``1e+16`` exponent notation
+"""
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+# Hand datetimes to DRF's encoder so their format (e.g. 'Z' for UTC) matches
+ORJSON_OPTIONS = (
+    orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME if orjson else 0
+)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer backed by orjson.
+
+    Indented output (browsable API, ``Accept: application/json; indent=4``)
+    and anything orjson refuses to encode go through the stdlib renderer.
+    """
+
+    _default = staticmethod(JSONEncoder().default)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b''
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=self._default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            # e.g. integers beyond 64 bits; let the stdlib path decide
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Same strict-javascript-subset escaping as JSONRenderer
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
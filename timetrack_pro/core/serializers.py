@@ -0,0 +1,177 @@
+"""
+Values-based fast read serializers for TimeTrack Pro API.
+
+A ModelSerializer builds a model instance per row and walks DRF's field
+machinery (get_attribute, nested serializer instances, OrderedDicts) for
+every field. For read-only list endpoints that is most of the request.
+
+ValuesSerializer compiles an existing ModelSerializer once into a flat
+``values_list()`` query plus per-field converters, then maps tuples straight
+to dicts. Nested one-to-one serializers become joined columns, so lists no
+longer load related rows one by one. The output is the same data, and
+renders to the same JSON, as the ModelSerializer it was compiled from.
+
+Usage:
+    timesheet_list_values = ValuesSerializer(
+        TimesheetListSerializer,
+        method_fields={'total_hours': (Sum('entries__hours'), format_hours)},
+    )
+    timesheet_list_values.serialize(queryset)
+"""
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from django.db.models import QuerySet
+from rest_framework import serializers
+from rest_framework.relations import ManyRelatedField, PrimaryKeyRelatedField
+from rest_framework.response import Response
+
+# Fields whose to_representation returns database values unchanged
+PASSTHROUGH_FIELDS = (
+    serializers.BooleanField,
+    serializers.CharField,
+    serializers.ChoiceField,
+    serializers.IntegerField,
+    PrimaryKeyRelatedField,
+)
+
+
+@dataclass(frozen=True)
+class _Column:
+    name: str
+    index: int
+    convert: Callable[[Any], Any] | None
+    # Method fields see None too, like SerializerMethodField does
+    convert_none: bool = False
+
+
+@dataclass(frozen=True)
+class _Nested:
+    name: str
+    null_index: int
+    columns: tuple
+
+
+class ValuesSerializer:
+    """
+    Read-only serializer working from ``values_list()`` tuples.
+
+    Supports plain fields, primary key relations and nested (non-many)
+    serializers. SerializerMethodFields must be supplied as
+    ``method_fields``: an annotation plus a function formatting its value.
+    """
+
+    def __init__(
+        self,
+        serializer_class: type[serializers.Serializer],
+        method_fields: dict[str, tuple[Any, Callable[[Any], Any]]] | None = None,
+        serializer: serializers.Serializer | None = None,
+    ):
+        self.serializer_class = serializer_class
+        self.method_fields = method_fields or {}
+        self.paths: list[str] = []
+        self.annotations: dict[str, Any] = {}
+        self.plan = self._compile(serializer or serializer_class(), prefix='')
+
+    def for_serializer(self, serializer: serializers.Serializer) -> 'ValuesSerializer':
+        """
+        Compile a variant for a modified instance of the same serializer
+        (e.g. with fields removed by ``?fields=``).
+
+        Raises:
+            ValueError: If the instance has fields the fast path can't read
+        """
+        return ValuesSerializer(self.serializer_class, self.method_fields, serializer=serializer)
+
+    def _column(self, path: str) -> int:
+        self.paths.append(path)
+        return len(self.paths) - 1
+
+    def _compile(self, serializer: serializers.Serializer, prefix: str) -> tuple:
+        plan = []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+
+            if not prefix and name in self.method_fields:
+                annotation, formatter = self.method_fields[name]
+                alias = f'_values_{name}'
+                self.annotations[alias] = annotation
+                plan.append(_Column(name, self._column(alias), formatter, convert_none=True))
+                continue
+
+            if isinstance(field, serializers.SerializerMethodField):
+                raise ValueError(f'{name}: SerializerMethodField needs a method_fields entry.')
+            if isinstance(field, (serializers.ListSerializer, ManyRelatedField)) or field.source == '*':
+                raise ValueError(f'{name}: to-many and source="*" fields are not supported.')
+
+            path = f'{prefix}{"__".join(field.source_attrs)}'
+            if isinstance(field, serializers.Serializer):
+                # The relation column itself tells us whether the object is null
+                null_index = self._column(path)
+                plan.append(_Nested(name, null_index, self._compile(field, f'{path}__')))
+            elif isinstance(field, PASSTHROUGH_FIELDS):
+                plan.append(_Column(name, self._column(path), None))
+            else:
+                plan.append(_Column(name, self._column(path), field.to_representation))
+        return tuple(plan)
+
+    def values(self, queryset: QuerySet) -> QuerySet:
+        """The queryset as the tuples this serializer reads."""
+        if self.annotations:
+            if not queryset.query.order_by:
+                # Django drops Meta.ordering from aggregate (GROUP BY) queries
+                queryset = queryset.order_by(*queryset.model._meta.ordering)
+            queryset = queryset.annotate(**self.annotations)
+        return queryset.values_list(*self.paths)
+
+    @staticmethod
+    def _map_row(plan: tuple, row: tuple) -> dict:
+        data = {}
+        for item in plan:
+            if type(item) is _Column:
+                value = row[item.index]
+                if item.convert is None or (value is None and not item.convert_none):
+                    data[item.name] = value
+                else:
+                    data[item.name] = item.convert(value)
+            elif row[item.null_index] is None:
+                data[item.name] = None
+            else:
+                data[item.name] = ValuesSerializer._map_row(item.columns, row)
+        return data
+
+    def to_representation(self, rows) -> list[dict]:
+        """Map values_list() rows to serialized dicts."""
+        plan = self.plan
+        return [self._map_row(plan, row) for row in rows]
+
+    def serialize(self, queryset: QuerySet) -> list[dict]:
+        """Serialize a queryset of the serializer's model."""
+        return self.to_representation(self.values(queryset))
+
+
+class ValuesListMixin:
+    """
+    Serve ``list`` through a ValuesSerializer.
+
+    Set ``values_serializer`` on the viewset. Filtering, ordering and
+    pagination behave as for the regular list.
+    """
+
+    values_serializer: ValuesSerializer | None = None
+
+    def get_values_serializer(self) -> ValuesSerializer | None:
+        return self.values_serializer
+
+    def list(self, request, *args, **kwargs):
+        values_serializer = self.get_values_serializer()
+        if values_serializer is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = values_serializer.values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(values_serializer.to_representation(page))
+        return Response(values_serializer.to_representation(queryset))
@@ -0,0 +1,220 @@
+"""
+Sparse fieldsets and expansion control for TimeTrack Pro API.
+
+    GET /api/v1/time-entries/?fields=id,date,hours,project.id
+    GET /api/v1/timesheets/?expand=user
+    GET /api/v1/timesheets/12/?fields=id,status,entries&expand=
+
+``fields`` lists the fields to return; dotted names select inside nested
+objects (``project.id``), a bare nested name returns the whole object.
+``expand`` lists the nested objects to render in full; when the parameter is
+present, every other nested object or list collapses to its primary key(s).
+Without either parameter responses are unchanged.
+
+On list endpoints the query is narrowed to match: only() the selected
+columns and select_related() just the expanded relations, so fewer columns
+are read, fewer tables joined and less is serialized.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.relations import ManyRelatedField, PrimaryKeyRelatedField
+
+FIELDS_PARAM = 'fields'
+EXPAND_PARAM = 'expand'
+
+# Leaf in a parsed fields tree meaning "the whole field"
+ALL = None
+
+
+def parse_fields(value: str) -> dict:
+    """
+    Parse ``a,b.c,b.d`` into ``{'a': ALL, 'b': {'c': ALL, 'd': ALL}}``.
+
+    A bare name wins over dotted names for the same field.
+    """
+    tree = {}
+    for item in value.split(','):
+        parts = [part.strip() for part in item.split('.')]
+        if not all(parts):
+            continue
+        node = tree
+        for part in parts[:-1]:
+            if part in node and node[part] is ALL:
+                break
+            node = node.setdefault(part, {})
+        else:
+            node[parts[-1]] = ALL
+    return tree
+
+
+def parse_expand(value: str) -> set[str]:
+    return {name.strip() for name in value.split(',') if name.strip()}
+
+
+def _nested_serializer(field):
+    """The nested serializer a field renders, if any."""
+    if isinstance(field, serializers.ListSerializer):
+        return field.child
+    if isinstance(field, serializers.Serializer):
+        return field
+    return None
+
+
+def prune_serializer(serializer, fields: dict | None, expand: set[str] | None, prefix: str = '') -> None:
+    """
+    Drop unrequested fields and collapse unexpanded nested objects, in place.
+
+    Args:
+        serializer: Serializer (or many=True list serializer) to prune
+        fields: Parsed fields tree, or ALL
+        expand: Nested fields to keep expanded, or None to keep all
+        prefix: Dotted path of this serializer, for error messages
+
+    Raises:
+        ValidationError: If a field or expansion does not exist
+    """
+    target = _nested_serializer(serializer)
+    available = target.fields
+
+    errors = []
+    if fields is not ALL:
+        errors += [f'Unknown field: {prefix}{name}' for name in fields if name not in available]
+    if expand:
+        errors += [
+            f'Cannot expand: {name}' for name in expand
+            if name not in available or _nested_serializer(available[name]) is None
+        ]
+    if errors:
+        raise serializers.ValidationError({FIELDS_PARAM if fields else EXPAND_PARAM: errors})
+
+    for name in list(available):
+        if fields is not ALL and name not in fields:
+            del available[name]
+
+    for name, field in list(available.items()):
+        selection = ALL if fields is ALL else fields[name]
+        nested = _nested_serializer(field)
+        if nested is None:
+            if selection is not ALL:
+                raise serializers.ValidationError({FIELDS_PARAM: [f'{prefix}{name} has no subfields']})
+            continue
+
+        if selection is ALL and expand is not None and name not in expand:
+            collapsed = {'source': field.source} if field.source != name else {}
+            available[name] = PrimaryKeyRelatedField(
+                read_only=True,
+                many=isinstance(field, serializers.ListSerializer),
+                **collapsed,
+            )
+        elif selection is not ALL:
+            prune_serializer(field, selection, None, prefix=f'{prefix}{name}.')
+
+
+def _resolve(model, path: list[str]):
+    """Model field for a source path, or None if not a concrete field."""
+    field = None
+    for i, part in enumerate(path):
+        try:
+            field = model._meta.get_field(part)
+        except FieldDoesNotExist:
+            return None
+        if not field.concrete:
+            return None
+        if i < len(path) - 1:
+            if not field.is_relation:
+                return None
+            model = field.related_model
+    return field
+
+
+def narrow_queryset(queryset, serializer):
+    """
+    Restrict a queryset to what a (pruned) serializer renders.
+
+    Nested objects become select_related() and nested lists
+    prefetch_related(). Columns are limited with only() when every field
+    maps to a model column; method fields and properties may read anything,
+    so their presence leaves the columns alone.
+    """
+    only, related, prefetch = [], [], []
+    columns_known = True
+
+    def walk(target, model, prefix):
+        nonlocal columns_known
+        for field in target.fields.values():
+            if field.write_only:
+                continue
+            if field.source == '*' or isinstance(field, serializers.SerializerMethodField):
+                columns_known = False
+                continue
+
+            path = f'{prefix}{"__".join(field.source_attrs)}'
+            if isinstance(field, (serializers.ListSerializer, ManyRelatedField)):
+                prefetch.append(path)
+                continue
+
+            model_field = _resolve(model, field.source_attrs)
+            if model_field is None:
+                columns_known = False
+                continue
+
+            only.append(path)
+            if isinstance(field, serializers.Serializer):
+                if not model_field.many_to_one and not model_field.one_to_one:
+                    columns_known = False
+                    continue
+                related.append(path)
+                walk(field, model_field.related_model, f'{path}__')
+
+    walk(_nested_serializer(serializer) or serializer, queryset.model, '')
+
+    if columns_known:
+        queryset = queryset.select_related(None).only(queryset.model._meta.pk.name, *only)
+    if related:
+        queryset = queryset.select_related(*related)
+    if prefetch:
+        queryset = queryset.prefetch_related(*prefetch)
+    return queryset
+
+
+class SparseFieldsMixin:
+    """
+    ``?fields=`` / ``?expand=`` support for generic views.
+
+    Applies to GET requests only; writes always validate and return the full
+    serializer.
+    """
+
+    def is_sparse_request(self) -> bool:
+        params = self.request.query_params
+        return self.request.method == 'GET' and (FIELDS_PARAM in params or EXPAND_PARAM in params)
+
+    def get_sparse_spec(self) -> tuple[dict | None, set[str] | None]:
+        params = self.request.query_params
+        fields = parse_fields(params[FIELDS_PARAM]) if params.get(FIELDS_PARAM) else None
+        expand = parse_expand(params[EXPAND_PARAM]) if EXPAND_PARAM in params else None
+        return fields, expand
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        if self.is_sparse_request():
+            prune_serializer(serializer, *self.get_sparse_spec())
+        return serializer
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        # Non-viewset generic views using this mixin are list views
+        if getattr(self, 'action', 'list') == 'list' and self.is_sparse_request():
+            queryset = narrow_queryset(queryset, self.get_serializer())
+        return queryset
+
+    def get_values_serializer(self):
+        # Used with core.serializers.ValuesListMixin: compile the pruned
+        # serializer, or fall back to the regular list if it can't be
+        values_serializer = super().get_values_serializer()
+        if values_serializer is None or not self.is_sparse_request():
+            return values_serializer
+        try:
+            return values_serializer.for_serializer(self.get_serializer())
+        except ValueError:
+            return None
@@ -0,0 +1,145 @@
+"""
+Tests for the orjson-backed renderer and parser.
+"""
+import io
+import uuid
+from datetime import UTC, date, datetime, time, timedelta
+from datetime import timezone as dt_timezone
+from decimal import Decimal
+
+import pytest
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ErrorDetail, ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from core.parsers import FastJSONParser
+from core.renderers import FastJSONRenderer
+
+pytest.importorskip('orjson')
+
+
+def assert_same_bytes(data, accepted_media_type=None, renderer_context=None):
+    expected = JSONRenderer().render(data, accepted_media_type, renderer_context)
+    actual = FastJSONRenderer().render(data, accepted_media_type, renderer_context)
+    assert actual == expected
+
+
+class TestFastJSONRenderer:
+    """Byte-for-byte parity with DRF's JSONRenderer."""
+
+    def test_pagination_envelope(self):
+        """The StandardPagination success/data/meta envelope renders identically."""
+        assert_same_bytes({
+            'success': True,
+            'data': [
+                {'id': 1, 'hours': '8.00', 'date': '2024-01-15', 'description': 'Café ☕ work',
+                 'created_at': '2024-01-15T09:30:00.123456Z', 'project': {'id': 2, 'name': 'X'}},
+            ],
+            'meta': {'page': 1, 'per_page': 20, 'total': 1, 'total_pages': 1},
+        })
+
+    def test_error_envelope(self):
+        """custom_exception_handler output, including ErrorDetail strings, matches."""
+        assert_same_bytes({
+            'success': False,
+            'error': {
+                'code': 'VAL_001',
+                'message': ErrorDetail('Hours must be positive.', code='invalid'),
+                'details': [{'field': 'hours', 'message': ErrorDetail('Too big.', code='max_value')}],
+            },
+        })
+
+    def test_non_json_types_use_drf_encoding(self):
+        """Datetimes, Decimals, UUIDs, lazy strings etc. are encoded the DRF way."""
+        assert_same_bytes({
+            'utc': datetime(2024, 1, 15, 9, 30, 0, 123456, tzinfo=UTC),
+            'offset': datetime(2024, 1, 15, 9, 30, tzinfo=dt_timezone(timedelta(hours=2))),
+            'naive': datetime(2024, 1, 15, 9, 30),
+            'date': date(2024, 1, 15),
+            'time': time(9, 30, 15),
+            'duration': timedelta(hours=1, minutes=30),
+            'decimal': Decimal('37.50'),
+            'uuid': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+            'lazy': gettext_lazy('Pending'),
+            'tuple': (1, 2),
+            1: 'int key',
+        })
+
+    def test_line_separators_escaped(self):
+        """U+2028/U+2029 are escaped as in JSONRenderer."""
+        assert_same_bytes({'description': 'line\u2028break\u2029para'})
+
+    def test_none_renders_empty(self):
+        assert FastJSONRenderer().render(None) == b''
+
+    def test_indent_falls_back(self):
+        """Indented output (e.g. browsable API) uses the stdlib renderer."""
+        assert_same_bytes({'a': [1, 2]}, 'application/json; indent=4')
+        assert_same_bytes({'a': [1, 2]}, None, {'indent': 2})
+
+    def test_unencodable_falls_back(self):
+        """Values orjson refuses (integers beyond 64 bits) use the stdlib path."""
+        assert_same_bytes({'big': 2 ** 70})
+
+
+class TestFastJSONParser:
+    """Tests for FastJSONParser."""
+
+    def test_parses_like_json_parser(self):
+        body = '{"hours": 7.5, "description": "Réunion", "tags": [null, true]}'.encode()
+
+        fast = FastJSONParser().parse(io.BytesIO(body))
+
+        assert fast == JSONParser().parse(io.BytesIO(body))
+
+    @pytest.mark.parametrize('body', [b'{"hours": NaN}', b'{"hours": ', b''])
+    def test_rejects_invalid_json(self, body):
+        """Malformed JSON and NaN literals raise ParseError."""
+        with pytest.raises(ParseError):
+            FastJSONParser().parse(io.BytesIO(body))
+
+    def test_non_utf8_charset_falls_back(self):
+        body = '{"name": "Zoë"}'.encode('latin-1')
+
+        data = FastJSONParser().parse(io.BytesIO(body), parser_context={'encoding': 'latin-1'})
+
+        assert data == {'name': 'Zoë'}
+
+
+@pytest.mark.django_db
+class TestRenderedResponses:
+    """The configured renderer produces the same bytes through the API."""
+
+    def test_list_response_matches_stdlib(self, authenticated_client, user, project):
+        from apps.timeentries.models import TimeEntry
+
+        TimeEntry.objects.create(
+            user=user, project=project, date=date.today(), hours=Decimal('8.00'),
+            billing_rate=Decimal('100.00'), rate_source=TimeEntry.RateSource.PROJECT,
+        )
+
+        response = authenticated_client.get('/api/v1/time-entries/')
+
+        assert response['Content-Type'] == 'application/json'
+        assert response.content == JSONRenderer().render(response.data)
+
+    def test_error_response_matches_stdlib(self, authenticated_client):
+        response = authenticated_client.post('/api/v1/time-entries/', {'hours': 'x'}, format='json')
+
+        assert response.status_code == 400
+        assert response.data['success'] is False
+        assert response.content == JSONRenderer().render(response.data)
+
+
+class TestBenchmarkCommand:
+    """Smoke test for manage.py benchmark_json."""
+
+    def test_reports_both_payloads(self):
+        from django.core.management import call_command
+
+        out = io.StringIO()
+        call_command('benchmark_json', entries=5, repeat=1, stdout=out)
+
+        assert 'timesheet detail' in out.getvalue()
+        assert 'hours report' in out.getvalue()
@@ -0,0 +1,140 @@
+"""
+Tests for values-based fast read serializers.
+"""
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+
+from core.serializers import ValuesSerializer
+
+
+def add_entry(user, project, timesheet=None, hours='8.00', days_ago=0):
+    from apps.timeentries.models import TimeEntry
+
+    return TimeEntry.objects.create(
+        user=user, project=project, timesheet=timesheet, date=date.today() - timedelta(days=days_ago),
+        hours=Decimal(hours), billing_rate=Decimal('112.50'), description='Réunion ☕',
+        rate_source=TimeEntry.RateSource.PROJECT,
+    )
+
+
+def render(data):
+    return JSONRenderer().render(data)
+
+
+@pytest.mark.django_db
+class TestValuesSerializer:
+    """Output parity with the ModelSerializer a ValuesSerializer is compiled from."""
+
+    def test_time_entry_matches_model_serializer(self, user, project, timesheet_factory):
+        """
+        Given: Entries with and without a timesheet
+        When: Serialized by both paths
+        Then: The rendered JSON is byte-identical
+        """
+        from apps.timeentries.models import TimeEntry
+        from apps.timeentries.serializers import TimeEntrySerializer, time_entry_list_values
+
+        timesheet = timesheet_factory()
+        add_entry(user, project, timesheet=timesheet)
+        add_entry(user, project, hours='0.25', days_ago=1)
+        queryset = TimeEntry.objects.filter(user=user)
+
+        assert render(time_entry_list_values.serialize(queryset)) == render(
+            TimeEntrySerializer(queryset, many=True).data
+        )
+
+    def test_timesheet_list_matches_model_serializer(self, user, manager, project, timesheet_factory):
+        """Nullable nested users, datetimes and annotated totals match."""
+        from apps.timesheets.models import Timesheet
+        from apps.timesheets.serializers import TimesheetListSerializer, timesheet_list_values
+
+        approved = timesheet_factory(
+            week_start=date(2024, 1, 1), status=Timesheet.Status.APPROVED,
+            approved_by=manager, approved_at=timezone.now(),
+        )
+        timesheet_factory(week_start=date(2024, 1, 8))
+        add_entry(user, project, timesheet=approved)
+        add_entry(user, project, timesheet=approved, hours='1.50', days_ago=1)
+        queryset = Timesheet.objects.filter(user=user)
+
+        assert render(timesheet_list_values.serialize(queryset)) == render(
+            TimesheetListSerializer(queryset, many=True).data
+        )
+
+    def test_single_query_regardless_of_rows(self, user, project):
+        """Nested users and projects are joined rather than loaded per row."""
+        from apps.timeentries.models import TimeEntry
+        from apps.timeentries.serializers import time_entry_list_values
+
+        for days_ago in range(5):
+            add_entry(user, project, days_ago=days_ago)
+
+        with CaptureQueriesContext(connection) as queries:
+            time_entry_list_values.serialize(TimeEntry.objects.filter(user=user))
+
+        assert len(queries) == 1
+
+    def test_method_field_requires_annotation(self):
+        """SerializerMethodFields cannot be compiled without method_fields."""
+
+        class WithMethod(serializers.Serializer):
+            total = serializers.SerializerMethodField()
+
+        with pytest.raises(ValueError):
+            ValuesSerializer(WithMethod)
+
+
+@pytest.mark.django_db
+class TestValuesListEndpoints:
+    """List endpoints serve the fast path with unchanged output."""
+
+    def test_time_entry_list(self, authenticated_client, user, project):
+        from apps.timeentries.models import TimeEntry
+        from apps.timeentries.serializers import TimeEntrySerializer
+
+        for days_ago in range(3):
+            add_entry(user, project, days_ago=days_ago)
+
+        response = authenticated_client.get('/api/v1/time-entries/', {'per_page': 2})
+
+        expected = TimeEntrySerializer(TimeEntry.objects.filter(user=user)[:2], many=True).data
+        assert response.status_code == 200
+        assert render(response.data['data']) == render(expected)
+        assert response.data['meta']['total'] == 3
+
+    def test_timesheet_list(self, authenticated_client, user, project, timesheet_factory):
+        from apps.timesheets.models import Timesheet
+        from apps.timesheets.serializers import TimesheetListSerializer
+
+        timesheet = timesheet_factory(week_start=date(2024, 1, 1))
+        add_entry(user, project, timesheet=timesheet)
+
+        response = authenticated_client.get('/api/v1/timesheets/')
+
+        expected = TimesheetListSerializer(Timesheet.objects.filter(user=user), many=True).data
+        assert render(response.data['data']) == render(expected)
+
+
+@pytest.mark.django_db
+class TestBenchmarkCommand:
+    """Smoke test for manage.py benchmark_serializers."""
+
+    def test_reports_and_rolls_back(self):
+        import io
+
+        from django.core.management import call_command
+
+        from apps.timeentries.models import TimeEntry
+
+        out = io.StringIO()
+        call_command('benchmark_serializers', page_size=3, repeat=1, stdout=out)
+
+        assert 'ValuesSerializer' in out.getvalue()
+        assert not TimeEntry.objects.exists()
@@ -0,0 +1,144 @@
+"""
+Tests for ?fields= / ?expand= sparse fieldsets.
+"""
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+
+from core.sparse import ALL, parse_fields
+
+
+def add_entry(user, project, timesheet=None, days_ago=0):
+    from apps.timeentries.models import TimeEntry
+
+    return TimeEntry.objects.create(
+        user=user, project=project, timesheet=timesheet, date=date.today() - timedelta(days=days_ago),
+        hours=Decimal('8.00'), billing_rate=Decimal('100.00'), description='Planning',
+        rate_source=TimeEntry.RateSource.PROJECT,
+    )
+
+
+def select_sql(queries, table):
+    return [q['sql'] for q in queries if q['sql'].startswith('SELECT') and f'FROM "{table}"' in q['sql']]
+
+
+class TestParseFields:
+    """Tests for parse_fields."""
+
+    def test_nested_and_bare_names(self):
+        assert parse_fields('id, project.id,project.name,user') == {
+            'id': ALL, 'project': {'id': ALL, 'name': ALL}, 'user': ALL,
+        }
+
+    def test_bare_name_wins(self):
+        assert parse_fields('project,project.id') == {'project': ALL}
+        assert parse_fields('project.id,project') == {'project': ALL}
+
+
+@pytest.mark.django_db
+class TestTimeEntrySparseFields:
+    """Tests for ?fields=/?expand= on /api/v1/time-entries/."""
+
+    def test_fields_prune_payload_and_query(self, authenticated_client, user, project):
+        """
+        Given: Time entries
+        When: Listing with fields=id,date,hours,project.id
+        Then: Only those fields are returned and read from the database
+        """
+        entry = add_entry(user, project)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = authenticated_client.get(
+                '/api/v1/time-entries/', {'fields': 'id,date,hours,project.id'},
+            )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['data'] == [
+            {'id': entry.id, 'date': entry.date.isoformat(), 'hours': '8.00', 'project': {'id': project.id}},
+        ]
+        (sql,) = [s for s in select_sql(queries, 'timeentries_timeentry') if 'COUNT(' not in s]
+        assert '"description"' not in sql
+        assert '"billing_rate"' not in sql
+        assert 'users_user' not in sql
+
+    def test_empty_expand_collapses_nested_objects(self, authenticated_client, user, project):
+        """expand= renders every nested object as its id."""
+        add_entry(user, project)
+
+        response = authenticated_client.get('/api/v1/time-entries/', {'expand': ''})
+
+        row = response.data['data'][0]
+        assert row['user'] == user.id
+        assert row['project'] == project.id
+        assert row['hours'] == '8.00'
+
+    def test_expand_keeps_named_objects(self, authenticated_client, user, project):
+        add_entry(user, project)
+
+        response = authenticated_client.get('/api/v1/time-entries/', {'expand': 'project'})
+
+        row = response.data['data'][0]
+        assert row['user'] == user.id
+        assert row['project'] == {'id': project.id, 'name': project.name}
+
+    def test_detail_fields(self, authenticated_client, user, project):
+        entry = add_entry(user, project)
+
+        response = authenticated_client.get(f'/api/v1/time-entries/{entry.id}/', {'fields': 'id,hours'})
+
+        assert response.data == {'id': entry.id, 'hours': '8.00'}
+
+    @pytest.mark.parametrize('params', [
+        {'fields': 'id,nope'},
+        {'fields': 'hours.id'},
+        {'expand': 'hours'},
+    ])
+    def test_invalid_selection_returns_400(self, authenticated_client, params):
+        response = authenticated_client.get('/api/v1/time-entries/', params)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data['success'] is False
+
+    def test_writes_ignore_fields(self, authenticated_client, user, project):
+        """Updates validate and respond with the full serializer."""
+        entry = add_entry(user, project)
+
+        response = authenticated_client.patch(
+            f'/api/v1/time-entries/{entry.id}/?fields=id', {'description': 'Review'}, format='json',
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['description'] == 'Review'
+
+
+@pytest.mark.django_db
+class TestSparseFieldsOtherEndpoints:
+    """The mixin on timesheet and rate endpoints."""
+
+    def test_timesheet_detail_collapses_entries(self, authenticated_client, user, project, timesheet_factory):
+        timesheet = timesheet_factory(week_start=date(2024, 1, 1))
+        entry = add_entry(user, project, timesheet=timesheet)
+
+        response = authenticated_client.get(
+            f'/api/v1/timesheets/{timesheet.id}/', {'fields': 'id,status,entries', 'expand': ''},
+        )
+
+        assert response.data == {'id': timesheet.id, 'status': timesheet.status, 'entries': [entry.id]}
+
+    def test_rate_list_narrows_columns(self, authenticated_admin_client, company, rate_factory):
+        """Endpoints without a values fast path are narrowed with only()."""
+        from apps.rates.models import Rate
+
+        rate = rate_factory(company=company, rate_type=Rate.RateType.PROJECT)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = authenticated_admin_client.get('/api/v1/rates/', {'fields': 'id,rate_type'})
+
+        assert response.data['data'] == [{'id': rate.id, 'rate_type': rate.rate_type}]
+        (sql,) = [s for s in select_sql(queries, 'rates_rate') if 'COUNT(' not in s]
+        assert '"hourly_rate"' not in sql
+        assert 'projects_project' not in sql